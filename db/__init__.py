@@ -1,4 +1,7 @@
 # db/__init__.py
+from db.migrations import tum_migrasyonlar
+
+
 def initialize_database(cursor):
     # Eğer tablo yoksa oluştur (güncellenmiş şema)
     cursor.execute("""
@@ -13,3 +16,6 @@ def initialize_database(cursor):
             gerceklesen_sure TEXT
         )
     """)
+
+    # Bekleyen şema migrasyonları (indeksler, gölge kolonlar; ucus_egitim.db + naeron_kayitlari.db)
+    tum_migrasyonlar(cursor.connection)
@@ -0,0 +1,483 @@
+# db/migrations.py
+import os
+import sqlite3
+from datetime import datetime
+
+NAERON_DB_PATH = "naeron_kayitlari.db"
+# meydan_aylik'te SIM satırlarının rota değeri (sim süreleri uçuş, iptal sim süreleri iptal kolonunda)
+MEYDAN_SIM_ROTA = "__sim__"
+
+_BOSLUK = "' ' || char(9) || char(10) || char(13)"
+
+
+# --- Gölge kolon ifadeleri (trigger'larda da kullanıldığı için saf SQL) ---
+def _trim(ifade: str) -> str:
+    return f"trim({ifade}, {_BOSLUK})"
+
+
+def plan_ogrenci_kodu_sql(kol: str) -> str:
+    """ozet_utils2.ogrenci_kodu_ayikla'nın SQL karşılığı: OZ… olduğu gibi, diğerleri ilk '-' öncesi."""
+    t = _trim(kol)
+    return f"""CASE
+        WHEN {kol} IS NULL THEN ''
+        WHEN substr({t}, 1, 2) = 'OZ' THEN {t}
+        WHEN instr({t}, '-') > 0 THEN {_trim(f"substr({t}, 1, instr({t}, '-') - 1)")}
+        ELSE {t}
+    END"""
+
+
+def naeron_ogrenci_kodu_sql(kol: str) -> str:
+    """ozet_utils2.naeron_ogrenci_kodu_ayikla'nın SQL karşılığı: OZ… ikinci '-' öncesi, diğerleri ilk '-' öncesi."""
+    t = _trim(kol)
+    ilk = f"instr({t}, '-')"
+    ikinci = f"instr(substr({t}, {ilk} + 1), '-')"
+    return f"""CASE
+        WHEN {kol} IS NULL THEN ''
+        WHEN substr({t}, 1, 2) = 'OZ' THEN
+            CASE WHEN {ilk} > 0 AND {ikinci} > 0
+                 THEN rtrim(substr({t}, 1, {ilk} + {ikinci} - 1), {_BOSLUK})
+                 ELSE {t} END
+        WHEN {ilk} > 0 THEN {_trim(f"substr({t}, 1, {ilk} - 1)")}
+        ELSE {t}
+    END"""
+
+
+def gorev_ust_sql(kol: str) -> str:
+    return f"UPPER(TRIM({kol}))"
+
+
+def iso_tarih_sql(kol: str) -> str:
+    """'YYYY-MM-DD[ ...]' ve 'GG.AA.YYYY' metinlerini 'YYYY-MM-DD'ye çevirir; diğerleri NULL."""
+    t = f"TRIM({kol})"
+    return f"""CASE
+        WHEN date({t}) IS NOT NULL THEN date({t})
+        WHEN {t} GLOB '[0-9][0-9].[0-9][0-9].[0-9][0-9][0-9][0-9]*'
+            THEN date(substr({t}, 7, 4) || '-' || substr({t}, 4, 2) || '-' || substr({t}, 1, 2))
+    END"""
+
+
+def _tam_sayi_sql(parca: str) -> str:
+    # int() gibi: çevresi boşluklu, isteğe bağlı tek işaretli rakam dizisi
+    u = _trim(parca)
+    return f"(({u} GLOB '[0-9]*' OR {u} GLOB '[+-][0-9]*') AND NOT substr({u}, 2) GLOB '*[^0-9]*')"
+
+
+def sure_saniye_sql(kol: str) -> str:
+    """
+    sure_utils.sure_saniye(tek_parca=True)'nın SQL karşılığı: "H", "H:M", "H:M:S" → saniye;
+    her parça tam sayı olmalı ("1.5", "12:xx", "01:30:00.5" gibi değerler Python'daki gibi 0).
+    Dördüncü ve sonraki parçalar yok sayılır; Python'dan farklı olarak bunlarda işaret / boşluk
+    kabul edilmez (sadece rakam). Boş / okunamayan değerler 0.
+    """
+    t = _trim(kol)
+    ilk = f"instr({t}, ':')"
+    kalan = f"substr({t}, {ilk} + 1)"
+    ikinci = f"instr({kalan}, ':')"
+    kalan2 = f"substr({kalan}, {ikinci} + 1)"
+    ucuncu = f"instr({kalan2}, ':')"
+    fazla = f"substr({kalan2}, {ucuncu} + 1)"
+
+    s = f"substr({t}, 1, {ilk} - 1)"
+    d = f"substr({kalan}, 1, {ikinci} - 1)"
+    sn3 = f"substr({kalan2}, 1, {ucuncu} - 1)"
+    fazla_gecerli = (
+        f"{fazla} != '' AND NOT {fazla} GLOB '*[^0-9:]*' AND instr({fazla}, '::') = 0 "
+        f"AND substr({fazla}, 1, 1) != ':' AND substr({fazla}, -1) != ':'"
+    )
+
+    def toplam(saat, dakika=None, saniye=None):
+        ifade = f"CAST({_trim(saat)} AS INTEGER) * 3600"
+        if dakika is not None:
+            ifade += f" + CAST({_trim(dakika)} AS INTEGER) * 60"
+        if saniye is not None:
+            ifade += f" + CAST({_trim(saniye)} AS INTEGER)"
+        return ifade
+
+    return f"""CASE
+        WHEN {kol} IS NULL OR {t} = '' THEN 0
+        WHEN {ilk} = 0 THEN
+            CASE WHEN {_tam_sayi_sql(t)} THEN {toplam(t)} ELSE 0 END
+        WHEN {ikinci} = 0 THEN
+            CASE WHEN {_tam_sayi_sql(s)} AND {_tam_sayi_sql(kalan)} THEN {toplam(s, kalan)} ELSE 0 END
+        WHEN {ucuncu} = 0 THEN
+            CASE WHEN {_tam_sayi_sql(s)} AND {_tam_sayi_sql(d)} AND {_tam_sayi_sql(kalan2)}
+                 THEN {toplam(s, d, kalan2)} ELSE 0 END
+        ELSE
+            CASE WHEN {_tam_sayi_sql(s)} AND {_tam_sayi_sql(d)} AND {_tam_sayi_sql(sn3)} AND {fazla_gecerli}
+                 THEN {toplam(s, d, sn3)} ELSE 0 END
+    END"""
+
+
+def _q(kol: str) -> str:
+    return f'"{kol}"'
+
+
+def _kolonlar(cur, tablo: str) -> set:
+    return {r[1] for r in cur.execute(f"PRAGMA table_info({tablo})")}
+
+
+def _golge_kolonlari_kur(cur, tablo: str, anahtar: str, kolonlar: dict) -> None:
+    """
+    `kolonlar` = {gölge kolon: (kaynak kolon, SQL ifadesi)}. Eksik kolonları ekler,
+    kaynak değiştikçe gölgeyi güncelleyen trigger'ları kurar ve mevcut satırları doldurur.
+    """
+    mevcut = _kolonlar(cur, tablo)
+    for kol in kolonlar:
+        if kol not in mevcut:
+            cur.execute(f'ALTER TABLE {tablo} ADD COLUMN "{kol}" TEXT')
+
+    kaynaklar = sorted({k for k, _ in kolonlar.values()})
+    set_new = ", ".join(f'"{kol}" = {ifade(f"NEW.{_q(k)}")}' for kol, (k, ifade) in kolonlar.items())
+    kaynak_sql = ", ".join(_q(k) for k in kaynaklar)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{tablo}_golge_ins AFTER INSERT ON {tablo}
+        BEGIN
+            UPDATE {tablo} SET {set_new} WHERE {anahtar} = NEW.{anahtar};
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{tablo}_golge_upd AFTER UPDATE OF {kaynak_sql} ON {tablo}
+        BEGIN
+            UPDATE {tablo} SET {set_new} WHERE {anahtar} = NEW.{anahtar};
+        END
+    """)
+    # Backfill: tek UPDATE
+    set_kol = ", ".join(f'"{kol}" = {ifade(_q(k))}' for kol, (k, ifade) in kolonlar.items())
+    cur.execute(f"UPDATE {tablo} SET {set_kol}")
+
+
+# --- ucus_egitim.db ---
+def _plan_indeksleri(cur):
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_plan_tarih ON ucus_planlari(plan_tarihi)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_plan_ogr ON ucus_planlari(ogrenci)")
+    # Dönem listeleri (SELECT DISTINCT donem, ogrenci ... WHERE donem = ?) indeksten karşılanır
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_plan_donem_ogr_tarih ON ucus_planlari(donem, ogrenci, plan_tarihi)")
+    # Revize güncellemeleri: WHERE ogrenci = ? AND gorev_ismi = ? AND plan_tarihi = ?
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_plan_ogr_gorev_tarih ON ucus_planlari(ogrenci, gorev_ismi, plan_tarihi)")
+
+
+PLAN_GOLGE_KOLONLARI = {
+    "ogrenci_kodu": ("ogrenci", plan_ogrenci_kodu_sql),
+    "gorev_ust": ("gorev_ismi", gorev_ust_sql),
+    "plan_tarihi_iso": ("plan_tarihi", iso_tarih_sql),
+}
+NAERON_GOLGE_KOLONLARI = {
+    "ogrenci_kodu": ("Öğrenci Pilot", naeron_ogrenci_kodu_sql),
+    "gorev_ust": ("Görev", gorev_ust_sql),
+    "ucus_tarihi_iso": ("Uçuş Tarihi 2", iso_tarih_sql),
+}
+# Tablo → gölge kolonları: okuyucular bunları kullanıcıya / dışa aktarıma göstermez
+GOLGE_KOLONLARI = {"ucus_planlari": PLAN_GOLGE_KOLONLARI, "naeron_ucuslar": NAERON_GOLGE_KOLONLARI}
+
+
+def plan_kolonlari(conn) -> list:
+    """ucus_planlari'nın kendi kolonları (gölge kolonlar hariç), tablo sırasıyla."""
+    return [
+        r[1] for r in conn.execute("PRAGMA table_info(ucus_planlari)")
+        if r[1] not in PLAN_GOLGE_KOLONLARI
+    ]
+
+
+def golgesiz_secim(conn, tablo: str) -> str:
+    """
+    `SELECT *` yerine kullanılacak kolon listesi: gölge kolonlar (GOLGE_KOLONLARI) hariç, tablo sırasıyla.
+    Tablo yoksa "*" döner (okuyucunun kendi "no such table" hata yolu korunur).
+    """
+    golge = GOLGE_KOLONLARI.get(tablo, {})
+    kolonlar = [r[1] for r in conn.execute(f"PRAGMA table_info({tablo})") if r[1] not in golge]
+    return ", ".join(_q(k) for k in kolonlar) if kolonlar else "*"
+
+
+def _plan_golge_kolonlari(cur):
+    _golge_kolonlari_kur(cur, "ucus_planlari", "id", PLAN_GOLGE_KOLONLARI)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_plan_kod_tarih ON ucus_planlari(ogrenci_kodu, plan_tarihi_iso, gorev_ust)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_plan_gorev_tarih ON ucus_planlari(gorev_ust, plan_tarihi_iso)")
+
+
+def _plan_degisiklik_gunlugu(cur):
+    # Öğrenci bazında değişiklik günlüğü: otomatik revize işaretleri (auto_revize_isaret) bu id'lere
+    # göre sadece değişen öğrencileri yeniden işler. id AUTOINCREMENT: budanan satırlardan sonra da artar.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS plan_degisiklik (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ogrenci_kodu TEXT
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_plan_degisiklik_kod ON plan_degisiklik(ogrenci_kodu, id)")
+    yeni, eski = plan_ogrenci_kodu_sql("NEW.ogrenci"), plan_ogrenci_kodu_sql("OLD.ogrenci")
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_ucus_planlari_degisiklik_ins AFTER INSERT ON ucus_planlari
+        BEGIN
+            INSERT INTO plan_degisiklik (ogrenci_kodu) VALUES ({yeni});
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_ucus_planlari_degisiklik_upd AFTER UPDATE ON ucus_planlari
+        BEGIN
+            INSERT INTO plan_degisiklik (ogrenci_kodu) VALUES ({eski});
+            INSERT INTO plan_degisiklik (ogrenci_kodu) SELECT {yeni} WHERE NEW.ogrenci IS NOT OLD.ogrenci;
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_ucus_planlari_degisiklik_del AFTER DELETE ON ucus_planlari
+        BEGIN
+            INSERT INTO plan_degisiklik (ogrenci_kodu) VALUES ({eski});
+        END
+    """)
+
+
+def _plan_degisiklik_kolonlu(cur):
+    # Gölge kolon trigger'larının takip UPDATE'i günlüğe ikinci satır yazmasın: sadece planın kendi
+    # kolonları (migrasyon anındaki hali) değişince tetiklenir
+    kolonlar = ", ".join(f'"{k}"' for k in plan_kolonlari(cur) if k != "id")
+    yeni, eski = plan_ogrenci_kodu_sql("NEW.ogrenci"), plan_ogrenci_kodu_sql("OLD.ogrenci")
+    cur.execute("DROP TRIGGER IF EXISTS trg_ucus_planlari_degisiklik_upd")
+    cur.execute(f"""
+        CREATE TRIGGER trg_ucus_planlari_degisiklik_upd AFTER UPDATE OF {kolonlar} ON ucus_planlari
+        BEGIN
+            INSERT INTO plan_degisiklik (ogrenci_kodu) VALUES ({eski});
+            INSERT INTO plan_degisiklik (ogrenci_kodu) SELECT {yeni} WHERE NEW.ogrenci IS NOT OLD.ogrenci;
+        END
+    """)
+
+
+PLAN_MIGRASYONLARI = [
+    (1, "ucus_planlari indeksleri", _plan_indeksleri),
+    (2, "ucus_planlari gölge kolonları (ogrenci_kodu, gorev_ust, plan_tarihi_iso)", _plan_golge_kolonlari),
+    (3, "plan_degisiklik günlüğü (öğrenci bazında değişiklik id'leri)", _plan_degisiklik_gunlugu),
+    (4, "plan_degisiklik güncelleme trigger'ı gölge kolonları yok sayar", _plan_degisiklik_kolonlu),
+]
+
+
+# --- naeron_kayitlari.db ---
+def _naeron_indeksleri(cur):
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_n_tarih2 ON naeron_ucuslar("Uçuş Tarihi 2")')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_n_gorev ON naeron_ucuslar("Görev")')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_n_pilot ON naeron_ucuslar("Öğrenci Pilot")')
+    # OZU sorguları: WHERE TRIM("Öğrenci Pilot") = TRIM(?) [AND UPPER(TRIM("Görev")) = ...]
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_n_pilot_trim_gorev
+        ON naeron_ucuslar(TRIM("Öğrenci Pilot"), UPPER(TRIM("Görev")), "Uçuş Tarihi 2")
+    """)
+
+
+def _naeron_golge_kolonlari(cur):
+    _golge_kolonlari_kur(cur, "naeron_ucuslar", "rowid", NAERON_GOLGE_KOLONLARI)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_n_kod_tarih ON naeron_ucuslar(ogrenci_kodu, ucus_tarihi_iso, gorev_ust)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_n_gorev_tarih ON naeron_ucuslar(gorev_ust, ucus_tarihi_iso)")
+
+
+# Günlük küp: boyut kolonu → (kaynak kolon, SQL ifadesi); NULL'lar '' saklanır ki birincil anahtarda eşleşsin
+NAERON_KUP_BOYUTLARI = {
+    "gun": ("Uçuş Tarihi 2", iso_tarih_sql),
+    "cagri": ("Çağrı", _trim),
+    "gorev": ("Görev", _trim),
+    "ogretmen": ("Öğretmen Pilot", _trim),
+    "kalkis": ("Kalkış", _trim),
+    "inis": ("İniş", _trim),
+}
+NAERON_KUP_OLCULERI = {"block_sn": "Block Time", "ucus_sn": "Flight Time"}
+
+
+def _kup_boyutu(kol: str, onek: str = "") -> str:
+    kaynak, ifade = NAERON_KUP_BOYUTLARI[kol]
+    return f"COALESCE({ifade(onek + _q(kaynak))}, '')"
+
+
+def _kup_ekle_sql(onek: str, isaret: str = "") -> str:
+    # onek: "NEW." / "OLD."; isaret "-" iken satırın katkısı geri alınır
+    boyutlar = ", ".join(NAERON_KUP_BOYUTLARI)
+    degerler = ", ".join(
+        [_kup_boyutu(kol, onek) for kol in NAERON_KUP_BOYUTLARI]
+        + [f"{isaret}1"]
+        + [f"{isaret}({sure_saniye_sql(onek + _q(k))})" for k in NAERON_KUP_OLCULERI.values()]
+    )
+    return f"""
+            INSERT INTO naeron_gunluk ({boyutlar}, sorti, block_sn, ucus_sn) VALUES ({degerler})
+            ON CONFLICT ({boyutlar}) DO UPDATE SET
+                sorti = sorti + excluded.sorti,
+                block_sn = block_sn + excluded.block_sn,
+                ucus_sn = ucus_sn + excluded.ucus_sn;"""
+
+
+def _naeron_gunluk_kup(cur):
+    """
+    naeron_gunluk: (gün, çağrı, görev, öğretmen, kalkış, iniş) başına sorti ve Block / Flight
+    saniyesi. naeron_ucuslar'daki her INSERT / UPDATE / DELETE trigger'larla küpe yansır;
+    katkısı sıfırlanan hücreler silinir. Mevcut satırlar tek GROUP BY ile doldurulur.
+    """
+    boyutlar = ", ".join(NAERON_KUP_BOYUTLARI)
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS naeron_gunluk (
+            gun TEXT NOT NULL, cagri TEXT NOT NULL, gorev TEXT NOT NULL,
+            ogretmen TEXT NOT NULL, kalkis TEXT NOT NULL, inis TEXT NOT NULL,
+            sorti INTEGER NOT NULL DEFAULT 0,
+            block_sn INTEGER NOT NULL DEFAULT 0,
+            ucus_sn INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY ({boyutlar})
+        ) WITHOUT ROWID
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_naeron_gunluk_cagri ON naeron_gunluk(cagri, gun)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_naeron_gunluk_rota ON naeron_gunluk(kalkis, inis, gun)")
+
+    eski_anahtar = " AND ".join(f"{kol} = {_kup_boyutu(kol, 'OLD.')}" for kol in NAERON_KUP_BOYUTLARI)
+    geri_al = f"""{_kup_ekle_sql("OLD.", "-")}
+            DELETE FROM naeron_gunluk WHERE {eski_anahtar} AND sorti <= 0;"""
+    kaynaklar = [k for k, _ in NAERON_KUP_BOYUTLARI.values()] + list(NAERON_KUP_OLCULERI.values())
+    kaynak_sql = ", ".join(_q(k) for k in kaynaklar)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_naeron_ucuslar_kup_ins AFTER INSERT ON naeron_ucuslar
+        BEGIN{_kup_ekle_sql("NEW.")}
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_naeron_ucuslar_kup_upd AFTER UPDATE OF {kaynak_sql} ON naeron_ucuslar
+        BEGIN{geri_al}{_kup_ekle_sql("NEW.")}
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_naeron_ucuslar_kup_del AFTER DELETE ON naeron_ucuslar
+        BEGIN{geri_al}
+        END
+    """)
+
+    # Backfill: tek GROUP BY
+    secim = ", ".join(
+        [f"{_kup_boyutu(kol)} AS {kol}" for kol in NAERON_KUP_BOYUTLARI]
+        + [f"{sure_saniye_sql(_q(k))} AS {kol}" for kol, k in NAERON_KUP_OLCULERI.items()]
+    )
+    cur.execute("DELETE FROM naeron_gunluk")
+    cur.execute(f"""
+        INSERT INTO naeron_gunluk ({boyutlar}, sorti, block_sn, ucus_sn)
+        SELECT {boyutlar}, COUNT(*), SUM(block_sn), SUM(ucus_sn)
+        FROM (SELECT {secim} FROM naeron_ucuslar)
+        GROUP BY {boyutlar}
+    """)
+
+
+def _naeron_gunluk_kup_yenile(cur):
+    # sure_saniye_sql geçersiz parçaları artık 0 sayıyor: trigger'lar yeni ifadeyle kurulur, küp baştan dolar
+    for olay in ("ins", "upd", "del"):
+        cur.execute(f"DROP TRIGGER IF EXISTS trg_naeron_ucuslar_kup_{olay}")
+    _naeron_gunluk_kup(cur)
+
+
+NAERON_MIGRASYONLARI = [
+    (1, "naeron_ucuslar indeksleri", _naeron_indeksleri),
+    (2, "naeron_ucuslar gölge kolonları (ogrenci_kodu, gorev_ust, ucus_tarihi_iso)", _naeron_golge_kolonlari),
+    (3, "naeron_gunluk günlük küpü (gün × çağrı × görev × öğretmen × kalkış × iniş)", _naeron_gunluk_kup),
+    (4, "naeron_gunluk süre ayrıştırması sure_utils ile aynı (geçersiz parçalar 0)", _naeron_gunluk_kup_yenile),
+]
+
+
+# --- meydan.db ---
+def _saniye_kolonu(kolonlar: set, kol: str) -> str:
+    # Eski tablolarda ALTER ile sonradan eklenen ay kolonları eksik olabilir
+    return f"COALESCE({kol}, 0)" if kol in kolonlar else "0"
+
+
+def _meydan_eski_tablolari_tasi(cur):
+    """
+    Rota başına (meydan_meta) ve SIM grubu başına (meydan_meta_sim) açılmış geniş tabloları
+    (ay başına *_saniye_{m} kolonları) meydan_aylik'e satır = (ana, route, yil, ucak_tipi, ay)
+    olarak aktarır. Eski tablolar silinmez, sadece artık okunmaz.
+    """
+    mevcut = {r[0] for r in cur.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    kaynaklar = []
+    if "meydan_meta" in mevcut:
+        kaynaklar += [
+            (tbl, ana, route, "ucak_tipi", "ucus_saniye", "iptal_saniye")
+            for tbl, ana, route in cur.execute("SELECT table_name, ana, route FROM meydan_meta").fetchall()
+        ]
+    if "meydan_meta_sim" in mevcut:
+        kaynaklar += [
+            (tbl, genel, MEYDAN_SIM_ROTA, "sim_tipi", "sim_saniye", "iptal_sim_saniye")
+            for tbl, genel in cur.execute("SELECT table_name, genel FROM meydan_meta_sim").fetchall()
+        ]
+
+    for tbl, ana, route, tip, ucus, iptal in kaynaklar:
+        if tbl not in mevcut:
+            continue
+        kolonlar = _kolonlar(cur, tbl)
+        guncelleme = "updated_at" if "updated_at" in kolonlar else "NULL"
+        aylar = " UNION ALL ".join(
+            f"SELECT yil, TRIM({tip}) AS tip, {m} AS ay, {_saniye_kolonu(kolonlar, f'{ucus}_{m}')} AS u, "
+            f"{_saniye_kolonu(kolonlar, f'{iptal}_{m}')} AS i, {guncelleme} AS guncelleme FROM {tbl}"
+            for m in range(1, 13)
+        )
+        cur.execute(f"""
+            INSERT OR REPLACE INTO meydan_aylik (ana, route, yil, ucak_tipi, ay, ucus_saniye, iptal_saniye, updated_at)
+            SELECT ?, ?, yil, tip, ay, u, i, guncelleme FROM ({aylar})
+            WHERE yil IS NOT NULL AND tip IS NOT NULL AND tip != ''
+        """, (ana, route))
+
+
+MEYDAN_MIGRASYONLARI = [
+    (1, "rota / SIM geniş tablolarının meydan_aylik'e taşınması", _meydan_eski_tablolari_tasi),
+]
+
+
+# --- Çalıştırıcı ---
+def migrasyonlari_uygula(conn: sqlite3.Connection, migrasyonlar, tablo: str) -> list:
+    """
+    `tablo` varsa, schema_surumu'nda kayıtlı olmayan migrasyonları sırayla uygular.
+    Her migrasyon kendi transaction'ında çalışır ve başarılı olursa sürümü yazılır.
+    Uygulanan sürümleri döndürür.
+    """
+    cur = conn.cursor()
+    if not cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (tablo,)
+    ).fetchone():
+        return []
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_surumu (
+            tablo TEXT NOT NULL,
+            surum INTEGER NOT NULL,
+            aciklama TEXT,
+            uygulama_zamani TEXT,
+            PRIMARY KEY (tablo, surum)
+        )
+    """)
+    conn.commit()
+    son = cur.execute("SELECT MAX(surum) FROM schema_surumu WHERE tablo = ?", (tablo,)).fetchone()[0] or 0
+
+    uygulanan = []
+    for surum, aciklama, fn in migrasyonlar:
+        if surum <= son:
+            continue
+        try:
+            cur.execute("BEGIN")
+            fn(cur)
+            cur.execute(
+                "INSERT INTO schema_surumu (tablo, surum, aciklama, uygulama_zamani) VALUES (?, ?, ?, ?)",
+                (tablo, surum, aciklama, datetime.now().isoformat(timespec="seconds")),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        uygulanan.append(surum)
+    return uygulanan
+
+
+def plan_migrasyonlari(conn: sqlite3.Connection) -> list:
+    return migrasyonlari_uygula(conn, PLAN_MIGRASYONLARI, "ucus_planlari")
+
+
+def naeron_migrasyonlari(conn: sqlite3.Connection) -> list:
+    return migrasyonlari_uygula(conn, NAERON_MIGRASYONLARI, "naeron_ucuslar")
+
+
+def meydan_migrasyonlari(conn: sqlite3.Connection) -> list:
+    return migrasyonlari_uygula(conn, MEYDAN_MIGRASYONLARI, "meydan_aylik")
+
+
+def tum_migrasyonlar(conn_plan: sqlite3.Connection, naeron_db_path: str = NAERON_DB_PATH) -> None:
+    """Plan DB'si ve (dosya varsa) Naeron DB'si için bekleyen migrasyonları uygular."""
+    plan_migrasyonlari(conn_plan)
+    if os.path.exists(naeron_db_path):
+        conn_n = sqlite3.connect(naeron_db_path)
+        try:
+            naeron_migrasyonlari(conn_n)
+        finally:
+            conn_n.close()
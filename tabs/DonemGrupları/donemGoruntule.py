@@ -267,10 +267,8 @@ def tab_donem_grup_tablosu(st, conn: sqlite3.Connection | None = None):
         )
 
         # --- Yardımcılar (mevcut util'den) ---
-        from tabs.utils.ozet_utils import (
-            ogrenci_kodu_ayikla,
-            naeron_ogrenci_kodu_ayikla,
-        )
+        from tabs.utils.ozet_utils import ogrenci_kodu_ayikla
+        from tabs.utils.ogrenci_kodu import ogrenci_patlat
 
         def _norm(s: str) -> str:
             return re.sub(r"[^\w]", "", str(s)).upper()
@@ -318,28 +316,12 @@ def tab_donem_grup_tablosu(st, conn: sqlite3.Connection | None = None):
         if df_n_raw.empty:
             df_naeron_long = pd.DataFrame(columns=["ogrenci_kodu","gorev_norm","tarih"])
         else:
-            mask_mcc = df_n_raw["Görev"].astype(str).str.upper().str.startswith("MCC")
-            df_mcc = df_n_raw[mask_mcc].copy()
-            rows = []
-            for _, r in df_mcc.iterrows():
-                kodlar = re.findall(r"\d{3}[A-Z]{2}", str(r.get("Öğrenci Pilot","")).upper())
-                for k in kodlar:
-                    rows.append({
-                        "ogrenci_kodu": k,
-                        "gorev_norm": _norm(r.get("Görev","")),
-                        "tarih": pd.to_datetime(r.get("Uçuş Tarihi 2", None), errors="coerce")
-                    })
-            df_mcc_long = pd.DataFrame(rows, columns=["ogrenci_kodu","gorev_norm","tarih"])
-
-            df_other = df_n_raw[~mask_mcc].copy()
-            df_other["ogrenci_kodu"] = df_other["Öğrenci Pilot"].apply(naeron_ogrenci_kodu_ayikla)
-            df_other["gorev_norm"] = df_other["Görev"].apply(_norm)
-            df_other["tarih"] = pd.to_datetime(df_other["Uçuş Tarihi 2"], errors="coerce")
-
-            df_naeron_long = pd.concat(
-                [df_mcc_long, df_other[["ogrenci_kodu","gorev_norm","tarih"]]],
-                ignore_index=True
-            ).dropna(subset=["ogrenci_kodu","gorev_norm","tarih"])
+            df_long = ogrenci_patlat(df_n_raw)
+            df_long["gorev_norm"] = df_long["Görev"].astype(str).str.replace(r"[^\w]", "", regex=True).str.upper()
+            df_long["tarih"] = pd.to_datetime(df_long["Uçuş Tarihi 2"], errors="coerce")
+            df_naeron_long = df_long[["ogrenci_kodu","gorev_norm","tarih"]].dropna(
+                subset=["ogrenci_kodu","gorev_norm","tarih"]
+            )
 
         # --- 12 hedef görev etiketi ---
         hedef_gorevler = {
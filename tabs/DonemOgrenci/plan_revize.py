@@ -2,16 +2,20 @@
 from __future__ import annotations
 
 import sqlite3
+from collections import Counter
 from datetime import datetime, date, time as dt_time, timedelta
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 import pandas as pd
 import streamlit as st
 
-from tabs.utils.ozet_utils2 import ogrenci_kodu_ayikla, to_saat, normalize_task
+from db.migrations import golgesiz_secim, iso_tarih_sql
+from tabs.utils.ogrenci_kodu import plan_ogrenci_kodu
+from tabs.utils.ozet_utils2 import to_saat, normalize_task
 
 
-def _ensure_log_table(conn: sqlite3.Connection) -> None:
+def _ensure_log_table(conn: sqlite3.Connection, commit: bool = True) -> None:
     cur = conn.cursor()
     cur.execute(
         """
@@ -30,13 +34,86 @@ def _ensure_log_table(conn: sqlite3.Connection) -> None:
         )
         """
     )
-    conn.commit()
+    ensure_revize_sayac(conn, commit=False)
+    if commit:
+        conn.commit()
+
+
+def ensure_revize_sayac(conn: sqlite3.Connection, commit: bool = True) -> None:
+    """
+    plan_revize_sayac: (donem, ogrenci, gün) başına plan_revize_log kayıt sayısı; _write_log ile
+    aynı transaction'da güncellenir. Tablo ilk kurulduğunda mevcut log'dan doldurulur.
+    """
+    cur = conn.cursor()
+    if cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='plan_revize_sayac'"
+    ).fetchone():
+        return
+    cur.execute(
+        """
+        CREATE TABLE plan_revize_sayac (
+            donem TEXT NOT NULL DEFAULT '',
+            ogrenci TEXT NOT NULL DEFAULT '',
+            plan_tarihi TEXT NOT NULL,
+            adet INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (donem, ogrenci, plan_tarihi)
+        )
+        """
+    )
+    if cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='plan_revize_log'"
+    ).fetchone():
+        cur.execute(
+            f"""
+            INSERT INTO plan_revize_sayac (donem, ogrenci, plan_tarihi, adet)
+            SELECT COALESCE(donem, ''), COALESCE(ogrenci, ''), gun, COUNT(*)
+            FROM (SELECT donem, ogrenci, {iso_tarih_sql("plan_tarihi")} AS gun FROM plan_revize_log)
+            WHERE gun IS NOT NULL
+            GROUP BY 1, 2, 3
+            """
+        )
+    if commit:
+        conn.commit()
 
 
-def _write_log(conn: sqlite3.Connection, rows: List[Dict]) -> None:
+def _sayaclari_artir(cur: sqlite3.Cursor, log_satirlari: List[tuple]) -> None:
+    # log satırı: (ts, action, donem, ogrenci, plan_tarihi, ...); plan_tarihi normalize edilmiş "YYYY-MM-DD[ HH:MM]"
+    def _anahtar(v) -> str:
+        return "" if v is None or (isinstance(v, float) and pd.isna(v)) else str(v)
+
+    sayac = Counter((_anahtar(r[2]), _anahtar(r[3]), r[4][:10]) for r in log_satirlari if r[4])
+    cur.executemany(
+        """
+        INSERT INTO plan_revize_sayac (donem, ogrenci, plan_tarihi, adet) VALUES (?, ?, ?, ?)
+        ON CONFLICT (donem, ogrenci, plan_tarihi) DO UPDATE SET adet = adet + excluded.adet
+        """,
+        [(*anahtar, adet) for anahtar, adet in sayac.items()],
+    )
+
+
+def _write_log(conn: sqlite3.Connection, rows: List[Dict], commit: bool = True) -> None:
     if not rows:
         return
-    _ensure_log_table(conn)
+    _ensure_log_table(conn, commit=commit)
+    ts = datetime.now().isoformat(timespec="seconds")
+    # Toplu loglarda tekrarlanan tarih / süre değerleri bir kez normalize edilir
+    tarih_norm = lru_cache(maxsize=None)(_normalize_plan_tarihi)
+    sure_norm = lru_cache(maxsize=None)(_normalize_sure)
+    satirlar = [
+        (
+            ts,
+            r.get("action", "update"),
+            r.get("donem", ""),
+            r.get("ogrenci", ""),
+            tarih_norm(r.get("plan_tarihi", "")) or "",
+            r.get("old_gorev_ismi", ""),
+            r.get("new_gorev_ismi", ""),
+            sure_norm(r.get("old_sure", "")),
+            sure_norm(r.get("new_sure", "")),
+            r.get("reason", ""),
+        )
+        for r in rows
+    ]
     cur = conn.cursor()
     cur.executemany(
         """
@@ -46,23 +123,11 @@ def _write_log(conn: sqlite3.Connection, rows: List[Dict]) -> None:
         )
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
-        [
-            (
-                datetime.now().isoformat(timespec="seconds"),
-                r.get("action", "update"),
-                r.get("donem", ""),
-                r.get("ogrenci", ""),
-                _normalize_plan_tarihi(r.get("plan_tarihi", "")) or "",
-                r.get("old_gorev_ismi", ""),
-                r.get("new_gorev_ismi", ""),
-                _normalize_sure(r.get("old_sure", "")),
-                _normalize_sure(r.get("new_sure", "")),
-                r.get("reason", ""),
-            )
-            for r in rows
-        ],
+        satirlar,
     )
-    conn.commit()
+    _sayaclari_artir(cur, satirlar)
+    if commit:
+        conn.commit()
 
 
 def _normalize_plan_tarihi(val) -> Optional[str]:
@@ -126,6 +191,180 @@ def _make_unique_columns(df: pd.DataFrame, preserve: Optional[str] = None) -> pd
     return df
 
 
+# --- Toplu revize API'si ---
+DUZENLENEBILIR_KOLONLAR = ["plan_tarihi", "gorev_tipi", "gorev_ismi", "sure", "egitim_yeri", "phase"]
+_LOG_KOLONLARI = ["donem", "ogrenci", "plan_tarihi", "gorev_ismi", "sure"]
+
+
+def _kolon_normalize(col: str, seri: pd.Series) -> pd.Series:
+    # Satır döngüsündeki normalizasyonlarla aynı; her benzersiz değer bir kez çevrilir
+    fn = {"plan_tarihi": _normalize_plan_tarihi, "sure": _normalize_sure}.get(col, _normalize_text)
+    degerler = seri.astype(object).where(seri.notna(), None)
+    tablo = {v: fn(v) for v in pd.unique(degerler)}
+    return degerler.map(tablo)
+
+
+def _kayitlari_oku(conn: sqlite3.Connection, key_col: str, anahtarlar: List[int], kolonlar: List[str]) -> pd.DataFrame:
+    """Anahtarları verilen plan satırlarını tek sorguda okur (temp tablo üzerinden join)."""
+    cur = conn.cursor()
+    cur.execute("DROP TABLE IF EXISTS temp.revize_anahtar")
+    cur.execute("CREATE TEMP TABLE revize_anahtar (anahtar INTEGER PRIMARY KEY)")
+    cur.executemany("INSERT OR IGNORE INTO temp.revize_anahtar VALUES (?)", [(k,) for k in anahtarlar])
+    mevcut = {r[1] for r in conn.execute("PRAGMA table_info(ucus_planlari)")}
+    secim = ", ".join(f"p.{c}" for c in kolonlar if c in mevcut)
+    df = pd.read_sql_query(
+        f"SELECT p.{key_col} AS anahtar, {secim} FROM ucus_planlari p "
+        f"JOIN temp.revize_anahtar a ON a.anahtar = p.{key_col}",
+        conn,
+    )
+    cur.execute("DROP TABLE temp.revize_anahtar")
+    return df
+
+
+def _anahtar_kontrol(key_col: str) -> None:
+    if key_col not in ("rowid", "id"):
+        raise ValueError(f"Geçersiz kayıt anahtarı: {key_col}")
+
+
+def toplu_revize_uygula(
+    conn: sqlite3.Connection,
+    degisiklikler: pd.DataFrame,
+    key_col: str = "id",
+    reason: str = "",
+    etiketler: Optional[Dict[str, str]] = None,
+) -> Dict:
+    """
+    `degisiklikler`: key_col (id / rowid) + yeni değer kolonları (DUZENLENEBILIR_KOLONLAR'dan herhangi
+    biri: plan_tarihi, sure, gorev_ismi, ...). Değerler satır bazlı kayıttaki gibi normalize edilir,
+    sadece değişen hücreler yazılır. Güncellemeler (değişen kolon kümesi başına bir executemany) ve
+    plan_revize_log satırları tek transaction'da yazılır. Log sebebi: `reason` | "kolon: eski → yeni"
+    notları (`etiketler` ile kolon adı yerine görünen ad kullanılabilir).
+    Dönüş: {guncellenen, degismeyen, bulunamayan, kolonlar: {kolon: adet}, fark: DataFrame}.
+    """
+    _anahtar_kontrol(key_col)
+    etiketler = etiketler or {}
+    kolonlar = [c for c in DUZENLENEBILIR_KOLONLAR if c in degisiklikler.columns]
+    bos_fark = pd.DataFrame(columns=["anahtar", "kolon", "eski", "yeni"])
+    yeni = degisiklikler[degisiklikler[key_col].notna()].copy()
+    yeni["anahtar"] = yeni[key_col].astype("int64")
+    yeni = yeni.drop_duplicates("anahtar", keep="last").set_index("anahtar")
+    if yeni.empty or not kolonlar:
+        return {"guncellenen": 0, "degismeyen": len(yeni), "bulunamayan": 0, "kolonlar": {}, "fark": bos_fark}
+
+    eski = _kayitlari_oku(conn, key_col, yeni.index.tolist(), list(dict.fromkeys(_LOG_KOLONLARI + kolonlar)))
+    eski = eski.set_index("anahtar")
+    bulunamayan = len(yeni.index.difference(eski.index))
+    yeni = yeni.loc[yeni.index.intersection(eski.index, sort=False)]
+    eski = eski.loc[yeni.index]
+
+    eski_norm = pd.DataFrame(
+        {c: _kolon_normalize(c, eski[c]) if c in eski.columns else "" for c in kolonlar}, index=yeni.index
+    )
+    yeni_norm = pd.DataFrame({c: _kolon_normalize(c, yeni[c]) for c in kolonlar}, index=yeni.index)
+    degisti = yeni_norm.ne(eski_norm) & ~(yeni_norm.isna() & eski_norm.isna())
+    satir_degisti = degisti.any(axis=1)
+    yazilacak = yeni_norm.fillna("")
+    if not satir_degisti.any():
+        return {"guncellenen": 0, "degismeyen": len(yeni), "bulunamayan": bulunamayan, "kolonlar": {}, "fark": bos_fark}
+
+    # Güncellemeler: aynı kolon kümesi değişen satırlar tek executemany
+    imza = degisti[satir_degisti].apply(lambda r: tuple(c for c in kolonlar if r[c]), axis=1)
+    # Log satırları (satır döngüsündeki alanlarla aynı)
+    notlar = pd.Series("", index=imza.index)
+    for c in kolonlar:
+        m = degisti.loc[imza.index, c]
+        parca = (
+            etiketler.get(c, c) + ": " + eski_norm.loc[imza.index, c].fillna("").replace("", "-")
+            + " → " + yazilacak.loc[imza.index, c].replace("", "-")
+        )
+        notlar = notlar.where(~m, notlar.where(notlar == "", notlar + "; ") + parca)
+    log_satirlari = []
+    orijinaller = eski.loc[notlar.index].to_dict("index")
+    for anahtar, not_txt in notlar.items():
+        orj = orijinaller[anahtar]
+        log_reason = f"{reason} | {not_txt}" if reason and not_txt else (reason or not_txt)
+        log_satirlari.append(
+            {
+                "action": "update",
+                "donem": orj.get("donem", ""),
+                "ogrenci": orj.get("ogrenci", ""),
+                "plan_tarihi": orj.get("plan_tarihi"),
+                "old_gorev_ismi": orj.get("gorev_ismi", ""),
+                "new_gorev_ismi": yazilacak.at[anahtar, "gorev_ismi"]
+                if "gorev_ismi" in kolonlar and degisti.at[anahtar, "gorev_ismi"] else orj.get("gorev_ismi", ""),
+                "old_sure": orj.get("sure", ""),
+                "new_sure": yazilacak.at[anahtar, "sure"]
+                if "sure" in kolonlar and degisti.at[anahtar, "sure"] else orj.get("sure", ""),
+                "reason": log_reason,
+            }
+        )
+
+    cur = conn.cursor()
+    try:
+        for kume, anahtarlar in imza.groupby(imza, sort=False).groups.items():
+            atama = ", ".join(f"{c} = ?" for c in kume)
+            degerler = yazilacak.loc[anahtarlar, list(kume)]
+            cur.executemany(
+                f"UPDATE ucus_planlari SET {atama} WHERE {key_col} = ?",
+                [(*vals, int(k)) for k, vals in zip(anahtarlar, degerler.itertuples(index=False, name=None))],
+            )
+        _write_log(conn, log_satirlari, commit=False)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    fark = degisti[satir_degisti].stack()
+    fark = fark[fark].index.to_frame(index=False, name=["anahtar", "kolon"])
+    if not fark.empty:
+        fark["eski"] = [eski_norm.at[a, c] for a, c in zip(fark["anahtar"], fark["kolon"])]
+        fark["yeni"] = [yazilacak.at[a, c] for a, c in zip(fark["anahtar"], fark["kolon"])]
+    return {
+        "guncellenen": int(satir_degisti.sum()),
+        "degismeyen": int((~satir_degisti).sum()),
+        "bulunamayan": bulunamayan,
+        "kolonlar": {c: int(degisti[c].sum()) for c in kolonlar if degisti[c].any()},
+        "fark": fark if not fark.empty else bos_fark,
+    }
+
+
+def toplu_sil(conn: sqlite3.Connection, anahtarlar, key_col: str = "id", reason: str = "") -> int:
+    """Anahtarları verilen plan satırlarını tek executemany ile siler, delete loglarını aynı transaction'da yazar."""
+    _anahtar_kontrol(key_col)
+    anahtarlar = pd.to_numeric(pd.Series(list(anahtarlar), dtype=object), errors="coerce").dropna()
+    anahtarlar = list(dict.fromkeys(int(k) for k in anahtarlar))
+    if not anahtarlar:
+        return 0
+    eski = _kayitlari_oku(conn, key_col, anahtarlar, _LOG_KOLONLARI)
+    if eski.empty:
+        return 0
+    log_satirlari = [
+        {
+            "action": "delete",
+            "donem": r.get("donem", ""),
+            "ogrenci": r.get("ogrenci", ""),
+            "plan_tarihi": r.get("plan_tarihi"),
+            "old_gorev_ismi": r.get("gorev_ismi", ""),
+            "new_gorev_ismi": "",
+            "old_sure": r.get("sure", ""),
+            "new_sure": "",
+            "reason": reason,
+        }
+        for r in eski.to_dict("records")
+    ]
+    cur = conn.cursor()
+    try:
+        cur.executemany(
+            f"DELETE FROM ucus_planlari WHERE {key_col} = ?", [(int(k),) for k in eski["anahtar"]]
+        )
+        _write_log(conn, log_satirlari, commit=False)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(log_satirlari)
+
+
 def _parse_plan_datetime(val) -> Optional[datetime]:
     if val is None or val == "":
         return None
@@ -170,7 +409,7 @@ def _load_filtered(
     tarih1: Optional[date],
     tarih2: Optional[date],
 ) -> pd.DataFrame:
-    base = "SELECT rowid, * FROM ucus_planlari"
+    base = f"SELECT rowid, {golgesiz_secim(conn, 'ucus_planlari')} FROM ucus_planlari"
     conditions, params = [], []
 
     if donem:
@@ -201,7 +440,7 @@ def _load_filtered(
         parse_dates=["plan_tarihi"],
     )
     if "ogrenci_kodu" not in df.columns and "ogrenci" in df.columns:
-        df["ogrenci_kodu"] = df["ogrenci"].apply(ogrenci_kodu_ayikla)
+        df["ogrenci_kodu"] = plan_ogrenci_kodu(df["ogrenci"])
     return df
 
 
@@ -377,73 +616,16 @@ def tab_gorev_revizyonu(st, conn: sqlite3.Connection) -> None:
     st.markdown("### Satır Değişikliklerini Kaydet")
     update_reason = st.text_input("Güncelleme sebebi (log için)", key="revize_update_reason")
     if st.button("Değişiklikleri Kaydet", key="revize_update_button"):
-        to_log: List[Dict] = []
-        cur = conn.cursor()
-        for _, row in edited.iterrows():
-            rid = row.get(pk_col)
-            if pd.isna(rid):
-                continue
-            rid = int(rid)
-            original_row = df_filtered[df_filtered[pk_col] == rid]
-            if original_row.empty:
-                continue
-            original = original_row.iloc[0]
-            updates: Dict[str, Optional[str]] = {}
-            change_notes: List[str] = []
-
-            for col in editable_cols:
-                if col not in edited.columns:
-                    continue
-                new_val = row.get(col)
-                old_val = original.get(col)
-                if col == "plan_tarihi":
-                    new_norm = _normalize_plan_tarihi(new_val)
-                    old_norm = _normalize_plan_tarihi(old_val)
-                    store_val = new_norm
-                elif col == "sure":
-                    new_norm = _normalize_sure(new_val)
-                    old_norm = _normalize_sure(old_val)
-                    store_val = new_norm
-                else:
-                    new_norm = _normalize_text(new_val)
-                    old_norm = _normalize_text(old_val)
-                    store_val = new_norm
-
-                if new_norm != old_norm:
-                    updates[col] = store_val if store_val is not None else ""
-                    change_notes.append(
-                        f"{col}: {old_norm or '-'} → {new_norm or '-'}"
-                    )
-
-            if updates:
-                placeholders = ", ".join(f"{c} = ?" for c in updates.keys())
-                params = list(updates.values()) + [rid]
-                where_clause = "rowid = ?" if pk_col == "rowid" else "id = ?"
-                cur.execute(f"UPDATE ucus_planlari SET {placeholders} WHERE {where_clause}", params)
-
-                log_reason = update_reason.strip()
-                if change_notes:
-                    note_txt = "; ".join(change_notes)
-                    log_reason = f"{log_reason} | {note_txt}" if log_reason else note_txt
-
-                to_log.append(
-                    {
-                        "action": "update",
-                        "donem": original.get("donem", ""),
-                        "ogrenci": original.get("ogrenci", ""),
-                        "plan_tarihi": original.get("plan_tarihi"),
-                        "old_gorev_ismi": original.get("gorev_ismi", ""),
-                        "new_gorev_ismi": updates.get("gorev_ismi", original.get("gorev_ismi", "")),
-                        "old_sure": original.get("sure", ""),
-                        "new_sure": updates.get("sure", original.get("sure", "")),
-                        "reason": log_reason,
-                    }
-                )
-
-        if to_log:
-            conn.commit()
-            _write_log(conn, to_log)
-            st.success(f"{len(to_log)} satır güncellendi.")
+        # Sadece tabloda görünen satırlar; değişen hücreler tek transaction'da yazılır
+        degisiklikler = edited[edited[pk_col].isin(df_filtered[pk_col])]
+        sonuc = toplu_revize_uygula(
+            conn,
+            degisiklikler[[pk_col] + [c for c in editable_cols if c in edited.columns]],
+            key_col=pk_col,
+            reason=update_reason.strip(),
+        )
+        if sonuc["guncellenen"]:
+            st.success(f"{sonuc['guncellenen']} satır güncellendi.")
             st.rerun()
         else:
             st.info("Kaydedilecek değişiklik bulunamadı.")
@@ -457,32 +639,8 @@ def tab_gorev_revizyonu(st, conn: sqlite3.Connection) -> None:
         elif not delete_confirm:
             st.warning("Silme işlemini gerçekleştirmek için onay kutusunu işaretleyin.")
         else:
-            to_log: List[Dict] = []
-            cur = conn.cursor()
-            where_clause = "rowid = ?" if pk_col == "rowid" else "id = ?"
-            for rid in selected_ids:
-                original_row = df_filtered[df_filtered[pk_col] == rid]
-                if original_row.empty:
-                    continue
-                original = original_row.iloc[0]
-                cur.execute(f"DELETE FROM ucus_planlari WHERE {where_clause}", (rid,))
-                to_log.append(
-                    {
-                        "action": "delete",
-                        "donem": original.get("donem", ""),
-                        "ogrenci": original.get("ogrenci", ""),
-                        "plan_tarihi": original.get("plan_tarihi"),
-                        "old_gorev_ismi": original.get("gorev_ismi", ""),
-                        "new_gorev_ismi": "",
-                        "old_sure": original.get("sure", ""),
-                        "new_sure": "",
-                        "reason": delete_reason.strip(),
-                    }
-                )
-            conn.commit()
-            if to_log:
-                _write_log(conn, to_log)
-            st.warning(f"{len(to_log)} satır silindi.")
+            silinen = toplu_sil(conn, selected_ids, key_col=pk_col, reason=delete_reason.strip())
+            st.warning(f"{silinen} satır silindi.")
             st.rerun()
 
     st.markdown("### Seili Gorevi Donem Genelinde Sil")
@@ -625,8 +783,6 @@ def tab_gorev_revizyonu(st, conn: sqlite3.Connection) -> None:
                         elif not term_key_col:
                             st.error("Kayit anahtari (rowid/id) bulunamadi; silme islemi yapilamiyor.")
                         else:
-                            cur = conn.cursor()
-                            delete_logs: List[Dict] = []
                             reason_base = delete_term_reason.strip()
                             detail_parts = [
                                 f"Donem: {term_value_term}",
@@ -637,43 +793,14 @@ def tab_gorev_revizyonu(st, conn: sqlite3.Connection) -> None:
                             if include_phase_term and phase_display_term:
                                 detail_parts.append(f"Phase: {phase_display_term}")
                             detail_text = " | ".join(detail_parts)
+                            log_reason = reason_base
+                            if detail_text:
+                                log_reason = f"{log_reason} | {detail_text}" if log_reason else detail_text
 
-                            for _, row in term_targets.iterrows():
-                                key_val = row.get(term_key_col)
-                                if pd.isna(key_val):
-                                    continue
-                                try:
-                                    key_int = int(key_val)
-                                except Exception:
-                                    continue
-
-                                cur.execute(
-                                    f"DELETE FROM ucus_planlari WHERE {term_key_col} = ?",
-                                    (key_int,),
-                                )
-                                log_reason = reason_base
-                                if detail_text:
-                                    log_reason = f"{log_reason} | {detail_text}" if log_reason else detail_text
-                                delete_logs.append(
-                                    {
-                                        "action": "delete",
-                                        "donem": row.get("donem", term_value_term),
-                                        "ogrenci": row.get("ogrenci", ""),
-                                        "plan_tarihi": row.get("plan_tarihi", ""),
-                                        "old_gorev_ismi": row.get("gorev_ismi", ""),
-                                        "new_gorev_ismi": "",
-                                        "old_sure": row.get("sure", ""),
-                                        "new_sure": "",
-                                        "reason": log_reason,
-                                    }
-                                )
-
-                            if delete_logs:
-                                conn.commit()
-                                _write_log(conn, delete_logs)
-                                st.success(f"{len(delete_logs)} kayit donemdeki tum ogrencilerden silindi.")
+                            silinen = toplu_sil(conn, term_targets[term_key_col], key_col=term_key_col, reason=log_reason)
+                            if silinen:
+                                st.success(f"{silinen} kayit donemdeki tum ogrencilerden silindi.")
                             else:
-                                conn.commit()
                                 st.info("Silinecek kayit bulunamadi veya silme islemi gerceklestirilemedi.")
                             st.rerun()
 
@@ -1259,38 +1386,13 @@ def tab_gorev_revizyonu(st, conn: sqlite3.Connection) -> None:
             st.error("Kayıt anahtarı (rowid/id) bulunamadı; güncelleme yapılamıyor.")
             return
 
-        cur = conn.cursor()
-        logs: List[Dict] = []
-        for _, row in to_update.iterrows():
-            try:
-                key_val = int(row[key_col])
-            except Exception:
-                continue
-            cur.execute(
-                f"UPDATE ucus_planlari SET sure = ? WHERE {key_col} = ?",
-                (new_duration_norm, key_val),
-            )
-            note_detail = f"Süre: {row.get('sure_norm', '') or '-'} → {new_duration_norm}"
-            log_reason = bulk_reason.strip()
-            if note_detail:
-                log_reason = f"{log_reason} | {note_detail}" if log_reason else note_detail
-            logs.append(
-                {
-                    "action": "update",
-                    "donem": row.get("donem", term_value),
-                    "ogrenci": row.get("ogrenci", ""),
-                    "plan_tarihi": row.get("plan_tarihi", ""),
-                    "old_gorev_ismi": row.get("gorev_ismi", gorev_ismi_norm),
-                    "new_gorev_ismi": row.get("gorev_ismi", gorev_ismi_norm),
-                    "old_sure": row.get("sure", ""),
-                    "new_sure": new_duration_norm,
-                    "reason": log_reason,
-                }
-            )
-
-        conn.commit()
-        if logs:
-            _write_log(conn, logs)
+        toplu_revize_uygula(
+            conn,
+            to_update[[key_col]].assign(sure=new_duration_norm),
+            key_col=key_col,
+            reason=bulk_reason.strip(),
+            etiketler={"sure": "Süre"},
+        )
 
         unchanged_count = len(targets) - len(to_update)
         scope_info = "tüm dönemlerde" if apply_all_terms else f"{term_value} döneminde"
@@ -1429,39 +1531,13 @@ def tab_gorev_revizyonu(st, conn: sqlite3.Connection) -> None:
                 st.error("Kayıt anahtarı (rowid/id) bulunamadı; güncelleme yapılamıyor.")
                 return
 
-            cur = conn.cursor()
-            name_logs: List[Dict] = []
-            for _, row in to_rename.iterrows():
-                try:
-                    key_val = int(row[key_col])
-                except Exception:
-                    continue
-                old_name_display = _normalize_text(row.get("gorev_ismi", ""))
-                cur.execute(
-                    f"UPDATE ucus_planlari SET gorev_ismi = ? WHERE {key_col} = ?",
-                    (new_name_norm, key_val),
-                )
-                note_detail = f"Görev ismi: {old_name_display or '-'} → {new_name_norm}"
-                log_reason = name_reason.strip()
-                if note_detail:
-                    log_reason = f"{log_reason} | {note_detail}" if log_reason else note_detail
-                name_logs.append(
-                    {
-                        "action": "update",
-                        "donem": row.get("donem", term_value_name),
-                        "ogrenci": row.get("ogrenci", ""),
-                        "plan_tarihi": row.get("plan_tarihi", ""),
-                        "old_gorev_ismi": row.get("gorev_ismi", ""),
-                        "new_gorev_ismi": new_name_norm,
-                        "old_sure": row.get("sure", ""),
-                        "new_sure": row.get("sure", ""),
-                        "reason": log_reason,
-                    }
-                )
-
-            conn.commit()
-            if name_logs:
-                _write_log(conn, name_logs)
+            toplu_revize_uygula(
+                conn,
+                to_rename[[key_col]].assign(gorev_ismi=new_name_norm),
+                key_col=key_col,
+                reason=name_reason.strip(),
+                etiketler={"gorev_ismi": "Görev ismi"},
+            )
 
             unchanged_name_count = len(name_targets) - len(to_rename)
             st.success(f"{len(to_rename)} kayıt güncellendi.")
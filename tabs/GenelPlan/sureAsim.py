@@ -3,24 +3,16 @@ import pandas as pd
 import streamlit as st
 import sqlite3
 import io
-import re
 from pandas.tseries.offsets import DateOffset
 
+from tabs.utils.ogrenci_kodu import ogrenci_patlat, oncelikli_ogrenci_kodu
+from tabs.utils.tarih_utils import tarih_normalize
+from tabs.utils.veri_deposu import naeron_oku, plan_oku
+
 # ===========================
 # Yardımcılar
 # ===========================
 
-def _ogrenci_kodu_ayikla(s: str) -> str:
-    """'123AB - Ad Soyad' -> 123AB; yoksa '-' öncesi.
-    3 rakam + 2 harf paterni varsa onu tercih et."""
-    if pd.isna(s):
-        return ""
-    s = str(s).strip()
-    m = re.search(r"\b(\d{3}[A-Z]{2})\b", s.upper())
-    if m:
-        return m.group(1)
-    return s.split("-")[0].strip()
-
 def _naeron_long_all() -> pd.DataFrame:
     """
     naeron_kayitlari.db/naeron_ucuslar -> long format:
@@ -28,9 +20,7 @@ def _naeron_long_all() -> pd.DataFrame:
     MCC çoklu öğrenci satırlarını öğrenci bazında çoğaltır.
     """
     try:
-        conn_n = sqlite3.connect("naeron_kayitlari.db")
-        df_raw = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn_n)
-        conn_n.close()
+        df_raw = naeron_oku("naeron_kayitlari.db")
     except Exception as e:
         st.error(f"Naeron verisi okunamadı: {e}")
         return pd.DataFrame(columns=["ogrenci_kodu", "Tarih", "Görev"])
@@ -43,33 +33,16 @@ def _naeron_long_all() -> pd.DataFrame:
         return pd.DataFrame(columns=["ogrenci_kodu", "Tarih", "Görev"])
 
     # Tarih için aday kolonlar
-    tarih_kaynak_aday = ["Uçuş Tarihi 2", "Uçuş Tarihi", "Tarih"]
+    tarih_kaynak_aday = ["ucus_tarihi", "Uçuş Tarihi 2", "Uçuş Tarihi", "Tarih"]
     tcol = next((c for c in tarih_kaynak_aday if c in df_raw.columns), None)
     if not tcol:
         return pd.DataFrame(columns=["ogrenci_kodu", "Tarih", "Görev"])
 
-    # MCC (çoklu öğrenci) -> long
-    mask_mcc = df_raw["Görev"].astype(str).str.upper().str.startswith("MCC")
-    df_mcc = df_raw[mask_mcc].copy()
-
-    def _extract_kodlar(pilot_str):
-        return re.findall(r"\d{3}[A-Z]{2}", str(pilot_str).upper())
+    # MCC (çoklu öğrenci) -> long; MCC dışı -> tek öğrenci (kod kelimesi öncelikli)
+    df_all = ogrenci_patlat(df_raw, kod_ayikla=oncelikli_ogrenci_kodu)
 
-    rows = []
-    for _, r in df_mcc.iterrows():
-        for kod in _extract_kodlar(r.get("Öğrenci Pilot", "")):
-            nr = r.copy()
-            nr["ogrenci_kodu"] = kod
-            rows.append(nr)
-    df_mcc_long = pd.DataFrame(rows)
-
-    # MCC dışı -> tek öğrenci
-    df_other = df_raw[~mask_mcc].copy()
-    df_other["ogrenci_kodu"] = df_other["Öğrenci Pilot"].apply(_ogrenci_kodu_ayikla)
-
-    # Birleştir + tarih parse
-    df_all = pd.concat([df_mcc_long, df_other], ignore_index=True)
-    df_all["Tarih"] = pd.to_datetime(df_all[tcol], errors="coerce")
+    # Tarih parse
+    df_all["Tarih"] = tarih_normalize(df_all[tcol])
     df_all = df_all.dropna(subset=["ogrenci_kodu", "Tarih"])
 
     # Sadece gerekli kolonlar
@@ -146,7 +119,7 @@ def sureAsim(st):
     try:
         # PLAN
         conn_plan = sqlite3.connect("ucus_egitim.db")
-        df_plan = pd.read_sql_query("SELECT * FROM ucus_planlari", conn_plan, parse_dates=["plan_tarihi"])
+        df_plan = plan_oku(conn_plan)
         conn_plan.close()
 
         # DÖNEM
@@ -154,6 +127,7 @@ def sureAsim(st):
         df_donem_bilgi = pd.read_sql_query(
             "SELECT donem, egitim_yeri, toplam_egitim_suresi_ay, baslangic_tarihi FROM donem_bilgileri", conn_donem)
         conn_donem.close()
+        df_donem_bilgi["baslangic_tarihi"] = tarih_normalize(df_donem_bilgi["baslangic_tarihi"])
 
         secilen_donemler = sorted(df_plan["donem"].dropna().unique().tolist())
         if not secilen_donemler:
@@ -176,10 +150,7 @@ def sureAsim(st):
             on="donem", how="left"
         )
 
-        # Başlangıç tarihi + bitiş tarihi
-        ogrenci_son_tarih["baslangic_tarihi"] = pd.to_datetime(
-            ogrenci_son_tarih["baslangic_tarihi"], dayfirst=True, errors="coerce"
-        )
+        # Bitiş tarihi (baslangic_tarihi dönem tablosu okunurken ayrıştırıldı)
         def _calc_bitis(row):
             try:
                 return row["baslangic_tarihi"] + DateOffset(months=int(row["toplam_egitim_suresi_ay"]))
@@ -208,7 +179,7 @@ def sureAsim(st):
         df_naeron_son = _naeron_son_ucus_ozeti()
 
         # Öğrenci kodu ile birleştir
-        ogrenci_son_tarih["ogrenci_kodu"] = ogrenci_son_tarih["ogrenci"].apply(_ogrenci_kodu_ayikla)
+        ogrenci_son_tarih["ogrenci_kodu"] = oncelikli_ogrenci_kodu(ogrenci_son_tarih["ogrenci"])
         ogrenci_son_tarih = ogrenci_son_tarih.merge(df_naeron_son, on="ogrenci_kodu", how="left")
 
         # ---- GÖRÜNÜM: Kolonlar, tarih formatı, renklendirme ----
@@ -270,13 +241,14 @@ def sureAsim(st):
     if st.button("📊 Tüm Öğrencilerin Son Görev Tarihlerini Listele ve Excel'e Aktar"):
         try:
             conn_plan = sqlite3.connect("ucus_egitim.db")
-            df_plan = pd.read_sql_query("SELECT * FROM ucus_planlari", conn_plan, parse_dates=["plan_tarihi"])
+            df_plan = plan_oku(conn_plan)
             conn_plan.close()
 
             conn_donem = sqlite3.connect("donem_bilgileri.db")
             df_donem_bilgi = pd.read_sql_query(
                 "SELECT donem, egitim_yeri, toplam_egitim_suresi_ay, baslangic_tarihi FROM donem_bilgileri", conn_donem)
             conn_donem.close()
+            df_donem_bilgi["baslangic_tarihi"] = tarih_normalize(df_donem_bilgi["baslangic_tarihi"])
 
             # Naeron özeti tek sefer
             df_naeron_son = _naeron_son_ucus_ozeti()
@@ -291,7 +263,7 @@ def sureAsim(st):
                 info = df_donem_bilgi[df_donem_bilgi["donem"] == donem]
                 if not info.empty:
                     row = info.iloc[0]
-                    baslangic_tarihi = pd.to_datetime(row["baslangic_tarihi"], dayfirst=True, errors="coerce")
+                    baslangic_tarihi = row["baslangic_tarihi"]
                     egitim_yeri = row.get("egitim_yeri", "")
                     toplam_ay = int(row["toplam_egitim_suresi_ay"]) if pd.notna(row["toplam_egitim_suresi_ay"]) else 0
                 else:
@@ -325,7 +297,7 @@ def sureAsim(st):
                 donem_ogrenci["Durum"] = donem_ogrenci.apply(_durum2, axis=1)
 
                 # Naeron kolonları
-                donem_ogrenci["ogrenci_kodu"] = donem_ogrenci["ogrenci"].apply(_ogrenci_kodu_ayikla)
+                donem_ogrenci["ogrenci_kodu"] = oncelikli_ogrenci_kodu(donem_ogrenci["ogrenci"])
                 donem_ogrenci = donem_ogrenci.merge(df_naeron_son, on="ogrenci_kodu", how="left")
 
                 # ---- tarihleri formatla ----
@@ -5,6 +5,8 @@ import sqlite3
 import io
 import re
 
+from tabs.utils.naeron_kup import kup_oku
+
 # =============== Yardımcılar ===============
 def _normkey(s: str) -> str:
     s = str(s or "").strip().lower()
@@ -34,27 +36,14 @@ def _akilli_tekil_seri(s: pd.Series) -> pd.DataFrame:
 
 
 # --- Günlük "TÜM görevler" hesaplayıcı ---
-def _compute_daily_all(df_naeron: pd.DataFrame | None, date_col: str | None,
-                       bas: pd.Timestamp, bit: pd.Timestamp) -> pd.DataFrame:
-    if df_naeron is None or date_col is None or date_col not in df_naeron.columns:
-        return pd.DataFrame(columns=["Tarih","Uçuş","Block (saat)"])
-    df = df_naeron.copy()
-    df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-    df = df[(df[date_col] >= bas) & (df[date_col] <= bit)].copy()
-    if df.empty:
+def _compute_daily_all(df_kup: pd.DataFrame | None) -> pd.DataFrame:
+    if df_kup is None or df_kup.empty:
         return pd.DataFrame(columns=["Tarih","Uçuş","Block (saat)"])
-    blk_col = _detect_block_col(df.columns)
-    if blk_col:
-        df["_block_min"] = df[blk_col].apply(_parse_block_to_minutes).fillna(0)
-    else:
-        df["_block_min"] = 0
-    out = (df
-           .groupby(df[date_col].dt.date)
-           .agg(Uçuş=("Görev","size") if "Görev" in df.columns else (date_col, "size"),
-                Block_dk=("_block_min","sum"))
-           .reset_index())
-    out = out.rename(columns={date_col:"Tarih"})
-    out["Tarih"] = pd.to_datetime(out.iloc[:,0])  # ilk kolonu tarih
+    out = (df_kup
+           .groupby("gun")
+           .agg(Uçuş=("sorti","sum"), Block_dk=("_block_min","sum"))
+           .reset_index()
+           .rename(columns={"gun":"Tarih"}))
     out = out[["Tarih","Uçuş","Block_dk"]].sort_values("Tarih")
     out["Block (saat)"] = (out["Block_dk"]/60).round(2)
     return out.drop(columns=["Block_dk"])
@@ -62,14 +51,13 @@ def _compute_daily_all(df_naeron: pd.DataFrame | None, date_col: str | None,
 
 # --- Toplamlar bölümünü çizen yardımcı ---
 def _render_totals_section(result: dict,
-                           df_naeron: pd.DataFrame | None,
-                           date_col: str | None,
+                           df_kup: pd.DataFrame | None,
                            bas: pd.Timestamp, bit: pd.Timestamp):
     st.markdown("### 📌 Toplamlar (Seçili Tarihler)")
 
     # Günlük toplamlar
     df_daily_sel = result.get("df_daily", pd.DataFrame(columns=["Tarih","Uçuş","Block (saat)"]))
-    df_daily_all = _compute_daily_all(df_naeron, date_col, bas, bit)
+    df_daily_all = _compute_daily_all(df_kup)
 
     # Toplamlar (seçili tip & tüm görevler)
     sel_ucus = int(df_daily_sel["Uçuş"].sum()) if "Uçuş" in df_daily_sel.columns else 0
@@ -113,40 +101,6 @@ def _render_totals_section(result: dict,
 
 
 
-# --- Block Time yardımcıları ---
-def _detect_block_col(cols):
-    adaylar = [
-        "Block Time","BLOCK TIME","BlockTime","BLOCKTIME","Block","BLOCK",
-        "Uçuş Süresi","Ucus Süresi","Ucus Suresi","Uçuş Suresi",
-        "Süre","Sure","Flight Time","FLIGHT TIME","FT","BLOCK DURATION"
-    ]
-    keymap = {_normkey(c): c for c in cols}
-    for a in adaylar:
-        k = _normkey(a)
-        if k in keymap:
-            return keymap[k]
-    return None
-
-def _parse_block_to_minutes(val):
-    s = str(val).strip()
-    if s == "" or s.lower() == "nan":
-        return None
-    # HH:MM
-    m = re.match(r"^\s*(\d{1,2}):(\d{2})\s*$", s)
-    if m:
-        h, mi = int(m.group(1)), int(m.group(2))
-        return h*60 + mi
-    # ondalık saat / dakika
-    s = s.replace(",", ".")
-    try:
-        v = float(s)
-        # 20 üzeri → dakika; aksi saat kabul et
-        if v > 20:
-            return int(round(v))
-        return int(round(v * 60))
-    except:
-        return None
-
 # =============== Veri Erişimi ===============
 def _load_ucus_planlari(conn: sqlite3.Connection | None) -> pd.DataFrame:
     if conn is None:
@@ -166,29 +120,21 @@ def _load_ucus_planlari(conn: sqlite3.Connection | None) -> pd.DataFrame:
     df = df[df["gorev_ismi"] != ""]
     return df
 
-def _load_naeron() -> tuple[pd.DataFrame | None, str | None]:
+def _load_naeron(bas: pd.Timestamp, bit: pd.Timestamp) -> pd.DataFrame | None:
+    """Naeron günlük küpünden aralıktaki (gün, görev, öğretmen) toplamları; Block dakikası `_block_min`."""
     try:
-        conn_n = sqlite3.connect("naeron_kayitlari.db", check_same_thread=False)
-        df_n = pd.read_sql_query("SELECT rowid, * FROM naeron_ucuslar", conn_n)
-        if df_n.empty:
-            return None, None
-        date_col = None
-        if "Uçuş Tarihi 2" in df_n.columns:
-            date_col = "Uçuş Tarihi 2"
-        elif "Uçuş Tarihi" in df_n.columns:
-            date_col = "Uçuş Tarihi"
-        return df_n, date_col
+        df = kup_oku(bas, bit, boyutlar=["gun", "gorev", "ogretmen"])
     except Exception:
-        return None, None
+        return None
+    df["_block_min"] = df["block_sn"] / 60
+    return df
 
 # =============== İş Kuralları ===============
 def _compute_by_tip_and_dates(df_plan: pd.DataFrame,
-                              df_naeron: pd.DataFrame | None,
-                              date_col: str | None,
-                              secili_tip: str,
-                              bas: pd.Timestamp,
-                              bit: pd.Timestamp) -> dict:
+                              df_kup: pd.DataFrame | None,
+                              secili_tip: str) -> dict:
     """
+    df_kup: _load_naeron'un (seçili aralıktaki) küp satırları.
     Dönüş: {
       out_all, df_match, df_missing,
       df_bar, df_daily, df_wd, df_instr, df_instr_blk
@@ -209,22 +155,13 @@ def _compute_by_tip_and_dates(df_plan: pd.DataFrame,
         df_instr_blk=pd.DataFrame(columns=["Öğretmen","Block (saat)"]),
     )
 
-    if df_naeron is None or date_col is None or "Görev" not in df_naeron.columns:
+    if df_kup is None or df_kup.empty:
         return result
 
-    df_n = df_naeron.copy()
-    df_n[date_col] = pd.to_datetime(df_n[date_col], errors="coerce")
-    df_nf = df_n[(df_n[date_col] >= bas) & (df_n[date_col] <= bit)].copy()
-    if df_nf.empty:
-        return result
-
-    # join key + block
-    df_nf["_join_key"] = df_nf["Görev"].astype(str).map(_norm_join_task)
-    blk_col = _detect_block_col(df_nf.columns)
-    if blk_col:
-        df_nf["_block_min"] = df_nf[blk_col].apply(_parse_block_to_minutes).fillna(0)
-    else:
-        df_nf["_block_min"] = 0
+    # join key (küpte görev başına tek kez)
+    df_nf = df_kup.copy()
+    gorevler = df_nf["gorev"].unique()
+    df_nf["_join_key"] = df_nf["gorev"].map(dict(zip(gorevler, map(_norm_join_task, gorevler))))
 
     tip_keys = set(out_all["_join_key"])
     df_nf = df_nf[df_nf["_join_key"].isin(tip_keys)]
@@ -234,7 +171,7 @@ def _compute_by_tip_and_dates(df_plan: pd.DataFrame,
         return result
 
     # Sayımlar
-    vc = df_nf["_join_key"].value_counts()
+    vc = df_nf.groupby("_join_key")["sorti"].sum()
     block_sum = df_nf.groupby("_join_key")["_block_min"].sum()
     seen_keys = set(vc.index)
     match_keys = tip_keys & seen_keys
@@ -254,11 +191,10 @@ def _compute_by_tip_and_dates(df_plan: pd.DataFrame,
 
     # Günlük seri
     g_daily = (df_nf
-               .groupby(df_nf[date_col].dt.date)
-               .agg(Uçuş=("Görev","size"), Block_dk=("_block_min","sum"))
-               .reset_index())
-    g_daily = g_daily.rename(columns={date_col:"Tarih"})
-    g_daily["Tarih"] = pd.to_datetime(g_daily[date_col] if "Tarih" not in g_daily.columns else g_daily["Tarih"])
+               .groupby("gun")
+               .agg(Uçuş=("sorti","sum"), Block_dk=("_block_min","sum"))
+               .reset_index()
+               .rename(columns={"gun":"Tarih"}))
     g_daily = g_daily[["Tarih","Uçuş","Block_dk"]]
     g_daily = g_daily.sort_values("Tarih")
     g_daily["7 Gün Ort."] = g_daily["Uçuş"].rolling(7, min_periods=1).mean()
@@ -270,9 +206,9 @@ def _compute_by_tip_and_dates(df_plan: pd.DataFrame,
         names = ["Pazartesi","Salı","Çarşamba","Perşembe","Cuma","Cumartesi","Pazar"]
         return names[int(idx)] if pd.notna(idx) and 0 <= int(idx) <= 6 else str(idx)
 
-    df_nf["wd"] = df_nf[date_col].dt.weekday
+    df_nf["wd"] = df_nf["gun"].dt.weekday
     g_wd = (df_nf.groupby("wd")
-                 .agg(Uçuş=("wd","size"), Block_dk=("_block_min","sum"))
+                 .agg(Uçuş=("sorti","sum"), Block_dk=("_block_min","sum"))
                  .reindex(range(7), fill_value=0)
                  .reset_index())
     g_wd["Gün"] = g_wd["wd"].map(_tr_dayname)
@@ -282,15 +218,15 @@ def _compute_by_tip_and_dates(df_plan: pd.DataFrame,
     # Eğitmenler
     df_instr = pd.DataFrame(columns=["Öğretmen","Uçuş"])
     df_instr_blk = pd.DataFrame(columns=["Öğretmen","Block (saat)"])
-    if "Öğretmen Pilot" in df_nf.columns:
-        gi = (df_nf.groupby("Öğretmen Pilot")
-                    .agg(Uçuş=("Öğretmen Pilot","size"), Block_dk=("_block_min","sum"))
-                    .reset_index())
+    df_ogr = df_nf[df_nf["ogretmen"] != ""]
+    if not df_ogr.empty:
+        gi = (df_ogr.groupby("ogretmen")
+                    .agg(Uçuş=("sorti","sum"), Block_dk=("_block_min","sum"))
+                    .reset_index()
+                    .rename(columns={"ogretmen":"Öğretmen"}))
         gi["Block (saat)"] = (gi["Block_dk"]/60).round(2)
-        df_instr = gi[["Öğretmen Pilot","Uçuş"]].rename(columns={"Öğretmen Pilot":"Öğretmen"}) \
-                     .sort_values("Uçuş", ascending=False).head(10)
-        df_instr_blk = gi[["Öğretmen Pilot","Block (saat)"]].rename(columns={"Öğretmen Pilot":"Öğretmen"}) \
-                         .sort_values("Block (saat)", ascending=False).head(10)
+        df_instr = gi[["Öğretmen","Uçuş"]].sort_values("Uçuş", ascending=False).head(10)
+        df_instr_blk = gi[["Öğretmen","Block (saat)"]].sort_values("Block (saat)", ascending=False).head(10)
 
     result.update(dict(
         df_match=df_match.sort_values(["Uçuş Sayısı","Görev İsmi"], ascending=[False, True]),
@@ -591,10 +527,6 @@ def tab_gorev_isimleri(st, conn: sqlite3.Connection | None = None):
     except Exception as e:
         st.error(str(e)); return
 
-    df_naeron, date_col = _load_naeron()
-    if df_naeron is None:
-        st.warning("Naeron verisi bulunamadı veya boş. (Raporlar sınırlı olabilir)")
-
     tipler = sorted([t for t in df_plan["gorev_tipi"].dropna().unique() if str(t).strip() != ""])
     if not tipler:
         st.warning("Hiç görev tipi bulunamadı."); return
@@ -620,8 +552,12 @@ def tab_gorev_isimleri(st, conn: sqlite3.Connection | None = None):
     if bit < bas:
         st.warning("Bitiş tarihi başlangıçtan küçük olamaz."); return
 
+    df_kup = _load_naeron(bas, bit)
+    if df_kup is None:
+        st.warning("Naeron verisi bulunamadı veya boş. (Raporlar sınırlı olabilir)")
+
     # Hesapla
-    result = _compute_by_tip_and_dates(df_plan, df_naeron, date_col, secili_tip, bas, bit)
+    result = _compute_by_tip_and_dates(df_plan, df_kup, secili_tip)
 
     # Başlık + tablo
     st.markdown(f"### ✅ {secili_tip} — Seçilen tarihlerde UÇULMUŞ görevler")
@@ -650,7 +586,7 @@ def tab_gorev_isimleri(st, conn: sqlite3.Connection | None = None):
                            file_name=f"{secili_tip}_uculmamis_{bas.date()}_{bit.date()}.xlsx",
                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
         
-    _render_totals_section(result, df_naeron, date_col, bas, bit)
+    _render_totals_section(result, df_kup, bas, bit)
 
     # Tek buton rapor (grafikli)
     st.markdown("### 📄 Rapor (Grafikli Excel)")
@@ -3,6 +3,8 @@ import sqlite3
 import streamlit as st
 from datetime import datetime as dt
 
+from db.migrations import golgesiz_secim
+
 # Benzersiz uçuş numarası oluşturma
 def generate_ucus_no(date, index):
     return f"NRS-{date.strftime('%Y%m%d')}-{index:03}"
@@ -45,7 +47,7 @@ def tab_naeron_yukle(st, secilen_tarih, conn_main):
 
         conn = sqlite3.connect("naeron_kayitlari.db")
         if selected_row:
-            detay_df = pd.read_sql_query("SELECT * FROM naeron_ucuslar WHERE `Uçuş Tarihi 2` = ?", conn, params=[selected_row])
+            detay_df = pd.read_sql_query(f"SELECT {golgesiz_secim(conn, 'naeron_ucuslar')} FROM naeron_ucuslar WHERE `Uçuş Tarihi 2` = ?", conn, params=[selected_row])
             if not detay_df.empty:
                 st.markdown(f"### 📄 {selected_row} tarihli uçuş detayları")
                 st.dataframe(detay_df, use_container_width=True)
@@ -89,7 +91,7 @@ def tab_naeron_yukle(st, secilen_tarih, conn_main):
                 )
             """)
 
-            existing = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn)
+            existing = pd.read_sql_query(f"SELECT {golgesiz_secim(conn, 'naeron_ucuslar')} FROM naeron_ucuslar", conn)
             existing_keys = set((row["Uçuş Tarihi 2"], row["Öğrenci Pilot"], row["Görev"]) for _, row in existing.iterrows())
 
             yeni_kayitlar = []
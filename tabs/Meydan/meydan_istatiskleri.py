@@ -4,21 +4,23 @@ import pandas as pd
 import sqlite3
 import io
 import plotly.express as px
-from datetime import timedelta, date
+
+from db.migrations import golgesiz_secim
+from tabs.utils.naeron_kup import KUP_ETIKETLERI, kup_degerleri, kup_oku, kup_tarih_araligi
+from tabs.utils.sure_utils import sure_saat
+from tabs.utils.tahmin import TahminHatasi, geriye_donuk_test, tahmin_et, yontem_karsilastir
+from tabs.utils.tarih_utils import tarih_normalize
 
 # ---------- yardımcılar ----------
-def _to_hours(v):
-    try:
-        if pd.isna(v) or str(v).strip() == "":
-            return 0.0
-        h, m, s = 0, 0, 0
-        parts = [int(p) for p in str(v).strip().split(":")]
-        if len(parts) >= 1: h = parts[0]
-        if len(parts) >= 2: m = parts[1]
-        if len(parts) >= 3: s = parts[2]
-        return h + m/60 + s/3600
-    except Exception:
-        return 0.0
+YONTEM_ADLARI = {
+    "Haftalık Ortalama (önerilen)": "Haftalık Ortalama",
+    "ARIMA (varsa)": "ARIMA",
+    "Holt-Winters (varsa)": "Holt-Winters",
+}
+
+def _to_hours(seri):
+    """Süre kolonu ("H[:M[:S]]") → ondalık saat; boş/geçersiz → 0."""
+    return sure_saat(seri, tek_parca=True, metne_cevir=True)
 
 def _fmt_hhmm(hours: float) -> str:
     h = int(hours)
@@ -35,7 +37,7 @@ def tab_naeron_tarih_filtre(st):
     # ---- veriyi oku ----
     try:
         conn = sqlite3.connect("naeron_kayitlari.db")
-        df = pd.read_sql_query("SELECT rowid, * FROM naeron_ucuslar", conn)
+        df = pd.read_sql_query(f"SELECT rowid, {golgesiz_secim(conn, 'naeron_ucuslar')} FROM naeron_ucuslar", conn)
         conn.close()
     except Exception as e:
         st.error(f"Veritabanı okunamadı: {e}")
@@ -52,7 +54,7 @@ def tab_naeron_tarih_filtre(st):
         st.error("Tabloda tarih kolonu bulunamadı.")
         return
     tarih_col = tarih_kolonlari[0]
-    df[tarih_col] = pd.to_datetime(df[tarih_col], errors="coerce")
+    df[tarih_col] = tarih_normalize(df[tarih_col])
 
     # kalkış / iniş
     dep_cands = ["Kalkış", "Kalkis", "Departure", "Dep"]
@@ -119,6 +121,12 @@ def tab_naeron_tarih_filtre(st):
             ]
 
         st.session_state["naeron_dff"] = dff
+        # Aynı filtre günlük küp sorguları için (SEK5): kup_oku argümanları
+        st.session_state["naeron_filtre"] = dict(
+            bas=bas, bit=bit,
+            filtreler={"kalkis": dep_sel, "inis": arr_sel},
+            dolu=("kalkis", "inis") if hide_empty else (),
+        )
         #st.success("Filtreler uygulandı. 'SEK2 — Sonuçlar' ve 'SEK3 — Meydan İstatistikleri' sekmelerinden görüntüleyin.")
 
         # --- Sonuç önizleme ---
@@ -128,8 +136,8 @@ def tab_naeron_tarih_filtre(st):
             st.info("Bu aralıkta sonuç yok. Tarih aralığını veya meydan seçimlerini değiştirin.")
         else:
             toplam_ucus = len(dff)
-            total_block  = _fmt_hhmm(dff[block_col].apply(_to_hours).sum())  if (block_col  and block_col  in dff.columns) else "00:00"
-            total_flight = _fmt_hhmm(dff[flight_col].apply(_to_hours).sum()) if (flight_col and flight_col in dff.columns) else "00:00"
+            total_block  = _fmt_hhmm(_to_hours(dff[block_col]).sum())  if (block_col  and block_col  in dff.columns) else "00:00"
+            total_flight = _fmt_hhmm(_to_hours(dff[flight_col]).sum()) if (flight_col and flight_col in dff.columns) else "00:00"
 
             m1, m2, m3 = st.columns(3)
             m1.metric("Toplam Uçuş", toplam_ucus)
@@ -201,14 +209,14 @@ def tab_naeron_tarih_filtre(st):
             with st.expander("⏱ Süre Özetleri (Block/Flight)"):
                 if block_col in dff.columns:
                     dep_block = (
-                        dff.assign(_block=dff[block_col].apply(_to_hours))
+                        dff.assign(_block=_to_hours(dff[block_col]))
                            .groupby(dep_col, dropna=True)["_block"].sum().reset_index()
                            .rename(columns={"_block": "Block Toplam (saat)"})
                            .sort_values("Block Toplam (saat)", ascending=False)
                            .head(topN)
                     )
                     arr_block = (
-                        dff.assign(_block=dff[block_col].apply(_to_hours))
+                        dff.assign(_block=_to_hours(dff[block_col]))
                            .groupby(arr_col, dropna=True)["_block"].sum().reset_index()
                            .rename(columns={"_block": "Block Toplam (saat)"})
                            .sort_values("Block Toplam (saat)", ascending=False)
@@ -223,14 +231,14 @@ def tab_naeron_tarih_filtre(st):
 
                 if flight_col in dff.columns:
                     dep_flight = (
-                        dff.assign(_flt=dff[flight_col].apply(_to_hours))
+                        dff.assign(_flt=_to_hours(dff[flight_col]))
                            .groupby(dep_col, dropna=True)["_flt"].sum().reset_index()
                            .rename(columns={"_flt": "Flight Toplam (saat)"})
                            .sort_values("Flight Toplam (saat)", ascending=False)
                            .head(topN)
                     )
                     arr_flight = (
-                        dff.assign(_flt=dff[flight_col].apply(_to_hours))
+                        dff.assign(_flt=_to_hours(dff[flight_col]))
                            .groupby(arr_col, dropna=True)["_flt"].sum().reset_index()
                            .rename(columns={"_flt": "Flight Toplam (saat)"})
                            .sort_values("Flight Toplam (saat)", ascending=False)
@@ -274,8 +282,8 @@ def tab_naeron_tarih_filtre(st):
                 st.info("Bu tarih aralığında kayıt yok.")
             else:
                 # Süreleri sayıya çevir
-                dfg["_block_h"]  = dfg[block_col].apply(_to_hours)  if (block_col  and block_col  in dfg.columns) else 0.0
-                dfg["_flight_h"] = dfg[flight_col].apply(_to_hours) if (flight_col and flight_col in dfg.columns) else 0.0
+                dfg["_block_h"]  = _to_hours(dfg[block_col])  if (block_col  and block_col  in dfg.columns) else 0.0
+                dfg["_flight_h"] = _to_hours(dfg[flight_col]) if (flight_col and flight_col in dfg.columns) else 0.0
 
                 # Üst metrikler
                 m1, m2, m3, m4 = st.columns(4)
@@ -386,8 +394,8 @@ def tab_naeron_tarih_filtre(st):
                     cA, cB, cC, cD = st.columns(4)
                     cA.metric("Uçuş Sayısı", len(dfa))
                     cB.metric("Gün Sayısı", dfa[tarih_col].dt.date.nunique())
-                    cC.metric("Toplam Block",  _fmt_hhmm(dfa[block_col].apply(_to_hours).sum())  if (block_col  and block_col  in dfa.columns) else "00:00")
-                    cD.metric("Toplam Flight", _fmt_hhmm(dfa[flight_col].apply(_to_hours).sum()) if (flight_col and flight_col in dfa.columns) else "00:00")
+                    cC.metric("Toplam Block",  _fmt_hhmm(_to_hours(dfa[block_col]).sum())  if (block_col  and block_col  in dfa.columns) else "00:00")
+                    cD.metric("Toplam Flight", _fmt_hhmm(_to_hours(dfa[flight_col]).sum()) if (flight_col and flight_col in dfa.columns) else "00:00")
 
                     # Günlük seri
                     st.markdown(f"#### ⏱ Günlük Uçuş Sayısı — {yon_baslik}")
@@ -437,17 +445,17 @@ def tab_naeron_tarih_filtre(st):
 
                     # Süre serileri (varsa)
                     with st.expander(f"⏱ Süre Grafikleri — {yon_baslik}"):
-                        if (block_col and block_col in dfa.columns and dfa[block_col].apply(_to_hours).sum() > 0):
+                        if (block_col and block_col in dfa.columns and _to_hours(dfa[block_col]).sum() > 0):
                             gb = (
-                                dfa.assign(_bh=dfa[block_col].apply(_to_hours))
+                                dfa.assign(_bh=_to_hours(dfa[block_col]))
                                 .groupby(dfa[tarih_col].dt.date)["_bh"].sum().reset_index()
                                 .rename(columns={tarih_col: "Tarih", "_bh": "Block (saat)"})
                             )
                             figb = px.line(gb, x="Tarih", y="Block (saat)", markers=True, title=f"{yon_baslik}: Günlük Block (saat)")
                             st.plotly_chart(figb, use_container_width=True)
-                        if (flight_col and flight_col in dfa.columns and dfa[flight_col].apply(_to_hours).sum() > 0):
+                        if (flight_col and flight_col in dfa.columns and _to_hours(dfa[flight_col]).sum() > 0):
                             gf = (
-                                dfa.assign(_fh=dfa[flight_col].apply(_to_hours))
+                                dfa.assign(_fh=_to_hours(dfa[flight_col]))
                                 .groupby(dfa[tarih_col].dt.date)["_fh"].sum().reset_index()
                                 .rename(columns={tarih_col: "Tarih", "_fh": "Flight (saat)"})
                             )
@@ -459,26 +467,23 @@ def tab_naeron_tarih_filtre(st):
     with sek4:
         st.markdown("### 🏆 En Çok Uçulan 5 Rota — Zaman Analizi (Tüm Kayıtlar)")
 
-        if df.empty:
+        # Günlük küpten (gün, kalkış, iniş) toplamları
+        dfa = kup_oku(boyutlar=["gun", "kalkis", "inis"]).rename(columns={"gun": "Tarih"})
+        if dfa.empty:
             st.info("Veri yok.")
         else:
-            # Tarih garanti
-            dfa = df.copy()
-            dfa[tarih_col] = pd.to_datetime(dfa[tarih_col], errors="coerce")
-            dfa = dfa.dropna(subset=[tarih_col])
-
             # Rota (Kalkış → İniş)
-            dfa["Rota"] = dfa[dep_col].astype(str).str.strip() + " → " + dfa[arr_col].astype(str).str.strip()
+            dfa["Rota"] = dfa["kalkis"] + " → " + dfa["inis"]
 
             # Tüm veri üzerinden Top 5 rota
-            top5 = dfa["Rota"].value_counts().head(5).index.tolist()
+            top5 = dfa.groupby("Rota")["sorti"].sum().sort_values(ascending=False, kind="mergesort").head(5).index.tolist()
             if not top5:
                 st.info("Rota tespit edilemedi.")
             else:
                 st.caption("Not: Top 5 seçimi tüm veriden yapılır; aşağıdaki tarih aralığı sadece grafik ve özetleri filtreler.")
 
                 # Tarih aralığı seçimi (grafik ve özetler için)
-                min_t, max_t = dfa[tarih_col].min().date(), dfa[tarih_col].max().date()
+                min_t, max_t = dfa["Tarih"].min().date(), dfa["Tarih"].max().date()
                 c1, c2 = st.columns(2)
                 with c1:
                     bas = st.date_input("Başlangıç", value=min_t, min_value=min_t, max_value=max_t, key="t5_bas")
@@ -490,15 +495,15 @@ def tab_naeron_tarih_filtre(st):
                 else:
                     # Seçilen aralık + Top5
                     df_top = dfa[dfa["Rota"].isin(top5)]
-                    df_top = df_top[(df_top[tarih_col].dt.date >= bas) & (df_top[tarih_col].dt.date <= bit)]
+                    df_top = df_top[(df_top["Tarih"].dt.date >= bas) & (df_top["Tarih"].dt.date <= bit)].copy()
 
                     if df_top.empty:
                         st.info("Bu tarih aralığında kayıt yok.")
                     else:
                         # Günlük uçuş sayısı (zaman serisi)
                         gunluk = (
-                            df_top.groupby([df_top[tarih_col].dt.date.rename("Tarih"), "Rota"])
-                                .size().reset_index(name="Uçuş Sayısı")
+                            df_top.groupby(["Tarih", "Rota"])["sorti"]
+                                .sum().reset_index(name="Uçuş Sayısı")
                         )
                         fig = px.line(
                             gunluk,
@@ -512,9 +517,9 @@ def tab_naeron_tarih_filtre(st):
                         ozet = (
                             df_top.groupby("Rota")
                                 .agg(
-                                    Toplam_Ucus=("Rota", "count"),
-                                    Ilk_Tarih=(tarih_col, "min"),
-                                    Son_Tarih=(tarih_col, "max")
+                                    Toplam_Ucus=("sorti", "sum"),
+                                    Ilk_Tarih=("Tarih", "min"),
+                                    Son_Tarih=("Tarih", "max")
                                 )
                                 .reset_index()
                         )
@@ -524,35 +529,25 @@ def tab_naeron_tarih_filtre(st):
                         st.markdown("#### 📋 Rota Bazlı Özet (Seçilen Tarih Aralığı)")
                         st.dataframe(ozet, use_container_width=True)
 
-                        # (Opsiyonel) Block/Flight zamanı da varsa göster
-                        has_block = block_col and (block_col in df_top.columns)
-                        has_flight = flight_col and (flight_col in df_top.columns)
-                        if has_block or has_flight:
-                            with st.expander("⏱ Süre Analizi (varsa Block/Flight)"):
-                                if has_block:
-                                    df_top["_block_h"] = df_top[block_col].apply(_to_hours)
-                                    g_block = (
-                                        df_top.groupby([df_top[tarih_col].dt.date.rename("Tarih"), "Rota"])["_block_h"]
-                                            .sum().reset_index()
-                                    )
-                                    figb = px.line(
-                                        g_block, x="Tarih", y="_block_h", color="Rota", markers=True,
-                                        title="Top 5 Rota — Günlük Toplam Block (saat)"
-                                    )
-                                    figb.update_yaxes(title="Block (saat)")
-                                    st.plotly_chart(figb, use_container_width=True)
-                                if has_flight:
-                                    df_top["_flight_h"] = df_top[flight_col].apply(_to_hours)
-                                    g_flt = (
-                                        df_top.groupby([df_top[tarih_col].dt.date.rename("Tarih"), "Rota"])["_flight_h"]
-                                            .sum().reset_index()
-                                    )
-                                    figf = px.line(
-                                        g_flt, x="Tarih", y="_flight_h", color="Rota", markers=True,
-                                        title="Top 5 Rota — Günlük Toplam Flight (saat)"
-                                    )
-                                    figf.update_yaxes(title="Flight (saat)")
-                                    st.plotly_chart(figf, use_container_width=True)
+                        # Block/Flight süreleri (küpte saniye olarak hazır)
+                        with st.expander("⏱ Süre Analizi (Block/Flight)"):
+                            df_top["_block_h"] = df_top["block_sn"] / 3600
+                            g_block = df_top.groupby(["Tarih", "Rota"])["_block_h"].sum().reset_index()
+                            figb = px.line(
+                                g_block, x="Tarih", y="_block_h", color="Rota", markers=True,
+                                title="Top 5 Rota — Günlük Toplam Block (saat)"
+                            )
+                            figb.update_yaxes(title="Block (saat)")
+                            st.plotly_chart(figb, use_container_width=True)
+
+                            df_top["_flight_h"] = df_top["ucus_sn"] / 3600
+                            g_flt = df_top.groupby(["Tarih", "Rota"])["_flight_h"].sum().reset_index()
+                            figf = px.line(
+                                g_flt, x="Tarih", y="_flight_h", color="Rota", markers=True,
+                                title="Top 5 Rota — Günlük Toplam Flight (saat)"
+                            )
+                            figf.update_yaxes(title="Flight (saat)")
+                            st.plotly_chart(figf, use_container_width=True)
 
                         # (Opsiyonel) 7 günlük hareketli ortalama (düzgün eksen için tarih doldurma)
                         with st.expander("🔧 7 Günlük Hareketli Ortalama (uçuş sayısı)"):
@@ -581,224 +576,144 @@ def tab_naeron_tarih_filtre(st):
     with sek5:
         st.markdown("### 🔮 Uçuş Süresi Tahmini (Günlük)")
 
-        if df.empty:
+        # Kaynak: tüm kayıtlar ya da SEK1 filtresi — günlük küpten (gün, çağrı) toplamları
+        kaynak = st.radio(
+            "Veri Kaynağı",
+            ["Tüm Kayıtlar", "SEK1 Filtre Sonucu"],
+            horizontal=True,
+            key="pred_src"
+        )
+        base = pd.DataFrame()
+        if kaynak == "SEK1 Filtre Sonucu":
+            base = kup_oku(boyutlar=["gun", "cagri"], **st.session_state.get("naeron_filtre", {}))
+            if base.empty:
+                st.warning("SEK1 filtresi boş. Tüm kayıtlar üzerinden tahmin yapılacak.")
+        if base.empty:
+            base = kup_oku(boyutlar=["gun", "cagri"])
+        base = base.rename(columns={"gun": "Tarih", "cagri": "Çağrı"})
+
+        if base.empty:
             st.info("Veri yok.")
         else:
-            # Kaynak: tüm kayıtlar ya da SEK1 filtresinden gelen sonuç
-            kaynak = st.radio(
-                "Veri Kaynağı",
-                ["Tüm Kayıtlar", "SEK1 Filtre Sonucu"],
-                horizontal=True,
-                key="pred_src"
-            )
-            if kaynak == "SEK1 Filtre Sonucu":
-                base = st.session_state.get("naeron_dff", pd.DataFrame()).copy()
-                if base.empty:
-                    st.warning("SEK1 filtresi boş. Tüm kayıtlar üzerinden tahmin yapılacak.")
-                    base = df.copy()
-            else:
-                base = df.copy()
-
-            # Tarih garanti
-            base[tarih_col] = pd.to_datetime(base[tarih_col], errors="coerce")
-            base = base.dropna(subset=[tarih_col])
-
             # Hangi süre üzerinden tahmin?
-            sure_ops, sure_default = [], None
-            if block_col and (block_col in base.columns):
-                sure_ops.append("Block Time")
-                sure_default = sure_default or "Block Time"
-            if flight_col and (flight_col in base.columns):
-                sure_ops.append("Flight Time")
-                sure_default = sure_default or "Flight Time"
-
-            if not sure_ops:
-                st.error("Ne 'Block' ne de 'Flight' süresi kolonu bulunamadı.")
-            else:
-                sure_tipi = st.selectbox("Tahmin Süresi", options=sure_ops, index=sure_ops.index(sure_default), key="pred_metric")
+            sure_ops = {"Block Time": "block_sn", "Flight Time": "ucus_sn"}
+            sure_tipi = st.selectbox("Tahmin Süresi", options=list(sure_ops), index=0, key="pred_metric")
 
-                # Süreyi saate çevir
-                hedef_col = block_col if sure_tipi == "Block Time" else flight_col
-                base["_hours"] = base[hedef_col].apply(_to_hours)
+            # Süreyi saate çevir
+            base["_hours"] = base[sure_ops[sure_tipi]] / 3600
 
-                # Günlük toplam saat serisi
-                daily = (
-                    base.groupby(base[tarih_col].dt.date)["_hours"].sum()
-                        .sort_index()
-                )
+            # Günlük toplam saat serisi
+            daily = base.groupby("Tarih")["_hours"].sum().sort_index()
 
-                if daily.empty or daily.sum() == 0:
-                    st.warning("Seçilen veride günlük süre serisi oluşturulamadı.")
-                else:
-                    # Parametreler
-                    col1, col2, col3 = st.columns([1,1,2])
-                    with col1:
-                        horizon = st.number_input("Tahmin ufku (gün)", min_value=3, max_value=60, value=14, step=1, key="pred_h")
-                    with col2:
-                        method = st.selectbox(
-                            "Yöntem",
-                            ["Haftalık Ortalama (önerilen)", "ARIMA (varsa)", "Holt-Winters (varsa)"],
-                            key="pred_m"
+            if daily.empty or daily.sum() == 0:
+                st.warning("Seçilen veride günlük süre serisi oluşturulamadı.")
+            else:
+                # Parametreler
+                col1, col2, col3 = st.columns([1,1,2])
+                with col1:
+                    horizon = st.number_input("Tahmin ufku (gün)", min_value=3, max_value=60, value=14, step=1, key="pred_h")
+                with col2:
+                    method = st.selectbox("Yöntem", list(YONTEM_ADLARI), key="pred_m")
+                with col3:
+                    show_ci = st.checkbox("Güven aralığı (uygunsa)", value=True, key="pred_ci")
+
+                # --- Tahmini üret (modeller tahmin modülünde önbellekli; ufuk / güven aralığı refit etmez) ---
+                daily = daily.astype(float)
+                daily.index = pd.to_datetime(daily.index)
+
+                yontem = YONTEM_ADLARI[method]
+                ci_lower = ci_upper = None
+                try:
+                    fc_df, ci_lower, ci_upper = tahmin_et(daily, yontem, int(horizon), guven_araligi=show_ci)
+                except TahminHatasi as e:
+                    st.info(f"{yontem} kullanılamadı ({e}); Haftalık Ortalama ile devam ediliyor.")
+                    fc_df, _, _ = tahmin_et(daily, "Haftalık Ortalama", int(horizon))
+
+                # --- Grafik: geçmiş + tahmin ---
+                st.markdown("#### 📈 Geçmiş ve Tahmin (Günlük Toplam Saat)")
+                hist_df = daily.reset_index().rename(columns={"index":"Tarih", 0:"Saat"})
+                hist_df.columns = ["Tarih", "Saat"]
+                fig = px.line(hist_df, x="Tarih", y="Saat", title=f"Geçmiş ({sure_tipi})")
+                fig.update_traces(name="Geçmiş", showlegend=True)
+
+                if fc_df is not None and not fc_df.empty:
+                    fcf = fc_df.reset_index().rename(columns={"index":"Tarih"})
+                    fig_fc = px.line(fcf, x="Tarih", y="Tahmin")
+                    # trace'ı birleştir
+                    for tr in fig_fc.data:
+                        tr.name = "Tahmin"
+                        tr.line.dash = "dash"
+                        fig.add_trace(tr)
+
+                    # Güven bandı (varsa)
+                    if (ci_lower is not None) and (ci_upper is not None):
+                        band = pd.DataFrame({
+                            "Tarih": fcf["Tarih"],
+                            "Alt": ci_lower.values,
+                            "Üst": ci_upper.values
+                        })
+                        fig.add_scatter(
+                            x=band["Tarih"], y=band["Üst"],
+                            mode="lines", line=dict(width=0), name="Üst Sınır",
+                            showlegend=False
                         )
-                    with col3:
-                        show_ci = st.checkbox("Güven aralığı (uygunsa)", value=True, key="pred_ci")
-
-                    # --- Tahmin yardımcıları ---
-                    def _future_dates(last_d: date, n: int):
-                        return [last_d + timedelta(days=i) for i in range(1, n+1)]
-
-                    fc_df = None      # tahmin DataFrame
-                    ci_lower = None   # alt güven sınırı
-                    ci_upper = None   # üst güven sınırı
-
-                    # 1) Haftalık Ortalama (bağımlılık yok – her ortamda çalışır)
-                    def weekly_mean_forecast(s: pd.Series, steps: int):
-                        # s.index -> date
-                        df = s.copy()
-                        idx = pd.to_datetime(df.index)
-                        # Son 8 haftadan weekday ortalaması (yeterli yoksa tüm seri)
-                        last_weeks = df[-56:] if len(df) >= 56 else df
-                        wd_means = last_weeks.groupby(pd.to_datetime(last_weeks.index).weekday).mean()
-                        # Eksik günler için genel ortalama
-                        global_mean = last_weeks.mean()
-                        preds = []
-                        future_idx = _future_dates(idx.max().date(), steps)
-                        for d in future_idx:
-                            wd = pd.Timestamp(d).weekday()
-                            val = wd_means.get(wd, global_mean)
-                            preds.append(float(val))
-                        out = pd.DataFrame({"Tarih": future_idx, "Tahmin": preds}).set_index("Tarih")
-                        return out
-
-                    # 2) ARIMA (statsmodels varsa)
-                    def arima_forecast(s: pd.Series, steps: int):
-                        try:
-                            import statsmodels.api as sm
-                            # eksiksiz günlük eksen (eksik gün = 0)
-                            full_idx = pd.date_range(start=pd.to_datetime(s.index.min()), end=pd.to_datetime(s.index.max()), freq="D")
-                            y = s.reindex(full_idx, fill_value=0.0)
-                            model = sm.tsa.ARIMA(y, order=(2,1,2))
-                            res = model.fit()
-                            fc = res.get_forecast(steps=steps)
-                            mean = fc.predicted_mean
-                            conf = fc.conf_int(alpha=0.32) if show_ci else None  # ~±1σ bandı için ~%68
-                            fidx = _future_dates(full_idx[-1].date(), steps)
-                            df_out = pd.DataFrame({"Tarih": fidx, "Tahmin": mean.values}).set_index("Tarih")
-                            lo, up = None, None
-                            if conf is not None:
-                                lo = pd.Series(conf.iloc[:,0].values, index=df_out.index, name="Alt")
-                                up = pd.Series(conf.iloc[:,1].values, index=df_out.index, name="Üst")
-                            return df_out, lo, up
-                        except Exception as e:
-                            st.info(f"ARIMA kullanılamadı: {e}")
-                            return None, None, None
-
-                    # 3) Holt-Winters (statsmodels varsa)
-                    def holt_winters_forecast(s: pd.Series, steps: int):
-                        try:
-                            from statsmodels.tsa.holtwinters import ExponentialSmoothing
-                            full_idx = pd.date_range(start=pd.to_datetime(s.index.min()), end=pd.to_datetime(s.index.max()), freq="D")
-                            y = s.reindex(full_idx, fill_value=0.0)
-                            # 7 günlük mevsimsellik varsayımı
-                            model = ExponentialSmoothing(y, trend="add", seasonal="add", seasonal_periods=7)
-                            res = model.fit(optimized=True)
-                            pred = res.forecast(steps)
-                            fidx = _future_dates(full_idx[-1].date(), steps)
-                            df_out = pd.DataFrame({"Tarih": fidx, "Tahmin": pred.values}).set_index("Tarih")
-                            # HW için doğrudan CI üretmiyoruz (basit band: ±1.0 std)
-                            lo = up = None
-                            if show_ci:
-                                sigma = float(y.std() if y.std() > 0 else 0.0)
-                                lo = df_out["Tahmin"] - sigma
-                                up = df_out["Tahmin"] + sigma
-                                lo.name, up.name = "Alt", "Üst"
-                            return df_out, lo, up
-                        except Exception as e:
-                            st.info(f"Holt-Winters kullanılamadı: {e}")
-                            return None, None, None
-
-                    # --- Tahmini üret ---
-                    daily = daily.astype(float)
-                    daily.index = pd.to_datetime(daily.index)
-
-                    if method.startswith("Haftalık"):
-                        fc_df = weekly_mean_forecast(daily, horizon)
-                    elif method.startswith("ARIMA"):
-                        fc_df, ci_lower, ci_upper = arima_forecast(daily, horizon)
-                        if fc_df is None:
-                            st.info("ARIMA başarısız oldu, yerine Haftalık Ortalama ile devam ediliyor.")
-                            fc_df = weekly_mean_forecast(daily, horizon)
-                    else:  # Holt-Winters
-                        fc_df, ci_lower, ci_upper = holt_winters_forecast(daily, horizon)
-                        if fc_df is None:
-                            st.info("Holt-Winters başarısız oldu, yerine Haftalık Ortalama ile devam ediliyor.")
-                            fc_df = weekly_mean_forecast(daily, horizon)
-
-                    # --- Grafik: geçmiş + tahmin ---
-                    st.markdown("#### 📈 Geçmiş ve Tahmin (Günlük Toplam Saat)")
-                    hist_df = daily.reset_index().rename(columns={"index":"Tarih", 0:"Saat"})
-                    hist_df.columns = ["Tarih", "Saat"]
-                    fig = px.line(hist_df, x="Tarih", y="Saat", title=f"Geçmiş ({sure_tipi})")
-                    fig.update_traces(name="Geçmiş", showlegend=True)
-
-                    if fc_df is not None and not fc_df.empty:
-                        fcf = fc_df.reset_index().rename(columns={"index":"Tarih"})
-                        fig_fc = px.line(fcf, x="Tarih", y="Tahmin")
-                        # trace'ı birleştir
-                        for tr in fig_fc.data:
-                            tr.name = "Tahmin"
-                            tr.line.dash = "dash"
-                            fig.add_trace(tr)
-
-                        # Güven bandı (varsa)
-                        if (ci_lower is not None) and (ci_upper is not None):
-                            band = pd.DataFrame({
-                                "Tarih": fcf["Tarih"],
-                                "Alt": ci_lower.values,
-                                "Üst": ci_upper.values
-                            })
-                            fig.add_scatter(
-                                x=band["Tarih"], y=band["Üst"],
-                                mode="lines", line=dict(width=0), name="Üst Sınır",
-                                showlegend=False
-                            )
-                            fig.add_scatter(
-                                x=band["Tarih"], y=band["Alt"],
-                                mode="lines", line=dict(width=0), name="Alt Sınır",
-                                fill="tonexty", fillcolor="rgba(0,0,0,0.08)",
-                                showlegend=False
-                            )
-
-                    st.plotly_chart(fig, use_container_width=True)
-
-                    # --- Tahmin Tablosu + İndirme ---
-                    if fc_df is not None and not fc_df.empty:
-                        out_tbl = fc_df.copy()
-                        # okunaklı: saatleri HH:MM yaz
-                        out_tbl["Tahmin (HH:MM)"] = out_tbl["Tahmin"].apply(_fmt_hhmm)
-                        if (ci_lower is not None) and (ci_upper is not None):
-                            out_tbl["Alt (HH:MM)"] = ci_lower.apply(lambda x: _fmt_hhmm(max(x, 0)))
-                            out_tbl["Üst (HH:MM)"] = ci_upper.apply(lambda x: _fmt_hhmm(max(x, 0)))
-
-                        st.markdown("#### 📋 Tahmin Tablosu")
-                        st.dataframe(out_tbl.reset_index(), use_container_width=True)
-
-                        # CSV indir
-                        csv_bytes = out_tbl.reset_index().to_csv(index=False).encode("utf-8")
-                        st.download_button(
-                            "⬇️ Tahminleri CSV indir",
-                            data=csv_bytes,
-                            file_name=f"tahmin_{sure_tipi.lower().replace(' ','_')}.csv",
-                            mime="text/csv"
+                        fig.add_scatter(
+                            x=band["Tarih"], y=band["Alt"],
+                            mode="lines", line=dict(width=0), name="Alt Sınır",
+                            fill="tonexty", fillcolor="rgba(0,0,0,0.08)",
+                            showlegend=False
                         )
 
-                    # --- Kısa yorum ---
-                    with st.expander("ℹ️ Yorum / Metodoloji"):
-                        st.write(
-                            "• Varsayılan yöntem **haftalık mevsimsellik ortalaması**dır (haftanın günlerine göre son 8 haftayı baz alır). "
-                            "İstersen **ARIMA** veya **Holt‑Winters** seçebilirsin (ortamda `statsmodels` kurulu olmalı). "
-                            "Güven aralığı, ARIMA için modelden; Holt‑Winters için ±1σ yaklaşık bandıyla çizilir."
-                        )
+                st.plotly_chart(fig, use_container_width=True)
+
+                # --- Tahmin Tablosu + İndirme ---
+                if fc_df is not None and not fc_df.empty:
+                    out_tbl = fc_df.copy()
+                    # okunaklı: saatleri HH:MM yaz
+                    out_tbl["Tahmin (HH:MM)"] = out_tbl["Tahmin"].apply(_fmt_hhmm)
+                    if (ci_lower is not None) and (ci_upper is not None):
+                        out_tbl["Alt (HH:MM)"] = ci_lower.apply(lambda x: _fmt_hhmm(max(x, 0)))
+                        out_tbl["Üst (HH:MM)"] = ci_upper.apply(lambda x: _fmt_hhmm(max(x, 0)))
+
+                    st.markdown("#### 📋 Tahmin Tablosu")
+                    st.dataframe(out_tbl.reset_index(), use_container_width=True)
+
+                    # CSV indir
+                    csv_bytes = out_tbl.reset_index().to_csv(index=False).encode("utf-8")
+                    st.download_button(
+                        "⬇️ Tahminleri CSV indir",
+                        data=csv_bytes,
+                        file_name=f"tahmin_{sure_tipi.lower().replace(' ','_')}.csv",
+                        mime="text/csv"
+                    )
+
+                # --- Yöntem karşılaştırması (kayan orijinli geriye dönük test) ---
+                with st.expander("🧪 Yöntem Karşılaştırması (geriye dönük test)"):
+                    st.caption(
+                        f"Son 8 haftalık orijinlerden {int(horizon)} günlük tahminler gerçekleşenle karşılaştırılır "
+                        "(MAE saat, MAPE %). Modeller bir kez fit edilir ve önbellekte tutulur."
+                    )
+                    if st.checkbox("Testi çalıştır", key="pred_bt"):
+                        st.dataframe(geriye_donuk_test(daily, ufuk=int(horizon)), use_container_width=True)
+
+                    if st.checkbox("Çağrı bazında karşılaştır", key="pred_bt_cagri"):
+                        kars = yontem_karsilastir(base[base["Çağrı"] != ""], "Çağrı", "Tarih", "_hours", ufuk=int(horizon))
+                        if kars.empty:
+                            st.info("Karşılaştırılacak çağrı bulunamadı.")
+                        else:
+                            mae = kars.pivot(index="Çağrı", columns="Yöntem", values="MAE")
+                            # Geçmişi kısa çağrılarda tüm yöntemler NaN: "En İyi" boş kalır
+                            dolu = mae.notna().any(axis=1)
+                            mae["En İyi"] = mae[dolu].idxmin(axis=1).reindex(mae.index)
+                            st.dataframe(mae.reset_index(), use_container_width=True)
+
+                # --- Kısa yorum ---
+                with st.expander("ℹ️ Yorum / Metodoloji"):
+                    st.write(
+                        "• Varsayılan yöntem **haftalık mevsimsellik ortalaması**dır (haftanın günlerine göre son 8 haftayı baz alır; uçuş olmayan günler 0 sayılır). "
+                        "İstersen **ARIMA** veya **Holt‑Winters** seçebilirsin (ortamda `statsmodels` kurulu olmalı). "
+                        "Güven aralığı, ARIMA için modelden; Holt‑Winters için ±1σ yaklaşık bandıyla çizilir."
+                    )
 
 
 
@@ -816,38 +731,34 @@ def sek6_kalkis_inis_filtre(st):
     st.header("🛫🛬 Kalkış / İniş Meydanı ve Tarih Filtresi")
 
     try:
-        # Veritabanı bağlan
-        conn = sqlite3.connect("naeron_kayitlari.db")
-        df = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn, parse_dates=["Uçuş Tarihi 2"])
-        conn.close()
+        # Seçenekler ve tarih sınırları günlük küpten
+        min_date, max_date = kup_tarih_araligi()
+        kalkislar, inisler = kup_degerleri("kalkis"), kup_degerleri("inis")
     except Exception as e:
         st.error(f"Veri okunamadı: {e}")
         return
 
-    if df.empty:
+    if min_date is None:
         st.warning("Veritabanında kayıt bulunamadı.")
         return
 
     # --- Filtreler ---
     col1, col2 = st.columns(2)
     with col1:
-        kalkis_sec = st.multiselect("Kalkış Meydanı Seç", sorted(df["Kalkış"].dropna().unique()))
+        kalkis_sec = st.multiselect("Kalkış Meydanı Seç", kalkislar)
     with col2:
-        inis_sec = st.multiselect("İniş Meydanı Seç", sorted(df["İniş"].dropna().unique()))
+        inis_sec = st.multiselect("İniş Meydanı Seç", inisler)
 
     # Tarih aralığı filtresi
-    min_date, max_date = df["Uçuş Tarihi 2"].min(), df["Uçuş Tarihi 2"].max()
     tarih_aralik = st.date_input("Tarih Aralığı Seç", [min_date, max_date])
 
-    # --- Filtre uygulama ---
-    df_filt = df.copy()
-    if kalkis_sec:
-        df_filt = df_filt[df_filt["Kalkış"].isin(kalkis_sec)]
-    if inis_sec:
-        df_filt = df_filt[df_filt["İniş"].isin(inis_sec)]
-    if len(tarih_aralik) == 2:
-        start, end = pd.to_datetime(tarih_aralik[0]), pd.to_datetime(tarih_aralik[1])
-        df_filt = df_filt[(df_filt["Uçuş Tarihi 2"] >= start) & (df_filt["Uçuş Tarihi 2"] <= end)]
+    # --- Filtre uygulama (gün × kalkış × iniş × görev toplamları) ---
+    bas, bit = tarih_aralik if len(tarih_aralik) == 2 else (None, None)
+    df_filt = kup_oku(
+        bas, bit,
+        boyutlar=["gun", "kalkis", "inis", "gorev"],
+        filtreler={"kalkis": kalkis_sec, "inis": inis_sec},
+    ).rename(columns={**KUP_ETIKETLERI, "sorti": "Uçuş"})
 
     st.markdown("### 📋 Filtreye Uyan Görevler")
     if df_filt.empty:
@@ -855,11 +766,11 @@ def sek6_kalkis_inis_filtre(st):
         return
 
     # Görev isimlerini listele
-    gorevler = sorted(df_filt["Görev"].dropna().unique().tolist())
+    gorevler = sorted(df_filt.loc[df_filt["Görev"] != "", "Görev"].unique().tolist())
     secilen_gorevler = st.multiselect("Görevleri Seç ve Ele", gorevler)
 
     # Gösterim
-    st.dataframe(df_filt[["Uçuş Tarihi 2", "Kalkış", "İniş", "Görev"]], use_container_width=True)
+    st.dataframe(df_filt[["Uçuş Tarihi 2", "Kalkış", "İniş", "Görev", "Uçuş"]], use_container_width=True)
 
     if secilen_gorevler:
-        st.success(f"Seçilen görevler ({len(secilen_gorevler)}): {', '.join(secilen_gorevler)}")
\ No newline at end of file
+        st.success(f"Seçilen görevler ({len(secilen_gorevler)}): {', '.join(secilen_gorevler)}")
@@ -3,10 +3,13 @@ import streamlit as st
 import pandas as pd
 import sqlite3
 import io
-from datetime import time as dtime
 import datetime as dt
 import plotly.express as px
 import math
+import numpy as np
+
+from db.migrations import MEYDAN_SIM_ROTA, meydan_migrasyonlari
+from tabs.utils.sure_utils import saat_tek, saniye_formatla, saniye_tek, sure_saniye
 
 AY_ADLARI = {
     1:"Ocak",2:"Şubat",3:"Mart",4:"Nisan",5:"Mayıs",6:"Haziran",
@@ -25,17 +28,11 @@ def _pick(df, candidates):
             return c
     return None
 
+# Süre hücreleri: "H[:M[:S]]", ondalık saat, time / timedelta nesneleri
+_SURE_KURALLARI = dict(tek_parca=True, ondalik=True, metne_cevir=True)
+
 def _hhmm_to_hours(x):
-    if pd.isna(x) or str(x).strip()=="":
-        return 0.0
-    s=str(x)
-    try:
-        parts=[int(p) for p in s.split(":")]
-        h=parts[0]; m=parts[1] if len(parts)>1 else 0; sec=parts[2] if len(parts)>2 else 0
-        return h + m/60 + sec/3600
-    except:
-        try: return float(s)
-        except: return 0.0
+    return saat_tek(x, **_SURE_KURALLARI)
 
 def _hours_to_hhmm(h: float) -> str:
     try:
@@ -50,23 +47,11 @@ def _hours_to_hhmm(h: float) -> str:
         return "00:00:00"
 
 def _time_to_seconds(x) -> int:
-    if x is None or (isinstance(x, float) and pd.isna(x)):
-        return 0
-    if isinstance(x, dtime):
-        return x.hour*3600 + x.minute*60 + x.second
-    if isinstance(x, dt.timedelta):
-        return int(x.total_seconds())
-    s = str(x)
-    try:
-        parts=[int(p) for p in s.split(":")]
-        h=parts[0]; m=parts[1] if len(parts)>1 else 0; sec=parts[2] if len(parts)>2 else 0
-        return h*3600 + m*60 + sec
-    except:
-        try:
-            # ondalık saat verilirse
-            h=float(s); return int(round(h*3600))
-        except:
-            return 0
+    return saniye_tek(x, **_SURE_KURALLARI)
+
+def _time_to_seconds_seri(seri) -> pd.Series:
+    """_time_to_seconds'ın kolon hali (tek geçişte, int64)."""
+    return sure_saniye(seri, **_SURE_KURALLARI)
 
 def _seconds_to_hhmmss(sec: int) -> str:
     sec = int(max(0, sec))
@@ -90,124 +75,12 @@ def _ui_key(kind, *parts):
 
 
 
-# --- SIM DB yardımcıları ---
-SIM_META = "meydan_meta_sim"
-
-def _sim_table_name(genel: str) -> str:
-    return f"{_safe_name(genel)}__sim"
-
-def _ensure_meta_sim(conn):
-    conn.execute(f"""
-        CREATE TABLE IF NOT EXISTS {SIM_META}(
-            table_name TEXT PRIMARY KEY,
-            genel      TEXT,
-            created_at TEXT,
-            updated_at TEXT
-        )
-    """)
-
-def _ensure_sim_table(conn, genel: str):
-    """SIM tablosunu oluşturur; eksik kolonları (sim + iptal_sim) ALTER ile ekler."""
-    tbl = _sim_table_name(genel)
-    cols = []
-    for m in range(1,13):
-        cols.append(f"sim_saniye_{m} INTEGER DEFAULT 0")
-        cols.append(f"iptal_sim_saniye_{m} INTEGER DEFAULT 0")
-    conn.execute(f"""
-        CREATE TABLE IF NOT EXISTS {tbl}(
-            yil INTEGER NOT NULL,
-            sim_tipi TEXT NOT NULL,
-            {", ".join(cols)},
-            created_at TEXT,
-            updated_at TEXT,
-            PRIMARY KEY (yil, sim_tipi)
-        )
-    """)
-    # eksik kolonları ekle
-    info = conn.execute(f"PRAGMA table_info({tbl})").fetchall()
-    existing = {c[1] for c in info}
-    for m in range(1,13):
-        if f"sim_saniye_{m}" not in existing:
-            conn.execute(f"ALTER TABLE {tbl} ADD COLUMN sim_saniye_{m} INTEGER DEFAULT 0")
-        if f"iptal_sim_saniye_{m}" not in existing:
-            conn.execute(f"ALTER TABLE {tbl} ADD COLUMN iptal_sim_saniye_{m} INTEGER DEFAULT 0")
-
-    _ensure_meta_sim(conn)
-    now = pd.Timestamp.utcnow().isoformat()
-    conn.execute(
-        f"INSERT OR IGNORE INTO {SIM_META}(table_name,genel,created_at,updated_at) VALUES (?,?,?,?)",
-        (tbl, genel, now, now)
-    )
-
-def _save_sim_year(conn, genel: str, yil: int, df_rows: pd.DataFrame,
-                   sim_cols: list[str], sim_cancel_cols: list[str]):
-    """Editörden gelen HH:MM[:SS] sim sürelerini (normal + iptal) saniye cinsinden kaydeder."""
-    tbl = _sim_table_name(genel)
-    _ensure_sim_table(conn, genel)
-    now = pd.Timestamp.utcnow().isoformat()
-
-    for _, r in df_rows.iterrows():
-        stype = str(r.get("Uçak Tipi","") or r.get("Sim Tipi","")).strip()
-        if not stype:
-            continue
-        sim_secs   = [int(_time_to_seconds(r[sim_cols[m-1]]))       for m in range(1,13)]
-        ipt_secs   = [int(_time_to_seconds(r[sim_cancel_cols[m-1]])) for m in range(1,13)]
-
-        col_list = (
-            [f"sim_saniye_{m}" for m in range(1,13)] +
-            [f"iptal_sim_saniye_{m}" for m in range(1,13)]
-        )
-        placeholders = ",".join(["?"]*(2 + len(col_list) + 2))
-        conn.execute(
-            f"REPLACE INTO {tbl}(yil,sim_tipi,{','.join(col_list)},created_at,updated_at) "
-            f"VALUES ({placeholders})",
-            (int(yil), stype, *sim_secs, *ipt_secs, now, now)
-        )
-
-def _load_sim_year(conn, genel: str, yil: int) -> pd.DataFrame | None:
-    """DB’den HH:MM:SS formatında SIM editör tablosu (normal + iptal) oluşturur."""
-    tbl = _sim_table_name(genel)
-    cur = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (tbl,))
-    if cur.fetchone() is None:
-        return None
-
-    rows = conn.execute(f"SELECT * FROM {tbl} WHERE yil=?", (int(yil),)).fetchall()
-    if not rows:
-        return pd.DataFrame()
-
-    cols = [c[1] for c in conn.execute(f"PRAGMA table_info({tbl})").fetchall()]
-    df = pd.DataFrame(rows, columns=cols)
-
-    out = []
-    for _, r in df.iterrows():
-        row = {"Uçak Tipi": r["sim_tipi"]}  # entegrasyon için aynı isim
-        for m in range(1,13):
-            row[f"{AY_ADLARI[m]} - Sim Süresi"]       = _seconds_to_hhmmss(int(r.get(f"sim_saniye_{m}",0)))
-            row[f"{AY_ADLARI[m]} - İptal Sim Süresi"] = _seconds_to_hhmmss(int(r.get(f"iptal_sim_saniye_{m}",0)))
-        out.append(row)
-    return pd.DataFrame(out)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+# --- meydan.db: tüm rota + SIM aylık süreleri tek uzun tabloda ---
 import re
 from pathlib import Path
 
 MEYDAN_DB_PATH = "meydan.db"
+SIM_ROTA = MEYDAN_SIM_ROTA  # SIM satırları: route = SIM_ROTA, ucak_tipi = sim tipi
 
 def _safe_name(s: str) -> str:
     s = re.sub(r"\s+", "_", str(s).strip())
@@ -218,106 +91,176 @@ def _safe_name(s: str) -> str:
     return s.lower()
 
 def _route_table_name(ana: str, route: str) -> str:
+    # Eski rota tablolarının adı; artık sadece editör/grafik anahtarlarında kullanılıyor
     return f"{_safe_name(ana)}__{_safe_name(route)}"
 
-def _ensure_meta(conn):
+def _ensure_meydan_aylik(conn):
+    """meydan_aylik tablosunu kurar; eski rota / SIM tabloları ilk açılışta bir kez taşınır."""
     conn.execute("""
-        CREATE TABLE IF NOT EXISTS meydan_meta (
-          table_name TEXT PRIMARY KEY,
-          ana        TEXT,
-          route      TEXT,
-          created_at TEXT,
-          updated_at TEXT
+        CREATE TABLE IF NOT EXISTS meydan_aylik (
+          ana          TEXT NOT NULL,
+          route        TEXT NOT NULL,
+          yil          INTEGER NOT NULL,
+          ucak_tipi    TEXT NOT NULL,
+          ay           INTEGER NOT NULL,
+          ucus_saniye  INTEGER NOT NULL DEFAULT 0,
+          iptal_saniye INTEGER NOT NULL DEFAULT 0,
+          updated_at   TEXT,
+          PRIMARY KEY (ana, route, yil, ucak_tipi, ay)
         )
     """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_meydan_aylik_yil ON meydan_aylik(yil, route)")
+    conn.commit()
+    meydan_migrasyonlari(conn)
+
+def _kosul(ana=None, route=None, sim_haric: bool = False):
+    parcalar, params = ["1 = 1"], []
+    if ana is not None:
+        parcalar.append("ana = ?"); params.append(ana)
+    if route is not None:
+        parcalar.append("route = ?"); params.append(route)
+    if sim_haric:
+        parcalar.append("route != ?"); params.append(SIM_ROTA)
+    return " AND ".join(parcalar), params
+
+def _yillar(conn, ana=None, route=None, sim_haric: bool = False) -> list[int]:
+    """Kayıtlı yıllar (büyükten küçüğe)."""
+    _ensure_meydan_aylik(conn)
+    where, params = _kosul(ana, route, sim_haric)
+    rows = conn.execute(f"SELECT DISTINCT yil FROM meydan_aylik WHERE {where} ORDER BY yil DESC", params)
+    return [int(r[0]) for r in rows]
+
+def _rotalar(conn) -> pd.DataFrame:
+    """Kaydı olan (ana, route) çiftleri (SIM hariç)."""
+    _ensure_meydan_aylik(conn)
+    return pd.read_sql_query(
+        "SELECT DISTINCT ana, route FROM meydan_aylik WHERE route != ? ORDER BY ana, route",
+        conn, params=(SIM_ROTA,)
+    )
 
-def _ensure_route_table(conn, ana: str, route: str):
-    """Tabloyu yoksa oluşturur; varsa eksik yeni sütunları ekler (ALTER)."""
-    tbl = _route_table_name(ana, route)
-
-    # İlk oluşturma (eski/yeniyi birlikte düşünerek)
-    cols_sql = ", ".join(
-        sum(([f"ucus_saniye_{m} INTEGER DEFAULT 0",
-              f"iptal_saniye_{m} INTEGER DEFAULT 0"] for m in range(1,13)), [])
+def _yil_toplamlari(conn, yil: int, ana=None, route=None, sim_haric: bool = False) -> pd.DataFrame:
+    """
+    Seçilen yılın uçak tipi başına aylık toplamları (saniye) — tek GROUP BY:
+    index "Uçak Tipi", kolonlar u_1..u_12 (uçuş / sim) ve i_1..i_12 (iptal / iptal sim).
+    ana / route verilmezse tüm kayıtlar toplanır; sim_haric=True SIM satırlarını dışarıda bırakır.
+    """
+    _ensure_meydan_aylik(conn)
+    where, params = _kosul(ana, route, sim_haric)
+    aylar = ", ".join(
+        f"SUM(CASE WHEN ay = {m} THEN ucus_saniye ELSE 0 END) AS u_{m}, "
+        f"SUM(CASE WHEN ay = {m} THEN iptal_saniye ELSE 0 END) AS i_{m}"
+        for m in range(1,13)
     )
-    conn.execute(f"""
-        CREATE TABLE IF NOT EXISTS {tbl}(
-          yil INTEGER NOT NULL,
-          ucak_tipi TEXT NOT NULL,
-          {cols_sql},
-          created_at TEXT,
-          updated_at TEXT,
-          PRIMARY KEY (yil, ucak_tipi)
-        )
-    """)
+    df = pd.read_sql_query(
+        f"SELECT ucak_tipi, {aylar} FROM meydan_aylik WHERE yil = ? AND {where} "
+        "GROUP BY ucak_tipi ORDER BY ucak_tipi",
+        conn, params=[int(yil), *params]
+    )
+    return df.set_index("ucak_tipi").rename_axis("Uçak Tipi")
 
-    # Geriye dönük: varsa eski tabloda eksik kolonları ekle
-    info = conn.execute(f"PRAGMA table_info({tbl})").fetchall()
-    existing = {c[1] for c in info}
-    for m in range(1,13):
-        if f"ucus_saniye_{m}" not in existing:
-            conn.execute(f"ALTER TABLE {tbl} ADD COLUMN ucus_saniye_{m} INTEGER DEFAULT 0")
-        if f"iptal_saniye_{m}" not in existing:
-            conn.execute(f"ALTER TABLE {tbl} ADD COLUMN iptal_saniye_{m} INTEGER DEFAULT 0")
-
-    _ensure_meta(conn)
-    conn.execute(
-        "INSERT OR IGNORE INTO meydan_meta(table_name, ana, route, created_at, updated_at) VALUES (?,?,?,?,?)",
-        (tbl, ana, route, pd.Timestamp.utcnow().isoformat(), pd.Timestamp.utcnow().isoformat())
+# --- Editör tablosu (HH:MM:SS, ay başına kolon) <-> uzun saniye satırları ---
+ROTA_ETIKETLERI = ("Uçuş Saati", "İptal Edilen")
+SIM_ETIKETLERI  = ("Sim Süresi", "İptal Sim Süresi")
+
+def _grid_to_long(df_rows: pd.DataFrame, ucus_cols: list[str], iptal_cols: list[str],
+                  anahtarlar: tuple = ()) -> pd.DataFrame:
+    """
+    Editör tablosu → [*anahtarlar, ucak_tipi, ay, ucus_saniye, iptal_saniye] (melt). Süreler tek
+    kolonda bir kez ayrıştırılır; tipi boş satırlar atlanır, aynı (anahtarlar, tip) iki kez
+    girildiyse sonraki satır geçerlidir. "Uçak Tipi" boşsa (SIM editörü) "Sim Tipi" kullanılır.
+    """
+    if df_rows.empty:
+        return pd.DataFrame(columns=[*anahtarlar, "ucak_tipi", "ay", "ucus_saniye", "iptal_saniye"])
+    tip = df_rows.get("Uçak Tipi", pd.Series(index=df_rows.index, dtype=object))
+    if "Sim Tipi" in df_rows.columns:
+        tip = tip.where(tip.notna() & (tip.astype(str) != ""), df_rows["Sim Tipi"])
+    tip = tip.fillna("").astype(str).str.strip()
+
+    n = len(df_rows)
+    sureler = pd.concat(
+        [df_rows[c] for c in (*ucus_cols, *iptal_cols)], ignore_index=True
+    )  # ay ay alt alta: önce 12 uçuş, sonra 12 iptal kolonu
+    saniye = _time_to_seconds_seri(sureler).to_numpy().reshape(2, -1)
+
+    df = pd.DataFrame({
+        "_sira": np.tile(np.arange(n), 12),
+        **{k: np.tile(df_rows[k].to_numpy(), 12) for k in anahtarlar},
+        "ucak_tipi": np.tile(tip.to_numpy(), 12),
+        "ay": np.repeat(np.arange(1, 13), n),
+        "ucus_saniye": saniye[0],
+        "iptal_saniye": saniye[1],
+    })
+    df = df[df["ucak_tipi"] != ""].drop_duplicates([*anahtarlar, "ucak_tipi", "ay"], keep="last")
+    return df.sort_values(["_sira", "ay"]).drop(columns="_sira").reset_index(drop=True)
+
+def _long_to_grid(grp: pd.DataFrame, etiketler: tuple[str, str]) -> pd.DataFrame:
+    """
+    _yil_toplamlari çıktısı (u_m / i_m saniye) → HH:MM:SS editör tablosu; kolonlar ay sırasıyla
+    "<Ay> - <uçuş etiketi>", "<Ay> - <iptal etiketi>". Biçimlendirme tüm hücrelerde tek geçişte.
+    """
+    kaynak = [f"{k}_{m}" for m in range(1,13) for k in ("u", "i")]
+    hedef  = [f"{AY_ADLARI[m]} - {e}" for m in range(1,13) for e in etiketler]
+    metin = saniye_formatla(grp[kaynak].to_numpy().ravel()).to_numpy().reshape(len(grp), len(kaynak))
+    out = pd.DataFrame(metin, columns=hedef)
+    out.insert(0, "Uçak Tipi", grp.index.to_numpy())
+    return out
+
+def _save_year_grids(conn, yil: int, gridler):
+    """
+    Bir yılın birden çok editör tablosunu tek transaction'da kaydeder.
+    gridler: [(ana, route, df_rows, ucus_cols, iptal_cols), ...] — SIM için route = SIM_ROTA.
+    """
+    _ensure_meydan_aylik(conn)
+    ucus_ortak  = [f"u_{m}" for m in range(1,13)]
+    iptal_ortak = [f"i_{m}" for m in range(1,13)]
+    # Tüm tablolar ortak kolon adlarıyla alt alta: süreler tek seferde ayrıştırılır
+    parcalar = [
+        df_rows.rename(columns=dict(zip([*ucus_cols, *iptal_cols], [*ucus_ortak, *iptal_ortak])))
+        .assign(_ana=ana, _route=route)
+        for ana, route, df_rows, ucus_cols, iptal_cols in gridler
+    ]
+    if not parcalar:
+        return
+    df = _grid_to_long(
+        pd.concat(parcalar, ignore_index=True), ucus_ortak, iptal_ortak, anahtarlar=("_ana", "_route")
     )
+    df = df.rename(columns={"_ana": "ana", "_route": "route"}).assign(
+        yil=int(yil), updated_at=pd.Timestamp.utcnow().isoformat()
+    )[["ana", "route", "yil", "ucak_tipi", "ay", "ucus_saniye", "iptal_saniye", "updated_at"]]
+    satirlar = list(df.astype(object).itertuples(index=False, name=None))
+    try:
+        conn.executemany("""
+            INSERT INTO meydan_aylik (ana, route, yil, ucak_tipi, ay, ucus_saniye, iptal_saniye, updated_at)
+            VALUES (?,?,?,?,?,?,?,?)
+            ON CONFLICT(ana, route, yil, ucak_tipi, ay) DO UPDATE SET
+              ucus_saniye  = excluded.ucus_saniye,
+              iptal_saniye = excluded.iptal_saniye,
+              updated_at   = excluded.updated_at
+        """, satirlar)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
 def _save_route_year(conn, ana: str, route: str, yil: int, df_rows: pd.DataFrame,
                      saat_cols: list[str], iptal_cols: list[str]):
-    """Editörden gelen HH:MM[:SS] alanlarını saniyeye çevirerek kaydeder."""
-    tbl = _route_table_name(ana, route)
-    _ensure_route_table(conn, ana, route)
-    now = pd.Timestamp.utcnow().isoformat()
-
-    for _, r in df_rows.iterrows():
-        uctype = str(r.get("Uçak Tipi","")).strip()
-        if not uctype:
-            continue
-
-        ucus_secs = [int(_time_to_seconds(r[f"{AY_ADLARI[m]} - Uçuş Saati"])) for m in range(1,13)]
-        iptal_secs = [int(_time_to_seconds(r[f"{AY_ADLARI[m]} - İptal Edilen"])) for m in range(1,13)]
-
-        col_names = (
-            ["yil","ucak_tipi"] +
-            [f"ucus_saniye_{m}" for m in range(1,13)] +
-            [f"iptal_saniye_{m}" for m in range(1,13)] +
-            ["created_at","updated_at"]
-        )
-        values = [yil, uctype, *ucus_secs, *iptal_secs, now, now]
-        placeholders = ",".join(["?"]*len(values))
-
-        # REPLACE = upsert (eski satırı silip yenisini yazar)
-        conn.execute(
-            f"REPLACE INTO {tbl} ({','.join(col_names)}) VALUES ({placeholders})",
-            values
-        )
-
-def _load_route_year(conn, ana: str, route: str, yil: int) -> pd.DataFrame | None:
-    """DB’den HH:MM:SS formatlı editör tablosu oluşturur."""
-    tbl = _route_table_name(ana, route)
-    cur = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (tbl,))
-    if cur.fetchone() is None:
-        return None
+    """Editörden gelen HH:MM[:SS] alanlarını saniyeye çevirerek (ay başına bir satır) kaydeder."""
+    _save_year_grids(conn, yil, [(ana, route, df_rows, saat_cols, iptal_cols)])
 
-    rows = conn.execute(f"SELECT * FROM {tbl} WHERE yil=?", (yil,)).fetchall()
-    if not rows:
-        return pd.DataFrame()
+def _load_route_year(conn, ana: str, route: str, yil: int) -> pd.DataFrame:
+    """DB’den HH:MM:SS formatlı editör tablosu oluşturur (kayıt yoksa boş)."""
+    grp = _yil_toplamlari(conn, yil, ana=ana, route=route)
+    return _long_to_grid(grp, ROTA_ETIKETLERI) if not grp.empty else pd.DataFrame()
 
-    cols = [c[1] for c in conn.execute(f"PRAGMA table_info({tbl})").fetchall()]
-    df = pd.DataFrame(rows, columns=cols)
+def _save_sim_year(conn, genel: str, yil: int, df_rows: pd.DataFrame,
+                   sim_cols: list[str], sim_cancel_cols: list[str]):
+    """Editörden gelen HH:MM[:SS] sim sürelerini (normal + iptal) saniye cinsinden kaydeder."""
+    _save_year_grids(conn, yil, [(genel, SIM_ROTA, df_rows, sim_cols, sim_cancel_cols)])
 
-    out = []
-    for _, r in df.iterrows():
-        row = {"Uçak Tipi": r["ucak_tipi"]}
-        for m in range(1,13):
-            row[f"{AY_ADLARI[m]} - Uçuş Saati"]  = _seconds_to_hhmmss(int(r.get(f"ucus_saniye_{m}", 0)))
-            row[f"{AY_ADLARI[m]} - İptal Edilen"] = _seconds_to_hhmmss(int(r.get(f"iptal_saniye_{m}", 0)))
-        out.append(row)
-    return pd.DataFrame(out)
+def _load_sim_year(conn, genel: str, yil: int) -> pd.DataFrame:
+    """DB’den HH:MM:SS formatında SIM editör tablosu (normal + iptal) oluşturur (kayıt yoksa boş)."""
+    grp = _yil_toplamlari(conn, yil, ana=genel, route=SIM_ROTA)
+    return _long_to_grid(grp, SIM_ETIKETLERI) if not grp.empty else pd.DataFrame()
 # ----------------- MANUEL GİRİŞ MODU -----------------
 
 def tab_meydan_istatistikleri(st, conn_naeron: sqlite3.Connection | None = None):
@@ -358,7 +301,7 @@ def _manuel_giris_ekrani(st):
         return
 
     route = st.selectbox("Düzenlenecek tablo (rota)", routes, index=0)
-    st.caption(f"DB tablo adı: `{_route_table_name(ana, route)}`  •  dosya: `meydan.db`")
+    st.caption(f"DB tablosu: `meydan_aylik` ({ana} • {route})  •  dosya: `meydan.db`")
 
     # Editör kolonları
     saat_cols = [f"{AY_ADLARI[m]} - Uçuş Saati" for m in range(1,13)]
@@ -391,8 +334,8 @@ def _manuel_giris_ekrani(st):
         if loaded is not None and not loaded.empty:
             df_base = loaded.copy()
             # toplam sütunlarını hesapla
-            t_sec  = sum(df_base[c].apply(_time_to_seconds) for c in saat_cols)
-            ti_sec = sum(df_base[c].apply(_time_to_seconds) for c in iptal_cols)
+            t_sec  = sum(_time_to_seconds_seri(df_base[c]) for c in saat_cols)
+            ti_sec = sum(_time_to_seconds_seri(df_base[c]) for c in iptal_cols)
             df_base[yil_toplam_saat]  = t_sec.apply(_seconds_to_hhmmss)
             df_base[yil_toplam_iptal] = ti_sec.apply(_seconds_to_hhmmss)
             st.success("DB’den yüklendi.")
@@ -432,8 +375,8 @@ def _manuel_giris_ekrani(st):
                 edited.loc[i, c] = "00:00"
 
     df_calc = edited.copy()
-    t_sec  = sum(df_calc[c].apply(_time_to_seconds) for c in saat_cols)
-    ti_sec = sum(df_calc[c].apply(_time_to_seconds) for c in iptal_cols)
+    t_sec  = sum(_time_to_seconds_seri(df_calc[c]) for c in saat_cols)
+    ti_sec = sum(_time_to_seconds_seri(df_calc[c]) for c in iptal_cols)
     df_calc[yil_toplam_saat]  = t_sec.apply(_seconds_to_hhmmss)
     df_calc[yil_toplam_iptal] = ti_sec.apply(_seconds_to_hhmmss)
 
@@ -443,16 +386,16 @@ def _manuel_giris_ekrani(st):
         with sqlite3.connect(MEYDAN_DB_PATH) as conn:
             _save_route_year(conn, ana, route, int(yil), pure, saat_cols, iptal_cols)
             conn.commit()
-        st.success(f"Kaydedildi → {MEYDAN_DB_PATH} • {_route_table_name(ana, route)} • {yil}")
+        st.success(f"Kaydedildi → {MEYDAN_DB_PATH} • {ana} • {route} • {yil}")
 
     # Alt toplam satırı ve göster
     total_row = {"Uçak Tipi": "Toplam"}
     for c in saat_cols:
-        total_row[c] = _seconds_to_hhmmss(df_calc[c].apply(_time_to_seconds).sum())
+        total_row[c] = _seconds_to_hhmmss(_time_to_seconds_seri(df_calc[c]).sum())
     for c in iptal_cols:
-        total_row[c] = _seconds_to_hhmmss(df_calc[c].apply(_time_to_seconds).sum())
-    total_row[yil_toplam_saat]  = _seconds_to_hhmmss(sum(df_calc[c].apply(_time_to_seconds).sum() for c in saat_cols))
-    total_row[yil_toplam_iptal] = _seconds_to_hhmmss(sum(df_calc[c].apply(_time_to_seconds).sum() for c in iptal_cols))
+        total_row[c] = _seconds_to_hhmmss(_time_to_seconds_seri(df_calc[c]).sum())
+    total_row[yil_toplam_saat]  = _seconds_to_hhmmss(sum(_time_to_seconds_seri(df_calc[c]).sum() for c in saat_cols))
+    total_row[yil_toplam_iptal] = _seconds_to_hhmmss(sum(_time_to_seconds_seri(df_calc[c]).sum() for c in iptal_cols))
 
     df_show = pd.concat([df_calc, pd.DataFrame([total_row])], ignore_index=True)
     st.markdown("#### 📋 Hesaplanan Toplamlar")
@@ -462,7 +405,7 @@ def _manuel_giris_ekrani(st):
     aylik_saat = []
     for m in range(1,13):
         col = f"{AY_ADLARI[m]} - Uçuş Saati"
-        s = df_calc[col].apply(_time_to_seconds).sum()
+        s = _time_to_seconds_seri(df_calc[col]).sum()
         aylik_saat.append({"Ay": AY_ADLARI[m], "Saat (ondalık)": round(s/3600, 2)})
     st.markdown(f"#### 📊 Aylık Toplam Uçuş Saati — {route} ({yil})")
     st.plotly_chart(px.bar(pd.DataFrame(aylik_saat), x="Ay", y="Saat (ondalık)", text="Saat (ondalık)"),
@@ -471,7 +414,7 @@ def _manuel_giris_ekrani(st):
     aylik_iptal = []
     for m in range(1,13):
         col = f"{AY_ADLARI[m]} - İptal Edilen"
-        s = df_calc[col].apply(_time_to_seconds).sum()
+        s = _time_to_seconds_seri(df_calc[col]).sum()
         aylik_iptal.append({"Ay": AY_ADLARI[m], "İptal Saat (ondalık)": round(s/3600, 2)})
     st.markdown(f"#### 📊 Aylık İptal Saati — {route} ({yil})")
     st.plotly_chart(px.bar(pd.DataFrame(aylik_iptal), x="Ay", y="İptal Saat (ondalık)",
@@ -480,7 +423,7 @@ def _manuel_giris_ekrani(st):
     # Excel indir
     out = df_show.copy()
     for c in (*saat_cols, *iptal_cols):
-        out[c] = out[c].apply(lambda v: _seconds_to_hhmmss(_time_to_seconds(v)) if pd.notna(v) else "00:00:00")
+        out[c] = saniye_formatla(_time_to_seconds_seri(out[c]))
     buf = io.BytesIO()
     with pd.ExcelWriter(buf, engine="xlsxwriter") as writer:
         out.to_excel(writer, sheet_name=f"{_safe_name(route)}_{yil}", index=False)
@@ -525,10 +468,7 @@ def _kayitlari_goruntule(st):
 
     # -- Meta: mevcut Genel/rota listesi --
     with sqlite3.connect(MEYDAN_DB_PATH) as conn:
-        _ensure_meta(conn)
-        meta = pd.read_sql_query(
-            "SELECT ana, route, table_name FROM meydan_meta ORDER BY ana, route", conn
-        )
+        meta = _rotalar(conn)
 
     if meta.empty:
         st.info("Henüz kayıt yok. Önce 'Veri Girişi' sekmesinden kaydedin.")
@@ -536,22 +476,13 @@ def _kayitlari_goruntule(st):
 
     # ---------------- ANA GENEL TOPLAM ----------------
     ana_sel = st.selectbox("Genel isim", sorted(meta["ana"].unique()), key="ana_sel_top")
-    routes_for_ana = meta.loc[meta["ana"] == ana_sel, "route"].tolist()
 
     # Yıl havuzu: ana altındaki TÜM rotaların yılları
-    years_set = set()
     with sqlite3.connect(MEYDAN_DB_PATH) as conn:
-        for r in routes_for_ana:
-            tbl = _route_table_name(ana_sel, r)
-            try:
-                yrs_df = pd.read_sql_query(f"SELECT DISTINCT yil FROM {tbl} ORDER BY yil DESC", conn)
-                if not yrs_df.empty:
-                    years_set.update(yrs_df["yil"].dropna().astype(int).tolist())
-            except Exception:
-                pass
-
-    if years_set:
-        yil_ana = st.selectbox("Yıl (Genel genel toplam)", sorted(years_set, reverse=True), key="ana_yil_sel")
+        years_ana = _yillar(conn, ana=ana_sel, sim_haric=True)
+
+    if years_ana:
+        yil_ana = st.selectbox("Yıl (Genel genel toplam)", years_ana, key="ana_yil_sel")
 
         # Kolon adları
         saat_cols  = [f"{AY_ADLARI[m]} - Uçuş Saati" for m in range(1,13)]
@@ -559,23 +490,11 @@ def _kayitlari_goruntule(st):
         yil_toplam_saat  = f"{yil_ana} Toplamı - Uçuş Saati"
         yil_toplam_iptal = f"{yil_ana} Toplamı - İptal Edilen"
 
-        # Rotalardan verileri topla (saniye bazında)
-        frames = []
+        # Ana altındaki tüm rotaların toplamı (saniye bazında, tek sorgu)
         with sqlite3.connect(MEYDAN_DB_PATH) as conn:
-            for r in routes_for_ana:
-                df_loaded = _load_route_year(conn, ana_sel, r, int(yil_ana))
-                if df_loaded is None or df_loaded.empty:
-                    continue
-                sec_df = pd.DataFrame()
-                sec_df["Uçak Tipi"] = df_loaded["Uçak Tipi"].astype(str)
-                for m in range(1,13):
-                    sec_df[f"u_{m}"] = df_loaded[f"{AY_ADLARI[m]} - Uçuş Saati"].apply(_time_to_seconds)
-                    sec_df[f"i_{m}"] = df_loaded[f"{AY_ADLARI[m]} - İptal Edilen"].apply(_time_to_seconds)
-                frames.append(sec_df)
+            grp = _yil_toplamlari(conn, int(yil_ana), ana=ana_sel, sim_haric=True)
 
-        if frames:
-            sec_all = pd.concat(frames, ignore_index=True)
-            grp = sec_all.groupby("Uçak Tipi", as_index=True).sum(numeric_only=True)
+        if not grp.empty:
 
             # Gösterim DataFrame'i (HH:MM:SS)
             disp = pd.DataFrame({"Uçak Tipi": grp.index})
@@ -681,14 +600,8 @@ def _kayitlari_goruntule(st):
     route_ops = meta.loc[meta["ana"] == ana_sel, "route"].tolist()
     route_sel = st.selectbox("Rota", route_ops, key="route_sel_view")
 
-    tbl = _route_table_name(ana_sel, route_sel)
-    years_route = []
     with sqlite3.connect(MEYDAN_DB_PATH) as conn:
-        try:
-            yrs_df = pd.read_sql_query(f"SELECT DISTINCT yil FROM {tbl} ORDER BY yil DESC", conn)
-            years_route = yrs_df["yil"].astype(int).tolist()
-        except Exception:
-            years_route = []
+        years_route = _yillar(conn, ana=ana_sel, route=route_sel)
 
     if not years_route:
         st.info("Bu rota için kayıt bulunamadı.")
@@ -709,18 +622,18 @@ def _kayitlari_goruntule(st):
     yil_toplam_iptal = f"{yil_sel} Toplamı - İptal Edilen"
 
     df_calc = df_loaded.copy()
-    t_sec  = sum(df_calc[c].apply(_time_to_seconds) for c in saat_cols)
-    ti_sec = sum(df_calc[c].apply(_time_to_seconds) for c in iptal_cols)
+    t_sec  = sum(_time_to_seconds_seri(df_calc[c]) for c in saat_cols)
+    ti_sec = sum(_time_to_seconds_seri(df_calc[c]) for c in iptal_cols)
     df_calc[yil_toplam_saat]  = t_sec.apply(_seconds_to_hhmmss)
     df_calc[yil_toplam_iptal] = ti_sec.apply(_seconds_to_hhmmss)
 
     total_row = {"Uçak Tipi": "Toplam"}
     for c in saat_cols:
-        total_row[c] = _seconds_to_hhmmss(df_calc[c].apply(_time_to_seconds).sum())
+        total_row[c] = _seconds_to_hhmmss(_time_to_seconds_seri(df_calc[c]).sum())
     for c in iptal_cols:
-        total_row[c] = _seconds_to_hhmmss(df_calc[c].apply(_time_to_seconds).sum())
-    total_row[yil_toplam_saat]  = _seconds_to_hhmmss(sum(df_calc[c].apply(_time_to_seconds).sum() for c in saat_cols))
-    total_row[yil_toplam_iptal] = _seconds_to_hhmmss(sum(df_calc[c].apply(_time_to_seconds).sum() for c in iptal_cols))
+        total_row[c] = _seconds_to_hhmmss(_time_to_seconds_seri(df_calc[c]).sum())
+    total_row[yil_toplam_saat]  = _seconds_to_hhmmss(sum(_time_to_seconds_seri(df_calc[c]).sum() for c in saat_cols))
+    total_row[yil_toplam_iptal] = _seconds_to_hhmmss(sum(_time_to_seconds_seri(df_calc[c]).sum() for c in iptal_cols))
 
     df_show = pd.concat([df_calc, pd.DataFrame([total_row])], ignore_index=True)
 
@@ -731,7 +644,7 @@ def _kayitlari_goruntule(st):
     aylik_saat = []
     max_ru = 0
     for m in range(1,13):
-        sec_val = int(df_calc[f"{AY_ADLARI[m]} - Uçuş Saati"].apply(_time_to_seconds).sum())
+        sec_val = int(_time_to_seconds_seri(df_calc[f"{AY_ADLARI[m]} - Uçuş Saati"]).sum())
         max_ru = max(max_ru, sec_val)
         aylik_saat.append({"Ay": AY_ADLARI[m], "Süre (sn)": sec_val, "Süre (HH:MM:SS)": _seconds_to_hhmmss(sec_val)})
     st.markdown(f"#### 📊 Aylık Toplam Uçuş Saati — {route_sel} ({yil_sel})")
@@ -744,7 +657,7 @@ def _kayitlari_goruntule(st):
     aylik_iptal = []
     max_ri = 0
     for m in range(1,13):
-        sec_val = int(df_calc[f"{AY_ADLARI[m]} - İptal Edilen"].apply(_time_to_seconds).sum())
+        sec_val = int(_time_to_seconds_seri(df_calc[f"{AY_ADLARI[m]} - İptal Edilen"]).sum())
         max_ri = max(max_ri, sec_val)
         aylik_iptal.append({"Ay": AY_ADLARI[m], "Süre (sn)": sec_val, "Süre (HH:MM:SS)": _seconds_to_hhmmss(sec_val)})
     st.markdown(f"#### 📊 Aylık İptal Saati — {route_sel} ({yil_sel})")
@@ -789,7 +702,7 @@ def _kayitlari_goruntule(st):
     # Excel indir (rota)
     out = df_show.copy()
     for c in (*saat_cols, *iptal_cols):
-        out[c] = out[c].apply(lambda v: _seconds_to_hhmmss(_time_to_seconds(v)) if pd.notna(v) else "00:00:00")
+        out[c] = saniye_formatla(_time_to_seconds_seri(out[c]))
     buf = io.BytesIO()
     with pd.ExcelWriter(buf, engine="xlsxwriter") as writer:
         out.to_excel(writer, sheet_name=f"{_safe_name(route_sel)}_{yil_sel}", index=False)
@@ -818,7 +731,7 @@ def _sim_veri_girisi(st):
         yil = st.number_input("Yıl", min_value=2020, max_value=2100,
                               value=dt.date.today().year, step=1, key="sim_yil_input")
     with colB:
-        st.caption(f"DB tablo adı: `{_sim_table_name(genel)}`")
+        st.caption(f"DB tablosu: `meydan_aylik` ({genel} • SIM)")
 
     # Kolonlar
     sim_cols       = [f"{AY_ADLARI[m]} - Sim Süresi" for m in range(1,13)]
@@ -849,8 +762,8 @@ def _sim_veri_girisi(st):
             loaded = _load_sim_year(conn, genel, int(yil))
         if loaded is not None and not loaded.empty:
             base = loaded.copy()
-            s_tot  = sum(base[c].apply(_time_to_seconds) for c in sim_cols)
-            si_tot = sum(base[c].apply(_time_to_seconds) for c in sim_cancel_cols)
+            s_tot  = sum(_time_to_seconds_seri(base[c]) for c in sim_cols)
+            si_tot = sum(_time_to_seconds_seri(base[c]) for c in sim_cancel_cols)
             base[yil_toplam_sim]     = s_tot.apply(_seconds_to_hhmmss)
             base[yil_toplam_sim_ipt] = si_tot.apply(_seconds_to_hhmmss)
             st.success("Sim verileri yüklendi.")
@@ -883,8 +796,8 @@ def _sim_veri_girisi(st):
             v = str(row.get(c,"")).strip()
             if v=="" or not DUR_RE.match(v):
                 edit.loc[i,c] = "00:00"
-    s_tot  = sum(edit[c].apply(_time_to_seconds) for c in sim_cols)
-    si_tot = sum(edit[c].apply(_time_to_seconds) for c in sim_cancel_cols)
+    s_tot  = sum(_time_to_seconds_seri(edit[c]) for c in sim_cols)
+    si_tot = sum(_time_to_seconds_seri(edit[c]) for c in sim_cancel_cols)
     edit[yil_toplam_sim]     = s_tot.apply(_seconds_to_hhmmss)
     edit[yil_toplam_sim_ipt] = si_tot.apply(_seconds_to_hhmmss)
 
@@ -894,7 +807,7 @@ def _sim_veri_girisi(st):
         with sqlite3.connect(MEYDAN_DB_PATH) as conn:
             _save_sim_year(conn, genel, int(yil), pure, sim_cols, sim_cancel_cols)
             conn.commit()
-        st.success(f"Sim verileri kaydedildi → `{_sim_table_name(genel)}` • {yil}")
+        st.success(f"Sim verileri kaydedildi → {genel} • SIM • {yil}")
 
     # Göster + grafik
     st.markdown("#### 📋 Sim Toplamları")
@@ -914,8 +827,8 @@ def _sim_veri_girisi(st):
     aylik_s, aylik_si = [], []
     max_s = max_si = 0
     for m in range(1,13):
-        s  = int(edit[sim_cols[m-1]].apply(_time_to_seconds).sum())
-        si = int(edit[sim_cancel_cols[m-1]].apply(_time_to_seconds).sum())
+        s  = int(_time_to_seconds_seri(edit[sim_cols[m-1]]).sum())
+        si = int(_time_to_seconds_seri(edit[sim_cancel_cols[m-1]]).sum())
         max_s  = max(max_s, s);   max_si = max(max_si, si)
         aylik_s.append({"Ay": AY_ADLARI[m], "Süre (sn)": s,  "Süre (HH:MM:SS)": _seconds_to_hhmmss(s)})
         aylik_si.append({"Ay": AY_ADLARI[m], "Süre (sn)": si, "Süre (HH:MM:SS)": _seconds_to_hhmmss(si)})
@@ -935,7 +848,7 @@ def _sim_veri_girisi(st):
     # Excel indir
     out = edit.copy()
     for c in (*sim_cols, *sim_cancel_cols):
-        out[c] = out[c].apply(lambda v: _seconds_to_hhmmss(_time_to_seconds(v)) if pd.notna(v) else "00:00:00")
+        out[c] = saniye_formatla(_time_to_seconds_seri(out[c]))
     buf = io.BytesIO()
     with pd.ExcelWriter(buf, engine="xlsxwriter") as writer:
         out.to_excel(writer, sheet_name=f"{_safe_name(genel)}_{yil}_sim", index=False)
@@ -978,86 +891,19 @@ def _genel_toplam_tum_ana(st):
 
     st.markdown("### 🌐 Genel Toplam — Tüm Genel İsimler")
 
-    # --- Meta & Yıl havuzu ---
+    # --- Yıl havuzu ---
     with sqlite3.connect(MEYDAN_DB_PATH) as conn:
-        _ensure_meta(conn)
-        meta = pd.read_sql_query("SELECT ana, route FROM meydan_meta ORDER BY ana, route", conn)
-        _ensure_meta_sim(conn)
-        meta_sim = pd.read_sql_query(f"SELECT genel, table_name FROM {SIM_META} ORDER BY genel", conn)
-
-        if meta.empty and meta_sim.empty:
-            st.info("Henüz kayıt yok.")
-            return
-
-        years = set()
-        for _, rr in meta.iterrows():
-            tbl = _route_table_name(rr["ana"], rr["route"])
-            try:
-                yrs_df = pd.read_sql_query(f"SELECT DISTINCT yil FROM {tbl} ORDER BY yil DESC", conn)
-                if not yrs_df.empty:
-                    years.update(yrs_df["yil"].dropna().astype(int).tolist())
-            except Exception:
-                pass
-        for _, rr in meta_sim.iterrows():
-            tbl = rr["table_name"]
-            try:
-                yrs_df = pd.read_sql_query(f"SELECT DISTINCT yil FROM {tbl} ORDER BY yil DESC", conn)
-                if not yrs_df.empty:
-                    years.update(yrs_df["yil"].dropna().astype(int).tolist())
-            except Exception:
-                pass
+        years = _yillar(conn)
 
     if not years:
-        st.info("Hiç yıl bulunamadı.")
+        st.info("Henüz kayıt yok.")
         return
 
-    yil_all = st.selectbox("Yıl (Tüm Genel toplam)", sorted(years, reverse=True), key="allgenel_yil")
+    yil_all = st.selectbox("Yıl (Tüm Genel toplam)", years, key="allgenel_yil")
 
-    # --- Rota verileri (u_=uçuş, i_=iptal) ---
-    frames = []
+    # --- Tüm rotalar + SIM tek GROUP BY'da (u_=uçuş + sim, i_=iptal + iptal sim) ---
     with sqlite3.connect(MEYDAN_DB_PATH) as conn:
-        for _, rr in meta.iterrows():
-            df_loaded = _load_route_year(conn, rr["ana"], rr["route"], int(yil_all))
-            if df_loaded is None or df_loaded.empty:
-                continue
-            sec_df = pd.DataFrame()
-            sec_df["Uçak Tipi"] = df_loaded["Uçak Tipi"].astype(str)
-            for m in range(1,13):
-                sec_df[f"u_{m}"] = df_loaded[f"{AY_ADLARI[m]} - Uçuş Saati"].apply(_time_to_seconds)
-                sec_df[f"i_{m}"] = df_loaded[f"{AY_ADLARI[m]} - İptal Edilen"].apply(_time_to_seconds)
-            frames.append(sec_df)
-    grp = (pd.concat(frames, ignore_index=True).groupby("Uçak Tipi", as_index=True).sum(numeric_only=True)
-           if frames else pd.DataFrame())
-
-    # --- SIM verileri (s_=sim, sc_=sim iptal) ---
-    sim_frames = []
-    with sqlite3.connect(MEYDAN_DB_PATH) as conn:
-        for _, rr in meta_sim.iterrows():
-            genel = rr["genel"]
-            df_sim = _load_sim_year(conn, genel, int(yil_all))
-            if df_sim is None or df_sim.empty:
-                continue
-            tmp = pd.DataFrame()
-            tmp["Uçak Tipi"] = df_sim["Uçak Tipi"].astype(str)
-            for m in range(1,13):
-                tmp[f"s_{m}"]  = df_sim[f"{AY_ADLARI[m]} - Sim Süresi"].apply(_time_to_seconds)
-                tmp[f"sc_{m}"] = df_sim[f"{AY_ADLARI[m]} - İptal Sim Süresi"].apply(_time_to_seconds)
-            sim_frames.append(tmp)
-    sim_grp = (pd.concat(sim_frames, ignore_index=True).groupby("Uçak Tipi", as_index=True).sum(numeric_only=True)
-               if sim_frames else pd.DataFrame())
-
-    # --- SIM'i uçuş ve iptal toplamlarına EKLE ---
-    if grp.empty and not sim_grp.empty:
-        grp = sim_grp.rename(columns={f"s_{m}": f"u_{m}" for m in range(1,13)})
-        for m in range(1,13):
-            grp[f"i_{m}"] = sim_grp.get(f"sc_{m}", 0)
-    elif not sim_grp.empty:
-        idx = grp.index.union(sim_grp.index)
-        grp = grp.reindex(idx, fill_value=0)
-        add = sim_grp.reindex(idx).fillna(0)
-        for m in range(1,13):
-            grp[f"u_{m}"] = grp.get(f"u_{m}", 0) + add.get(f"s_{m}", 0)
-            grp[f"i_{m}"] = grp.get(f"i_{m}", 0) + add.get(f"sc_{m}", 0)
+        grp = _yil_toplamlari(conn, int(yil_all))
 
     if grp.empty:
         st.info("Seçilen yıl için veri bulunamadı.")
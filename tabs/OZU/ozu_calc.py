@@ -1,440 +1,12 @@
-# tabs/tab_donem_ogrenci_yonetimi.py
+import json
 import pandas as pd
 import sqlite3
 import re
 import calendar
 import streamlit as st
-from io import StringIO
 from datetime import timedelta
 
-# =========================
-# Yardımcılar – Tarih Ayrıştırma (format-duyarlı)
-# =========================
-
-def _parse_excel_serial(s: str):
-    """Excel seri sayısı -> Timestamp (1899-12-30 bazlı)."""
-    try:
-        days = float(s)
-        base = pd.Timestamp("1899-12-30")
-        return base + pd.to_timedelta(days, unit="D")
-    except Exception:
-        return pd.NaT
-
-def _parse_iso(s: str):
-    """YYYY-MM-DD veya 'YYYY-MM-DD hh:mm[:ss]'"""
-    try:
-        if re.fullmatch(r"\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2})?)?", s):
-            return pd.to_datetime(s[:10], format="%Y-%m-%d", errors="raise")
-    except Exception:
-        pass
-    return pd.NaT
-
-def _parse_tr_dotted(s: str):
-    """GG.AA.YYYY veya 'GG.AA.YYYY hh:mm[:ss]'"""
-    try:
-        if re.fullmatch(r"\d{2}\.\d{2}\.\d{4}( \d{2}:\d{2}(:\d{2})?)?", s):
-            return pd.to_datetime(s[:10], format="%d.%m.%Y", errors="raise")
-    except Exception:
-        pass
-    return pd.NaT
-
-def _parse_slash_heuristic(s: str):
-    """
-    GG/AA/YYYY veya AA/GG/YYYY sezgisel:
-      - 1. parça > 12 ise GG/AA/Y
-      - 2. parça > 12 ise AA/GG/Y
-      - ikisi de ≤ 12 ise TR varsayımı: GG/AA/Y
-    """
-    try:
-        if re.fullmatch(r"\d{1,2}/\d{1,2}/\d{4}( \d{2}:\d{2}(:\d{2})?)?", s):
-            p = s.split()[0].split("/")
-            d1, d2, y = int(p[0]), int(p[1]), int(p[2])
-            if d1 > 12:
-                fmt = "%d/%m/%Y"
-            elif d2 > 12:
-                fmt = "%m/%d/%Y"
-            else:
-                fmt = "%d/%m/%Y"
-            return pd.to_datetime(s.split()[0], format=fmt, errors="raise")
-    except Exception:
-        pass
-    return pd.NaT
-
-def _coerce_datetime_any(series: pd.Series) -> pd.Series:
-    """
-    Biçime göre kesin ayrıştırma:
-    - Excel seri
-    - ISO  (YYYY-MM-DD[*])
-    - TR noktalı (GG.AA.YYYY[*])
-    - Slash (GG/AA/YYYY ya da AA/GG/YYYY sezgisel)
-    - Son çare: dayfirst=True + yearfirst=True
-    """
-    def _parse_one(x):
-        if pd.isna(x):
-            return pd.NaT
-        s = str(x).strip()
-
-        if re.fullmatch(r"\d+(\.\d+)?", s):
-            ts = _parse_excel_serial(s)
-            if ts is not pd.NaT:
-                return ts
-
-        ts = _parse_iso(s)
-        if ts is not pd.NaT:
-            return ts
-
-        ts = _parse_tr_dotted(s)
-        if ts is not pd.NaT:
-            return ts
-
-        ts = _parse_slash_heuristic(s)
-        if ts is not pd.NaT:
-            return ts
-
-        try:
-            return pd.to_datetime(s, errors="raise", dayfirst=True, yearfirst=True)
-        except Exception:
-            return pd.NaT
-
-    return series.apply(_parse_one)
-
-# =========================
-# Yardımcılar – Fark Hesapları
-# =========================
-
-def _diff_months_days(d1: pd.Timestamp, d2: pd.Timestamp) -> str:
-    """
-    İki tarih arasında 'Ay Gün' farkı.
-    Gün negatifse önceki aydan ödünç alınır (ay-1, gün+ay_gün_sayısı).
-    """
-    if pd.isna(d1) or pd.isna(d2):
-        return ""
-    if d2 < d1:
-        d1, d2 = d2, d1
-    y1, m1, day1 = d1.year, d1.month, d1.day
-    y2, m2, day2 = d2.year, d2.month, d2.day
-    months = (y2 - y1) * 12 + (m2 - m1)
-    days = day2 - day1
-    if days < 0:
-        pm_year = y2 if m2 > 1 else y2 - 1
-        pm_month = m2 - 1 if m2 > 1 else 12
-        days_in_prev_month = calendar.monthrange(pm_year, pm_month)[1]
-        months -= 1
-        days = days_in_prev_month + days
-    return f"{months} Ay {days} Gün"
-
-def _days_between(d1: pd.Timestamp, d2: pd.Timestamp) -> str:
-    """İki tarih arası gün sayısı 'n GÜN' (mutlak)."""
-    if pd.isna(d1) or pd.isna(d2):
-        return ""
-    return f"{abs((d2.normalize() - d1.normalize()).days)} GÜN"
-
-# =========================
-# Naeron Sorgu Yardımcıları
-# =========================
-
-def _dates_for(student_name: str, task_code: str, conn_naeron):
-    """
-    Belirli bir görev için tüm 'Uçuş Tarihi 2' değerleri (ISO string list) ve ilk Timestamp.
-    E-1/E-20 listelerini göstermek için kullanılır.
-    """
-    try:
-        rows = pd.read_sql_query(
-            """
-            SELECT "Uçuş Tarihi 2" AS t2
-            FROM naeron_ucuslar
-            WHERE TRIM("Öğrenci Pilot") = TRIM(?)
-              AND UPPER(TRIM("Görev")) = UPPER(TRIM(?))
-            """,
-            conn_naeron, params=(student_name, task_code)
-        )
-    except Exception:
-        return [], pd.NaT
-    if rows.empty:
-        return [], pd.NaT
-    dt = _coerce_datetime_any(rows["t2"]).dropna()
-    if dt.empty:
-        return [], pd.NaT
-    iso_dates = sorted(set(dt.dt.date.astype(str).tolist()))
-    first_dt = dt.min().normalize()
-    return iso_dates, first_dt
-
-def _chain_records_between_e1_and_until(student_name: str, conn_naeron):
-    """
-    Öğrencinin Naeron kayıtlarını kronolojik sıralayıp:
-      - İlk 'E-1' tarihinden başlar,
-      - 'E-20' varsa E-20 dahil orada biter,
-      - 'E-20' yoksa son uçtuğu kayıtta biter.
-    DÖNER: DataFrame [tarih(Timestamp), gorev(str)]
-    """
-    try:
-        dfn = pd.read_sql_query(
-            """
-            SELECT "Görev" AS gorev, "Uçuş Tarihi 2" AS t2
-            FROM naeron_ucuslar
-            WHERE TRIM("Öğrenci Pilot") = TRIM(?)
-            """,
-            conn_naeron, params=(student_name,)
-        )
-    except Exception:
-        return pd.DataFrame(columns=["tarih", "gorev"])
-
-    if dfn.empty:
-        return pd.DataFrame(columns=["tarih", "gorev"])
-
-    dfn["tarih"] = _coerce_datetime_any(dfn["t2"])
-    dfn = dfn.dropna(subset=["tarih"]).sort_values("tarih").reset_index(drop=True)
-
-    # başlangıç: ilk E-1
-    idx_e1 = dfn[dfn["gorev"].str.upper().str.strip() == "E-1"].index
-    if len(idx_e1) == 0:
-        return pd.DataFrame(columns=["tarih", "gorev"])  # E-1 hiç yoksa zincir üretilmez
-    start = idx_e1[0]
-
-    # bitiş: ilk E-20 veya son kayıt
-    idx_e20 = dfn[dfn["gorev"].str.upper().str.strip() == "E-20"].index
-    end = idx_e20[0] if len(idx_e20) > 0 else len(dfn) - 1
-
-    chain = dfn.loc[start:end, ["tarih", "gorev"]].reset_index(drop=True)
-    return chain
-
-# =========================
-# Ana Sekme
-# =========================
-
-def tab_donem_ogrenci_liste_e1_e20_exact_per_student_with_diff(
-    st,
-    conn_ucus: sqlite3.Connection,
-    naeron_path: str = "naeron_kayitlari.db"
-):
-    st.subheader("📚 Dönem & Öğrenci Listesi (E-1 / E-20 — Uçuş Tarihi 2, fark Ay-Gün)")
-
-    # --- ucus_planlari: dönem & öğrenci ---
-    try:
-        df = pd.read_sql_query(
-            """
-            SELECT DISTINCT donem, ogrenci
-            FROM ucus_planlari
-            WHERE donem IS NOT NULL AND ogrenci IS NOT NULL
-            ORDER BY donem, ogrenci
-            """,
-            conn_ucus
-        )
-    except Exception as e:
-        st.error(f"Veri okunamadı: {e}")
-        return
-
-    if df.empty:
-        st.warning("Henüz veri yok.")
-        return
-
-    # Dönem filtresi
-    tum_donemler = sorted(df["donem"].dropna().unique().tolist())
-    secilen = st.selectbox("Dönem Seç (Görüntüleme)", options=["Tüm Dönemler"] + tum_donemler)
-    df_goster = df.copy() if secilen == "Tüm Dönemler" else df[df["donem"] == secilen].copy()
-
-    # Naeron bağlantısı
-    try:
-        conn_naeron = sqlite3.connect(naeron_path)
-    except Exception as e:
-        st.error(f"Naeron açılamadı: {e}")
-        return
-
-    out = df_goster.copy()
-    e1_lists, e20_lists, diffs = [], [], []
-    chain_tables = []   # (ogrenci, df_row)
-
-    progress = st.progress(0)
-    total = len(out)
-
-    for i, name in enumerate(out["ogrenci"]):
-        # E-1 / E-20 listeleri ve fark (Ay-Gün)
-        e1_all, e1_first = _dates_for(name, "E-1", conn_naeron)
-        e20_all, e20_first = _dates_for(name, "E-20", conn_naeron)
-
-        e1_lists.append("; ".join(e1_all))
-        e20_lists.append("; ".join(e20_all))
-        diffs.append(_diff_months_days(e1_first, e20_first))
-
-        # --- Dinamik GÖREV ZİNCİRİ (E-1 → E-20, yoksa son uçuşa kadar) ---
-        chain = _chain_records_between_e1_and_until(name, conn_naeron)
-        if chain.empty:
-            chain_tables.append((name, pd.DataFrame([[]])))
-        else:
-            cols = []
-            data = []
-            # Görev ve aralar için dinamik kolonlar
-            for k in range(len(chain)):
-                gk = str(chain.loc[k, "gorev"]).strip()
-                tk = chain.loc[k, "tarih"]
-                cols.append(f"{k+1:02d}. {gk}")
-                data.append("" if pd.isna(tk) else str(tk.date()))
-                # Ara (k ile k+1 arası)
-                if k < len(chain) - 1:
-                    gn = str(chain.loc[k+1, "gorev"]).strip()
-                    tn = chain.loc[k+1, "tarih"]
-                    cols.append(f"ARA {k+1:02d} ({gk}→{gn})")
-                    data.append(_days_between(tk, tn) if (pd.notna(tk) and pd.notna(tn)) else "")
-
-            df_row = pd.DataFrame([data], columns=cols)
-            chain_tables.append((name, df_row))
-
-        if total > 0:
-            progress.progress((i + 1) / total)
-
-    try:
-        conn_naeron.close()
-    except Exception:
-        pass
-
-    out["E-1 Tarihleri"] = e1_lists
-    out["E-20 Tarihleri"] = e20_lists
-    out["E-1 → E-20 Farkı (Ay-Gün)"] = diffs
-
-    # Metrikler
-    c1, c2, c3 = st.columns(3)
-    with c1:
-        st.metric("Toplam Öğrenci", len(out))
-    with c2:
-        st.metric("E-1 bulunan", sum(out["E-1 Tarihleri"].astype(str).str.len() > 0))
-    with c3:
-        st.metric("E-20 bulunan", sum(out["E-20 Tarihleri"].astype(str).str.len() > 0))
-
-    # Üst tablo
-    st.markdown("### Mevcut Dönem ve Öğrenciler")
-    view_cols = ["donem", "ogrenci", "E-1 Tarihleri", "E-20 Tarihleri", "E-1 → E-20 Farkı (Ay-Gün)"]
-    st.dataframe(out[view_cols], use_container_width=True)
-
-    # CSV (üst özet)
-    csv_buf = StringIO()
-    out[view_cols].to_csv(csv_buf, index=False, encoding="utf-8")
-    st.download_button(
-        "📥 CSV indir (Özet)",
-        data=csv_buf.getvalue().encode("utf-8"),
-        file_name="donem_ogrenci_e1_e20_ozet.csv",
-        mime="text/csv"
-    )
-
-    # Alt: Dinamik görev zinciri tabloları
-    st.markdown("---")
-    st.markdown("## 🔗 E-1 → E-20 Arası Dinamik Görev Zinciri (Naeron kayıtlarından)")
-    st.caption("Kolonlar görev isimleriyle dinamiktir. E-20 yoksa son uçulan görevde biter. ARA hücrelerinde iki görev arası gün yazılır.")
-
-    # Toplu zincir çıktısı için biriktir
-    merged_for_export = []
-
-    for name, df_row in chain_tables:
-        with st.expander(f"👤 {name} — Görev zinciri"):
-            if df_row.shape[1] == 0:
-                st.info("Bu öğrenci için E-1 bulunamadı ya da zincir üretilemedi.")
-            else:
-                st.dataframe(df_row, use_container_width=True)
-                # dışa aktarım için öğrenci adıyla genişlet
-                tmp = df_row.copy()
-                tmp.insert(0, "ogrenci", name)
-                merged_for_export.append(tmp)
-
-    # =========================
-    # TEK EXCEL: Her öğrenci için ayrı sayfa (özet + görev zinciri)
-    # =========================
-    import io
-    import re
-
-    st.markdown("---")
-    st.markdown("## 📗 Tek Excel: Her Öğrenci Ayrı Sayfa (Özet + Görev Zinciri)")
-
-    # Özet sütunları
-    _summary_cols = ["donem", "ogrenci", "E-1 Tarihleri", "E-20 Tarihleri", "E-1 → E-20 Farkı (Ay-Gün)"]
-
-    # Excel sheet adı için güvenli dönüştürücü (maks 31, yasak karakterler: : \ / ? * [ ])
-    def _safe_sheet_name(name: str) -> str:
-        name = str(name or "").strip()
-        name = re.sub(r'[:\\/\?\*\[\]]+', "_", name)   # yasak karakterleri alt çizgi yap
-        name = name[:31] if len(name) > 31 else name   # 31 karakter sınırı
-        return name or "Sayfa"
-
-    # Aynı sheet adı çakışırsa sayac ekle
-    def _unique_sheet_name(base: str, used: set) -> str:
-        n = 1
-        cand = base
-        while cand in used:
-            suffix = f"_{n}"
-            # 31 sınırı içinde kalsın diye kes
-            cand = (base[: max(0, 31 - len(suffix))] + suffix)[:31]
-            n += 1
-        used.add(cand)
-        return cand
-
-    # Tüm öğrenciler için tek dosya
-    buf_xlsx_all = io.BytesIO()
-    with pd.ExcelWriter(buf_xlsx_all, engine="xlsxwriter") as writer:
-        used_names = set()
-
-        index_rows = []  # "Dizin" sayfası için (öğrenci -> sheet adı)
-        for i, (ogrenci_adi, df_chain_row) in enumerate(chain_tables):
-            # out ile aynı sırada üretildiği için dönem bilgisini out.iloc[i] üzerinden alabiliriz
-            try:
-                donem_i = out.iloc[i]["donem"]
-            except Exception:
-                donem_i = ""
-
-            # --- ÖĞRENCİ ÖZETİ (tek satır) ---
-            try:
-                row_summary = out.iloc[i][_summary_cols]
-            except Exception:
-                # güvenli fallback (eğer indeks kayarsa, ogrenci adına göre ara)
-                tmp = out[out["ogrenci"].astype(str).str.strip() == str(ogrenci_adi).strip()]
-                row_summary = tmp.iloc[0][_summary_cols] if not tmp.empty else pd.Series(
-                    {"donem": donem_i, "ogrenci": ogrenci_adi, "E-1 Tarihleri": "", "E-20 Tarihleri": "", "E-1 → E-20 Farkı (Ay-Gün)": ""}
-                )
-            df_summary = pd.DataFrame([row_summary.values], columns=_summary_cols)
-
-            # --- SHEET ADI ---
-            base_sheet = _safe_sheet_name(f"{ogrenci_adi}")
-            sheet_name = _unique_sheet_name(base_sheet, used_names)
-            index_rows.append({"Dönem": donem_i, "Öğrenci": ogrenci_adi, "Sayfa": sheet_name})
-
-            # --- YAZ: önce özet, sonra görev zinciri tabloları ---
-            startrow = 0
-            df_summary.to_excel(writer, sheet_name=sheet_name, index=False, startrow=startrow)
-            startrow += len(df_summary) + 2  # iki satır boşluk
-
-            if df_chain_row is not None and df_chain_row.shape[1] > 0:
-                df_chain_row.to_excel(writer, sheet_name=sheet_name, index=False, startrow=startrow)
-                # sütun genişliklerini kabaca ayarla
-                ws = writer.sheets[sheet_name]
-                # özet bölümünü kapsayan sütun genişliği
-                ws.set_column(0, max(len(_summary_cols)-1, 0), 22)
-                # zincir sütunları epey geniş olabilir:
-                ws.set_column(0, max(df_chain_row.shape[1]-1, 0), 18)
-            else:
-                ws = writer.sheets[sheet_name]
-                ws.write(startrow, 0, "Bu öğrenci için görev zinciri bulunamadı.")
-
-        # --- Dizin sayfası (öğrenci -> sheet adı) ---
-        if index_rows:
-            df_index = pd.DataFrame(index_rows, columns=["Dönem", "Öğrenci", "Sayfa"])
-            df_index.to_excel(writer, sheet_name="Dizin", index=False)
-            # biraz genişlik
-            ws_idx = writer.sheets["Dizin"]
-            ws_idx.set_column(0, 0, 16)
-            ws_idx.set_column(1, 1, 28)
-            ws_idx.set_column(2, 2, 20)
-
-    # İndirme butonu
-    st.download_button(
-        "📥 Tek Excel (her öğrenci ayrı sayfa)",
-        data=buf_xlsx_all.getvalue(),
-        file_name="ogrenciler_tek_dosya_ayri_sayfa.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
-# tabs/tab_donem_ogrenci_yonetimi.py
-import pandas as pd
-import sqlite3
-import re
-import calendar
-import streamlit as st
-from datetime import timedelta
+from tabs.utils.tarih_utils import tarih_normalize
 
 # =========================
 # Yardımcılar – Görev Adı Normalize
@@ -457,92 +29,9 @@ def _norm_task_label(s: str) -> str:
 # =========================
 # Yardımcılar – Tarih Ayrıştırma
 # =========================
-def _parse_excel_serial(s: str):
-    """Excel seri sayısı -> Timestamp (1899-12-30 bazlı)."""
-    try:
-        days = float(s)
-        base = pd.Timestamp("1899-12-30")
-        return base + pd.to_timedelta(days, unit="D")
-    except Exception:
-        return pd.NaT
-
-def _parse_iso(s: str):
-    """YYYY-MM-DD veya 'YYYY-MM-DD hh:mm[:ss]'"""
-    try:
-        if re.fullmatch(r"\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2})?)?", s):
-            return pd.to_datetime(s[:10], format="%Y-%m-%d", errors="raise")
-    except Exception:
-        pass
-    return pd.NaT
-
-def _parse_tr_dotted(s: str):
-    """GG.AA.YYYY veya 'GG.AA.YYYY hh:mm[:ss]'"""
-    try:
-        if re.fullmatch(r"\d{2}\.\d{2}\.\d{4}( \d{2}:\d{2}(:\d{2})?)?", s):
-            return pd.to_datetime(s[:10], format="%d.%m.%Y", errors="raise")
-    except Exception:
-        pass
-    return pd.NaT
-
-def _parse_slash_heuristic(s: str):
-    """
-    GG/AA/YYYY veya AA/GG/YYYY sezgisel:
-      - 1. parça > 12 ise GG/AA/Y
-      - 2. parça > 12 ise AA/GG/Y
-      - ikisi de ≤ 12 ise TR varsayımı: GG/AA/Y
-    """
-    try:
-        if re.fullmatch(r"\d{1,2}/\d{1,2}/\d{4}( \d{2}:\d{2}(:\d{2})?)?", s):
-            p = s.split()[0].split("/")
-            d1, d2, y = int(p[0]), int(p[1]), int(p[2])
-            if d1 > 12:
-                fmt = "%d/%m/%Y"
-            elif d2 > 12:
-                fmt = "%m/%d/%Y"
-            else:
-                fmt = "%d/%m/%Y"
-            return pd.to_datetime(s.split()[0], format=fmt, errors="raise")
-    except Exception:
-        pass
-    return pd.NaT
-
 def _coerce_datetime_any(series: pd.Series) -> pd.Series:
-    """
-    Biçime göre kesin ayrıştırma:
-    - Excel seri
-    - ISO  (YYYY-MM-DD[*])
-    - TR noktalı (GG.AA.YYYY[*])
-    - Slash (GG/AA/YYYY ya da AA/GG/YYYY sezgisel)
-    - Son çare: dayfirst=True + yearfirst=True
-    """
-    def _parse_one(x):
-        if pd.isna(x):
-            return pd.NaT
-        s = str(x).strip()
-
-        if re.fullmatch(r"\d+(\.\d+)?", s):
-            ts = _parse_excel_serial(s)
-            if ts is not pd.NaT:
-                return ts
-
-        ts = _parse_iso(s)
-        if ts is not pd.NaT:
-            return ts
-
-        ts = _parse_tr_dotted(s)
-        if ts is not pd.NaT:
-            return ts
-
-        ts = _parse_slash_heuristic(s)
-        if ts is not pd.NaT:
-            return ts
-
-        try:
-            return pd.to_datetime(s, errors="raise", dayfirst=True, yearfirst=True)
-        except Exception:
-            return pd.NaT
-
-    return series.apply(_parse_one)
+    """Biçime duyarlı toplu ayrıştırma (Excel seri / ISO / GG.AA.YYYY / eğik çizgi / son çare) — bkz. tarih_normalize."""
+    return tarih_normalize(series)
 
 # =========================
 # Yardımcılar – Fark Hesapları
@@ -575,82 +64,107 @@ def _days_between(d1: pd.Timestamp, d2: pd.Timestamp) -> str:
     return f"{abs((d2.normalize() - d1.normalize()).days)} GÜN"
 
 # =========================
-# Naeron Sorgu Yardımcıları
+# Toplu (dönem) hesaplama
 # =========================
-def _dates_for(student_name: str, task_code: str, conn_naeron):
+def _diff_months_days_seri(d1: pd.Series, d2: pd.Series) -> pd.Series:
+    """_diff_months_days'in vektörel hali (aynı ödünç alma kuralı); eksik tarih → ""."""
+    d1 = pd.to_datetime(d1, errors="coerce")
+    d2 = pd.to_datetime(d2, errors="coerce")
+    ters = d2 < d1
+    a, b = d1.where(~ters, d2), d2.where(~ters, d1)
+    ay = (b.dt.year - a.dt.year) * 12 + (b.dt.month - a.dt.month)
+    gun = b.dt.day - a.dt.day
+    onceki_ay_gun = (b.dt.to_period("M") - 1).dt.days_in_month
+    negatif = gun < 0
+    ay = ay - negatif.astype(int)
+    gun = gun.where(~negatif, gun + onceki_ay_gun)
+    sonuc = ay.astype("Int64").astype(str) + " Ay " + gun.astype("Int64").astype(str) + " Gün"
+    return sonuc.where(a.notna() & b.notna(), "")
+
+
+def _naeron_kayitlari_toplu(student_names, conn_naeron) -> pd.DataFrame:
     """
-    Belirli görev için tüm 'Uçuş Tarihi 2' değerleri (ISO string list) ve ilk Timestamp.
-    Görev adı önce normalize edilir (E – 20, E20, E 20 vb. -> E-20).
-    """
-    try:
-        rows = pd.read_sql_query(
-            """
-            SELECT "Görev" AS gorev, "Uçuş Tarihi 2" AS t2
-            FROM naeron_ucuslar
-            WHERE TRIM("Öğrenci Pilot") = TRIM(?)
-            """,
-            conn_naeron, params=(student_name,)
-        )
-    except Exception:
-        return [], pd.NaT
-
-    if rows.empty:
-        return [], pd.NaT
-
-    rows["gorev_norm"] = rows["gorev"].map(_norm_task_label)
-    target = _norm_task_label(task_code)
-    rows = rows[rows["gorev_norm"] == target]
-
-    if rows.empty:
-        return [], pd.NaT
-
-    dt = _coerce_datetime_any(rows["t2"]).dropna()
-    if dt.empty:
-        return [], pd.NaT
-
-    iso_dates = sorted(set(dt.dt.date.astype(str).tolist()))
-    first_dt = dt.min().normalize()
-    return iso_dates, first_dt
-
-def _chain_records_between_e1_and_until(student_name: str, conn_naeron):
-    """
-    Öğrencinin Naeron kayıtlarını kronolojik sıralayıp:
-      - İlk 'E-1' tarihinden başlar,
-      - 'E-20' varsa E-20 dahil orada biter,
-      - 'E-20' yoksa son uçtuğu kayıtta biter.
-    DÖNER: DataFrame [tarih(Timestamp), gorev(str)]
+    Öğrencilerin tüm Naeron kayıtları tek sorguda (TRIM("Öğrenci Pilot") ifade indeksinden).
+    DÖNER: [anahtar (TRIM'lenmiş pilot), gorev, tarih, gorev_norm] — kayıt (rowid) sırasıyla.
     """
+    bos = pd.DataFrame(columns=["anahtar", "gorev", "tarih", "gorev_norm"])
+    adlar = sorted({str(a) for a in student_names if pd.notna(a)})
+    if not adlar:
+        return bos
     try:
         dfn = pd.read_sql_query(
             """
-            SELECT "Görev" AS gorev, "Uçuş Tarihi 2" AS t2
+            SELECT TRIM("Öğrenci Pilot") AS anahtar, "Görev" AS gorev, "Uçuş Tarihi 2" AS t2
             FROM naeron_ucuslar
-            WHERE TRIM("Öğrenci Pilot") = TRIM(?)
+            WHERE TRIM("Öğrenci Pilot") IN (SELECT TRIM(value) FROM json_each(?))
+            ORDER BY rowid
             """,
-            conn_naeron, params=(student_name,)
+            conn_naeron, params=(json.dumps(adlar),)
         )
     except Exception:
-        return pd.DataFrame(columns=["tarih", "gorev"])
-
+        return bos
     if dfn.empty:
-        return pd.DataFrame(columns=["tarih", "gorev"])
+        return bos
 
     dfn["tarih"] = _coerce_datetime_any(dfn["t2"])
-    dfn = dfn.dropna(subset=["tarih"]).sort_values("tarih").reset_index(drop=True)
     dfn["gorev_norm"] = dfn["gorev"].map(_norm_task_label)
+    return dfn.drop(columns="t2")
 
-    # başlangıç: ilk E-1
-    idx_e1 = dfn[dfn["gorev_norm"] == "E-1"].index
-    if len(idx_e1) == 0:
-        return pd.DataFrame(columns=["tarih", "gorev"])
-    start = idx_e1[0]
 
-    # bitiş: ilk E-20 veya son kayıt
-    idx_e20 = dfn[dfn["gorev_norm"] == "E-20"].index
-    end = idx_e20[0] if len(idx_e20) > 0 else len(dfn) - 1
+def _e1_e20_toplu(student_names, conn_naeron) -> pd.DataFrame:
+    """
+    Tüm öğrenciler için tek sorgu ve groupby ile: E-1 / E-20 uçuş günleri (normalize görev adına göre),
+    ilk E-1 ile ilk E-20 arası fark ve ilk E-1'den ilk E-20'ye (yoksa son kayda) uçuş zinciri.
+    İndeks: TRIM'lenmiş öğrenci adı.
+    Kolonlar: e1_liste, e20_liste, fark, zincir (dinamik görev/ARA kolonlu tek satırlık DataFrame).
+    """
+    dfn = _naeron_kayitlari_toplu(student_names, conn_naeron)
+    dfn = dfn.dropna(subset=["tarih"])
+    sonuc = pd.DataFrame(index=pd.Index(dfn["anahtar"].unique(), name="anahtar"))
+
+    # E-1 / E-20: benzersiz gün listeleri ve ilk tarih
+    ilkler = {}
+    for hedef, kol in (("E-1", "e1_liste"), ("E-20", "e20_liste")):
+        sec = dfn[dfn["gorev_norm"] == hedef]
+        gunler = (
+            sec.assign(gun=sec["tarih"].dt.date.astype(str))
+            .drop_duplicates(["anahtar", "gun"])
+            .sort_values(["anahtar", "gun"])
+            .groupby("anahtar")["gun"].agg("; ".join)
+        )
+        sonuc[kol] = gunler.reindex(sonuc.index).fillna("")
+        ilkler[hedef] = sec.groupby("anahtar")["tarih"].min().dt.normalize().reindex(sonuc.index)
+    sonuc["fark"] = _diff_months_days_seri(ilkler["E-1"], ilkler["E-20"])
+
+    # Zincir: kronolojik sıra (aynı anda olanlar kayıt sırasıyla), ilk E-1'den ilk E-20'ye / son kayda
+    z = dfn.sort_values(["anahtar", "tarih"], kind="mergesort")
+    z["sira"] = z.groupby("anahtar").cumcount()
+    bas = z["anahtar"].map(z[z["gorev_norm"] == "E-1"].groupby("anahtar")["sira"].min())
+    bit = z["anahtar"].map(z[z["gorev_norm"] == "E-20"].groupby("anahtar")["sira"].min())
+    bit = bit.fillna(z["anahtar"].map(z.groupby("anahtar")["sira"].max()))
+    z = z[bas.notna() & (z["sira"] >= bas) & (z["sira"] <= bit)].copy()
+
+    g = z.groupby("anahtar", sort=False)
+    z["k"] = g.cumcount()
+    z["gk"] = z["gorev"].astype(str).str.strip()
+    z["gn"] = g["gk"].shift(-1)
+    z["tarih_str"] = z["tarih"].dt.date.astype(str)
+    gun = z["tarih"].dt.normalize()
+    z["ara"] = (g["tarih"].shift(-1).dt.normalize() - gun).abs().dt.days
+
+    zincirler = {}
+    for anahtar, grp in z.groupby("anahtar", sort=False):
+        cols, data = [], []
+        for r in grp.itertuples(index=False):
+            cols.append(f"{r.k + 1:02d}. {r.gk}")
+            data.append(r.tarih_str)
+            if pd.notna(r.gn):
+                cols.append(f"ARA {r.k + 1:02d} ({r.gk}→{r.gn})")
+                data.append(f"{int(r.ara)} GÜN")
+        zincirler[anahtar] = pd.DataFrame([data], columns=cols)
+    sonuc["zincir"] = pd.Series(zincirler, dtype=object).reindex(sonuc.index)
+    return sonuc
 
-    chain = dfn.loc[start:end, ["tarih", "gorev"]].reset_index(drop=True)
-    return chain
 
 # =========================
 # Ana Sekme
@@ -694,45 +208,25 @@ def tab_donem_ogrenci_liste_e1_e20_exact_per_student_with_diff(
         return
 
     out = df_goster.copy()
+
+    # Tüm öğrenciler tek sorgu + groupby (öğrenci başına sorgu yerine)
+    toplu = _e1_e20_toplu(out["ogrenci"], conn_naeron)
     e1_lists, e20_lists, diffs = [], [], []
     chain_tables = []   # (ogrenci, df_row)
-
-    progress = st.progress(0)
-    total = len(out)
-
-    for i, name in enumerate(out["ogrenci"]):
-        # E-1 / E-20 listeleri ve fark (Ay-Gün)
-        e1_all, e1_first = _dates_for(name, "E-1", conn_naeron)
-        e20_all, e20_first = _dates_for(name, "E-20", conn_naeron)
-
-        e1_lists.append("; ".join(e1_all))
-        e20_lists.append("; ".join(e20_all))
-        diffs.append(_diff_months_days(e1_first, e20_first))
-
-        # --- Dinamik GÖREV ZİNCİRİ (E-1 → E-20, yoksa son uçuşa kadar) ---
-        chain = _chain_records_between_e1_and_until(name, conn_naeron)
-        if chain.empty:
-            chain_tables.append((name, pd.DataFrame([[]])))
+    for name in out["ogrenci"]:
+        anahtar = str(name).strip(" ")
+        if anahtar in toplu.index:
+            kayit = toplu.loc[anahtar]
+            e1_lists.append(kayit["e1_liste"])
+            e20_lists.append(kayit["e20_liste"])
+            diffs.append(kayit["fark"])
+            df_row = kayit["zincir"]
         else:
-            cols = []
-            data = []
-            for k in range(len(chain)):
-                gk = str(chain.loc[k, "gorev"]).strip()
-                tk = chain.loc[k, "tarih"]
-                cols.append(f"{k+1:02d}. {gk}")
-                data.append("" if pd.isna(tk) else str(tk.date()))
-                # Ara (k ile k+1 arası)
-                if k < len(chain) - 1:
-                    gn = str(chain.loc[k+1, "gorev"]).strip()
-                    tn = chain.loc[k+1, "tarih"]
-                    cols.append(f"ARA {k+1:02d} ({gk}→{gn})")
-                    data.append(_days_between(tk, tn) if (pd.notna(tk) and pd.notna(tn)) else "")
-
-            df_row = pd.DataFrame([data], columns=cols)
-            chain_tables.append((name, df_row))
-
-        if total > 0:
-            progress.progress((i + 1) / total)
+            e1_lists.append("")
+            e20_lists.append("")
+            diffs.append("")
+            df_row = None
+        chain_tables.append((name, df_row if isinstance(df_row, pd.DataFrame) else pd.DataFrame([[]])))
 
     try:
         conn_naeron.close()
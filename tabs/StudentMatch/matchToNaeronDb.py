@@ -7,26 +7,13 @@ from collections import deque
 import re
 import io
 
+from tabs.utils.sure_utils import saat_formatla, saat_tek, sure_saat
+from tabs.utils.veri_deposu import naeron_ogrenci_oku, plan_oku
+
 
 def plan_naeron_eslestirme(st, conn):
 
     
-    def ogrenci_kodu_ayikla(ogrenci):
-        if pd.isna(ogrenci):
-            return ""
-
-        ogrenci = ogrenci.strip()
-
-        if ogrenci.startswith("OZ"):
-
-            return ogrenci
-        else:
-            # Normal öğrencilerde "-" öncesini al
-            return ogrenci.split("-")[0].strip()
-        
-
-
-
     st.subheader("📊 Plan - Gerçekleşme Özeti")
     st.markdown("""
         **Durum Açıklamaları:**
@@ -44,16 +31,12 @@ def plan_naeron_eslestirme(st, conn):
         - ✨ SIF TAMAMLANDI: SIF 1–14 görevleri tamamlanmış.
         """)
     # Plan verisini çek
-    df = pd.read_sql_query("SELECT * FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
+    df = plan_oku(conn)
     if df.empty:
         st.warning("Veri bulunamadı.")
         return
 
-    # Öğrenci kodu
-    #print("Öğrenci kodları:", df["ogrenci"].dropna().unique().tolist())
-    
-    df["ogrenci_kodu"] = df["ogrenci"].apply(ogrenci_kodu_ayikla)
-
+    # Öğrenci kodu veri deposunda hazır gelir (ogrenci_kodu)
     secilen_kod = st.selectbox(
         "Öğrenci kodunu seçin",
         df["ogrenci_kodu"].dropna().unique().tolist(),
@@ -64,57 +47,9 @@ def plan_naeron_eslestirme(st, conn):
 
     # Naeron verisini çek
     try:
-        conn_naeron = sqlite3.connect("naeron_kayitlari.db")
-        df_naeron_raw = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn_naeron)
-        conn_naeron.close()
-
-        # MCC çoklu öğrenci ayrıştırma fonksiyonu
-        # --- MCC Çoklu Öğrenci Ayrıştırma (Long Format) ---
-        def mcc_coklu_ogrenci(df_naeron):
-            mask = df_naeron["Görev"].astype(str).str.upper().str.startswith("MCC")
-            df_mcc = df_naeron[mask].copy()
-            def extract_ogrenciler(pilot_str):
-                return re.findall(r"\d{3}[A-Z]{2}", str(pilot_str).upper())
-
-            rows = []
-            for _, row in df_mcc.iterrows():
-                kodlar = extract_ogrenciler(row["Öğrenci Pilot"])
-                for kod in kodlar:
-                    new_row = row.copy()
-                    new_row["ogrenci_kodu"] = kod
-                    rows.append(new_row)
-            return pd.DataFrame(rows)
-
-        df_naeron_mcc = mcc_coklu_ogrenci(df_naeron_raw)
-        # Tek öğrenci görev kodu ayrıştırma
-        def naeron_ogrenci_kodu_ayikla(pilot):
-            if pd.isna(pilot):
-                return ""
-            pilot = pilot.strip()
-            if pilot.startswith("OZ"):
-                if pilot.count("-") >= 2:
-                    
-                    ikinci_tire_index = [i for i, c in enumerate(pilot) if c == "-"][1]
-                    # O index'ten itibaren olan her şeyi sil (ikinci '-' dahil)
-                    pilot = pilot[:ikinci_tire_index].rstrip()
-                    #print("Uyarı: İkinci tire bulunamadı, tüm metni alındı:", pilot)
-                return pilot
-            
-            else:
-                return pilot.split("-")[0].strip()
-        # Tek öğrenci görevleri
-        mask_mcc = df_naeron_raw["Görev"].astype(str).str.upper().str.startswith("MCC")
-        df_naeron_other = df_naeron_raw[~mask_mcc].copy()
-
-
-        
-        df_naeron_other["ogrenci_kodu"] = df_naeron_other["Öğrenci Pilot"].apply(naeron_ogrenci_kodu_ayikla)
-        # df_naeron_other["ogrenci_kodu"] = (
-        #     df_naeron_other["Öğrenci Pilot"].str.split("-").str[0].str.strip()
-        # )
-
-        # Birleştir ve tüm veride long format
-        df_naeron_all = pd.concat([df_naeron_mcc, df_naeron_other], ignore_index=True)
+        # MCC çoklu öğrenci satırları öğrenci bazında açılmış (long format) halde gelir;
+        # diğer satırların ogrenci_kodu veri deposunda hazır
+        df_naeron_all = naeron_ogrenci_oku("naeron_kayitlari.db")
 
         # Görev isimleri normalize etme fonksiyonu
         def normalize_task(name):
@@ -133,25 +68,6 @@ def plan_naeron_eslestirme(st, conn):
         df_naeron = df_naeron_all[df_naeron_all["ogrenci_kodu"] == secilen_kod].copy()
 
         # Yardımcı dönüştürücüler
-        def to_saat(sure_str):
-            try:
-                if pd.isna(sure_str) or sure_str == "":
-                    return 0
-                parts = [int(p) for p in sure_str.split(":")]
-                # saat + dakika/60 + saniye/3600
-                return parts[0] + parts[1]/60 + (parts[2] if len(parts)>2 else 0)/3600
-            except:
-                return 0
-
-        def format_sure(hours_float):
-            """Ondalık saat → 'HH:MM' formatına dönüştürür."""
-            neg = hours_float < 0
-            h_abs = abs(hours_float)
-            h = int(h_abs)
-            m = int(round((h_abs - h) * 60))
-            sign = "-" if neg else ""
-            return f"{sign}{h:02}:{m:02}"
-
         # Görev isimlerini gruplandır burayı PIC kımı için farklı yapman gerekiyor.
 
                     # --- PIC görevleri için eşleştirme fonksiyonları ---
@@ -174,7 +90,7 @@ def plan_naeron_eslestirme(st, conn):
             for i, plan_i in enumerate(plan_pic_idx):
                 if i < len(naeron_pic):
                     # i’inci uçuşun Block Time’ını ata
-                    df_plan.at[plan_i, "gerceklesen_saat_ondalik"] = to_saat(
+                    df_plan.at[plan_i, "gerceklesen_saat_ondalik"] = saat_tek(
                         naeron_pic.at[i, "Block Time"]
                     )
                 else:
@@ -197,10 +113,8 @@ def plan_naeron_eslestirme(st, conn):
                 if not df_naeron_fam.empty:
                     if "Uu Tarihi 2" in df_naeron_fam.columns:
                         df_naeron_fam = df_naeron_fam.sort_values("Uu Tarihi 2")
-                    fam_segments = deque(
-                        h for h in (to_saat(bt) for bt in df_naeron_fam["Block Time"].fillna("00:00"))
-                        if h > 0
-                    )
+                    fam_saat = sure_saat(df_naeron_fam["Block Time"].fillna("00:00"))
+                    fam_segments = deque(fam_saat[fam_saat > 0].tolist())
 
                 def allocate_hours(requested):
                     allocated = 0.0
@@ -226,7 +140,7 @@ def plan_naeron_eslestirme(st, conn):
 
             def match(gorev):
                 eslesme = df_naeron[df_naeron["Görev"] == gorev]
-                return eslesme["Block Time"].apply(to_saat).sum() if not eslesme.empty else 0
+                return sure_saat(eslesme["Block Time"]).sum() if not eslesme.empty else 0
 
             df_plan.loc[regular_mask, "gerceklesen_saat_ondalik"] = (
                 df_plan.loc[regular_mask, "gorev_ismi"].apply(match)
@@ -249,7 +163,7 @@ def plan_naeron_eslestirme(st, conn):
                 return "🔴 Eksik"
 
         # Planlanan süre
-        df_ogrenci["planlanan_saat_ondalik"] = df_ogrenci["sure"].apply(to_saat)
+        df_ogrenci["planlanan_saat_ondalik"] = sure_saat(df_ogrenci["sure"])
         # Gerçekleşen süre (önce PIC, sonra normal)
         df_ogrenci["gerceklesen_saat_ondalik"] = 0
         df_ogrenci = eslesen_pic_sure_sirali(df_ogrenci, df_naeron)
@@ -258,9 +172,9 @@ def plan_naeron_eslestirme(st, conn):
         df_ogrenci["fark_saat_ondalik"] = df_ogrenci["gerceklesen_saat_ondalik"] - df_ogrenci["planlanan_saat_ondalik"]
 
         # Ondalık değerleri HH:MM metnine çevir
-        df_ogrenci["Planlanan"] = df_ogrenci["planlanan_saat_ondalik"].apply(format_sure)
-        df_ogrenci["Gerçekleşen"] = df_ogrenci["gerceklesen_saat_ondalik"].apply(format_sure)
-        df_ogrenci["Fark"] = df_ogrenci["fark_saat_ondalik"].apply(format_sure)
+        df_ogrenci["Planlanan"] = saat_formatla(df_ogrenci["planlanan_saat_ondalik"])
+        df_ogrenci["Gerçekleşen"] = saat_formatla(df_ogrenci["gerceklesen_saat_ondalik"])
+        df_ogrenci["Fark"] = saat_formatla(df_ogrenci["fark_saat_ondalik"])
 
         # Durum hesaplama
         df_ogrenci["durum"] = df_ogrenci.apply(durum_pic_renk, axis=1)
@@ -500,9 +414,9 @@ def plan_naeron_eslestirme(st, conn):
             phase_ozet["fark"] = phase_ozet["gerceklesen_saat_ondalik"] - phase_ozet["planlanan_saat_ondalik"]
             phase_ozet["durum"] = phase_ozet["fark"].apply(lambda x: "✅ Tamamlandı" if x >= 0 else "❌ Tamamlanmadı")
 
-            phase_ozet["Planlanan"] = phase_ozet["planlanan_saat_ondalik"].apply(format_sure)
-            phase_ozet["Gerçekleşen"] = phase_ozet["gerceklesen_saat_ondalik"].apply(format_sure)
-            phase_ozet["Fark"] = phase_ozet["fark"].apply(format_sure)
+            phase_ozet["Planlanan"] = saat_formatla(phase_ozet["planlanan_saat_ondalik"])
+            phase_ozet["Gerçekleşen"] = saat_formatla(phase_ozet["gerceklesen_saat_ondalik"])
+            phase_ozet["Fark"] = saat_formatla(phase_ozet["fark"])
 
             st.dataframe(
                 phase_ozet[["phase", "Planlanan", "Gerçekleşen", "Fark", "durum"]]
@@ -2,6 +2,9 @@ import re, sqlite3
 import pandas as pd
 import numpy as np
 
+from tabs.utils.ogrenci_kodu import ogrenci_patlat
+from tabs.utils.sure_utils import timedelta_saat
+
 # -------------------------------------------------------------------
 # HIZLI: Yardımcılar
 # -------------------------------------------------------------------
@@ -86,34 +89,9 @@ def _ogr_kod_from_plan(s: str) -> str:
     s = str(s or "").strip()
     return s.split("-")[0].strip()
 
-def _naeron_ogrenci_kodu_ayikla(pilot: str) -> str:
-    """Naeron 'Öğrenci Pilot' → OZ/XXX kodu. (MCC dışı satırlarda kullanılır)"""
-    if pd.isna(pilot): return ""
-    pilot = str(pilot).strip()
-    if pilot.startswith("OZ"):
-        if pilot.count("-") >= 2:
-            ikinci = [i for i, c in enumerate(pilot) if c == "-"][1]
-            pilot = pilot[:ikinci].rstrip()
-        return pilot
-    else:
-        return pilot.split("-")[0].strip()
-
-# Block Time → saat (float)
-def _to_hours_bt(s):
-    if pd.isna(s) or s == "": return 0.0
-    s = str(s).strip()
-    # pandas to_timedelta ile hızlı parse dene
-    td = pd.to_timedelta(s, errors="coerce")
-    if pd.isna(td):
-        # "1:30" gibi formata da izin
-        parts = s.split(":")
-        try:
-            h = int(parts[0]); m = int(parts[1]) if len(parts) > 1 else 0
-            s_ = int(parts[2]) if len(parts) > 2 else 0
-            return h + m/60 + s_/3600
-        except Exception:
-            return 0.0
-    return td.total_seconds()/3600.0
+# Block Time → saat (float): önce pandas to_timedelta, "1:30" gibi formata da izin
+def _to_hours_bt(seri: pd.Series) -> pd.Series:
+    return timedelta_saat(seri, tek_parca=True)
 
 # -------------------------------------------------------------------
 # CACHE'LENEN YÜKLEYİCİLER
@@ -254,42 +232,13 @@ def fast_plan_vs_actual(conn, tarih1, tarih2, only_planned_students=True):
                 set())
 
     # 2.a) Öğrenci filtresi
-    plan_kod_set = set(dfp["ogrenci"].dropna().map(_ogr_kod_from_plan).unique())
+    plan_kod_set = set(dfp["ogrenci"].dropna().drop_duplicates().map(_ogr_kod_from_plan))
     if not plan_kod_set:
         # plan içinde ogrenci kolonu boşsa tüm Naeron’u al
         only_planned_students = False
 
-    # 2.b) MCC satırlarını çoklu öğrenciye patlat
-    # 2.b) MCC satırlarını çoklu öğrenciye patlat  ✅ DÜZELTİLMİŞ
-    dfn["is_mcc"] = dfn["gorev"].astype(str).str.upper().str.startswith("MCC")
-
-    mcc = dfn[dfn["is_mcc"]].copy()
-    if not mcc.empty:
-        # Tüm öğrenci kodlarını çoklayıp orijinal satıra bağla
-        extracted = (
-            mcc["ogr_pilot"].astype(str).str.upper()
-            .str.extractall(r"(\d{3}[A-Z]{2})")                # çoklu eşleşme
-            .reset_index()                                     # -> ['level_0','match',0]
-            .rename(columns={"level_0": "orig_idx", 0: "ogr_kod"})
-        )
-        if not extracted.empty:
-            mcc_reset = mcc.reset_index().rename(columns={"index": "orig_idx"})
-            # orig_idx üzerinden eşleştir
-            mcc_exp = (
-                mcc_reset.merge(extracted[["orig_idx", "ogr_kod"]], on="orig_idx", how="inner")
-                .drop(columns=["orig_idx"])
-            )
-        else:
-            mcc_exp = pd.DataFrame(columns=list(mcc.columns) + ["ogr_kod"])
-    else:
-        mcc_exp = pd.DataFrame(columns=list(dfn.columns) + ["ogr_kod"])
-
-    # MCC dışı (tek öğrenci)
-    other = dfn[~dfn["is_mcc"]].copy()
-    other["ogr_kod"] = other["ogr_pilot"].map(_naeron_ogrenci_kodu_ayikla).fillna("")
-
-    # Hepsini birleştir
-    dfn_all = pd.concat([mcc_exp, other], ignore_index=True)
+    # 2.b) MCC satırlarını çoklu öğrenciye patlat, MCC dışı satırlar tek öğrenci kodu
+    dfn_all = ogrenci_patlat(dfn, pilot_kolonu="ogr_pilot", gorev_kolonu="gorev", kod_kolonu="ogr_kod")
 
     if only_planned_students:
         dfn_all = dfn_all[dfn_all["ogr_kod"].isin(plan_kod_set)]
@@ -298,7 +247,7 @@ def fast_plan_vs_actual(conn, tarih1, tarih2, only_planned_students=True):
     dfn_all["ucus_tarihi"] = pd.to_datetime(dfn_all["ucus_tarihi"], errors="coerce")
     dfn_all = dfn_all.dropna(subset=["ucus_tarihi"])
     dfn_all["gun"] = dfn_all["ucus_tarihi"].dt.normalize()
-    dfn_all["saat"] = dfn_all["block_time"].map(_to_hours_bt)
+    dfn_all["saat"] = _to_hours_bt(dfn_all["block_time"])
 
     # Günlük toplam (GERÇEK)
     df_act_daily = (dfn_all.groupby("gun")["saat"].sum()
@@ -24,7 +24,41 @@ def _ensure_column(conn: sqlite3.Connection, table: str, column: str, definition
         conn.commit()
 
 
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    return row is not None
+
+
+def rebuild_afml_totals(conn: sqlite3.Connection) -> None:
+    """Recompute bakim_afml_totals from every AFML log (caller commits)."""
+    conn.execute("DELETE FROM bakim_afml_totals")
+    conn.execute(
+        """
+        INSERT INTO bakim_afml_totals (
+            tail_number,
+            total_flight_minutes,
+            total_block_minutes,
+            entry_count,
+            first_flight_date,
+            last_flight_date
+        )
+        SELECT
+            tail_number,
+            SUM(total_flight_minutes),
+            SUM(total_block_minutes),
+            COUNT(*),
+            MIN(flight_date),
+            MAX(flight_date)
+        FROM bakim_afml_logs
+        GROUP BY tail_number
+        """
+    )
+
+
 def ensure_schema(conn: sqlite3.Connection) -> None:
+    totals_missing = not _table_exists(conn, "bakim_afml_totals")
     conn.executescript(
         """
         CREATE TABLE IF NOT EXISTS bakim_ucaklari (
@@ -64,6 +98,16 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
             FOREIGN KEY (tail_number) REFERENCES bakim_ucaklari(tail_number)
         );
 
+        -- Per-tail running totals, maintained by insert_afml_entry / update_afml_entry
+        CREATE TABLE IF NOT EXISTS bakim_afml_totals (
+            tail_number TEXT PRIMARY KEY,
+            total_flight_minutes INTEGER NOT NULL DEFAULT 0,
+            total_block_minutes INTEGER NOT NULL DEFAULT 0,
+            entry_count INTEGER NOT NULL DEFAULT 0,
+            first_flight_date TEXT,
+            last_flight_date TEXT
+        );
+
         CREATE INDEX IF NOT EXISTS idx_bakim_afml_tail_date
             ON bakim_afml_logs (tail_number, flight_date);
 
@@ -74,6 +118,8 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
 
     _ensure_column(conn, "bakim_ucaklari", "manufacturer", "TEXT")
     _ensure_column(conn, "bakim_ucaklari", "serial_number", "TEXT")
+    if totals_missing:
+        rebuild_afml_totals(conn)
     conn.commit()
 
 
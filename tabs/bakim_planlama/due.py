@@ -0,0 +1,179 @@
+"""
+Vectorized due calculations for routine maintenance tasks.
+
+Every task in bakim_rutin_isler is joined with its tail's running AFML totals
+(bakim_afml_totals) in one query; remaining minutes, remaining days and the
+projected due date are then computed column-wise for the whole fleet.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import date
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Hour limits further out than this at the current utilization are not projected
+PROJECTION_HORIZON_DAYS = 3650
+
+DUE_COLUMNS = [
+    "id",
+    "tail_number",
+    "task_name",
+    "part_number",
+    "task_serial_number",
+    "hour_interval_minutes",
+    "day_interval",
+    "co_start_time_minutes",
+    "co_start_date",
+    "notes",
+    "actual_time_minutes",
+    "actual_date",
+    "time_due_minutes",
+    "remain_time_minutes",
+    "date_due",
+    "remain_days",
+    "daily_flight_minutes",
+    "projected_due_date",
+]
+
+
+def compute_task_due(
+    conn: sqlite3.Connection,
+    *,
+    tail_numbers: Optional[Iterable[str]] = None,
+    as_of: Optional[date] = None,
+) -> pd.DataFrame:
+    """
+    Due status of every routine task (optionally only for `tail_numbers`), one row per task.
+
+    - time_due_minutes / remain_time_minutes: CO start time + hour interval, minus the tail's
+      total flight minutes.
+    - date_due / remain_days: CO start date + day interval, counted from the tail's last
+      AFML date (`as_of`, default today, when the tail has no logs).
+    - projected_due_date: the earlier of the calendar limit and the day the hour limit is
+      reached at the tail's average daily utilization; only limits with a non-zero interval
+      count. NaT when the task has no usable limit within PROJECTION_HORIZON_DAYS.
+    """
+    where = ""
+    params: list = []
+    if tail_numbers is not None:
+        tails = [t.strip().upper() for t in tail_numbers]
+        if not tails:
+            return pd.DataFrame(columns=DUE_COLUMNS)
+        where = f"WHERE r.tail_number IN ({', '.join('?' * len(tails))})"
+        params = tails
+
+    df = pd.read_sql_query(
+        f"""
+        SELECT
+            r.id,
+            r.tail_number,
+            r.task_name,
+            r.part_number,
+            r.task_serial_number,
+            r.hour_interval_minutes,
+            r.day_interval,
+            r.co_start_time_minutes,
+            r.co_start_date,
+            r.notes,
+            COALESCE(t.total_flight_minutes, 0) AS actual_time_minutes,
+            t.first_flight_date,
+            t.last_flight_date
+        FROM bakim_rutin_isler r
+        LEFT JOIN bakim_afml_totals t ON t.tail_number = r.tail_number
+        {where}
+        ORDER BY r.tail_number, r.task_name COLLATE NOCASE
+        """,
+        conn,
+        params=params,
+    )
+    if df.empty:
+        return pd.DataFrame(columns=DUE_COLUMNS)
+
+    for col in ["hour_interval_minutes", "day_interval", "co_start_time_minutes", "actual_time_minutes"]:
+        df[col] = df[col].fillna(0).astype("int64")
+    for col in ["part_number", "task_serial_number", "notes"]:
+        df[col] = df[col].fillna("")
+
+    as_of_ts = pd.Timestamp(as_of or date.today())
+    first_flight = pd.to_datetime(df["first_flight_date"], format="%Y-%m-%d", errors="coerce")
+    last_flight = pd.to_datetime(df["last_flight_date"], format="%Y-%m-%d", errors="coerce")
+    df["actual_date"] = last_flight.fillna(as_of_ts)
+
+    df["time_due_minutes"] = df["co_start_time_minutes"] + df["hour_interval_minutes"]
+    df["remain_time_minutes"] = df["time_due_minutes"] - df["actual_time_minutes"]
+
+    df["co_start_date"] = pd.to_datetime(df["co_start_date"], format="%Y-%m-%d", errors="coerce")
+    df["date_due"] = df["co_start_date"] + pd.to_timedelta(df["day_interval"], unit="D")
+    df["remain_days"] = (df["date_due"] - df["actual_date"]).dt.days.astype("Int64")
+
+    # Average utilization over the logged span (first to last AFML day, inclusive)
+    span_days = (last_flight - first_flight).dt.days + 1
+    df["daily_flight_minutes"] = (df["actual_time_minutes"] / span_days).where(span_days > 0)
+
+    days_to_hour_limit = np.ceil(df["remain_time_minutes"].clip(lower=0) / df["daily_flight_minutes"])
+    hour_limited = (df["hour_interval_minutes"] > 0) & (days_to_hour_limit <= PROJECTION_HORIZON_DAYS)
+    hour_projection = (
+        df["actual_date"] + pd.to_timedelta(days_to_hour_limit.where(hour_limited, 0), unit="D")
+    ).where(hour_limited)
+    calendar_due = df["date_due"].where(df["day_interval"] > 0)
+    df["projected_due_date"] = pd.concat([hour_projection, calendar_due], axis=1).min(axis=1)
+
+    return df[DUE_COLUMNS].reset_index(drop=True)
+
+
+def filter_tasks(
+    due: pd.DataFrame,
+    *,
+    name_contains: str = "",
+    time_threshold_minutes: Optional[int] = None,
+    day_threshold: Optional[int] = None,
+) -> pd.DataFrame:
+    """Per-aircraft task filters: every given criterion must hold (tasks without a date fail the day filter)."""
+    mask = pd.Series(True, index=due.index)
+    if name_contains:
+        mask &= due["task_name"].str.contains(name_contains, case=False, regex=False)
+    if time_threshold_minutes is not None:
+        mask &= due["remain_time_minutes"] <= time_threshold_minutes
+    if day_threshold:
+        mask &= (due["remain_days"] <= day_threshold).fillna(False).astype(bool)
+    return due[mask]
+
+
+def due_soon(
+    due: pd.DataFrame,
+    *,
+    within_minutes: Optional[int] = None,
+    within_days: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Fleet-wide "due soon" list: tasks whose hour limit is within `within_minutes` or whose
+    calendar limit is within `within_days`, earliest projected due date first.
+    """
+    mask = pd.Series(False, index=due.index)
+    if within_minutes is not None:
+        mask |= (due["hour_interval_minutes"] > 0) & (due["remain_time_minutes"] <= within_minutes)
+    if within_days is not None:
+        mask |= (
+            (due["day_interval"] > 0) & (due["remain_days"] <= within_days)
+        ).fillna(False).astype(bool)
+    return due[mask].sort_values(
+        ["projected_due_date", "tail_number"], na_position="last", kind="mergesort"
+    )
+
+
+def fetch_due_soon(
+    conn: sqlite3.Connection,
+    *,
+    within_minutes: Optional[int] = None,
+    within_days: Optional[int] = None,
+    as_of: Optional[date] = None,
+) -> pd.DataFrame:
+    return due_soon(
+        compute_task_due(conn, as_of=as_of),
+        within_minutes=within_minutes,
+        within_days=within_days,
+    )
@@ -92,34 +92,97 @@ def update_aircraft(
     conn.commit()
 
 
-def insert_afml_entry(
+def _add_to_afml_totals(
     conn: sqlite3.Connection,
     *,
     tail_number: str,
-    flight_date: date,
-    total_flight_minutes: int,
-    total_block_minutes: int,
-    notes: str,
+    flight_date: str,
+    flight_minutes: int,
+    block_minutes: int,
+    entry_count: int,
 ) -> None:
+    """Apply one log's contribution (or, with negative values, remove it) to the running totals."""
     conn.execute(
         """
-        INSERT INTO bakim_afml_logs (
+        INSERT INTO bakim_afml_totals (
             tail_number,
-            flight_date,
             total_flight_minutes,
             total_block_minutes,
-            notes
-        ) VALUES (?, ?, ?, ?, ?)
+            entry_count,
+            first_flight_date,
+            last_flight_date
+        ) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(tail_number) DO UPDATE SET
+            total_flight_minutes = total_flight_minutes + excluded.total_flight_minutes,
+            total_block_minutes = total_block_minutes + excluded.total_block_minutes,
+            entry_count = entry_count + excluded.entry_count,
+            first_flight_date = MIN(COALESCE(first_flight_date, excluded.first_flight_date), excluded.first_flight_date),
+            last_flight_date = MAX(COALESCE(last_flight_date, excluded.last_flight_date), excluded.last_flight_date)
         """,
-        (
-            tail_number.strip().upper(),
-            flight_date.isoformat(),
-            total_flight_minutes,
-            total_block_minutes,
-            notes.strip(),
-        ),
+        (tail_number, flight_minutes, block_minutes, entry_count, flight_date, flight_date),
     )
-    conn.commit()
+
+
+def _refresh_afml_total_dates(conn: sqlite3.Connection, tail_number: str) -> None:
+    """Re-read first/last flight date of a tail (index seek) after a log moved away from it."""
+    conn.execute(
+        """
+        UPDATE bakim_afml_totals
+        SET
+            first_flight_date = (
+                SELECT MIN(flight_date) FROM bakim_afml_logs WHERE tail_number = ?
+            ),
+            last_flight_date = (
+                SELECT MAX(flight_date) FROM bakim_afml_logs WHERE tail_number = ?
+            )
+        WHERE tail_number = ?
+        """,
+        (tail_number, tail_number, tail_number),
+    )
+    conn.execute("DELETE FROM bakim_afml_totals WHERE entry_count <= 0")
+
+
+def insert_afml_entry(
+    conn: sqlite3.Connection,
+    *,
+    tail_number: str,
+    flight_date: date,
+    total_flight_minutes: int,
+    total_block_minutes: int,
+    notes: str,
+) -> None:
+    tail_clean = tail_number.strip().upper()
+    try:
+        conn.execute(
+            """
+            INSERT INTO bakim_afml_logs (
+                tail_number,
+                flight_date,
+                total_flight_minutes,
+                total_block_minutes,
+                notes
+            ) VALUES (?, ?, ?, ?, ?)
+            """,
+            (
+                tail_clean,
+                flight_date.isoformat(),
+                total_flight_minutes,
+                total_block_minutes,
+                notes.strip(),
+            ),
+        )
+        _add_to_afml_totals(
+            conn,
+            tail_number=tail_clean,
+            flight_date=flight_date.isoformat(),
+            flight_minutes=total_flight_minutes,
+            block_minutes=total_block_minutes,
+            entry_count=1,
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
 
 def update_afml_entry(
@@ -132,27 +195,58 @@ def update_afml_entry(
     total_block_minutes: int,
     notes: str,
 ) -> None:
-    conn.execute(
-        """
-        UPDATE bakim_afml_logs
-        SET
-            tail_number = ?,
-            flight_date = ?,
-            total_flight_minutes = ?,
-            total_block_minutes = ?,
-            notes = ?
-        WHERE id = ?
-        """,
-        (
-            tail_number.strip().upper(),
-            flight_date.isoformat(),
-            total_flight_minutes,
-            total_block_minutes,
-            notes.strip(),
-            entry_id,
-        ),
-    )
-    conn.commit()
+    tail_clean = tail_number.strip().upper()
+    try:
+        old = conn.execute(
+            """
+            SELECT tail_number, flight_date, total_flight_minutes, total_block_minutes
+            FROM bakim_afml_logs
+            WHERE id = ?
+            """,
+            (entry_id,),
+        ).fetchone()
+        conn.execute(
+            """
+            UPDATE bakim_afml_logs
+            SET
+                tail_number = ?,
+                flight_date = ?,
+                total_flight_minutes = ?,
+                total_block_minutes = ?,
+                notes = ?
+            WHERE id = ?
+            """,
+            (
+                tail_clean,
+                flight_date.isoformat(),
+                total_flight_minutes,
+                total_block_minutes,
+                notes.strip(),
+                entry_id,
+            ),
+        )
+        if old is not None:
+            _add_to_afml_totals(
+                conn,
+                tail_number=old[0],
+                flight_date=old[1],
+                flight_minutes=-(old[2] or 0),
+                block_minutes=-(old[3] or 0),
+                entry_count=-1,
+            )
+            _add_to_afml_totals(
+                conn,
+                tail_number=tail_clean,
+                flight_date=flight_date.isoformat(),
+                flight_minutes=total_flight_minutes,
+                block_minutes=total_block_minutes,
+                entry_count=1,
+            )
+            _refresh_afml_total_dates(conn, old[0])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
 
 def insert_task(
@@ -267,10 +361,9 @@ def get_afml_summary(conn: sqlite3.Connection) -> Dict[str, Dict[str, Optional[s
         """
         SELECT
             tail_number,
-            SUM(total_flight_minutes) AS total_flight_minutes,
-            MAX(flight_date) AS last_flight_date
-        FROM bakim_afml_logs
-        GROUP BY tail_number
+            total_flight_minutes,
+            last_flight_date
+        FROM bakim_afml_totals
         """
     ).fetchall()
     summary: Dict[str, Dict[str, Optional[str]]] = {}
@@ -5,18 +5,18 @@ Streamlit views for the maintenance planning tab.
 from __future__ import annotations
 
 import sqlite3
-from datetime import date, timedelta
+from datetime import date
 from typing import Dict, List, Optional
 
 import pandas as pd
 import streamlit as st
 
 from .database import get_bakim_connection
+from .due import compute_task_due, fetch_due_soon, filter_tasks
 from .formatters import format_days, format_minutes, hours_to_minutes, minutes_to_hours
 from .repositories import (
     fetch_afml_entries,
     fetch_aircraft,
-    fetch_tasks_for_tail,
     get_afml_summary,
     insert_afml_entry,
     insert_aircraft,
@@ -450,71 +450,45 @@ def _render_ac_status_header(
             "Gunu az kalan isleri filtreleme (gun)", min_value=0, step=1, value=0
         )
 
-    tasks = fetch_tasks_for_tail(conn, tail_choice)
-    if not tasks:
+    due = compute_task_due(conn, tail_numbers=[tail_choice])
+    if due.empty:
         st_module.info("Bu ucak icin kayitli rutin is bulunmuyor. Asagidan yeni bir is ekleyebilirsiniz.")
     else:
-        records = []
-        actual_date_ref = actual_date_obj or date.today()
-        time_threshold_minutes = hours_to_minutes(time_threshold_hours) if time_threshold_hours > 0 else None
-
-        for row in tasks:
-            task_name = row["task_name"]
-            if task_name_filter and task_name_filter.lower() not in task_name.lower():
-                continue
-
-            hour_interval = row["hour_interval_minutes"] or 0
-            co_start_time = row["co_start_time_minutes"] or 0
-            time_due_minutes = co_start_time + hour_interval
-            remain_time_minutes = time_due_minutes - actual_time_minutes
-
-            day_interval = row["day_interval"] or 0
-            co_start_date_text = row["co_start_date"]
-            co_start_date_obj = None
-            date_due_obj = None
-            if co_start_date_text:
-                try:
-                    co_start_date_obj = date.fromisoformat(co_start_date_text)
-                    date_due_obj = co_start_date_obj + timedelta(days=day_interval)
-                except ValueError:
-                    co_start_date_obj = None
-                    date_due_obj = None
-
-            remain_days = None
-            if date_due_obj:
-                remain_days = (date_due_obj - actual_date_ref).days
-
-            if time_threshold_minutes is not None and remain_time_minutes > time_threshold_minutes:
-                continue
-            if day_threshold > 0 and (remain_days is None or remain_days > day_threshold):
-                continue
-
-            records.append(
-                {
-                    "Yapilacak Is": task_name,
-                    "Parca Numarasi": row["part_number"] or "",
-                    "Seri Numarasi": row["task_serial_number"] or "",
-                    "Saat Interval": format_minutes(hour_interval),
-                    "Gun Interval": day_interval,
-                    "CO Start Time": format_minutes(co_start_time),
-                    "CO Start Date": co_start_date_obj.strftime("%d.%m.%Y") if co_start_date_obj else "N/A",
-                    "Time Due": format_minutes(time_due_minutes),
-                    "Date Due": date_due_obj.strftime("%d.%m.%Y") if date_due_obj else "N/A",
-                    "Remain Time": format_minutes(remain_time_minutes),
-                    "Remain Days": format_days(remain_days),
-                    "Not": row["notes"] or "",
-                }
-            )
-
-        if records:
+        filtered_due = filter_tasks(
+            due,
+            name_contains=task_name_filter,
+            time_threshold_minutes=hours_to_minutes(time_threshold_hours) if time_threshold_hours > 0 else None,
+            day_threshold=int(day_threshold),
+        )
+        if not filtered_due.empty:
             st_module.dataframe(
-                pd.DataFrame(records),
+                _due_display_frame(filtered_due),
                 use_container_width=True,
                 hide_index=True,
             )
         else:
             st_module.warning("Filtre kriterlerine uyan rutin is bulunamadi.")
 
+    with st_module.expander("Filo geneli yaklasan isler", expanded=False):
+        fleet_cols = st_module.columns(2)
+        with fleet_cols[0]:
+            fleet_hours = st_module.number_input(
+                "Kalan saat (saat)", min_value=0.0, step=0.5, value=10.0, key="bakim_filo_saat"
+            )
+        with fleet_cols[1]:
+            fleet_days = st_module.number_input(
+                "Kalan gun (gun)", min_value=0, step=1, value=30, key="bakim_filo_gun"
+            )
+        fleet_due = fetch_due_soon(
+            conn, within_minutes=hours_to_minutes(fleet_hours), within_days=int(fleet_days)
+        )
+        if fleet_due.empty:
+            st_module.info("Secilen esiklerde yaklasan rutin is bulunmuyor.")
+        else:
+            fleet_df = _due_display_frame(fleet_due)
+            fleet_df.insert(0, "REG", fleet_due["tail_number"].to_numpy())
+            st_module.dataframe(fleet_df, use_container_width=True, hide_index=True)
+
     with st_module.expander("Yeni rutin is ekle"):
         with st_module.form("bakim_rutin_is_form", clear_on_submit=True):
             job_tail = st_module.selectbox("Ucak (REG)", tail_options, index=tail_options.index(tail_choice))
@@ -554,6 +528,33 @@ def _render_ac_status_header(
                 st_module.rerun()
 
 
+def _format_dates(values: pd.Series) -> pd.Series:
+    return values.dt.strftime("%d.%m.%Y").fillna("N/A")
+
+
+def _due_display_frame(due: pd.DataFrame) -> pd.DataFrame:
+    """Display columns of the routine task table, built from compute_task_due output."""
+    return pd.DataFrame(
+        {
+            "Yapilacak Is": due["task_name"],
+            "Parca Numarasi": due["part_number"],
+            "Seri Numarasi": due["task_serial_number"],
+            "Saat Interval": due["hour_interval_minutes"].map(format_minutes),
+            "Gun Interval": due["day_interval"],
+            "CO Start Time": due["co_start_time_minutes"].map(format_minutes),
+            "CO Start Date": _format_dates(due["co_start_date"]),
+            "Time Due": due["time_due_minutes"].map(format_minutes),
+            "Date Due": _format_dates(due["date_due"]),
+            "Remain Time": due["remain_time_minutes"].map(format_minutes),
+            "Remain Days": due["remain_days"].map(
+                lambda v: format_days(None if pd.isna(v) else int(v))
+            ),
+            "Projected Due": _format_dates(due["projected_due_date"]),
+            "Not": due["notes"],
+        }
+    ).reset_index(drop=True)
+
+
 def _render_ac_status_header_moved_notice(st_module) -> None:
     """Inform users that AC STATUS HEADER moved under DATAMINE."""
     st_module.markdown("### 3. AC STATUS HEADER")
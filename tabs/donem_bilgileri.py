@@ -4,6 +4,9 @@ import sqlite3
 import io
 from pandas.tseries.offsets import DateOffset
 
+from db.migrations import golgesiz_secim
+from tabs.utils.gorev_durum_db import donemleri_kirlet
+
 def donem_bilgileri(st):
     st.title("📘 Tüm Dönem Bilgileri ve Uçuş Eğitim Başlangıçları")
 
@@ -59,6 +62,7 @@ def donem_bilgileri(st):
         )
 
         if st.button("💾 Değişiklikleri Kaydet"):
+            eski_tipler = dict(cursor.execute("SELECT donem, donem_tipi FROM donem_bilgileri").fetchall())
             cursor.execute("DELETE FROM donem_bilgileri")
             for _, row in edited_df.iterrows():
                 cursor.execute("""
@@ -75,6 +79,17 @@ def donem_bilgileri(st):
                     row["egitim_yeri"], row["toplam_egitim_suresi_ay"]
                 ))
             conn_donem.commit()
+            # Dönem tipi PIF/SIF durumlarını belirler: tipi değişen (eklenen / silinen) dönemlerin
+            # öğrencileri görev durum tablosunda yeniden hesaplanmak üzere işaretlenir
+            yeni_tipler = dict(zip(edited_df["donem"], edited_df["donem_tipi"]))
+            degisen = [d for d in set(eski_tipler) | set(yeni_tipler) if eski_tipler.get(d) != yeni_tipler.get(d)]
+            if degisen:
+                try:
+                    conn_plan = sqlite3.connect("ucus_egitim.db")
+                    donemleri_kirlet(conn_plan, degisen)
+                    conn_plan.close()
+                except sqlite3.Error as e:
+                    st.warning(f"Görev durumları yenilemeye işaretlenemedi: {e}")
             st.success("Tüm değişiklikler kaydedildi!")
         conn_donem.close()
     except Exception as e:
@@ -85,7 +100,7 @@ def donem_bilgileri(st):
     st.subheader("📅 Seçilen Dönemdeki Öğrencilerin Tahmini Bitiş Tarihleri")
     try:
         conn_plan = sqlite3.connect("ucus_egitim.db")
-        df_plan = pd.read_sql_query("SELECT * FROM ucus_planlari", conn_plan, parse_dates=["plan_tarihi"])
+        df_plan = pd.read_sql_query(f"SELECT {golgesiz_secim(conn_plan, 'ucus_planlari')} FROM ucus_planlari", conn_plan, parse_dates=["plan_tarihi"])
         conn_plan.close()
 
         conn_donem = sqlite3.connect("donem_bilgileri.db")
@@ -188,7 +203,7 @@ def donem_bilgileri(st):
     if st.button("📊 Tüm Öğrencilerin Son Görev Tarihlerini Listele ve Excel'e Aktar"):
         try:
             conn_plan = sqlite3.connect("ucus_egitim.db")
-            df_plan = pd.read_sql_query("SELECT * FROM ucus_planlari", conn_plan, parse_dates=["plan_tarihi"])
+            df_plan = pd.read_sql_query(f"SELECT {golgesiz_secim(conn_plan, 'ucus_planlari')} FROM ucus_planlari", conn_plan, parse_dates=["plan_tarihi"])
             conn_plan.close()
             conn_donem = sqlite3.connect("donem_bilgileri.db")
             df_donem_bilgi = pd.read_sql_query(
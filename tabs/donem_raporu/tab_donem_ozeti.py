@@ -11,10 +11,9 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 # 'ozet_utils2' modülünden gerekli fonksiyonları import ediyoruz.
-from tabs.utils.ozet_utils2 import (
-    ozet_panel_verisi_hazirla_batch,
-    ogrenci_kodu_ayikla
-)
+from tabs.utils.ogrenci_kodu import plan_ogrenci_kodu
+from tabs.utils.gorev_durum_db import gorev_durum_oku
+from tabs.utils.sure_utils import sure_parcala_tek, sure_timedelta
 
 EXCLUDED_GOREVLER = {"CPL ST(ME)", "IR ST(ME)"}
 EXCLUDED_GOREVLER_NORMALIZED = {
@@ -92,17 +91,9 @@ def anlasilir_saat_formatina_cevir(td: timedelta) -> str:
     return f"{sign}{saat:02}:{dakika:02}"
 
 def saat_stringini_timedeltaya_cevir(sure_str: str) -> timedelta:
-    """'HH:MM' veya 'HH:MM:SS' formatındaki string'i timedelta objesine çevirir."""
-    if not isinstance(sure_str, str) or ':' not in sure_str:
-        return timedelta(0)
-    try:
-        parcalar = sure_str.strip().split(':')
-        saat = int(parcalar[0])
-        dakika = int(parcalar[1])
-        saniye = int(parcalar[2]) if len(parcalar) > 2 else 0
-        return timedelta(hours=saat, minutes=dakika, seconds=saniye)
-    except (ValueError, IndexError):
-        return timedelta(0)
+    """'HH:MM' veya 'HH:MM:SS' formatındaki string'i timedelta objesine çevirir (kolonlar için sure_timedelta)."""
+    p = sure_parcala_tek(sure_str)
+    return timedelta(hours=p[0], minutes=p[1], seconds=p[2]) if p else timedelta(0)
 
 def _normalize_column_key(name: str) -> str:
     """Kolon adlarındaki Türkçe karakterleri ASCII anahtarlara dönüştürür."""
@@ -188,15 +179,8 @@ def _ekle_toplam_satir_sutun(df: pd.DataFrame, value_columns: list[str]) -> pd.D
         return df
 
     work = df.copy()
-    satir_toplamlari: list[str] = []
-
-    for _, row in work[value_columns].iterrows():
-        toplam_td = timedelta(0)
-        for col in value_columns:
-            toplam_td += saat_stringini_timedeltaya_cevir(row.get(col, "00:00"))
-        satir_toplamlari.append(anlasilir_saat_formatina_cevir(toplam_td))
-
-    work['toplam'] = satir_toplamlari
+    sureler = pd.DataFrame({col: sure_timedelta(work[col]) for col in value_columns}, index=work.index)
+    work['toplam'] = sureler.sum(axis=1).map(anlasilir_saat_formatina_cevir)
 
     toplam_satir = {col: "" for col in work.columns}
     student_column = _student_column_name(work.columns)
@@ -204,15 +188,8 @@ def _ekle_toplam_satir_sutun(df: pd.DataFrame, value_columns: list[str]) -> pd.D
         toplam_satir[student_column] = "TOPLAM"
 
     for col in value_columns:
-        toplam_td = timedelta(0)
-        for val in work[col]:
-            toplam_td += saat_stringini_timedeltaya_cevir(val)
-        toplam_satir[col] = anlasilir_saat_formatina_cevir(toplam_td)
-
-    toplam_td = timedelta(0)
-    for val in work['toplam']:
-        toplam_td += saat_stringini_timedeltaya_cevir(val)
-    toplam_satir['toplam'] = anlasilir_saat_formatina_cevir(toplam_td)
+        toplam_satir[col] = anlasilir_saat_formatina_cevir(sureler[col].sum())
+    toplam_satir['toplam'] = anlasilir_saat_formatina_cevir(sure_timedelta(work['toplam']).sum())
 
     work = pd.concat([work, pd.DataFrame([toplam_satir], columns=work.columns)], ignore_index=True)
     return work
@@ -262,8 +239,8 @@ def hazirla_eksik_kayitlar(df: pd.DataFrame) -> pd.DataFrame:
     if eksik_df.empty:
         return pd.DataFrame()
 
-    eksik_df['planlanan_td'] = eksik_df['sure'].apply(saat_stringini_timedeltaya_cevir)
-    eksik_df['gerceklesen_td'] = eksik_df['gerceklesen_sure'].apply(saat_stringini_timedeltaya_cevir)
+    eksik_df['planlanan_td'] = sure_timedelta(eksik_df['sure'])
+    eksik_df['gerceklesen_td'] = sure_timedelta(eksik_df['gerceklesen_sure'])
     eksik_df['eksik_td'] = eksik_df['planlanan_td'] - eksik_df['gerceklesen_td']
     eksik_df['eksik_td'] = eksik_df['eksik_td'].clip(lower=pd.Timedelta(0))
     eksik_df = eksik_df[eksik_df['eksik_td'] > pd.Timedelta(0)]
@@ -346,8 +323,8 @@ def _generate_graph_exports(df: pd.DataFrame, donem: str, max_students: int | No
     if work.empty:
         return []
 
-    work["plan_td"] = work["sure"].apply(saat_stringini_timedeltaya_cevir)
-    work["gercek_td"] = work["gerceklesen_sure"].apply(saat_stringini_timedeltaya_cevir)
+    work["plan_td"] = sure_timedelta(work["sure"])
+    work["gercek_td"] = sure_timedelta(work["gerceklesen_sure"])
     work["fark_td"] = work["gercek_td"] - work["plan_td"]
 
     charts: list[tuple[str, bytes]] = []
@@ -457,8 +434,8 @@ def hazirla_toplam_fark_tablosu(df_term: pd.DataFrame) -> pd.DataFrame:
     if df_local.empty:
         return pd.DataFrame()
 
-    df_local['planlanan_saat'] = df_local['sure'].apply(saat_stringini_timedeltaya_cevir)
-    df_local['gerceklesen_saat'] = df_local['gerceklesen_sure'].apply(saat_stringini_timedeltaya_cevir)
+    df_local['planlanan_saat'] = sure_timedelta(df_local['sure'])
+    df_local['gerceklesen_saat'] = sure_timedelta(df_local['gerceklesen_sure'])
 
     ozet = df_local.groupby(['ogrenci', 'gorev_tipi']).agg(
         planlanan_td=('planlanan_saat', 'sum'),
@@ -562,7 +539,7 @@ def render_donem_ozeti_tab(st, conn: sqlite3.Connection):
         if ogrenci_plan_df.empty:
             st.warning("Veritabanında öğrenci kaydı bulunamadı.")
             return
-        ogrenci_plan_df['ogrenci_kodu'] = ogrenci_plan_df['ogrenci'].apply(ogrenci_kodu_ayikla)
+        ogrenci_plan_df['ogrenci_kodu'] = plan_ogrenci_kodu(ogrenci_plan_df['ogrenci'])
         ogrenci_plan_df = ogrenci_plan_df[ogrenci_plan_df['ogrenci_kodu'].notna()]
     except Exception as e:
         st.error(f"Öğrenci listesi alınırken bir hata oluştu: {e}")
@@ -580,16 +557,15 @@ def render_donem_ozeti_tab(st, conn: sqlite3.Connection):
         st.warning("İşlenecek öğrenci kodu bulunamadı.")
         return
         
-    # 3. Tüm öğrenciler için Naeron eşleştirmeli veriyi BATCH olarak çek
-    with st.spinner("Tüm dönem verileri işleniyor... Bu işlem biraz zaman alabilir."):
-        sonuclar = ozet_panel_verisi_hazirla_batch(tum_ogrenci_kodlari, conn)
+    # 3. Tüm öğrenciler için Naeron eşleştirmeli veri (materialized tablodan; sadece değişenler yenilenir)
+    with st.spinner("Tüm dönem verileri işleniyor..."):
+        tum_df_ham = gorev_durum_oku(conn)
 
-    all_data_frames = [res[0] for res in sonuclar.values() if res and res[0] is not None]
-    if not all_data_frames:
+    if tum_df_ham.empty:
         st.warning("İşlenecek plan verisi bulunamadı.")
         return
 
-    tum_df_all = normalize_plan_gercek_kolonlari(pd.concat(all_data_frames, ignore_index=True))
+    tum_df_all = normalize_plan_gercek_kolonlari(tum_df_ham)
     tum_df_all = filtrele_donem_raporu_gorevleri(tum_df_all)
 
     dislanacak_kume = set(dislanacak_donemler)
@@ -688,8 +664,8 @@ def render_donem_ozeti_tab(st, conn: sqlite3.Connection):
     st.markdown(f"#### 🧑‍✈️ **{secilen_donem}** Dönemi Öğrenci ve Görev Tipi Bazlı Detaylı Süreler")
 
     df_detay = df.copy()
-    df_detay['planlanan_saat'] = df_detay['sure'].apply(saat_stringini_timedeltaya_cevir)
-    df_detay['gerceklesen_saat'] = df_detay['gerceklesen_sure'].apply(saat_stringini_timedeltaya_cevir)
+    df_detay['planlanan_saat'] = sure_timedelta(df_detay['sure'])
+    df_detay['gerceklesen_saat'] = sure_timedelta(df_detay['gerceklesen_sure'])
 
     ozet_detayli = df_detay.groupby(['ogrenci', 'gorev_tipi']).agg(
         planlanan_td=('planlanan_saat', 'sum'),
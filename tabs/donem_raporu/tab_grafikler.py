@@ -8,10 +8,11 @@ import altair as alt
 import pandas as pd
 import streamlit as st
 
-from tabs.utils.ozet_utils2 import ozet_panel_verisi_hazirla_batch, ogrenci_kodu_ayikla
+from tabs.utils.ogrenci_kodu import plan_ogrenci_kodu
+from tabs.utils.gorev_durum_db import gorev_durum_oku
+from tabs.utils.sure_utils import sure_timedelta
 from tabs.donem_raporu.tab_donem_ozeti import (
     normalize_plan_gercek_kolonlari,
-    saat_stringini_timedeltaya_cevir,
     anlasilir_saat_formatina_cevir,
     filtrele_donem_raporu_gorevleri,
 )
@@ -38,7 +39,7 @@ def _prepare_donem_dataframe(conn: sqlite3.Connection, donem: str) -> pd.DataFra
     if ogrenci_plan_df.empty:
         return pd.DataFrame()
 
-    ogrenci_plan_df["ogrenci_kodu"] = ogrenci_plan_df["ogrenci"].apply(ogrenci_kodu_ayikla)
+    ogrenci_plan_df["ogrenci_kodu"] = plan_ogrenci_kodu(ogrenci_plan_df["ogrenci"])
     ogrenci_plan_df = ogrenci_plan_df[ogrenci_plan_df["ogrenci_kodu"].notna()]
 
     term_codes: List[str] = (
@@ -54,14 +55,11 @@ def _prepare_donem_dataframe(conn: sqlite3.Connection, donem: str) -> pd.DataFra
     if not tum_kodlar:
         return pd.DataFrame()
 
-    sonuclar = ozet_panel_verisi_hazirla_batch(tum_kodlar, conn)
-    all_data_frames = [
-        res[0] for res in sonuclar.values() if res and isinstance(res, (list, tuple)) and res[0] is not None
-    ]
-    if not all_data_frames:
+    tum_df_ham = gorev_durum_oku(conn)
+    if tum_df_ham.empty:
         return pd.DataFrame()
 
-    tum_df_all = normalize_plan_gercek_kolonlari(pd.concat(all_data_frames, ignore_index=True))
+    tum_df_all = normalize_plan_gercek_kolonlari(tum_df_ham)
     tum_df_all = filtrele_donem_raporu_gorevleri(tum_df_all)
     if tum_df_all.empty:
         return pd.DataFrame()
@@ -108,8 +106,8 @@ def render_grafikler_tab(st, conn: sqlite3.Connection) -> None:
         st.warning("Bu dönem için görev tipi bilgisi içeren kayıt bulunamadı.")
         return
 
-    df["plan_td"] = df["sure"].apply(saat_stringini_timedeltaya_cevir)
-    df["gercek_td"] = df["gerceklesen_sure"].apply(saat_stringini_timedeltaya_cevir)
+    df["plan_td"] = sure_timedelta(df["sure"])
+    df["gercek_td"] = sure_timedelta(df["gerceklesen_sure"])
     df["fark_td"] = df["gercek_td"] - df["plan_td"]
 
     toplam_plan = df["plan_td"].sum()
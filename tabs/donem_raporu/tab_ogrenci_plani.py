@@ -8,9 +8,9 @@ from typing import List
 # Bu fonksiyonların 'tabs/utils/ozet_utils2.py' dosyasında olduğunu varsayıyoruz.
 from tabs.utils.ozet_utils2 import (
     ozet_panel_verisi_hazirla_batch,
-    ogrenci_kodu_ayikla,
     format_sure,
 )
+from tabs.utils.ogrenci_kodu import plan_ogrenci_kodu
 from tabs.donem_raporu.tab_donem_ozeti import filtrele_donem_raporu_gorevleri
 
 def _first_present(series: pd.Series, candidates: List[str], default_value=None):
@@ -33,7 +33,7 @@ def _read_plan_ogrenci_list(conn: sqlite3.Connection) -> pd.DataFrame:
     df = pd.read_sql_query("SELECT ogrenci FROM ucus_planlari", conn)
     if "ogrenci" not in df.columns:
         return pd.DataFrame(columns=["ogrenci", "ogrenci_kodu"])
-    df["ogrenci_kodu"] = df["ogrenci"].apply(ogrenci_kodu_ayikla)
+    df["ogrenci_kodu"] = plan_ogrenci_kodu(df["ogrenci"])
     df = df.dropna(subset=["ogrenci_kodu"]).drop_duplicates("ogrenci_kodu")
     return df[["ogrenci", "ogrenci_kodu"]].sort_values("ogrenci_kodu").reset_index(drop=True)
 
@@ -54,7 +54,7 @@ def render_ogrenci_plani_tab(st, conn: sqlite3.Connection):
             try:
                 df_g = pd.read_sql_query("SELECT ogrenci, Gerceklesen_sure FROM ucus_planlari", conn)
                 if not df_g.empty and "ogrenci" in df_g.columns:
-                    df_g["ogrenci_kodu"] = df_g["ogrenci"].apply(ogrenci_kodu_ayikla)
+                    df_g["ogrenci_kodu"] = plan_ogrenci_kodu(df_g["ogrenci"])
                     m = df_g["Gerceklesen_sure"].astype(str).str.strip().replace({"nan": "", "None": ""})
                     m = m.fillna("").astype(str)
                     has_real = df_g.loc[m.ne("") & m.ne("00:00"), "ogrenci_kodu"].dropna().unique().tolist()
@@ -3,6 +3,8 @@ import pandas as pd
 import streamlit as st
 from datetime import datetime, time
 
+from tabs.utils.excel_akis import excel_parcalari, ilerleme_cubugu
+
 def generate_naeron_ucus_no(date_obj, index):
     """NRS-YYYYMMDD-XXX formatında uçuş numarası oluşturur."""
     idx = int(index)
@@ -18,21 +20,29 @@ def tab_fams_to_naeron(st, conn):
     if not uploaded:
         return
 
-    # Dosyayı oku (CSV ise ';' ile ayrılmış)
+    # Gereksiz sütunlar
+    cols_to_drop = [
+        'SAFETY', 'DAY T.', 'TACH. READING',
+        'DUAL', 'DUAL.1', 'SOLO', 'SPIC', 'IR', 'LC'
+    ]
+
+    # Dosyayı oku (CSV ise ';' ile ayrılmış; XLSX parça parça, gereksiz sütunlar parça başında atılır)
     try:
         if uploaded.name.lower().endswith(".csv"):
             df = pd.read_csv(uploaded, sep=';', encoding='latin1')
         else:
-            df = pd.read_excel(uploaded)
+            parcalar = [
+                parca.drop(columns=cols_to_drop, errors='ignore')
+                for parca in excel_parcalari(
+                    uploaded, baslik_duzelt=str,
+                    ilerleme=ilerleme_cubugu(st, "📥 FAMS dosyası okunuyor")
+                )
+            ]
+            df = pd.concat(parcalar, ignore_index=True) if parcalar else pd.DataFrame()
     except Exception as e:
         st.error(f"Dosya okunamadı: {e}")
         return
 
-    # Gereksiz sütunları sil
-    cols_to_drop = [
-        'SAFETY', 'DAY T.', 'TACH. READING',
-        'DUAL', 'DUAL.1', 'SOLO', 'SPIC', 'IR', 'LC'
-    ]
     df = df.drop(columns=cols_to_drop, errors='ignore')
 
     # plan_tarihi tip dönüşümü
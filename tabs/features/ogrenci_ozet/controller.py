@@ -3,7 +3,9 @@ import pandas as pd
 import streamlit as st
 from typing import Dict, List
 
-from tabs.utils.ozet_utils2 import ozet_panel_verisi_hazirla_batch, ogrenci_kodu_ayikla
+from tabs.utils.ogrenci_kodu import plan_ogrenci_kodu
+from tabs.utils.ozet_utils2 import ozet_panel_verisi_hazirla_batch
+from tabs.utils.veri_deposu import onbellegi_temizle, veri_surumleri
 from .repository import read_plan, read_naeron
 from .ui import header_and_range, filter_tabs
 from .domain import fmt_hhmm, extract_toplam_fark, last_date_and_tasks
@@ -18,6 +20,7 @@ def tab_ogrenci_ozet(st, conn: sqlite3.Connection, naeron_db_path: str = "naeron
         if st.button("♻️ Yenile (cache temizle)"):
             st.cache_data.clear()
             st.cache_resource.clear()
+            onbellegi_temizle()
             st.session_state.weekly_cache_buster = st.session_state.get("weekly_cache_buster", 0) + 1
             st.rerun()
     if "weekly_cache_buster" not in st.session_state:
@@ -46,20 +49,23 @@ def tab_ogrenci_ozet(st, conn: sqlite3.Connection, naeron_db_path: str = "naeron
 
     # Ağır işlemler
     with st.spinner("Veriler hazırlanıyor..."):
-        # batch özet
-        @st.cache_data(show_spinner=False, ttl=5)
-        def _cached_batch(kodlar, buster):
-            return ozet_panel_verisi_hazirla_batch(kodlar, conn)
-        sonuc = _cached_batch(tuple(sorted(ogrenciler)), st.session_state.weekly_cache_buster)
+        # batch özet (anahtar veri sürümlerini içerir; eski sürümlerin girdileri max_entries ile düşer)
+        @st.cache_data(show_spinner=False, max_entries=8)
+        def _cached_batch(kodlar, buster, surumler):
+            return ozet_panel_verisi_hazirla_batch(kodlar, conn, naeron_db_path)
+        sonuc = _cached_batch(
+            tuple(sorted(ogrenciler)),
+            st.session_state.weekly_cache_buster,
+            veri_surumleri(conn, naeron_db_path),
+        )
 
         # Naeron verisi
         df_naeron = read_naeron(naeron_db_path)
         # naeron sütunlarını hazırla
         gerekli = {"Öğrenci Pilot","Uçuş Tarihi 2","Görev"}
         if not df_naeron.empty and gerekli.issubset(df_naeron.columns):
-            from tabs.utils.ozet_utils2 import ogrenci_kodu_ayikla
-            df_naeron["ogrenci_kodu"] = df_naeron["Öğrenci Pilot"].apply(ogrenci_kodu_ayikla)
-            df_naeron["Tarih"] = pd.to_datetime(df_naeron["Uçuş Tarihi 2"], errors="coerce")
+            df_naeron["ogrenci_kodu"] = plan_ogrenci_kodu(df_naeron["Öğrenci Pilot"])
+            df_naeron["Tarih"] = df_naeron["ucus_tarihi"]
             df_naeron = df_naeron.dropna(subset=["Tarih"])
         else:
             df_naeron = pd.DataFrame(columns=["ogrenci_kodu","Tarih","Görev"])
@@ -2,8 +2,10 @@ import sqlite3
 import pandas as pd
 from typing import Dict, List
 
+from tabs.utils.veri_deposu import naeron_oku, plan_oku
+
 def read_plan(conn: sqlite3.Connection) -> pd.DataFrame:
-    df = pd.read_sql_query("SELECT * FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
+    df = plan_oku(conn)
     if "gorev_ismi" not in df.columns:
         if "gorev" in df.columns:
             df = df.rename(columns={"gorev": "gorev_ismi"})
@@ -13,9 +15,7 @@ def read_plan(conn: sqlite3.Connection) -> pd.DataFrame:
 
 def read_naeron(naeron_db_path: str) -> pd.DataFrame:
     try:
-        conn_n = sqlite3.connect(naeron_db_path, check_same_thread=False)
-        df = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn_n)
-        conn_n.close()
+        df = naeron_oku(naeron_db_path)
     except Exception:
         df = pd.DataFrame()
     return df
@@ -2,7 +2,7 @@ import pandas as pd
 import streamlit as st
 from typing import Dict, List, Tuple
 from datetime import timedelta
-from tabs.utils.ozet_utils2 import ogrenci_kodu_ayikla
+from tabs.utils.ogrenci_kodu import plan_ogrenci_kodu
 from .repository import load_kume_map, save_kume_map
 from .domain import apply_kume_filter
 
@@ -28,7 +28,7 @@ def header_and_range():
 def filter_tabs(conn, df_plan: pd.DataFrame) -> Tuple[pd.DataFrame, str]:
     # ogrenci_kodu türet
     df_plan = df_plan.copy()
-    df_plan["ogrenci_kodu"] = df_plan["ogrenci"].apply(ogrenci_kodu_ayikla)
+    df_plan["ogrenci_kodu"] = plan_ogrenci_kodu(df_plan["ogrenci"])
 
     st.markdown("## 🔧 Filtreler & Kümeler")
     tab_filtre, tab_kume = st.tabs(["🔎 Filtrele", "🧩 Küme Yönetimi"])
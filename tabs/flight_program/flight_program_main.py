@@ -1,6 +1,5 @@
 import math
 import html
-import hashlib
 from datetime import date, datetime, timedelta
 from io import BytesIO
 from typing import Dict, Tuple
@@ -9,6 +8,14 @@ from urllib.parse import quote
 import pandas as pd
 import streamlit as st
 
+from tabs.flight_program.flight_program_query import (
+    count_days,
+    date_bounds,
+    load_plan_day,
+    query_page,
+    query_rows,
+)
+
 TURKISH_MONTHS = [
     "",
     "Ocak",
@@ -445,12 +452,6 @@ def _format_turkish_date(value: pd.Timestamp | str | None) -> str:
     return f"{dt.day} {month} {dt.year}, {weekday}"
 
 
-def _generate_plan_code(row: pd.Series) -> str:
-    seed = f"{row.get('donem', '')}-{row.get('ogrenci', '')}-{row.get('id', '')}"
-    hashed = hashlib.sha1(seed.encode("utf-8")).hexdigest().upper()
-    return f"P{int(row.get('id', 0)) % 10000:04}-{hashed[:4]}"
-
-
 def _safe_text(value, fallback: str = "-") -> str:
     if value is None:
         return fallback
@@ -466,22 +467,6 @@ def _safe_text(value, fallback: str = "-") -> str:
     return text
 
 
-def _determine_status(row: pd.Series, today: date) -> str:
-    if pd.notna(row.get("veri_giris_tarihi")) and str(row.get("veri_giris_tarihi")).strip():
-        return "Bitti"
-    if pd.notna(row.get("gerceklesen_sure")) and str(row.get("gerceklesen_sure")).strip():
-        return "Bitti"
-    plan_dt = pd.to_datetime(row.get("plan_tarihi"), errors="coerce")
-    if pd.isna(plan_dt):
-        return "Taslak"
-    plan_date = plan_dt.date()
-    if plan_date < today:
-        return "Uçuş Takip"
-    if plan_date == today:
-        return "Bugün"
-    return "Taslak"
-
-
 def _badge_html(status: str) -> str:
     style = STATUS_STYLES.get(status, {"bg": "#4F4F4F", "fg": "#FFFFFF"})
     return (
@@ -502,101 +487,24 @@ def _actions_html(plan_code: str) -> str:
     )
 
 
-def _load_revision_info(conn) -> pd.DataFrame:
-    try:
-        rev_df = pd.read_sql_query(
-            """
-            SELECT donem, ogrenci, plan_tarihi, COUNT(*) AS rev_count
-            FROM plan_revize_log
-            GROUP BY donem, ogrenci, plan_tarihi
-            """,
-            conn,
-        )
-    except Exception:
-        return pd.DataFrame(columns=["donem", "ogrenci", "plan_tarihi", "revizyon"])
-    rev_df["plan_tarihi"] = pd.to_datetime(rev_df["plan_tarihi"], errors="coerce").dt.date
-    rev_df["revizyon"] = rev_df["rev_count"].fillna(0).astype(int).apply(lambda x: f"Rev.{x:02}")
-    return rev_df[["donem", "ogrenci", "plan_tarihi", "revizyon"]]
-
-
-def _prepare_dataframe(conn) -> pd.DataFrame:
-    try:
-        df = pd.read_sql_query(
-            """
-            SELECT id, donem, ogrenci, plan_tarihi, gorev_tipi, gorev_ismi,
-                   sure, gerceklesen_sure, phase, egitim_yeri, veri_giris_tarihi
-            FROM ucus_planlari
-            """,
-            conn,
-        )
-    except Exception:
-        return pd.DataFrame()
-
-    if df.empty:
+def _with_display_dates(df: pd.DataFrame) -> pd.DataFrame:
+    if df is None or df.empty:
         return df
-
-    df["plan_tarihi"] = pd.to_datetime(df["plan_tarihi"], errors="coerce")
-    df["plan_tarihi_display"] = df["plan_tarihi"].apply(_format_turkish_date)
-    df["plan_tarihi_date"] = df["plan_tarihi"].dt.date
-    df["plan_kodu"] = df.apply(_generate_plan_code, axis=1)
-    df["revizyon"] = "Rev.00"
-    rev_df = _load_revision_info(conn)
-    if not rev_df.empty:
-        df = df.merge(
-            rev_df,
-            how="left",
-            left_on=["donem", "ogrenci", "plan_tarihi_date"],
-            right_on=["donem", "ogrenci", "plan_tarihi"],
-            suffixes=("", "_rev"),
-        )
-        if "revizyon_rev" in df.columns:
-            df["revizyon"] = df["revizyon_rev"].fillna(df["revizyon"])
-            df = df.drop(columns=["revizyon_rev", "plan_tarihi_rev"], errors="ignore")
-
-    today = date.today()
-    df["durum"] = df.apply(lambda row: _determine_status(row, today), axis=1)
-    df["durum_badge"] = df["durum"].apply(_badge_html)
-    df["bas_egitmen"] = df["egitim_yeri"].fillna("").replace("", "-")
-    df["not"] = df["phase"].fillna("").astype(str)
-    missing_note_mask = df["not"].str.strip() == ""
-    if missing_note_mask.any():
-        df.loc[missing_note_mask, "not"] = df.loc[missing_note_mask, "gorev_ismi"].fillna("-")
-    df["not"] = df["not"].replace({"": "-"})
-    df["actions"] = df["plan_kodu"].apply(_actions_html)
-    df["search_blob"] = (
-        df["plan_kodu"].fillna("")
-        + " "
-        + df["ogrenci"].fillna("")
-        + " "
-        + df["gorev_tipi"].fillna("")
-        + " "
-        + df["gorev_ismi"].fillna("")
-        + " "
-        + df["not"].fillna("")
-    ).str.lower()
+    days = df["plan_tarihi"].dt.normalize()
+    labels = {d: _format_turkish_date(d) for d in days.dropna().unique()}
+    df["plan_tarihi_display"] = days.map(labels).fillna("")
     return df
 
 
-def _default_filter_state(df: pd.DataFrame) -> Dict[str, object]:
-    if df.empty:
-        today = date.today()
-        return {
-            "search": "",
-            "statuses": list(STATUS_STYLES.keys()),
-            "start": today - timedelta(days=7),
-            "end": today + timedelta(days=21),
-        }
-    valid_dates = df["plan_tarihi_date"].dropna()
-    if valid_dates.empty:
+def _default_filter_state(conn) -> Dict[str, object]:
+    start_date, end_date = date_bounds(conn)
+    if start_date is None:
         today = date.today()
         start_date = today - timedelta(days=7)
         end_date = today + timedelta(days=21)
-    else:
-        start_date = valid_dates.min()
-        end_date = valid_dates.max()
     return {
         "search": "",
-        "statuses": sorted(df["durum"].dropna().unique().tolist()),
+        "statuses": sorted(STATUS_STYLES.keys()),
         "start": start_date,
         "end": end_date,
     }
@@ -615,13 +523,13 @@ def _normalize_date_range(value, fallback_start: date, fallback_end: date) -> Tu
     return fallback_start, fallback_end
 
 
-def _render_filter_bar(st_module, df: pd.DataFrame) -> Dict[str, object]:
+def _render_filter_bar(st_module, conn) -> Dict[str, object]:
     state_key = "flight_program_filters"
     if state_key not in st.session_state:
-        st.session_state[state_key] = _default_filter_state(df)
+        st.session_state[state_key] = _default_filter_state(conn)
 
     filter_state = st.session_state[state_key]
-    status_options = sorted(df["durum"].dropna().unique().tolist()) if not df.empty else list(STATUS_STYLES.keys())
+    status_options = sorted(STATUS_STYLES.keys())
 
     with st_module.form("flight_program_filter_form"):
         col_search, col_status, col_dates = st_module.columns([3, 2, 3])
@@ -645,7 +553,7 @@ def _render_filter_bar(st_module, df: pd.DataFrame) -> Dict[str, object]:
         reset_clicked = col_btn_clear.form_submit_button("Temizle", use_container_width=True)
 
     if reset_clicked:
-        st.session_state[state_key] = _default_filter_state(df)
+        st.session_state[state_key] = _default_filter_state(conn)
         return st.session_state[state_key]
 
     if apply_clicked:
@@ -664,30 +572,6 @@ def _render_filter_bar(st_module, df: pd.DataFrame) -> Dict[str, object]:
     return st.session_state[state_key]
 
 
-def _filter_dataframe(df: pd.DataFrame, filters: Dict[str, object]) -> pd.DataFrame:
-    if df.empty:
-        return df
-    result = df.copy()
-
-    start_date = filters.get("start")
-    end_date = filters.get("end")
-    if start_date and end_date:
-        result = result[
-            (result["plan_tarihi_date"] >= start_date)
-            & (result["plan_tarihi_date"] <= end_date)
-        ]
-
-    statuses = filters.get("statuses")
-    if statuses:
-        result = result[result["durum"].isin(statuses)]
-
-    search_term = str(filters.get("search", "")).strip().lower()
-    if search_term:
-        result = result[result["search_blob"].str.contains(search_term, na=False)]
-
-    return result.sort_values(["plan_tarihi", "ogrenci", "gorev_ismi"], kind="mergesort")
-
-
 def _aggregate_daily_view(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
@@ -804,6 +688,18 @@ def _render_download_buttons(st_module, df: pd.DataFrame) -> None:
     st_module.markdown("</div>", unsafe_allow_html=True)
 
 
+def _render_export(st_module, conn, filters: Dict[str, object]) -> None:
+    # Dışa aktarım filtreye uyan tüm günleri kapsar; sadece istenince hazırlanır
+    state_key = "flight_program_export"
+    signature = repr(sorted(filters.items(), key=lambda item: item[0]))
+    if st_module.button("Dışa Aktarımı Hazırla", key="fp_export_prepare"):
+        daily_view = _aggregate_daily_view(_with_display_dates(query_rows(conn, filters)))
+        st.session_state[state_key] = {"signature": signature, "data": daily_view}
+    prepared = st.session_state.get(state_key)
+    if prepared and prepared["signature"] == signature:
+        _render_download_buttons(st_module, prepared["data"])
+
+
 def _render_table(st_module, df: pd.DataFrame) -> None:
     if df.empty:
         st_module.info("Seçilen filtreler için uçuş planı kaydı bulunamadı.")
@@ -1032,10 +928,12 @@ def _get_query_params(st_module) -> Dict[str, object]:
         return {}
 
 
-def _render_detail_view(st_module, data: pd.DataFrame, plan_code: str) -> None:
-    if data.empty:
+def _render_detail_view(st_module, conn, plan_code: str) -> None:
+    data = load_plan_day(conn, plan_code)
+    if data is None:
         st_module.info("Plan detayını göstermek için kayıt bulunamadı.")
         return
+    data = _with_display_dates(data)
     st_module.markdown(
         """
         <style>
@@ -1050,7 +948,7 @@ def _render_detail_view(st_module, data: pd.DataFrame, plan_code: str) -> None:
         """,
         unsafe_allow_html=True,
     )
-    selected = data[data["plan_kodu"] == plan_code]
+    selected = data[data["plan_kodu"] == plan_code] if not data.empty else data
     if selected.empty:
         st_module.warning("Seçilen plan kodu bulunamadı.")
         st_module.markdown("<div class='fp-breadcrumb'><a href='./'>Flight Program</a> <span>/</span><span>Bulunamadı</span></div>", unsafe_allow_html=True)
@@ -1175,7 +1073,7 @@ def _render_detail_view(st_module, data: pd.DataFrame, plan_code: str) -> None:
     )
 
 
-def _render_list_view(st_module, data: pd.DataFrame) -> None:
+def _render_list_view(st_module, conn) -> None:
     st_module.markdown(
         """
         <div class='fp-wrapper'>
@@ -1192,33 +1090,26 @@ def _render_list_view(st_module, data: pd.DataFrame) -> None:
         unsafe_allow_html=True,
     )
 
-    filters = _render_filter_bar(st_module, data)
-    filtered = _filter_dataframe(data, filters)
-    daily_view = _aggregate_daily_view(filtered)
-    _render_download_buttons(st_module, daily_view)
+    filters = _render_filter_bar(st_module, conn)
+    _render_export(st_module, conn, filters)
 
-    total_rows = len(daily_view)
+    total_rows = count_days(conn, filters)
     if total_rows == 0:
-        _render_table(st_module, daily_view)
+        _render_table(st_module, pd.DataFrame())
         return
 
     page, page_size = _render_pagination(st_module, total_rows)
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-    page_df = daily_view.iloc[start_idx:end_idx]
-
-    _render_table(st_module, page_df)
+    page_rows = _with_display_dates(query_page(conn, filters, page, page_size))
+    _render_table(st_module, _aggregate_daily_view(page_rows))
 
 
 def flight_program_main(st_module, conn) -> None:
     st_module.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
-    data = _prepare_dataframe(conn)
-
     params = _get_query_params(st_module)
     plan_code = _extract_param(params, "flightPlanDetail")
 
     if plan_code:
-        _render_detail_view(st_module, data, str(plan_code))
+        _render_detail_view(st_module, conn, str(plan_code))
     else:
-        _render_list_view(st_module, data)
+        _render_list_view(st_module, conn)
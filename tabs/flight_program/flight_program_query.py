@@ -0,0 +1,340 @@
+import hashlib
+import sqlite3
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from tabs.DonemOgrenci.plan_revize import ensure_revize_sayac
+from tabs.utils.veri_deposu import veri_surumu
+
+# Flight Program sorgu katmanı: plan kodu, gün ve arama metni ucus_planlari'nin yanında
+# flight_program_rows tablosunda önceden hesaplanır (plan sürümü değiştikçe sadece değişen
+# satırlar yenilenir), arama FTS5 trigram indeksiyle yapılır. Liste sayfa sayfa (gün bazında)
+# SQL'de süzülür; durum sorgu içinde (STATUS_SQL) hesaplanır.
+
+ROW_TABLE = "flight_program_rows"
+FTS_TABLE = "flight_program_fts"
+STATE_TABLE = "flight_program_index_state"
+
+# Trigram indeksi 3 karakterden kısa aramalarda kullanılamaz (instr ile aranır)
+FTS_MIN_TERM = 3
+
+PLAN_COLUMNS = [
+    "id", "donem", "ogrenci", "plan_tarihi", "gorev_tipi", "gorev_ismi",
+    "sure", "gerceklesen_sure", "phase", "egitim_yeri", "veri_giris_tarihi",
+]
+INDEXED_COLUMNS = ["donem", "ogrenci", "plan_tarihi", "gorev_tipi", "gorev_ismi", "phase"]
+
+# {veri_giris_tarihi} / {gerceklesen_sure}: _plan_exprs ifadeleri (kolon yoksa NULL)
+STATUS_SQL = """
+    CASE
+        WHEN TRIM(COALESCE({veri_giris_tarihi}, ''), char(32, 9, 10, 13)) != ''
+          OR TRIM(COALESCE({gerceklesen_sure}, ''), char(32, 9, 10, 13)) != '' THEN 'Bitti'
+        WHEN r.gun IS NULL THEN 'Taslak'
+        WHEN r.gun < :today THEN 'Uçuş Takip'
+        WHEN r.gun = :today THEN 'Bugün'
+        ELSE 'Taslak'
+    END
+"""
+
+
+def _plan_exprs(conn: sqlite3.Connection) -> Dict[str, str]:
+    """
+    PLAN_COLUMNS için SELECT ifadeleri: ucus_planlari'nda olmayan kolonlar (ör. egitim_yeri,
+    veri_giris_tarihi, eski tablolarda phase) NULL okunur.
+    """
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(ucus_planlari)")}
+    return {c: f"p.{c}" if c in existing else "NULL" for c in PLAN_COLUMNS}
+
+
+# --- İndeks ---
+def _fts_available(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).fetchone() is not None
+
+
+def ensure_flight_program_index(conn: sqlite3.Connection) -> bool:
+    """Önceden hesaplanmış satır tablosunu ve (destekleniyorsa) FTS5 indeksini kurar; FTS varsa True."""
+    cur = conn.cursor()
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {ROW_TABLE} (
+            id INTEGER PRIMARY KEY,
+            -- ucus_planlari'ndan kopyalanan kolonlar tipsiz: değerler olduğu gibi saklanır,
+            -- değişiklik karşılaştırması (IS NOT) tür dönüşümünden etkilenmez
+            donem,
+            ogrenci,
+            plan_tarihi,
+            gorev_tipi,
+            gorev_ismi,
+            phase,
+            plan_kodu TEXT,
+            gun TEXT,
+            plan_ts TEXT,
+            search_blob TEXT
+        )
+    """)
+    cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{ROW_TABLE}_gun ON {ROW_TABLE}(gun)")
+    cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{ROW_TABLE}_kod ON {ROW_TABLE}(plan_kodu)")
+    cur.execute(f"""
+        CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            kimlik TEXT,
+            surum INTEGER
+        )
+    """)
+    if not _fts_available(conn):
+        try:
+            cur.execute(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(search_blob, tokenize = 'trigram')")
+            # İndeks sonradan kuruldu: mevcut satırlar bir sonraki yenilemede baştan eklenir
+            cur.execute(f"DELETE FROM {STATE_TABLE}")
+            cur.execute(f"DELETE FROM {ROW_TABLE}")
+        except sqlite3.OperationalError:
+            # FTS5 / trigram desteklemeyen SQLite: arama instr ile yapılır
+            pass
+    conn.commit()
+    return _fts_available(conn)
+
+
+def _plan_code(donem, ogrenci, row_id) -> str:
+    seed = f"{donem}-{ogrenci}-{row_id}"
+    hashed = hashlib.sha1(seed.encode("utf-8")).hexdigest().upper()
+    return f"P{int(row_id) % 10000:04}-{hashed[:4]}"
+
+
+def _parse_plan_dates(values: pd.Series) -> pd.Series:
+    # Her benzersiz değer ayrı ayrı okunur (biçimi satırdan satıra değişebilir)
+    unique = {v: pd.to_datetime(v, errors="coerce") for v in pd.unique(values.astype(object))}
+    return pd.to_datetime(values.astype(object).map(unique), errors="coerce")
+
+
+def _note_text(phase: pd.Series, gorev_ismi: pd.Series) -> pd.Series:
+    note = phase.fillna("").astype(str)
+    missing = note.str.strip() == ""
+    note = note.where(~missing, gorev_ismi.where(gorev_ismi.notna(), "-").astype(str))
+    return note.replace({"": "-"})
+
+
+def _index_rows(raw: List[tuple]) -> List[tuple]:
+    df = pd.DataFrame(raw, columns=["id"] + INDEXED_COLUMNS)
+    df["plan_kodu"] = [_plan_code(d, o, i) for d, o, i in zip(df["donem"], df["ogrenci"], df["id"])]
+    ts = _parse_plan_dates(df["plan_tarihi"])
+    df["gun"] = ts.dt.strftime("%Y-%m-%d")
+    df["plan_ts"] = ts.dt.strftime("%Y-%m-%d %H:%M:%S")
+    df["search_blob"] = (
+        df["plan_kodu"]
+        + " " + df["ogrenci"].fillna("").astype(str)
+        + " " + df["gorev_tipi"].fillna("").astype(str)
+        + " " + df["gorev_ismi"].fillna("").astype(str)
+        + " " + _note_text(df["phase"], df["gorev_ismi"])
+    ).str.lower()
+    df = df.astype(object).where(df.notna(), None)
+    return list(df[["id"] + INDEXED_COLUMNS + ["plan_kodu", "gun", "plan_ts", "search_blob"]].itertuples(index=False, name=None))
+
+
+def refresh_flight_program_index(conn: sqlite3.Connection) -> bool:
+    """
+    Plan sürümü son indekslemeden beri değiştiyse yeni / değişen / silinen satırları
+    flight_program_rows ve FTS indeksine yansıtır. Plan tablosu yoksa False.
+    """
+    surum = veri_surumu(conn, "ucus_planlari")
+    if surum is None:
+        return False
+    fts = ensure_flight_program_index(conn)
+    state = conn.execute(f"SELECT kimlik, surum FROM {STATE_TABLE} WHERE id = 1").fetchone()
+    if state is not None and tuple(state) == surum:
+        return True
+
+    exprs = _plan_exprs(conn)
+    degisti = " OR ".join(f"r.{c} IS NOT {exprs[c]}" for c in INDEXED_COLUMNS)
+    cur = conn.cursor()
+    try:
+        deleted = [
+            (r[0],) for r in cur.execute(
+                f"SELECT id FROM {ROW_TABLE} WHERE id NOT IN (SELECT id FROM ucus_planlari)"
+            )
+        ]
+        changed = cur.execute(f"""
+            SELECT p.id, {', '.join(exprs[c] for c in INDEXED_COLUMNS)}
+            FROM ucus_planlari p
+            LEFT JOIN {ROW_TABLE} r ON r.id = p.id
+            WHERE r.id IS NULL OR {degisti}
+        """).fetchall()
+        rows = _index_rows(changed) if changed else []
+
+        cur.executemany(f"DELETE FROM {ROW_TABLE} WHERE id = ?", deleted)
+        cur.executemany(f"INSERT OR REPLACE INTO {ROW_TABLE} VALUES ({', '.join('?' * 11)})", rows)
+        if fts:
+            cur.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = ?", deleted + [(r[0],) for r in rows])
+            cur.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, search_blob) VALUES (?, ?)", [(r[0], r[-1]) for r in rows]
+            )
+        cur.execute(f"INSERT OR REPLACE INTO {STATE_TABLE} (id, kimlik, surum) VALUES (1, ?, ?)", surum)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return True
+
+
+# --- Sorgular ---
+def date_bounds(conn: sqlite3.Connection) -> Tuple[Optional[date], Optional[date]]:
+    """İndekslenmiş planın en erken ve en geç günü (plan yoksa None, None)."""
+    if not refresh_flight_program_index(conn):
+        return None, None
+    lo, hi = conn.execute(f"SELECT MIN(gun), MAX(gun) FROM {ROW_TABLE}").fetchone()
+    if lo is None:
+        return None, None
+    return date.fromisoformat(lo), date.fromisoformat(hi)
+
+
+def _filtered_cte(conn: sqlite3.Connection, filters: Dict[str, object], today: date) -> Tuple[str, Dict]:
+    params: Dict[str, object] = {"today": today.isoformat()}
+    where = []
+    start, end = filters.get("start"), filters.get("end")
+    if start and end:
+        where.append("r.gun BETWEEN :start AND :end")
+        params.update(start=start.isoformat(), end=end.isoformat())
+
+    term = str(filters.get("search", "")).strip().lower()
+    if term:
+        if len(term) >= FTS_MIN_TERM and _fts_available(conn):
+            where.append(f"r.id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :fts)")
+            params["fts"] = '"' + term.replace('"', '""') + '"'
+        else:
+            where.append("instr(r.search_blob, :search) > 0")
+            params["search"] = term
+
+    status_filter = ""
+    statuses = list(filters.get("statuses") or [])
+    if statuses:
+        names = [f":s{i}" for i in range(len(statuses))]
+        params.update({f"s{i}": s for i, s in enumerate(statuses)})
+        status_filter = f"WHERE durum IN ({', '.join(names)})"
+
+    cte = f"""
+        WITH f AS (
+            SELECT * FROM (
+                SELECT r.id, r.gun, {STATUS_SQL.format(**_plan_exprs(conn))} AS durum
+                FROM {ROW_TABLE} r
+                JOIN ucus_planlari p ON p.id = r.id
+                {'WHERE ' + ' AND '.join(where) if where else ''}
+            )
+            {status_filter}
+        )
+    """
+    return cte, params
+
+
+def count_days(conn: sqlite3.Connection, filters: Dict[str, object], today: Optional[date] = None) -> int:
+    """Filtreye uyan plan satırlarının kaç farklı güne yayıldığı (liste sayfalaması gün bazındadır)."""
+    if not refresh_flight_program_index(conn):
+        return 0
+    cte, params = _filtered_cte(conn, filters, today or date.today())
+    return conn.execute(cte + "SELECT COUNT(DISTINCT gun) FROM f", params).fetchone()[0]
+
+
+def _fetch_rows(conn: sqlite3.Connection, cte: str, params: Dict, day_clause: str = "") -> pd.DataFrame:
+    cols = ", ".join(f"{expr} AS {c}" for c, expr in _plan_exprs(conn).items())
+    return pd.read_sql_query(
+        cte + f"""
+        SELECT {cols}, r.plan_kodu, r.plan_ts, f.durum
+        FROM f
+        JOIN ucus_planlari p ON p.id = f.id
+        JOIN {ROW_TABLE} r ON r.id = f.id
+        {day_clause}
+        ORDER BY p.id
+        """,
+        conn,
+        params=params,
+    )
+
+
+def query_page(conn: sqlite3.Connection, filters: Dict[str, object], page: int, page_size: int,
+               today: Optional[date] = None) -> pd.DataFrame:
+    """İstenen sayfadaki günlerin (gün sırasıyla) filtreye uyan plan satırları, görünüm kolonlarıyla."""
+    if not refresh_flight_program_index(conn):
+        return pd.DataFrame()
+    cte, params = _filtered_cte(conn, filters, today or date.today())
+    params = dict(params, limit=int(page_size), offset=(max(int(page), 1) - 1) * int(page_size))
+    day_clause = "WHERE f.gun IN (SELECT DISTINCT gun FROM f ORDER BY gun LIMIT :limit OFFSET :offset)"
+    return decorate_rows(conn, _fetch_rows(conn, cte, params, day_clause))
+
+
+def query_rows(conn: sqlite3.Connection, filters: Dict[str, object], today: Optional[date] = None) -> pd.DataFrame:
+    """Filtreye uyan tüm plan satırları (dışa aktarım için), görünüm kolonlarıyla."""
+    if not refresh_flight_program_index(conn):
+        return pd.DataFrame()
+    cte, params = _filtered_cte(conn, filters, today or date.today())
+    return decorate_rows(conn, _fetch_rows(conn, cte, params))
+
+
+def load_plan_day(conn: sqlite3.Connection, plan_code: str, today: Optional[date] = None) -> Optional[pd.DataFrame]:
+    """
+    Plan kodunun ait olduğu günün tüm plan satırları (detay görünümü). Plan yoksa None,
+    kod bulunamazsa boş DataFrame.
+    """
+    if not refresh_flight_program_index(conn):
+        return None
+    row = conn.execute(
+        f"SELECT gun FROM {ROW_TABLE} WHERE plan_kodu = ? ORDER BY id LIMIT 1", (plan_code,)
+    ).fetchone()
+    if row is None:
+        has_rows = conn.execute(f"SELECT 1 FROM {ROW_TABLE} LIMIT 1").fetchone() is not None
+        return pd.DataFrame() if has_rows else None
+    if row[0] is None:
+        # Tarihsiz plan: sadece kendisi
+        cte, params = _filtered_cte(conn, {}, today or date.today())
+        params = dict(params, plan_kodu=plan_code)
+        return decorate_rows(conn, _fetch_rows(conn, cte, params, "WHERE r.plan_kodu = :plan_kodu"))
+    day = date.fromisoformat(row[0])
+    return query_rows(conn, {"start": day, "end": day}, today)
+
+
+# --- Görünüm kolonları ---
+def load_revision_info(conn: sqlite3.Connection, df: pd.DataFrame) -> pd.Series:
+    """
+    Satırların (donem, ogrenci, gün) anahtarları için plan_revize_sayac'tan revizyon sayısı
+    ("Rev.NN"; kaydı olmayanlar NaN). Sadece verilen satırların anahtarları okunur.
+    """
+    ensure_revize_sayac(conn)
+    keys = pd.DataFrame({
+        "donem": df["donem"].astype(object).where(df["donem"].notna(), ""),
+        "ogrenci": df["ogrenci"].astype(object).where(df["ogrenci"].notna(), ""),
+        "gun": df["plan_tarihi_date"].map(lambda d: d.isoformat() if pd.notna(d) else None),
+    })
+    codes, unique = pd.factorize(pd.MultiIndex.from_frame(keys))
+    cur = conn.cursor()
+    cur.execute("DROP TABLE IF EXISTS temp.fp_rev_anahtar")
+    cur.execute("CREATE TEMP TABLE fp_rev_anahtar (i INTEGER PRIMARY KEY, donem TEXT, ogrenci TEXT, plan_tarihi TEXT)")
+    cur.executemany(
+        "INSERT INTO temp.fp_rev_anahtar VALUES (?, ?, ?, ?)",
+        [(i, *key) for i, key in enumerate(unique) if key[2] is not None],
+    )
+    counts = dict(cur.execute("""
+        SELECT a.i, s.adet
+        FROM temp.fp_rev_anahtar a
+        JOIN plan_revize_sayac s
+          ON s.donem = a.donem AND s.ogrenci = a.ogrenci AND s.plan_tarihi = a.plan_tarihi
+    """).fetchall())
+    cur.execute("DROP TABLE temp.fp_rev_anahtar")
+    revizyon = pd.Series(codes, index=df.index).map(counts)
+    return ("Rev." + revizyon.dropna().astype(int).astype(str).str.zfill(2)).reindex(df.index)
+
+
+def decorate_rows(conn: sqlite3.Connection, df: pd.DataFrame) -> pd.DataFrame:
+    """Sorgu satırlarına liste/detay görünümünün kullandığı kolonları vektörel olarak ekler."""
+    if df.empty:
+        return df
+    # İndekste ayrıştırılmış hali (sabit biçim) kullanılır
+    df["plan_tarihi"] = pd.to_datetime(df.pop("plan_ts"), format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    df = df.sort_values(["plan_tarihi", "ogrenci", "gorev_ismi"], kind="mergesort").reset_index(drop=True)
+    df["plan_tarihi_date"] = df["plan_tarihi"].dt.date
+
+    df["revizyon"] = load_revision_info(conn, df).fillna("Rev.00")
+
+    df["bas_egitmen"] = df["egitim_yeri"].fillna("").replace("", "-")
+    df["not"] = _note_text(df["phase"], df["gorev_ismi"])
+    return df
+
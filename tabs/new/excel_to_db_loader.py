@@ -4,6 +4,8 @@ import sqlite3
 from datetime import datetime
 import re
 
+from tabs.utils.excel_akis import excel_oku
+
 def sureyi_stringe_cevir(sure_cell):
     if pd.isnull(sure_cell):
         return ""
@@ -36,8 +38,7 @@ def tab_sablon_yukle(st):
         if cursor.fetchone():
             st.warning(f"'{sablon_adi}' şablonu zaten mevcut.")
         else:
-            df = pd.read_excel(uploaded_file)
-            df.columns = [c.strip() for c in df.columns]
+            df = excel_oku(uploaded_file)
             required_cols = ["GÖREV TİPİ", "TARİH", "GÖREV İSMİ", "SÜRE"]
 
             if not all(col in df.columns for col in required_cols):
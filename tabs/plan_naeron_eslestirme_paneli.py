@@ -3,6 +3,8 @@ import streamlit as st
 import sqlite3
 import io
 
+from db.migrations import golgesiz_secim
+
 def plan_naeron_eslestirme_ve_elle_duzeltme(st):
     st.subheader("🎯 Plan & Naeron Görev Eşleştirme + Elle Düzeltme")
 
@@ -22,7 +24,7 @@ def plan_naeron_eslestirme_ve_elle_duzeltme(st):
     # PLAN VERİ
     try:
         conn_plan = sqlite3.connect("ucus_egitim.db")
-        df_plan = pd.read_sql_query("SELECT * FROM ucus_planlari", conn_plan, parse_dates=["plan_tarihi"])
+        df_plan = pd.read_sql_query(f"SELECT {golgesiz_secim(conn_plan, 'ucus_planlari')} FROM ucus_planlari", conn_plan, parse_dates=["plan_tarihi"])
         df_plan["sure_str"] = df_plan["sure"].apply(format_sure)
     except Exception as e:
         st.error(f"Plan verisi okunamadı: {e}")
@@ -31,7 +33,7 @@ def plan_naeron_eslestirme_ve_elle_duzeltme(st):
     # NAERON VERİ
     try:
         conn_naeron = sqlite3.connect("naeron_kayitlari.db")
-        df_naeron = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn_naeron)
+        df_naeron = pd.read_sql_query(f"SELECT {golgesiz_secim(conn_naeron, 'naeron_ucuslar')} FROM naeron_ucuslar", conn_naeron)
     except Exception as e:
         st.error(f"Naeron verisi okunamadı: {e}")
         return
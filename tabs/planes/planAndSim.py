@@ -3,12 +3,14 @@ import pandas as pd
 import sqlite3
 import streamlit as st
 
+from db.migrations import golgesiz_secim
+
 def tab_naeron_kayitlari(st):
     st.subheader("🗂 Naeron Veritabanını Görüntüle, Filtrele, Düzelt, Sil")
 
     try:
         conn = sqlite3.connect("naeron_kayitlari.db")
-        df = pd.read_sql_query("SELECT rowid, * FROM naeron_ucuslar", conn)
+        df = pd.read_sql_query(f"SELECT rowid, {golgesiz_secim(conn, 'naeron_ucuslar')} FROM naeron_ucuslar", conn)
 
         if df.empty:
             st.warning("Veritabanında kayıt bulunamadı.")
@@ -3,43 +3,14 @@ import pandas as pd
 from datetime import datetime, timedelta
 import io
 import time
-from tabs.utils.ozet_utils import ozet_panel_verisi_hazirla
-
-# Ay bazlı kaydırma için (yüklü değilse: pip install python-dateutil)
-try:
-    from dateutil.relativedelta import relativedelta
-    _HAS_RELDELTA = True
-except Exception:
-    _HAS_RELDELTA = False
-
-
-def _sec_en_ileri_referans(df: pd.DataFrame, bugun: pd.Timestamp):
-    """
-    df: içinde 'durum' ve 'plan_tarihi' sütunları olan DataFrame
-    bugun: pd.Timestamp; sadece > bugun olan tarihler dikkate alınır
-
-    Dönüş:
-      (ref_tarih, ref_durum) -> ('🟢 Uçuş Yapıldı' veya '🟣 Eksik Uçuş Saati')
-      eğer ileri tarihli 🟢/🟣 yoksa (None, None)
-    """
-    if df is None or df.empty:
-        return None, None
-
-    d = df.copy()
-    d["plan_tarihi"] = pd.to_datetime(d["plan_tarihi"], errors="coerce")
-
-    mask_yesil = (d["durum"] == "🟢 Uçuş Yapıldı") & (d["plan_tarihi"] > bugun)
-    mask_mor   = (d["durum"] == "🟣 Eksik Uçuş Saati") & (d["plan_tarihi"] > bugun)
-
-    max_yesil = d.loc[mask_yesil, "plan_tarihi"].max() if mask_yesil.any() else pd.NaT
-    max_mor   = d.loc[mask_mor,   "plan_tarihi"].max() if mask_mor.any()   else pd.NaT
-
-    if pd.isna(max_yesil) and pd.isna(max_mor):
-        return None, None
-    if pd.isna(max_mor) or (not pd.isna(max_yesil) and max_yesil >= max_mor):
-        return max_yesil.normalize(), "🟢 Uçuş Yapıldı"
-    else:
-        return max_mor.normalize(), "🟣 Eksik Uçuş Saati"
+from tabs.utils.donem_tarama import ileri_uculmus_tara
+from tabs.utils.ogrenci_kodu import plan_ogrenci_kodu
+from tabs.utils.revize_simulasyon import (
+    KAYDIRMA_MODLARI,
+    EskiSimulasyonHatasi,
+    revize_simule_et,
+    simulasyonu_uygula,
+)
 
 
 def ileride_gidenleri_tespit_et(conn):
@@ -52,7 +23,7 @@ def ileride_gidenleri_tespit_et(conn):
     # 🔄 Kaydırma Modu (öğrenciye özel)
     kaydirma_modu = st.radio(
         "Kaydırma Modu",
-        ["Bugüne çek", "Hedef tarihe çek", "Sabit miktar kadar geri al"],
+        KAYDIRMA_MODLARI,
         horizontal=True,
         key="revize_kaydirma_modu",
     )
@@ -66,86 +37,46 @@ def ileride_gidenleri_tespit_et(conn):
     elif kaydirma_modu == "Sabit miktar kadar geri al":
         sabit_birim = st.radio("Birim", ["Gün", "Ay"], horizontal=True, key="revize_sabit_birim")
         sabit_miktar = st.number_input("Miktar", min_value=1, value=30, step=1, key="revize_sabit_miktar")
-        if sabit_birim == "Ay" and not _HAS_RELDELTA:
-            st.warning("‘Ay’ bazlı kaydırma için python-dateutil (relativedelta) gerekli. Gün bazına geçebilirsiniz.")
 
     if st.button("🔄 Seçili Öğrencinin Tüm Planını Önizle ve Revize Et", key="btn_revize_onizle"):
-        df_all, *_ = ozet_panel_verisi_hazirla(secilen_ogrenci_revize, conn)
-        if df_all is None or df_all.empty:
-            st.warning("Bu öğrenci için plan bulunamadı.")
-            st.session_state["zincir_revize_df"] = None
-        else:
-            # Tarih güvence
-            df_all["plan_tarihi"] = pd.to_datetime(df_all["plan_tarihi"], errors="coerce")
-            bugun = pd.to_datetime(datetime.today().date())
-
-            # 🟢/🟣 ileri tarih içinden referans seç
-            ref_tarih, ref_durum = _sec_en_ileri_referans(df_all, bugun)
-
-            if ref_tarih is None:
-                st.warning("Bu öğrenci için ileri tarihte 🟢/🟣 görev yok, revize yapılmayacak.")
-                st.session_state["zincir_revize_df"] = None
+        # Kuru çalıştırma: plan bellekte kaydırılır, DB'ye onayda yazılır
+        sim = revize_simule_et(
+            conn,
+            kaydirma_modu,
+            ogrenci_kodlari=plan_ogrenci_kodu(pd.Series([secilen_ogrenci_revize])).tolist(),
+            hedef_tarih=hedef_tarih,
+            birim=sabit_birim or "Gün",
+            miktar=int(sabit_miktar or 30),
+        )
+        st.session_state["zincir_revize_sim"] = None
+        if not sim["atlanan"].empty:
+            atl = sim["atlanan"].iloc[0]
+            if atl["sebep"] == "Kaydırma gerekmiyor":
+                st.success("Seçilen moda göre kaydırma gerekmiyor.")
             else:
-                st.info(f"Referans (en ileri) görev: {ref_tarih.date()} • Statü: {ref_durum}  (Bugün: {bugun.date()})")
-
-                # 🔢 Fark (gün) belirle – ref_tarih esas
-                if kaydirma_modu == "Bugüne çek":
-                    hedef = bugun
-                    fark_gun = int((ref_tarih - hedef).days)
-
-                elif kaydirma_modu == "Hedef tarihe çek":
-                    hedef = pd.to_datetime(hedef_tarih)
-                    if hedef >= ref_tarih:
-                        st.error("Hedef tarih, referans tarihten önce olmalı (geri çekiyoruz).")
-                        st.session_state["zincir_revize_df"] = None
-                        st.stop()
-                    fark_gun = int((ref_tarih - hedef).days)
-
-                else:  # Sabit miktar kadar geri al
-                    miktar = int(sabit_miktar)
-                    if sabit_birim == "Ay":
-                        if _HAS_RELDELTA:
-                            hedef = ref_tarih - relativedelta(months=miktar)
-                            fark_gun = int((ref_tarih - hedef).days)
-                        else:
-                            hedef = ref_tarih - timedelta(days=miktar)
-                            fark_gun = miktar
-                    else:
-                        hedef = ref_tarih - timedelta(days=miktar)
-                        fark_gun = miktar
-
-                if fark_gun <= 0:
-                    st.success("Seçilen moda göre kaydırma gerekmiyor.")
-                    st.dataframe(df_all[["ogrenci", "gorev_ismi", "plan_tarihi", "durum"]], use_container_width=True)
-                    st.session_state["zincir_revize_df"] = None
-                else:
-                    df_all["yeni_plan_tarihi"] = df_all["plan_tarihi"] - pd.to_timedelta(fark_gun, unit="D")
-                    st.write(f"🧮 Referans {ref_durum} {ref_tarih.date()} → {int(fark_gun)} gün geri; tüm plan {int(fark_gun)} gün geri alınacak.")
-                    st.dataframe(
-                        df_all[["ogrenci", "gorev_ismi", "plan_tarihi", "yeni_plan_tarihi", "durum"]],
-                        use_container_width=True
-                    )
-                    st.session_state["zincir_revize_df"] = df_all.copy()
+                st.error(f"{atl['sebep']} (Referans: {atl['ref_tarih'].date()})")
+        elif sim["ozet"].empty:
+            st.warning("Bu öğrenci için ileri tarihte 🟢/🟣 görev yok, revize yapılmayacak.")
+        else:
+            oz = sim["ozet"].iloc[0]
+            st.info(f"Referans (en ileri) görev: {oz['ref_tarih'].date()} • Statü: {oz['ref_durum']}  (Bugün: {sim['bugun'].date()})")
+            st.write(f"🧮 Referans {oz['ref_durum']} {oz['ref_tarih'].date()} → {int(oz['fark_gun'])} gün geri; tüm plan {int(oz['fark_gun'])} gün geri alınacak.")
+            st.dataframe(
+                sim["plan"][["ogrenci", "gorev_ismi", "plan_tarihi", "yeni_plan_tarihi", "durum"]],
+                use_container_width=True
+            )
+            st.session_state["zincir_revize_sim"] = sim
 
     # Onay butonu (her zaman en altta!)
-    if "zincir_revize_df" in st.session_state and st.session_state["zincir_revize_df"] is not None:
+    if st.session_state.get("zincir_revize_sim") is not None:
         if st.button("✅ Onayla ve Veritabanında Güncelle", key="btn_revize_update", type="primary"):
-            df_all = st.session_state["zincir_revize_df"]
-            cursor = conn.cursor()
-            guncel = 0
-            for _, row in df_all.iterrows():
-                eski = pd.to_datetime(row["plan_tarihi"])
-                yeni = pd.to_datetime(row["yeni_plan_tarihi"])
-                if pd.isna(eski) or pd.isna(yeni):
-                    continue
-                cursor.execute(
-                    "UPDATE ucus_planlari SET plan_tarihi = ? WHERE ogrenci = ? AND gorev_ismi = ? AND plan_tarihi = ?",
-                    (yeni.strftime("%Y-%m-%d"), row["ogrenci"], row["gorev_ismi"], eski.strftime("%Y-%m-%d"))
-                )
-                guncel += 1
-            conn.commit()
-            st.success(f"Tüm plan başarıyla güncellendi! (Toplam {guncel} satır)  •  Sayfayı yenileyebilirsiniz.")
-            st.session_state["zincir_revize_df"] = None
+            try:
+                sonuc = simulasyonu_uygula(conn, st.session_state["zincir_revize_sim"])
+            except EskiSimulasyonHatasi as e:
+                st.warning(str(e))
+            else:
+                st.success(f"Tüm plan başarıyla güncellendi! (Toplam {sonuc['guncellenen']} satır)  •  Sayfayı yenileyebilirsiniz.")
+            st.session_state["zincir_revize_sim"] = None
 
     # --- 5) 🌐 EN ALTA: TOPLU TARA & TOPLU REVİZE ET ---
     st.markdown("---")
@@ -167,6 +98,10 @@ def ileride_gidenleri_tespit_et(conn):
         else:
             secilen_donem_global = st.selectbox("📆 Dönem seçiniz", _donemler_all, key="global_donem_select")
 
+    paralel_tara = scope == "Tüm Dönemler" and st.checkbox(
+        "⚡ Dönemleri paralel tara", value=False, key="global_paralel_tara"
+    )
+
     colg1, colg2 = st.columns(2)
     with colg1:
         tara_clicked = st.button(
@@ -187,64 +122,18 @@ def ileride_gidenleri_tespit_et(conn):
 
     # ---------- TARA ----------
     if tara_clicked:
-        bugun = pd.to_datetime(datetime.today().date())
-        sonuc = []
-
-        if scope == "Seçili Dönem":
-            if not secilen_donem_global:
-                st.warning("Dönem seçiniz.")
-            else:
-                ogrs = pd.read_sql_query(
-                    "SELECT DISTINCT ogrenci FROM ucus_planlari WHERE donem = ?",
-                    conn, params=[secilen_donem_global]
-                )["ogrenci"].tolist()
-                for o in ogrs:
-                    df_o, *_ = ozet_panel_verisi_hazirla(o, conn)
-                    if df_o is None or df_o.empty:
-                        continue
-                    # Dönem süz
-                    df_o = df_o[df_o.get("donem").astype(str) == str(secilen_donem_global)]
-                    # Tarih güvence
-                    df_o["plan_tarihi"] = pd.to_datetime(df_o["plan_tarihi"], errors="coerce")
-                    ileri = df_o[df_o["durum"].isin(ucus_yapilmis_durumlar) & (df_o["plan_tarihi"] > bugun)]
-                    if not ileri.empty:
-                        ileri = ileri.copy()
-                        ileri["donem"] = secilen_donem_global
-                        ileri["ogrenci"] = ileri.get("ogrenci", o)
-                        for _, r in ileri.iterrows():
-                            rec = {k: r[k] for k in gosterilecekler if k in ileri.columns}
-                            sonuc.append(rec)
+        if scope == "Seçili Dönem" and not secilen_donem_global:
+            st.warning("Dönem seçiniz.")
+            df_global = pd.DataFrame()
         else:
-            # Tüm dönemler
-            donemler_all = pd.read_sql_query("SELECT DISTINCT donem FROM ucus_planlari", conn)["donem"].dropna().tolist()
-            for d in donemler_all:
-                ogrs = pd.read_sql_query(
-                    "SELECT DISTINCT ogrenci FROM ucus_planlari WHERE donem = ?",
-                    conn, params=[d]
-                )["ogrenci"].tolist()
-                for o in ogrs:
-                    df_o, *_ = ozet_panel_verisi_hazirla(o, conn)
-                    if df_o is None or df_o.empty:
-                        continue
-                    df_o["plan_tarihi"] = pd.to_datetime(df_o["plan_tarihi"], errors="coerce")
-                    ileri = df_o[df_o["durum"].isin(ucus_yapilmis_durumlar) & (df_o["plan_tarihi"] > bugun)]
-                    if not ileri.empty:
-                        ileri = ileri.copy()
-                        ileri["donem"] = d
-                        ileri["ogrenci"] = ileri.get("ogrenci", o)
-                        for _, r in ileri.iterrows():
-                            rec = {k: r[k] for k in gosterilecekler if k in ileri.columns}
-                            sonuc.append(rec)
-
-        if sonuc:
-            df_global = pd.DataFrame(sonuc)
-            # Sütun garanti + sıralama
-            for c in gosterilecekler:
-                if c not in df_global.columns:
-                    df_global[c] = None
-            df_global["plan_tarihi"] = pd.to_datetime(df_global["plan_tarihi"], errors="coerce")
-            df_global = df_global.sort_values(["donem", "ogrenci", "plan_tarihi", "gorev_ismi"], na_position="last").reset_index(drop=True)
+            # Dönem bazında tarama (paralel seçiliyse dönemler süreç havuzunda)
+            df_global = ileri_uculmus_tara(
+                conn,
+                donemler=[secilen_donem_global] if scope == "Seçili Dönem" else None,
+                paralel=paralel_tara,
+            )
 
+        if not df_global.empty:
             # Görünüm için key üret
             df_global["row_key"] = df_global.apply(
                 lambda row: f"{row.get('donem','')}|{row.get('ogrenci','?')}|{row.get('gorev_ismi','?')}|{_safe_date_for_key(row.get('plan_tarihi'))}",
@@ -324,7 +213,7 @@ def ileride_gidenleri_tespit_et(conn):
 
         kaydirma_modu_g = st.radio(
             "Global Kaydırma Modu",
-            ["Bugüne çek", "Hedef tarihe çek", "Sabit miktar kadar geri al"],
+            KAYDIRMA_MODLARI,
             horizontal=True,
             key=f"global_kaydirma_modu_{scope}_{secilen_donem_global or 'ALL'}"
         )
@@ -341,76 +230,59 @@ def ileride_gidenleri_tespit_et(conn):
         elif kaydirma_modu_g == "Sabit miktar kadar geri al":
             sabit_birim_g = st.radio("Birim (Global)", ["Gün", "Ay"], horizontal=True, key=f"global_birim_{scope}_{secilen_donem_global or 'ALL'}")
             sabit_miktar_g = st.number_input("Miktar (Global)", min_value=1, value=30, step=1, key=f"global_miktar_{scope}_{secilen_donem_global or 'ALL'}")
-            if sabit_birim_g == "Ay" and not _HAS_RELDELTA:
-                st.warning("‘Ay’ bazlı kaydırma için python-dateutil (relativedelta) gerekli. Gün bazına geçebilirsiniz.")
 
     if revize_clicked:
         secili = st.session_state.get("global_secili_df")
         if secili is None or secili.empty:
             st.info("Global revize için kayıt seçilmedi.")
+            st.session_state["global_revize_sim"] = None
         else:
-            bugun = pd.to_datetime(datetime.today().date())
-            cursor = conn.cursor()
-            toplam_guncellenen = 0
-
-            # Öğrenci bazında referans (🟢/🟣) seç → hedefe göre fark → tüm planı zincir halinde geri al
-            for ogr in secili["ogrenci"].unique().tolist():
-                df_o, *_ = ozet_panel_verisi_hazirla(ogr, conn)
-                if df_o is None or df_o.empty:
-                    continue
-
-                df_o["plan_tarihi"] = pd.to_datetime(df_o["plan_tarihi"], errors="coerce")
-
-                ref_tarih, ref_durum = _sec_en_ileri_referans(df_o, bugun)
-                if ref_tarih is None:
-                    continue  # bu öğrenci için ileri 🟢/🟣 yok
-
-                # Global kaydırma modu ve fark
-                _mod_key = f"global_kaydirma_modu_{scope}_{secilen_donem_global or 'ALL'}"
-                kaymod = st.session_state.get(_mod_key, "Bugüne çek")
-
-                if kaymod == "Bugüne çek":
-                    hedef = bugun
-                    fark = int((ref_tarih - hedef).days)
-                elif kaymod == "Hedef tarihe çek":
-                    hedef = pd.to_datetime(st.session_state.get(f"global_hedef_{scope}_{secilen_donem_global or 'ALL'}", bugun.date()))
-                    if hedef >= ref_tarih:
-                        st.warning(f"[{ogr}] Hedef tarih referans tarihten önce olmalı, atlandı. (Ref: {ref_tarih.date()} • {ref_durum})")
-                        continue
-                    fark = int((ref_tarih - hedef).days)
-                else:  # Sabit miktar
-                    birim = st.session_state.get(f"global_birim_{scope}_{secilen_donem_global or 'ALL'}", "Gün")
-                    miktar = int(st.session_state.get(f"global_miktar_{scope}_{secilen_donem_global or 'ALL'}", 30))
-                    if birim == "Ay":
-                        if _HAS_RELDELTA:
-                            hedef = ref_tarih - relativedelta(months=miktar)
-                            fark = int((ref_tarih - hedef).days)
-                        else:
-                            hedef = ref_tarih - timedelta(days=miktar)
-                            fark = miktar
-                    else:
-                        hedef = ref_tarih - timedelta(days=miktar)
-                        fark = miktar
-
-                if fark <= 0:
-                    continue
-
-                # Zincir halinde tüm planı geri al
-                df_o["yeni_plan_tarihi"] = df_o["plan_tarihi"] - pd.to_timedelta(fark, unit="D")
-                for _, r in df_o.iterrows():
-                    _pt_old = pd.to_datetime(r["plan_tarihi"])
-                    _pt_new = pd.to_datetime(r["yeni_plan_tarihi"])
-                    if pd.isna(_pt_old) or pd.isna(_pt_new):
-                        continue
-                    cursor.execute(
-                        "UPDATE ucus_planlari SET plan_tarihi = ? WHERE ogrenci = ? AND gorev_ismi = ? AND plan_tarihi = ?",
-                        (_pt_new.strftime("%Y-%m-%d"), r.get("ogrenci", ogr), r["gorev_ismi"], _pt_old.strftime("%Y-%m-%d"))
-                    )
-                    toplam_guncellenen += 1
-
-            conn.commit()
-            st.success(f"🌐 Global revize tamamlandı. Güncellenen toplam kayıt: {toplam_guncellenen}")
+            # Seçilen öğrencilerin planları bellekte kaydırılır; yazma aşağıdaki onayla yapılır
+            _sfx = f"{scope}_{secilen_donem_global or 'ALL'}"
+            st.session_state["global_revize_sim"] = revize_simule_et(
+                conn,
+                st.session_state.get(f"global_kaydirma_modu_{_sfx}", "Bugüne çek"),
+                ogrenci_kodlari=plan_ogrenci_kodu(pd.Series(secili["ogrenci"].unique())).tolist(),
+                hedef_tarih=st.session_state.get(f"global_hedef_{_sfx}", datetime.today().date()),
+                birim=st.session_state.get(f"global_birim_{_sfx}", "Gün"),
+                miktar=int(st.session_state.get(f"global_miktar_{_sfx}", 30)),
+            )
 
-            # Ekranı sıfırla
-            st.session_state["global_ileri_uculmus_df"] = pd.DataFrame()
-            st.session_state["global_secili_df"] = pd.DataFrame()
+    sim_g = st.session_state.get("global_revize_sim")
+    if sim_g is not None:
+        st.markdown("### 🧪 Global Revize Önizlemesi")
+        for _, atl in sim_g["atlanan"].iterrows():
+            st.warning(f"[{atl['ogrenci']}] {atl['sebep']}, atlandı. (Ref: {atl['ref_tarih'].date()})")
+        if sim_g["fark"].empty:
+            st.info("Seçilen kural ile değişecek kayıt yok.")
+        else:
+            st.write(
+                f"{len(sim_g['ozet'])} öğrenci • {len(sim_g['fark'])} görev geri alınacak "
+                f"(Kural: {sim_g['kural']['mod']})"
+            )
+            st.dataframe(
+                sim_g["ozet"].reset_index()[["ogrenci", "ref_tarih", "ref_durum", "hedef", "fark_gun", "satir"]],
+                use_container_width=True, hide_index=True
+            )
+            with st.expander("Önerilen plan", expanded=False):
+                st.dataframe(sim_g["plan"].drop(columns=["id"]), use_container_width=True, hide_index=True)
+
+        col_ok, col_iptal = st.columns(2)
+        with col_ok:
+            onay = st.button("✅ Önizlemeyi Onayla ve Uygula", key="btn_global_revize_onay",
+                             type="primary", disabled=sim_g["fark"].empty)
+        with col_iptal:
+            iptal = st.button("✖️ Önizlemeyi Kapat", key="btn_global_revize_iptal")
+        if iptal:
+            st.session_state["global_revize_sim"] = None
+        elif onay:
+            try:
+                sonuc = simulasyonu_uygula(conn, sim_g)
+            except EskiSimulasyonHatasi as e:
+                st.warning(str(e))
+            else:
+                st.success(f"🌐 Global revize tamamlandı. Güncellenen toplam kayıt: {sonuc['guncellenen']}")
+                # Ekranı sıfırla
+                st.session_state["global_ileri_uculmus_df"] = pd.DataFrame()
+                st.session_state["global_secili_df"] = pd.DataFrame()
+            st.session_state["global_revize_sim"] = None
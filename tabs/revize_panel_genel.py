@@ -1,5 +1,9 @@
-def hazirla_tum_donemler_df(conn, bugun=None):
-    """Hazirlar ve dondurulmus veriyi dataframe olarak dondurur."""
+def hazirla_tum_donemler_df(conn, bugun=None, ogrenci_kodlari=None, paralel=False, max_workers=None):
+    """
+    Hazirlar ve dondurulmus veriyi dataframe olarak dondurur.
+    ogrenci_kodlari verilirse sadece bu ogrenciler taranir (artimli otomatik revize).
+    paralel=True iken donemler surec havuzunda ayri ayri taranir (bkz. donem_tarama.donem_bazinda).
+    """
     if bugun is None:
         bugun = datetime.today().date()
     bugun_ts = pd.to_datetime(bugun)
@@ -12,29 +16,19 @@ def hazirla_tum_donemler_df(conn, bugun=None):
         return None
 
     gosterilecekler = ["donem", "ogrenci", "plan_tarihi", "gorev_ismi", "sure", "durum"]
-    sonuc_listesi = []
-    for donem in donemler:
-        ogrenciler = pd.read_sql_query(
-            "SELECT DISTINCT ogrenci FROM ucus_planlari WHERE donem = ?",
-            conn,
-            params=[donem]
-        )["ogrenci"].tolist()
-        for ogrenci in ogrenciler:
-            df_ogrenci, *_ = ozet_panel_verisi_hazirla(ogrenci, conn)
-            df_ogrenci = df_ogrenci[df_ogrenci["donem"] == donem]
-            durum_mask = df_ogrenci['durum'].fillna('').astype(str).str.contains('eksik', case=False)
-            df_eksik = df_ogrenci[durum_mask & (df_ogrenci['plan_tarihi'] < bugun_ts)]
-            if not df_eksik.empty:
-                ilk_eksik = df_eksik.sort_values("plan_tarihi").iloc[0]
-                row = {"donem": donem, "ogrenci": ogrenci}
-                row.update({k: ilk_eksik[k] for k in gosterilecekler if k in ilk_eksik})
-                sonuc_listesi.append(row)
-
-    if not sonuc_listesi:
+
+    # Donem parcalarinda gecikmis eksik gorevler; (donem, ogrenci) basina ilki groupby ile
+    df_eksik = parcalari_birlestir(donem_bazinda(
+        conn, gecikmis_eksikler, bugun_ts,
+        ogrenci_kodlari=ogrenci_kodlari, paralel=paralel, max_workers=max_workers
+    ))
+    if df_eksik.empty:
         return pd.DataFrame()
 
-    df_sonuc = pd.DataFrame(sonuc_listesi)
-    return df_sonuc
+    df_eksik = df_eksik.sort_values(["sira", "plan_tarihi"], kind="mergesort")
+    ilk_eksikler = df_eksik.groupby(["donem", "ogrenci_kodu"], sort=False).head(1)
+    df_sonuc = ilk_eksikler[[k for k in gosterilecekler if k in ilk_eksikler.columns]]
+    return df_sonuc.reset_index(drop=True)
 
 import streamlit as st
 import pandas as pd
@@ -42,6 +36,7 @@ from datetime import datetime, timedelta
 import io
 
 from tabs.utils.ozet_utils import ozet_panel_verisi_hazirla
+from tabs.utils.donem_tarama import donem_bazinda, gecikmis_eksikler, parcalari_birlestir
 
 def _render_tum_donemler_panel(df_sonuc: pd.DataFrame, conn) -> None:
     df_sonuc = df_sonuc.sort_values(['donem', 'ogrenci', 'plan_tarihi']).reset_index(drop=True)
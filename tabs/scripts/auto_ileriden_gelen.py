@@ -4,57 +4,41 @@ from datetime import datetime, timedelta
 import io
 import time
 from tabs.utils.ozet_utils import ozet_panel_verisi_hazirla
+from tabs.utils.donem_tarama import donem_bazinda, ileri_kaydirma_plani, ileri_uculmus_tara, parcalari_birlestir
 
 # === YENİ: UI'siz (headless) toplu revize fonksiyonu =========================
-def otomatik_global_revize(conn, donem: str | int = "127") -> int:
+def otomatik_global_revize(conn, donem: str | int | None = "127", paralel: bool = False, max_workers=None) -> int:
     """
-    UI olmadan çalışır. Verilen 'donem' içindeki tüm öğrencilerde
+    UI olmadan çalışır. Verilen 'donem' (None: tüm dönemler) içindeki tüm öğrencilerde
     ileri tarihe 'uçuş yapılmış' kayıt varsa planı bugüne çeker.
+    Tarama dönem bazında (paralel=True iken süreç havuzunda) yapılır; güncellemeler burada
+    tek transaction'da yazılır.
     Dönüş: güncellenen satır sayısı (int).
     """
-    ucus_yapilmis_durumlar = ["🟢 Uçuş Yapıldı", "🟣 Eksik Uçuş Saati"]
     bugun = pd.to_datetime(datetime.today().date())
-    toplam_guncellenen = 0
-    cur = conn.cursor()
-
-    # İlgili dönemin öğrencileri
-    ogrs = pd.read_sql_query(
-        "SELECT DISTINCT ogrenci FROM ucus_planlari WHERE donem = ?",
-        conn, params=[str(donem)]
-    )["ogrenci"].tolist()
-
-    for ogr in ogrs:
-        df_o, *_ = ozet_panel_verisi_hazirla(ogr, conn)
-        if df_o is None or df_o.empty:
-            continue
-
-        # Sadece bu dönem
-        df_o = df_o[df_o.get("donem").astype(str) == str(donem)].copy()
-        df_o["plan_tarihi"] = pd.to_datetime(df_o["plan_tarihi"], errors="coerce")
-        ileri_o = df_o[df_o["durum"].isin(ucus_yapilmis_durumlar) & (df_o["plan_tarihi"] > bugun)]
-        if ileri_o.empty:
-            continue
-
-        max_t = ileri_o["plan_tarihi"].max()
-        fark = (max_t - bugun).days
-        if fark <= 0:
-            continue
-
-        # Tüm planı aynı fark kadar geri al
-        df_o["yeni_plan_tarihi"] = df_o["plan_tarihi"] - timedelta(days=fark)
-        for _, r in df_o.iterrows():
-            _pt_old = r["plan_tarihi"]
-            _pt_new = r["yeni_plan_tarihi"]
-            if pd.isna(_pt_old) or pd.isna(_pt_new):
-                continue
-            cur.execute(
-                "UPDATE ucus_planlari SET plan_tarihi = ? WHERE ogrenci = ? AND gorev_ismi = ? AND plan_tarihi = ?",
-                (_pt_new.strftime("%Y-%m-%d"), r.get("ogrenci", ogr), r["gorev_ismi"], _pt_old.strftime("%Y-%m-%d"))
-            )
-            toplam_guncellenen += 1
-
-    conn.commit()
-    return toplam_guncellenen
+    plan = parcalari_birlestir(donem_bazinda(
+        conn, ileri_kaydirma_plani, bugun,
+        donemler=None if donem is None else [donem], paralel=paralel, max_workers=max_workers
+    ))
+    if plan.empty:
+        return 0
+
+    satirlar = list(zip(
+        plan["yeni_plan_tarihi"].dt.strftime("%Y-%m-%d"),
+        plan["ogrenci"],
+        plan["gorev_ismi"],
+        plan["plan_tarihi"].dt.strftime("%Y-%m-%d"),
+    ))
+    try:
+        conn.executemany(
+            "UPDATE ucus_planlari SET plan_tarihi = ? WHERE ogrenci = ? AND gorev_ismi = ? AND plan_tarihi = ?",
+            satirlar
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return len(satirlar)
 
 
 # === VAR OLAN FONKSİYONA SADECE PARAMETRELER ve OTOMATİK AKIŞ EKLENDİ ========
@@ -136,6 +120,10 @@ def ileride_gidenleri_tespit_et(
             else:
                 secilen_donem_global = st.selectbox("📆 Dönem seçiniz", _donemler_all, key="global_donem_select")
 
+    paralel_tara = scope == "Tüm Dönemler" and st.checkbox(
+        "⚡ Dönemleri paralel tara", value=False, key="global_paralel_tara"
+    )
+
     colg1, colg2 = st.columns(2)
     with colg1:
         tara_clicked = st.button(
@@ -160,64 +148,18 @@ def ileride_gidenleri_tespit_et(
 
     # ---------- TARA ----------
     if tara_clicked:
-        bugun = pd.to_datetime(datetime.today().date())
-        sonuc = []
-
-        if scope == "Seçili Dönem":
-            if not secilen_donem_global:
-                st.warning("Dönem seçiniz.")
-            else:
-                ogrs = pd.read_sql_query(
-                    "SELECT DISTINCT ogrenci FROM ucus_planlari WHERE donem = ?",
-                    conn, params=[secilen_donem_global]
-                )["ogrenci"].tolist()
-                for o in ogrs:
-                    df_o, *_ = ozet_panel_verisi_hazirla(o, conn)
-                    if df_o is None or df_o.empty:
-                        continue
-                    # Dönem süz
-                    df_o = df_o[df_o.get("donem").astype(str) == str(secilen_donem_global)]
-                    # Tarih güvence
-                    df_o["plan_tarihi"] = pd.to_datetime(df_o["plan_tarihi"], errors="coerce")
-                    ileri = df_o[df_o["durum"].isin(ucus_yapilmis_durumlar) & (df_o["plan_tarihi"] > bugun)]
-                    if not ileri.empty:
-                        ileri = ileri.copy()
-                        ileri["donem"] = secilen_donem_global
-                        ileri["ogrenci"] = ileri.get("ogrenci", o)
-                        for _, r in ileri.iterrows():
-                            rec = {k: r[k] for k in gosterilecekler if k in ileri.columns}
-                            sonuc.append(rec)
+        if scope == "Seçili Dönem" and not secilen_donem_global:
+            st.warning("Dönem seçiniz.")
+            df_global = pd.DataFrame()
         else:
-            # Tüm dönemler
-            donemler_all = pd.read_sql_query("SELECT DISTINCT donem FROM ucus_planlari", conn)["donem"].dropna().tolist()
-            for d in donemler_all:
-                ogrs = pd.read_sql_query(
-                    "SELECT DISTINCT ogrenci FROM ucus_planlari WHERE donem = ?",
-                    conn, params=[d]
-                )["ogrenci"].tolist()
-                for o in ogrs:
-                    df_o, *_ = ozet_panel_verisi_hazirla(o, conn)
-                    if df_o is None or df_o.empty:
-                        continue
-                    df_o["plan_tarihi"] = pd.to_datetime(df_o["plan_tarihi"], errors="coerce")
-                    ileri = df_o[df_o["durum"].isin(ucus_yapilmis_durumlar) & (df_o["plan_tarihi"] > bugun)]
-                    if not ileri.empty:
-                        ileri = ileri.copy()
-                        ileri["donem"] = d
-                        ileri["ogrenci"] = ileri.get("ogrenci", o)
-                        for _, r in ileri.iterrows():
-                            rec = {k: r[k] for k in gosterilecekler if k in ileri.columns}
-                            sonuc.append(rec)
-
-        if sonuc:
-            df_global = pd.DataFrame(sonuc)
-            # Sütun garanti + sıralama
-            for c in gosterilecekler:
-                if c not in df_global.columns:
-                    df_global[c] = None
-            df_global["plan_tarihi"] = pd.to_datetime(df_global["plan_tarihi"], errors="coerce")
-            df_global = df_global.sort_values(["donem", "ogrenci", "plan_tarihi", "gorev_ismi"], na_position="last").reset_index(drop=True)
+            # Dönem bazında tarama (paralel seçiliyse dönemler süreç havuzunda)
+            df_global = ileri_uculmus_tara(
+                conn,
+                donemler=[secilen_donem_global] if scope == "Seçili Dönem" else None,
+                paralel=paralel_tara,
+            )
 
+        if not df_global.empty:
             # Görünüm için key üret
             df_global["row_key"] = df_global.apply(
                 lambda row: f"{row.get('donem','')}|{row.get('ogrenci','?')}|{row.get('gorev_ismi','?')}|{_safe_date_for_key(row.get('plan_tarihi'))}",
@@ -86,12 +86,19 @@ def auto_refresh_panel(
     scheduler = None
     scheduler_result = None
     scheduler_error = None
+    durum_conn = None
     if enable_revize_controls and conn is not None:
+        # Revize sayfa içinde çalışmaz: zamanlama ve istekler arka plan worker'ında (revize_worker)
         try:
             from tabs.scripts.revize_scheduler import AutoRevizeScheduler
+            from tabs.scripts import revize_worker
 
             scheduler = AutoRevizeScheduler()
-            scheduler_result = scheduler.run_if_due(conn)
+            durum_conn = revize_worker.durum_baglan()
+            if scheduler.config.get("enabled", False):
+                revize_worker.worker_baslat(durum_conn)
+            son = revize_worker.son_isler(durum_conn, limit=1)
+            scheduler_result = son[0] if son else None
         except Exception as exc:  # noqa: BLE001
             scheduler_error = str(exc)
 
@@ -185,19 +192,9 @@ def auto_refresh_panel(
                         st.success("Otomatik revize ayarlari guncellendi.")
 
                     if col_run.button("Simdi calistir", key=f"{key}_rev_run"):
-                        run_now = scheduler.run_now(conn)
-                        status_now = run_now.get("status")
-                        summary_now = run_now.get("summary", {})
-                        if status_now == "completed":
-                            st.success(f"Revize tamamlandi: {summary_now.get('gorev_sayisi', 0)} gorev guncellendi.")
-                        elif status_now == "no_missing":
-                            st.info("Revize calisti ancak guncellenecek kayit bulunmadi.")
-                        elif status_now == "no_period":
-                            st.warning("Veritabanda planlanan donem bulunamadi.")
-                        else:
-                            st.error(f"Revize tamamlanamadi: {status_now}.")
-                        if run_now.get("log_path"):
-                            st.caption(f"Log: {run_now['log_path']}")
+                        is_id = revize_worker.is_iste(durum_conn, "elle")
+                        revize_worker.worker_baslat(durum_conn)
+                        st.info(f"Revize istegi arka plan worker'ina iletildi (is #{is_id}).")
 
                     last_status = cfg.get("last_run_status")
                     last_date = cfg.get("last_run_date")
@@ -205,13 +202,32 @@ def auto_refresh_panel(
                         st.caption(f"Son durum: {last_status} ({last_date})")
                     if cfg.get("last_run_log"):
                         st.caption(f"Son log dosyasi: {cfg['last_run_log']}")
-                    if scheduler_result and scheduler_result.get("ran") and scheduler_result.get("reason") != "forced":
-                        auto_summary = scheduler_result.get("summary", {})
-                        st.success(
-                            f"Planlanan otomatik revize tamamlandi: {auto_summary.get('gorev_sayisi', 0)} gorev guncellendi."
-                        )
+                    if scheduler_result:
+                        is_durum = scheduler_result.get("durum")
+                        is_ozet = scheduler_result.get("ozet", {})
+                        baslik = f"Son is #{scheduler_result['id']} ({scheduler_result.get('tur')})"
+                        if is_durum in ("bekliyor", "calisiyor"):
+                            st.info(f"{baslik}: {is_durum}. {scheduler_result.get('asama') or ''}")
+                        elif is_durum == "completed":
+                            st.success(f"{baslik}: {is_ozet.get('gorev_sayisi', 0)} gorev guncellendi.")
+                        elif is_durum == "no_missing":
+                            st.info(f"{baslik}: guncellenecek kayit bulunmadi.")
+                        elif is_durum == "no_period":
+                            st.warning(f"{baslik}: veritabaninda planlanan donem bulunamadi.")
+                        else:
+                            st.error(f"{baslik}: {is_durum}. {is_ozet.get('hata', '')}")
+                        if "islenen_ogrenci" in is_ozet:
+                            st.caption(
+                                f"Islenen ogrenci: {is_ozet['islenen_ogrenci']}, "
+                                f"atlanan: {is_ozet['atlanan_ogrenci']} "
+                                f"({is_ozet.get('mod')}, {is_ozet.get('sure_sn')} sn)"
+                            )
                         if scheduler_result.get("log_path"):
                             st.caption(f"Log: {scheduler_result['log_path']}")
+                    worker = revize_worker.worker_aktif(durum_conn)
+                    st.caption(
+                        f"Arka plan worker: {'calisiyor (' + worker['sahip'] + ')' if worker else 'calismiyor'}"
+                    )
 
         if not silent:
             if not is_active and active_hours:
@@ -309,6 +325,9 @@ def auto_refresh_panel(
             message = random.choice(messages)
             st.caption(f" {message}")
 
+    if durum_conn is not None:
+        durum_conn.close()
+
     return {
         "paused": bool(ss[f"{prefix}__paused"]),
         "interval_minutes": float(ss[f"{prefix}__interval"]),
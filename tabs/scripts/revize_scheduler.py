@@ -1,14 +1,18 @@
 import json
+import time as _time
 from datetime import datetime, time
 from pathlib import Path
 from typing import Callable, Optional
 
+import pandas as pd
+
 try:
     from zoneinfo import ZoneInfo
 except ImportError:  # Python < 3.9 fallback
     ZoneInfo = None  # type: ignore
 
 from tabs.revize_panel_genel import hazirla_tum_donemler_df, revize_kayitlar
+from tabs.utils.revize_isaret import degisen_ogrenciler, isaretleri_ilerlet
 
 DEFAULT_TZ = "Europe/Istanbul"
 CONFIG_PATH = Path("auto_revize_config.json")
@@ -33,6 +37,8 @@ class AutoRevizeScheduler:
                 "last_run_status": None,
                 "last_run_log": None,
                 "last_run_summary": None,
+                "incremental": True,
+                "paralel_tarama": False,
             }
         try:
             return json.loads(self.config_path.read_text(encoding="utf-8"))
@@ -45,6 +51,8 @@ class AutoRevizeScheduler:
                 "last_run_status": "config_error",
                 "last_run_log": None,
                 "last_run_summary": None,
+                "incremental": True,
+                "paralel_tarama": False,
             }
 
     def save_config(self) -> None:
@@ -94,7 +102,9 @@ class AutoRevizeScheduler:
         return False, "scheduled"
 
     # ------------------------------------------------------------------
-    def _new_log_writer(self, started_at: datetime) -> tuple[Path, Callable[[str], None]]:
+    def _new_log_writer(
+        self, started_at: datetime, ilerleme: Optional[Callable[[str], None]] = None
+    ) -> tuple[Path, Callable[[str], None]]:
         LOG_DIR.mkdir(parents=True, exist_ok=True)
         stamp = started_at.strftime("%Y%m%d_%H%M%S")
         log_path = LOG_DIR / f"auto_revize_{stamp}.log"
@@ -104,10 +114,26 @@ class AutoRevizeScheduler:
             ts = now_ts.strftime("%Y-%m-%d %H:%M:%S")
             with log_path.open('a', encoding='utf-8') as fh:
                 fh.write(f"[{ts}] {message}\n")
+            if ilerleme is not None:
+                ilerleme(message)
 
         return log_path, write
 
-    def run_if_due(self, conn, now: Optional[datetime] = None, *, force: bool = False) -> dict:
+    def run_if_due(
+        self,
+        conn,
+        now: Optional[datetime] = None,
+        *,
+        force: bool = False,
+        tam: bool = False,
+        ilerleme: Optional[Callable[[str], None]] = None,
+    ) -> dict:
+        """
+        Zamanı geldiyse (ya da force) revize çalıştırır. Varsayılan artımlı modda sadece son
+        çalışmadan beri yeni uçuşu / plan değişikliği / tarihi geçen görevi olan öğrenciler
+        taranır (auto_revize_isaret); tam=True ya da config'te "incremental": false ise herkes.
+        `ilerleme` verilirse log satırları ona da iletilir (arka plan worker'ı durum tablosuna yazar).
+        """
         now = now or self._now()
         if not force:
             should_run, reason = self.should_run(now)
@@ -116,12 +142,31 @@ class AutoRevizeScheduler:
         else:
             reason = "forced"
 
-        log_path, log = self._new_log_writer(now)
+        log_path, log = self._new_log_writer(now, ilerleme)
         log("Otomatik revize sureci baslatiliyor.")
         summary: dict[str, object] = {}
+        baslangic = _time.perf_counter()
+        tam = tam or not self.config.get("incremental", True)
 
         try:
-            df = hazirla_tum_donemler_df(conn, bugun=now.date())
+            tarama = degisen_ogrenciler(conn, now.date(), tam=tam)
+            kodlar = tarama["kodlar"]
+            sayilar = {
+                "mod": "tam" if tarama["tam"] else "artimli",
+                "islenen_ogrenci": len(kodlar),
+                "atlanan_ogrenci": len(tarama["tum_kodlar"]) - len(kodlar),
+            }
+            log(
+                f"{'Tam' if tarama['tam'] else 'Artimli'} tarama: {sayilar['islenen_ogrenci']} ogrenci islenecek, "
+                f"{sayilar['atlanan_ogrenci']} ogrenci degismedigi icin atlandi."
+            )
+            df = (
+                hazirla_tum_donemler_df(
+                    conn, bugun=now.date(), ogrenci_kodlari=kodlar,
+                    paralel=bool(self.config.get("paralel_tarama", False)),
+                )
+                if kodlar else pd.DataFrame()
+            )
             if df is None:
                 log("Veritabanda donem bulunamadi.")
                 status = "no_period"
@@ -139,10 +184,15 @@ class AutoRevizeScheduler:
                     "gorev_sayisi": revize_sonuc.get("guncellenen_gorev", 0)
                 }
                 log(f"Revize tamamlandi. {summary['ogrenci_sayisi']} ogrenci, {summary['gorev_sayisi']} gorev.")
+            eksikler = set(df["ogrenci"]) if df is not None and not df.empty else set()
+            isaretleri_ilerlet(conn, tarama, now.date(), eksikler=eksikler)
+            summary = {**sayilar, **summary}
         except Exception as exc:  # noqa: BLE001
             status = "error"
             log(f"Hata: {exc}")
             summary = {"hata": str(exc)}
+        summary["sure_sn"] = round(_time.perf_counter() - baslangic, 2)
+        log(f"Sure: {summary['sure_sn']} sn.")
 
         cfg = self.config
         cfg["last_run_date"] = now.date().isoformat()
@@ -154,6 +204,6 @@ class AutoRevizeScheduler:
         return {"ran": True, "status": status, "summary": summary, "log_path": log_path, "reason": reason}
 
 
-    def run_now(self, conn) -> dict:
+    def run_now(self, conn, *, tam: bool = False, ilerleme: Optional[Callable[[str], None]] = None) -> dict:
         """Force triggers an immediate run ignoring schedule."""
-        return self.run_if_due(conn, force=True)
+        return self.run_if_due(conn, force=True, tam=tam, ilerleme=ilerleme)
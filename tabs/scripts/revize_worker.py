@@ -0,0 +1,388 @@
+"""
+Otomatik revize için ayrı süreçte çalışan arka plan worker'ı.
+
+Streamlit sayfaları revizeyi kendileri çalıştırmaz: worker zamanlayıcıyla AutoRevizeScheduler'ın
+zamanı gelmiş mi kontrolünü yapar, sayfalardan gelen "şimdi çalıştır" / "genel tarama" isteklerini
+sırayla işler. Tek örnek kuralı ve ilerleme bilgisi ayrı bir SQLite dosyasında (auto_revize_durum.db)
+tutulur; revize ucus_egitim.db'yi tek transaction'da yazdığı için durum yazımları onu beklemez.
+
+Çalıştırma:
+    python -m tabs.scripts.revize_worker              # sürekli (varsayılan 60 sn aralık)
+    python -m tabs.scripts.revize_worker --bir-kez    # tek tur (cron / Görev Zamanlayıcı)
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time as _time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from tabs.scripts.revize_scheduler import CONFIG_PATH, LOG_DIR, AutoRevizeScheduler
+
+PLAN_DB_PATH = "ucus_egitim.db"
+DURUM_DB_PATH = Path("auto_revize_durum.db")
+KILIT_ADI = "auto_revize"
+KONTROL_ARALIGI_SN = 60
+# Nabzı bu süreden eski kilit sahibi ölmüş sayılır
+KILIT_ZAMAN_ASIMI_SN = 15 * 60
+# İş sürerken nabız thread'inin kilidi yenileme aralığı (zaman aşımının çok altında kalmalı)
+NABIZ_ARALIGI_SN = 60
+WORKER_LOG = LOG_DIR / "worker.log"
+
+BITMIS_DURUMLAR = ("completed", "no_missing", "no_period", "error")
+
+
+# --- Durum veritabanı ---
+def durum_baglan(path: Path | str = DURUM_DB_PATH) -> sqlite3.Connection:
+    """Durum DB bağlantısı (autocommit; kilit için açık BEGIN IMMEDIATE kullanılır)."""
+    conn = sqlite3.connect(str(path), timeout=10, isolation_level=None, check_same_thread=False)
+    ensure_durum_tablolari(conn)
+    return conn
+
+
+def ensure_durum_tablolari(conn: sqlite3.Connection) -> None:
+    """
+    auto_revize_kilit: tek worker kuralı (sahip + nabız).
+    auto_revize_is: sayfaların istediği / zamanlayıcının başlattığı işler ve ilerlemesi.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS auto_revize_kilit (
+            ad TEXT PRIMARY KEY,
+            sahip TEXT NOT NULL,
+            pid INTEGER,
+            alindi TEXT,
+            nabiz REAL NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS auto_revize_is (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tur TEXT NOT NULL,
+            tam INTEGER NOT NULL DEFAULT 0,
+            durum TEXT NOT NULL DEFAULT 'bekliyor',
+            asama TEXT,
+            istendi TEXT,
+            basladi TEXT,
+            bitti TEXT,
+            ozet TEXT,
+            log_path TEXT,
+            pid INTEGER
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_auto_revize_is_durum ON auto_revize_is(durum, id)")
+
+
+def _simdi_str() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+# --- Kilit ---
+def kilit_al(conn: sqlite3.Connection, sahip: str, zaman_asimi: float = KILIT_ZAMAN_ASIMI_SN) -> bool:
+    """Kilit boşsa ya da sahibinin nabzı zaman aşımına uğradıysa alır; başka canlı sahip varsa False."""
+    simdi = _time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT sahip, nabiz FROM auto_revize_kilit WHERE ad = ?", (KILIT_ADI,)).fetchone()
+        if row and row[0] != sahip and row[1] >= simdi - zaman_asimi:
+            conn.execute("ROLLBACK")
+            return False
+        conn.execute(
+            "INSERT OR REPLACE INTO auto_revize_kilit (ad, sahip, pid, alindi, nabiz) VALUES (?, ?, ?, ?, ?)",
+            (KILIT_ADI, sahip, os.getpid(), _simdi_str(), simdi),
+        )
+        conn.execute("COMMIT")
+        return True
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def kilit_yenile(conn: sqlite3.Connection, sahip: str) -> bool:
+    """Nabzı günceller; kilit başka bir örneğe geçtiyse False."""
+    cur = conn.execute(
+        "UPDATE auto_revize_kilit SET nabiz = ? WHERE ad = ? AND sahip = ?",
+        (_time.time(), KILIT_ADI, sahip),
+    )
+    return cur.rowcount == 1
+
+
+def kilit_birak(conn: sqlite3.Connection, sahip: str) -> None:
+    conn.execute("DELETE FROM auto_revize_kilit WHERE ad = ? AND sahip = ?", (KILIT_ADI, sahip))
+
+
+def worker_aktif(conn: sqlite3.Connection, zaman_asimi: float = KILIT_ZAMAN_ASIMI_SN) -> Optional[dict]:
+    """Nabzı taze bir worker varsa {sahip, pid, alindi, nabiz}, yoksa None."""
+    row = conn.execute(
+        "SELECT sahip, pid, alindi, nabiz FROM auto_revize_kilit WHERE ad = ? AND nabiz >= ?",
+        (KILIT_ADI, _time.time() - zaman_asimi),
+    ).fetchone()
+    if row is None:
+        return None
+    return {"sahip": row[0], "pid": row[1], "alindi": row[2], "nabiz": row[3]}
+
+
+# --- İş kuyruğu ---
+def is_iste(conn: sqlite3.Connection, tur: str = "elle", tam: bool = False) -> int:
+    """
+    Worker'a iş bırakır ("elle": zamanı beklemeden revize, "tarama": genel tarama).
+    Aynı türde bekleyen/çalışan iş varsa yenisi açılmaz, onun id'si döner.
+    """
+    row = conn.execute(
+        "SELECT id FROM auto_revize_is WHERE tur = ? AND durum IN ('bekliyor', 'calisiyor') ORDER BY id LIMIT 1",
+        (tur,),
+    ).fetchone()
+    if row:
+        return row[0]
+    cur = conn.execute(
+        "INSERT INTO auto_revize_is (tur, tam, durum, istendi) VALUES (?, ?, 'bekliyor', ?)",
+        (tur, int(tam), _simdi_str()),
+    )
+    return cur.lastrowid
+
+
+def son_isler(conn: sqlite3.Connection, limit: int = 5, tur: Optional[str] = None) -> list[dict]:
+    """Son işler (en yeni önce); ozet JSON'dan sözlüğe çevrilir. Sayfalar bunu yoklar."""
+    sorgu = "SELECT * FROM auto_revize_is"
+    params: list = []
+    if tur is not None:
+        sorgu += " WHERE tur = ?"
+        params.append(tur)
+    cur = conn.execute(sorgu + " ORDER BY id DESC LIMIT ?", (*params, limit))
+    kolonlar = [c[0] for c in cur.description]
+    isler = [dict(zip(kolonlar, r)) for r in cur.fetchall()]
+    for is_ in isler:
+        is_["ozet"] = json.loads(is_["ozet"]) if is_["ozet"] else {}
+    return isler
+
+
+def son_tarama_sonucu(conn: sqlite3.Connection) -> Optional[pd.DataFrame]:
+    """Worker'ın son genel tarama çıktısı (hiç tarama yapılmadıysa None)."""
+    try:
+        return pd.read_sql_query("SELECT * FROM auto_revize_tarama", conn)
+    except Exception:
+        return None
+
+
+def _is_guncelle(conn: sqlite3.Connection, is_id: int, **alanlar) -> None:
+    if "ozet" in alanlar:
+        alanlar["ozet"] = json.dumps(alanlar["ozet"], ensure_ascii=False, default=str)
+    atama = ", ".join(f"{k} = ?" for k in alanlar)
+    conn.execute(f"UPDATE auto_revize_is SET {atama} WHERE id = ?", (*alanlar.values(), is_id))
+
+
+# --- Worker ---
+class RevizeWorker:
+    def __init__(
+        self,
+        db_path: str = PLAN_DB_PATH,
+        durum_db_path: Path | str = DURUM_DB_PATH,
+        config_path: Path | str = CONFIG_PATH,
+        aralik_sn: float = KONTROL_ARALIGI_SN,
+    ):
+        self.db_path = db_path
+        self.config_path = config_path
+        self.aralik_sn = aralik_sn
+        self.sahip = f"{socket.gethostname()}:{os.getpid()}"
+        self.durum_db_path = durum_db_path
+        self.durum = durum_baglan(durum_db_path)
+
+    def _log(self, mesaj: str) -> None:
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        with WORKER_LOG.open("a", encoding="utf-8") as fh:
+            fh.write(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] [{self.sahip}] {mesaj}\n")
+
+    def _ilerleme(self, is_id: int):
+        def yaz(mesaj: str) -> None:
+            # İlerleme kaydı revizeyi durdurmamalı: durum DB meşgulse satır atlanır
+            try:
+                _is_guncelle(self.durum, is_id, asama=mesaj)
+                kilit_yenile(self.durum, self.sahip)
+            except sqlite3.Error:
+                pass
+        return yaz
+
+    @contextmanager
+    def _nabiz(self, aralik_sn: float = NABIZ_ARALIGI_SN):
+        """
+        Blok süresince kilidi ayrı bir thread'den yeniler: tarama / revize ilerleme yazmadan uzun
+        sürse de kilit zaman aşımına uğrayıp ikinci bir worker'a geçmez. Thread kendi durum
+        bağlantısını kullanır (ana bağlantıdaki açık transaction'lara karışmaz).
+        """
+        dur = threading.Event()
+
+        def dongu() -> None:
+            conn = durum_baglan(self.durum_db_path)
+            try:
+                while not dur.wait(aralik_sn):
+                    try:
+                        if not kilit_yenile(conn, self.sahip):
+                            self._log("Kilit baska bir worker'a gecti (is suruyor).")
+                            return
+                    except sqlite3.Error:
+                        pass
+            finally:
+                conn.close()
+
+        thread = threading.Thread(target=dongu, name="revize-nabiz", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            dur.set()
+            thread.join()
+
+    def _revize_calistir(self, scheduler: AutoRevizeScheduler, is_id: int, *, force: bool, tam: bool) -> None:
+        _is_guncelle(self.durum, is_id, durum="calisiyor", basladi=_simdi_str(), pid=os.getpid())
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            sonuc = scheduler.run_if_due(conn, force=force, tam=tam, ilerleme=self._ilerleme(is_id))
+        except Exception as exc:  # noqa: BLE001
+            sonuc = {"ran": True, "status": "error", "summary": {"hata": str(exc)}}
+        finally:
+            conn.close()
+        _is_guncelle(
+            self.durum, is_id,
+            durum=sonuc.get("status") if sonuc.get("ran") else sonuc.get("reason", "atlandi"),
+            bitti=_simdi_str(),
+            ozet=sonuc.get("summary", {}),
+            log_path=str(sonuc["log_path"]) if sonuc.get("log_path") else None,
+        )
+        self._log(f"Is #{is_id} bitti: {sonuc.get('status') or sonuc.get('reason')}")
+
+    def _tarama_calistir(self, scheduler: AutoRevizeScheduler, is_id: int) -> None:
+        from tabs.revize_panel_genel import hazirla_tum_donemler_df
+
+        _is_guncelle(self.durum, is_id, durum="calisiyor", basladi=_simdi_str(), pid=os.getpid(),
+                     asama="Tum donemler taraniyor.")
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            df = hazirla_tum_donemler_df(
+                conn, bugun=scheduler._now().date(),
+                paralel=bool(scheduler.config.get("paralel_tarama", False)),
+            )
+            if df is None:
+                durum, ozet = "no_period", {"satir": 0}
+            else:
+                durum, ozet = ("no_missing" if df.empty else "completed"), {"satir": int(len(df))}
+                self.durum.execute("BEGIN")
+                df.to_sql("auto_revize_tarama", self.durum, if_exists="replace", index=False)
+        except Exception as exc:  # noqa: BLE001
+            if self.durum.in_transaction:
+                self.durum.execute("ROLLBACK")
+            durum, ozet = "error", {"hata": str(exc)}
+        finally:
+            conn.close()
+        _is_guncelle(self.durum, is_id, durum=durum, bitti=_simdi_str(), ozet=ozet, asama=None)
+        self._log(f"Tarama #{is_id} bitti: {durum}")
+
+    def tur(self) -> None:
+        """Tek tur: önce bekleyen istekler (sırayla), sonra zamanlanmış revizenin vakti."""
+        while True:
+            row = self.durum.execute(
+                "SELECT id, tur, tam FROM auto_revize_is WHERE durum = 'bekliyor' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            is_id, tur, tam = row
+            if not kilit_yenile(self.durum, self.sahip):
+                self._log("Kilit baska bir worker'a gecti, bekleyen isler birakildi.")
+                return
+            scheduler = AutoRevizeScheduler(self.config_path)
+            self._log(f"Is #{is_id} basladi ({tur}).")
+            with self._nabiz():
+                if tur == "tarama":
+                    self._tarama_calistir(scheduler, is_id)
+                else:
+                    self._revize_calistir(scheduler, is_id, force=True, tam=bool(tam))
+
+        # Config her turda yeniden okunur (sayfadan yapılan ayar değişiklikleri)
+        scheduler = AutoRevizeScheduler(self.config_path)
+        due, _ = scheduler.should_run()
+        if due:
+            if not kilit_yenile(self.durum, self.sahip):
+                self._log("Kilit baska bir worker'a gecti, zamanli revize atlandi.")
+                return
+            cur = self.durum.execute(
+                "INSERT INTO auto_revize_is (tur, tam, durum, istendi) VALUES ('zamanli', 0, 'bekliyor', ?)",
+                (_simdi_str(),),
+            )
+            self._log(f"Is #{cur.lastrowid} basladi (zamanli).")
+            with self._nabiz():
+                self._revize_calistir(scheduler, cur.lastrowid, force=False, tam=False)
+
+    def calistir(self, bir_kez: bool = False) -> int:
+        """Kilidi alır ve turları döndürür. Başka bir worker çalışıyorsa 1 ile döner."""
+        if not kilit_al(self.durum, self.sahip):
+            self._log("Baska bir worker calisiyor, cikiliyor.")
+            return 1
+        self._log("Worker basladi.")
+        # Önceki örnek iş ortasında öldüyse yarım kalan işler kapatılır
+        self.durum.execute(
+            "UPDATE auto_revize_is SET durum = 'error', bitti = ?, asama = 'Worker beklenmedik sekilde durdu.' "
+            "WHERE durum = 'calisiyor'",
+            (_simdi_str(),),
+        )
+        try:
+            while True:
+                if not kilit_yenile(self.durum, self.sahip):
+                    self._log("Kilit baska bir worker'a gecti, cikiliyor.")
+                    return 1
+                try:
+                    self.tur()
+                except Exception as exc:  # noqa: BLE001
+                    self._log(f"Hata: {exc}")
+                if bir_kez:
+                    return 0
+                _time.sleep(self.aralik_sn)
+        except KeyboardInterrupt:
+            return 0
+        finally:
+            kilit_birak(self.durum, self.sahip)
+            self._log("Worker durdu.")
+
+
+def worker_baslat(durum_conn: Optional[sqlite3.Connection] = None) -> bool:
+    """
+    Canlı worker yoksa ayrık (detached) bir süreçte başlatır; sayfalar bunu çağırır, beklemez.
+    Aynı anda iki sayfa başlatsa da kilit yüzünden biri hemen çıkar. Başlatma yapıldıysa True.
+    """
+    conn = durum_conn or durum_baglan()
+    try:
+        if worker_aktif(conn) is not None:
+            return False
+    finally:
+        if durum_conn is None:
+            conn.close()
+    kwargs: dict = {"cwd": os.getcwd(), "stdin": subprocess.DEVNULL,
+                    "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen([sys.executable, "-m", "tabs.scripts.revize_worker"], **kwargs)
+    return True
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Otomatik revize arka plan worker'i")
+    parser.add_argument("--db", default=PLAN_DB_PATH, help="Plan veritabani (ucus_egitim.db)")
+    parser.add_argument("--durum-db", default=str(DURUM_DB_PATH), help="Kilit / durum veritabani")
+    parser.add_argument("--config", default=str(CONFIG_PATH), help="auto_revize_config.json yolu")
+    parser.add_argument("--aralik", type=float, default=KONTROL_ARALIGI_SN, help="Kontrol araligi (sn)")
+    parser.add_argument("--bir-kez", action="store_true", help="Tek tur calis ve cik")
+    args = parser.parse_args(argv)
+    worker = RevizeWorker(args.db, args.durum_db, args.config, args.aralik)
+    return worker.calistir(bir_kez=args.bir_kez)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,38 +5,17 @@ from datetime import datetime, timedelta
 import re
 import io
 
+from tabs.utils.sure_utils import saat_formatla, saat_tek, sure_saat
+from tabs.utils.veri_deposu import naeron_ogrenci_oku, plan_oku
+
 def tab_gorev_aralik_ort(st, conn):
 
     # ----------------- Yardımcılar -----------------
-    def ogrenci_kodu_ayikla(ogrenci):
-        if pd.isna(ogrenci):
-            return ""
-        ogrenci = str(ogrenci).strip()
-        if ogrenci.startswith("OZ"):
-            return ogrenci
-        return ogrenci.split("-")[0].strip()
-
     def normalize_task(name):
         return re.sub(r"[\s\-]+", "", str(name)).upper()
 
-    def to_saat(sure_str):
-        try:
-            if pd.isna(sure_str) or sure_str == "":
-                return 0
-            parts = [int(p) for p in str(sure_str).split(":")]
-            return (parts[0] if len(parts) > 0 else 0) + (parts[1] if len(parts) > 1 else 0)/60 + (parts[2] if len(parts) > 2 else 0)/3600
-        except:
-            return 0
-
-    def format_sure(hours_float):
-        neg = hours_float < 0
-        h_abs = abs(hours_float)
-        h = int(h_abs)
-        m = int(round((h_abs - h) * 60))
-        if m == 60:
-            h += 1; m = 0
-        sign = "-" if neg else ""
-        return f"{sign}{h:02}:{m:02}"
+    # Süreler: "H[:M[:S]]" (tek parça = saat), str olmayanlar metne çevrilerek okunur
+    SURE_KURALLARI = dict(tek_parca=True, metne_cevir=True)
 
     def pick_first_col(df, candidates):
         for c in candidates:
@@ -62,7 +41,7 @@ def tab_gorev_aralik_ort(st, conn):
     """)
 
     # ----------------- PLAN: veri -----------------
-    df = pd.read_sql_query("SELECT * FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
+    df = plan_oku(conn)
     if df.empty:
         st.warning("Veri bulunamadı.")
         return
@@ -79,7 +58,6 @@ def tab_gorev_aralik_ort(st, conn):
         return
 
     # 2) Öğrenci kodunu seçtir
-    df["ogrenci_kodu"] = df["ogrenci"].apply(ogrenci_kodu_ayikla)
     ogr_liste = df["ogrenci_kodu"].dropna().unique().tolist()
     if not ogr_liste:
         st.warning("Bu dönem için öğrenci bulunamadı.")
@@ -92,52 +70,17 @@ def tab_gorev_aralik_ort(st, conn):
 
     # ----------------- NAERON: veri -----------------
     try:
-        conn_naeron = sqlite3.connect("naeron_kayitlari.db")
-        df_naeron_raw = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn_naeron)
-        conn_naeron.close()
+        # MCC çoklu öğrenci satırları öğrenci bazında açılmış (long) halde;
+        # ogrenci_kodu ve gorev_norm veri deposunda hazır gelir
+        df_naeron_all = naeron_ogrenci_oku("naeron_kayitlari.db")
     except Exception as e:
         st.error(f"Naeron verisi alınamadı: {e}")
         return
 
-    if df_naeron_raw.empty:
+    if df_naeron_all.empty:
         st.warning("Naeron uçuş kaydı bulunamadı.")
         return
 
-    # --- MCC çoklu öğrenci long ---
-    def mcc_coklu_ogrenci(df_naeron):
-        mask = df_naeron["Görev"].astype(str).str.upper().str.startswith("MCC")
-        df_mcc = df_naeron[mask].copy()
-        def extract_ogrenciler(pilot_str):
-            return re.findall(r"\d{3}[A-Z]{2}", str(pilot_str).upper())
-        rows = []
-        for _, row in df_mcc.iterrows():
-            for kod in extract_ogrenciler(row["Öğrenci Pilot"]):
-                new_row = row.copy()
-                new_row["ogrenci_kodu"] = kod
-                rows.append(new_row)
-        return pd.DataFrame(rows)
-
-    df_naeron_mcc = mcc_coklu_ogrenci(df_naeron_raw)
-
-    # --- Tek öğrenci görevleri ---
-    def naeron_ogrenci_kodu_ayikla(pilot):
-        if pd.isna(pilot): return ""
-        pilot = str(pilot).strip()
-        if pilot.startswith("OZ"):
-            idxs = [i for i, c in enumerate(pilot) if c == "-"]
-            if len(idxs) >= 2:
-                pilot = pilot[:idxs[1]].rstrip()
-            return pilot
-        return pilot.split("-")[0].strip()
-
-    mask_mcc = df_naeron_raw["Görev"].astype(str).str.upper().str.startswith("MCC")
-    df_naeron_other = df_naeron_raw[~mask_mcc].copy()
-    df_naeron_other["ogrenci_kodu"] = df_naeron_other["Öğrenci Pilot"].apply(naeron_ogrenci_kodu_ayikla)
-
-    # Birleştir ve normalize
-    df_naeron_all = pd.concat([df_naeron_mcc, df_naeron_other], ignore_index=True)
-    df_naeron_all["gorev_norm"] = df_naeron_all["Görev"].apply(normalize_task)
-
     # Sadece seçilen öğrenci
     df_naeron = df_naeron_all[df_naeron_all["ogrenci_kodu"] == secilen_kod].copy()
     if df_naeron.empty:
@@ -161,7 +104,7 @@ def tab_gorev_aralik_ort(st, conn):
         )
         for i, plan_i in enumerate(plan_pic_idx):
             if i < len(naeron_pic):
-                df_plan.at[plan_i, "gerceklesen_saat_ondalik"] = to_saat(naeron_pic.at[i, "Block Time"])
+                df_plan.at[plan_i, "gerceklesen_saat_ondalik"] = saat_tek(naeron_pic.at[i, "Block Time"], **SURE_KURALLARI)
             else:
                 df_plan.at[plan_i, "gerceklesen_saat_ondalik"] = 0
         return df_plan, naeron_pic
@@ -169,13 +112,13 @@ def tab_gorev_aralik_ort(st, conn):
     def eslesen_normal_sure(df_plan, df_n):
         def match(gorev):
             es = df_n[df_n["Görev"] == gorev]
-            return es["Block Time"].apply(to_saat).sum() if not es.empty else 0
+            return sure_saat(es["Block Time"], **SURE_KURALLARI).sum() if not es.empty else 0
         mask = ~df_plan["gorev_ismi"].str.upper().str.contains("PIC")
         df_plan.loc[mask, "gerceklesen_saat_ondalik"] = df_plan.loc[mask, "gorev_ismi"].apply(match)
         return df_plan
 
     # Plan tarafında hazırlık
-    df_ogrenci["planlanan_saat_ondalik"] = df_ogrenci["sure"].apply(to_saat)
+    df_ogrenci["planlanan_saat_ondalik"] = sure_saat(df_ogrenci["sure"], **SURE_KURALLARI)
     df_ogrenci["gerceklesen_saat_ondalik"] = 0.0
     df_ogrenci["gorev_norm"] = df_ogrenci["gorev_ismi"].apply(normalize_task)
     df_ogrenci["gercek_tarih_dt"] = pd.NaT
@@ -203,9 +146,9 @@ def tab_gorev_aralik_ort(st, conn):
     # Süre eşleştirme (mevcut mantığın devamı)
     df_ogrenci = eslesen_normal_sure(df_ogrenci, df_naeron)
     df_ogrenci["fark_saat_ondalik"] = df_ogrenci["gerceklesen_saat_ondalik"] - df_ogrenci["planlanan_saat_ondalik"]
-    df_ogrenci["Planlanan"] = df_ogrenci["planlanan_saat_ondalik"].apply(format_sure)
-    df_ogrenci["Gerçekleşen"] = df_ogrenci["gerceklesen_saat_ondalik"].apply(format_sure)
-    df_ogrenci["Fark"] = df_ogrenci["fark_saat_ondalik"].apply(format_sure)
+    df_ogrenci["Planlanan"] = saat_formatla(df_ogrenci["planlanan_saat_ondalik"], tasi=True)
+    df_ogrenci["Gerçekleşen"] = saat_formatla(df_ogrenci["gerceklesen_saat_ondalik"], tasi=True)
+    df_ogrenci["Fark"] = saat_formatla(df_ogrenci["fark_saat_ondalik"], tasi=True)
 
     # Durum etiketi
     def durum_pic_renk(row):
@@ -255,11 +198,13 @@ import sqlite3
 import re
 from io import StringIO
 
+from tabs.utils.veri_deposu import naeron_oku, plan_oku
+
 def tab_gorev_aralik_gercek(st, conn):
     st.subheader("⏱️ Gerçekleşen Sıraya Göre Görevler Arası Gün Farkı")
 
     # --- 1) PLAN: oku ve dönem seçtir ---
-    df_plan = pd.read_sql_query("SELECT * FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
+    df_plan = plan_oku(conn)
     if df_plan.empty:
         st.warning("Plan verisi bulunamadı.")
         return
@@ -274,23 +219,11 @@ def tab_gorev_aralik_gercek(st, conn):
         st.warning("Bu döneme ait plan bulunamadı.")
         return
 
-    # Öğrenci kodu normalize (plan)
-    def ogr_kodu_plan(s):
-        if pd.isna(s): return ""
-        s = str(s).strip()
-        return s if s.startswith("OZ") else s.split("-")[0].strip()
-    dfp["ogrenci_kodu"] = dfp["ogrenci"].apply(ogr_kodu_plan)
-
-    # Görev ismi normalize (eşleştirme için)
-    def norm_task(x):
-        return re.sub(r"[\s\-]+", "", str(x)).upper()
-    dfp["gorev_norm"] = dfp["gorev_ismi"].apply(norm_task)
+    # ogrenci_kodu ve gorev_norm (eşleştirme için) veri deposunda hazır gelir
 
     # --- 2) NAERON: oku ve hazırlık ---
     try:
-        conn_naeron = sqlite3.connect("naeron_kayitlari.db")
-        dfn = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn_naeron)
-        conn_naeron.close()
+        dfn = naeron_oku("naeron_kayitlari.db")
     except Exception as e:
         st.error(f"Naeron verisi okunamadı: {e}")
         return
@@ -298,18 +231,6 @@ def tab_gorev_aralik_gercek(st, conn):
         st.warning("Naeron uçuş kaydı bulunamadı.")
         return
 
-    # Öğrenci kodu normalize (naeron)
-    def ogr_kodu_naeron(s):
-        if pd.isna(s): return ""
-        s = str(s).strip()
-        if s.startswith("OZ"):
-            parts = [i for i, c in enumerate(s) if c == "-"]
-            if len(parts) >= 2:
-                s = s[:parts[1]].rstrip()
-            return s
-        return s.split("-")[0].strip()
-    dfn["ogrenci_kodu"] = dfn["Öğrenci Pilot"].apply(ogr_kodu_naeron)
-
     # Tarih kolonu (varsa Uçuş Tarihi 2 → yoksa Uçuş Tarihi/Tarih)
     date_col = None
     for cand in ["Uçuş Tarihi 2", "Uçuş Tarihi", "Tarih", "Date", "date", "tarih"]:
@@ -321,9 +242,6 @@ def tab_gorev_aralik_gercek(st, conn):
         return
     dfn["gercek_tarih"] = pd.to_datetime(dfn[date_col], errors="coerce")
 
-    # Görev ismi normalize (naeron)
-    dfn["gorev_norm"] = dfn["Görev"].apply(norm_task)
-
     # --- 3) Plan satırına 'Gerçek Tarih' yaz (ogrenci_kodu+gorev_norm ile en erken tarih) ---
     dfn_valid = dfn.dropna(subset=["gercek_tarih"]).copy()
     earliest = (
@@ -1,6 +1,8 @@
 import re
 import pandas as pd
 
+from tabs.utils.sure_utils import timedelta_saat
+
 
 def tab_ihtiyac_analizi(st, conn):
     st.subheader("📈 Tarihsel Uçuş Süre Analizi")
@@ -373,13 +375,9 @@ def tarihsel_akilli_ozet_panel(st, conn, tarih1, tarih2, df_aralik):
     import pandas as pd, re, io
     from datetime import date
 
-    def _to_hours(s):
-        try:
-            if pd.isna(s) or str(s).strip() in ("", "nan"): return 0.0
-            return pd.to_timedelta(str(s)).total_seconds()/3600.0
-        except Exception:
-            try: return float(s)
-            except Exception: return 0.0
+    def _to_hours(seri):
+        # pd.to_timedelta, olmazsa "H:M[:S]" / ondalık saat; boş/geçersiz → 0
+        return timedelta_saat(seri, ondalik=True)
 
     def _fmt_hhmmss(h):
         try:
@@ -407,7 +405,7 @@ def tarihsel_akilli_ozet_panel(st, conn, tarih1, tarih2, df_aralik):
     df_range = df_aralik.copy()
     df_range["plan_tarihi"] = pd.to_datetime(df_range["plan_tarihi"]).dt.normalize()
     if "sure_saat" not in df_range.columns and "sure" in df_range.columns:
-        df_range["sure_saat"] = df_range["sure"].apply(_to_hours)
+        df_range["sure_saat"] = _to_hours(df_range["sure"])
 
     gunluk = df_range.groupby("plan_tarihi")["sure_saat"].sum().sort_index()
     total_hours = gunluk.sum()
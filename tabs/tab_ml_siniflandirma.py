@@ -5,11 +5,12 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
 import numpy as np
+from db.migrations import golgesiz_secim
 
 def tab_ml_siniflandirma(st, conn):
     st.subheader("⚠️ ML ile Revize Gerekir Mi? (Sınıflandırma)")
 
-    df = pd.read_sql_query("SELECT * FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
+    df = pd.read_sql_query(f"SELECT {golgesiz_secim(conn, 'ucus_planlari')} FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
     if df.empty:
         st.warning("Veri bulunamadı.")
         return
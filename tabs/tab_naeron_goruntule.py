@@ -1,15 +1,46 @@
 # tabs/tab_naeron_goruntule.py
 import pandas as pd
 import sqlite3
+import re
 import streamlit as st
 import unicodedata
 
+from db.migrations import golgesiz_secim
+
+# Naeron tekil indeksinin (tarih, öğrenci, görev) kolonları: toplu düzeltmeler bunları değiştirirken
+# mevcut bir kayıtla çakışabilir
+_TEKIL_KOLONLAR = {'"Uçuş Tarihi 2"', '"Öğrenci Pilot"', '"Görev"'}
+_UPDATE_RE = re.compile(r"\s*UPDATE\s+naeron_ucuslar\s+SET\s+(\"[^\"]+\")\s*=\s*(.*?)\s+WHERE\s+(.*)", re.S)
+
+
+def _toplu_guncelle(cursor, stmt: str) -> list:
+    """
+    Toplu düzeltmeyi UPDATE OR IGNORE ile çalıştırır: tekil indeksle çakışan satırlar atlanır,
+    diğerleri yine düzeltilir. Atlanan (çakışan) satırları döndürür.
+    """
+    cursor.execute(re.sub(r"^\s*UPDATE\s", "UPDATE OR IGNORE ", stmt, count=1))
+    m = _UPDATE_RE.fullmatch(stmt)
+    if not m or m.group(1) not in _TEKIL_KOLONLAR:
+        return []
+    kolon, ifade, kosul = m.groups()
+    # Hâlâ koşula uyan ve yeni değeri farklı olan satırlar: çakışma yüzünden atlananlar
+    rows = cursor.execute(f"""
+        SELECT ucus_no, "Uçuş Tarihi 2", "Öğrenci Pilot", {kolon} AS eski, {ifade} AS yeni
+        FROM naeron_ucuslar
+        WHERE ({kosul}) AND ({ifade}) IS NOT {kolon}
+    """).fetchall()
+    return [
+        {"Uçuş No": r[0], "Uçuş Tarihi": r[1], "Öğrenci Pilot": r[2], "Kolon": kolon.strip('"'),
+         "Mevcut": r[3], "Olması Gereken": r[4]}
+        for r in rows
+    ]
+
 def tab_naeron_goruntule(st):
     st.subheader("🗂 Naeron Veritabanını Görüntüle, Filtrele, Düzelt, Sil")
 
     try:
         conn = sqlite3.connect("naeron_kayitlari.db")
-        df = pd.read_sql_query("SELECT rowid, * FROM naeron_ucuslar", conn)
+        df = pd.read_sql_query(f"SELECT rowid, {golgesiz_secim(conn, 'naeron_ucuslar')} FROM naeron_ucuslar", conn)
 
         if df.empty:
             st.warning("Veritabanında kayıt bulunamadı.")
@@ -201,20 +232,24 @@ def tab_naeron_goruntule(st):
                 # EĞT.TKR.(SE) (boşluksuz) -> EGT. TKR. (SE)
                 sql_statements.append(f"UPDATE naeron_ucuslar SET {gorev_col} = 'EGT. TKR. (SE)' WHERE {gorev_col} = 'EĞT.TKR.(SE)'")
 
-                # Ek düzeltme: DIFF.(SE) -> DIFF(SE)
-                sql_statements.append("UPDATE naeron_ucuslar SET \"G��rev\" = 'DIFF(SE)' WHERE \"G��rev\" = 'DIFF.(SE)'")
-
-                # Ek düzeltme: EĞT.TKR.(SE) -> EGT. TKR. (SE) (boşluksuz varyantı da düzelt)
-                sql_statements.append("UPDATE naeron_ucuslar SET \"G��rev\" = 'EGT. TKR. (SE)' WHERE \"G��rev\" = 'E�?T.TKR.(SE)'")
-
+                atlananlar, hatalar = [], []
                 for stmt in sql_statements:
                     try:
-                        cursor.execute(stmt)
-                    except Exception:
-                        pass
+                        atlananlar.extend(_toplu_guncelle(cursor, stmt))
+                    except sqlite3.Error as e:
+                        hatalar.append(f"{' '.join(stmt.split())[:120]} → {e}")
                 conn.commit()
-                st.success("✅ Tüm toplu düzeltmeler tamamlandı.")
-                st.rerun()
+                if hatalar:
+                    st.error("Bazı düzeltmeler çalıştırılamadı:\n\n" + "\n\n".join(hatalar))
+                if atlananlar:
+                    st.warning(
+                        f"⚠️ {len(atlananlar)} kayıt düzeltilmedi: aynı tarih / öğrenci / görev ile zaten bir kayıt var. "
+                        "Yinelenen kayıtları kontrol edip silin, sonra düzeltmeleri tekrar uygulayın."
+                    )
+                    st.dataframe(pd.DataFrame(atlananlar), use_container_width=True)
+                else:
+                    st.success("✅ Tüm toplu düzeltmeler tamamlandı.")
+                    st.rerun()
 
 
 
@@ -249,20 +284,28 @@ def tab_naeron_goruntule(st):
 
                 if guncelle:
                     cursor = conn.cursor()
-                    cursor.execute("""
-                        UPDATE naeron_ucuslar SET
-                            "Uçuş Tarihi 2" = ?, "Çağrı" = ?, "Off Bl." = ?, "On Bl." = ?,
-                            "Block Time" = ?, "Flight Time" = ?, "Öğretmen Pilot" = ?, "Öğrenci Pilot" = ?,
-                            "Kalkış" = ?, "İniş" = ?, "Görev" = ?, "Engine" = ?, "IFR Süresi" = ?
-                        WHERE ucus_no = ?
-                    """, (
-                        ucus_tarihi, cagri, offbl, onbl,
-                        block_time, flight_time, ogretmen, ogrenci,
-                        kalkis, inis, gorev, engine, ifr_suresi,
-                        secilen_ucus_no
-                    ))
-                    conn.commit()
-                    st.success("✅ Kayıt başarıyla güncellendi.")
+                    try:
+                        cursor.execute("""
+                            UPDATE naeron_ucuslar SET
+                                "Uçuş Tarihi 2" = ?, "Çağrı" = ?, "Off Bl." = ?, "On Bl." = ?,
+                                "Block Time" = ?, "Flight Time" = ?, "Öğretmen Pilot" = ?, "Öğrenci Pilot" = ?,
+                                "Kalkış" = ?, "İniş" = ?, "Görev" = ?, "Engine" = ?, "IFR Süresi" = ?
+                            WHERE ucus_no = ?
+                        """, (
+                            ucus_tarihi, cagri, offbl, onbl,
+                            block_time, flight_time, ogretmen, ogrenci,
+                            kalkis, inis, gorev, engine, ifr_suresi,
+                            secilen_ucus_no
+                        ))
+                        conn.commit()
+                    except sqlite3.IntegrityError:
+                        conn.rollback()
+                        st.error(
+                            f"❌ {ucus_tarihi} tarihinde {ogrenci} için '{gorev}' görevi zaten kayıtlı; "
+                            "kayıt güncellenmedi."
+                        )
+                    else:
+                        st.success("✅ Kayıt başarıyla güncellendi.")
 
                 if sil:
                     cursor = conn.cursor()
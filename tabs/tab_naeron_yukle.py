@@ -3,9 +3,11 @@ import sqlite3
 import streamlit as st
 from datetime import datetime as dt, date
 
-# Benzersiz uçuş numarası oluşturma
-def generate_ucus_no(d, idx):
-    return f"NRS-{d.strftime('%Y%m%d')}-{idx:03}"
+from db.migrations import golgesiz_secim
+from tabs.utils.gorev_durum_db import durum_yenile
+from tabs.utils.excel_akis import EksikSutunHatasi, ilerleme_cubugu
+from tabs.utils.naeron_aktarim import kayitlari_aktar, naeron_excel_oku, yeni_kayitlari_hazirla
+
 def format_time_cell(cell):
     try:
         if pd.isnull(cell):
@@ -27,17 +29,6 @@ def format_time_cell(cell):
     except:
         return str(cell)
 
-# Belirli bir tarih için son index'i veritabanından alma
-def get_last_index_for_date(conn, d):
-    query = "SELECT ucus_no FROM naeron_ucuslar WHERE ucus_no LIKE ? ORDER BY ucus_no DESC LIMIT 1"
-    cursor = conn.execute(query, (f"NRS-{d.strftime('%Y%m%d')}-%",))
-    result = cursor.fetchone()
-    if result:
-        last_ucus_no = result[0]
-        return int(last_ucus_no.split("-")[-1])
-    return 0
-
-
 def tab_naeron_yukle(st, secilen_tarih, conn_main):
     sekme1, sekme2 , sekme3 = st.tabs([
         "📆 Aylık Veri Yükle",
@@ -60,78 +51,31 @@ def tab_naeron_yukle(st, secilen_tarih, conn_main):
         )
 
         if uploaded_file_month:
-            df = pd.read_excel(uploaded_file_month)
-            df.columns = [c.strip() for c in df.columns]
-            beklenen = [
-                "Uçuş Tarihi 2", "Çağrı", "Off Bl.", "On Bl.",
-                "Block Time", "Flight Time", "Öğretmen Pilot",
-                "Öğrenci Pilot", "Kalkış", "İniş", "Görev",
-                "Engine", "IFR Süresi"
-            ]
-            eksik = [s for s in beklenen if s not in df.columns]
-            if eksik:
-                st.error(f"❌ Eksik sütun(lar): {', '.join(eksik)}")
+            # Excel parça parça okunur; sadece seçilen yıl ve ayın satırları biriktirilir
+            try:
+                df = naeron_excel_oku(
+                    uploaded_file_month,
+                    filtre=lambda p: (
+                        (pd.DatetimeIndex(p["Uçuş Tarihi 2"]).year == yil) &
+                        (pd.DatetimeIndex(p["Uçuş Tarihi 2"]).month == ay)
+                    ),
+                    ilerleme=ilerleme_cubugu(st, "📥 Excel okunuyor"),
+                )
+            except EksikSutunHatasi as e:
+                st.error(f"❌ {e}")
                 return
-
-            df = df[beklenen]
-            df["Uçuş Tarihi 2"] = pd.to_datetime(
-                df["Uçuş Tarihi 2"], errors="coerce"
-            ).dt.date
-            # Sadece seçilen yıl ve ay
-            df = df[
-                (pd.DatetimeIndex(df["Uçuş Tarihi 2"]).year == yil) &
-                (pd.DatetimeIndex(df["Uçuş Tarihi 2"]).month == ay)
-            ]
             if df.empty:
                 st.warning(f"⚠️ Seçilen {yil}-{ay:02} için veri bulunamadı.")
                 return
 
-            # Veritabanı ve tablo kontrolü
+            # Tekrar kontrolü ve uçuş no ataması SQLite içinde, toplu
             conn = sqlite3.connect("naeron_kayitlari.db")
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS naeron_ucuslar (
-                    ucus_no TEXT PRIMARY KEY,
-                    "Uçuş Tarihi 2" TEXT,
-                    "Çağrı" TEXT,
-                    "Off Bl." TEXT,
-                    "On Bl." TEXT,
-                    "Block Time" TEXT,
-                    "Flight Time" TEXT,
-                    "Öğretmen Pilot" TEXT,
-                    "Öğrenci Pilot" TEXT,
-                    "Kalkış" TEXT,
-                    "İniş" TEXT,
-                    "Görev" TEXT,
-                    "Engine" TEXT,
-                    "IFR Süresi" TEXT
-                )
-            """)
-
-            existing = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn)
-            existing_keys = set(
-                (row["Uçuş Tarihi 2"], row["Öğrenci Pilot"], row["Görev"])
-                for _, row in existing.iterrows()
-            )
-
-            yeni_kayitlar = []
-            last_index_by_date = {}
-            for _, row in df.iterrows():
-                d = row["Uçuş Tarihi 2"]
-                key = (str(d), row["Öğrenci Pilot"], row["Görev"])
-                if key in existing_keys:
-                    continue
-                if d not in last_index_by_date:
-                    last_index_by_date[d] = get_last_index_for_date(conn, d) + 1
-                idx = last_index_by_date[d]
-                ucus_no = generate_ucus_no(d, idx)
-                last_index_by_date[d] += 1
-                yeni_kayitlar.append({"ucus_no": ucus_no, **row.to_dict()})
-
-            if yeni_kayitlar:
-                df_yeni = pd.DataFrame(yeni_kayitlar)
+            df_yeni = yeni_kayitlari_hazirla(conn, df)
+
+            if not df_yeni.empty:
                 st.dataframe(df_yeni, use_container_width=True)
                 if st.button("💾 Aylık Verileri Aktar"):
-                    df_yeni.to_sql("naeron_ucuslar", conn, if_exists="append", index=False)
+                    kayitlari_aktar(conn, df_yeni)
                     # Log ay ilk gün olarak kaydet
                     log_date = date(yil, ay, 1)
                     cursor_main = conn_main.cursor()
@@ -141,6 +85,8 @@ def tab_naeron_yukle(st, secilen_tarih, conn_main):
                     )
                     conn_main.commit()
                     conn.close()
+                    # Sadece yeni uçuşları olan öğrencilerin durum tablosunu yenile
+                    durum_yenile(conn_main)
                     st.success("🧾 Aylık kayıtlar aktarıldı ve log güncellendi.")
             else:
                 st.info("⚠️ Yeni kayıt bulunamadı. Hepsi zaten mevcut.")
@@ -156,27 +102,19 @@ def tab_naeron_yukle(st, secilen_tarih, conn_main):
 
         if uploaded_file_range:
             # 1) Oku ve filtrele
-            df_range = pd.read_excel(uploaded_file_range)
-            df_range.columns = [c.strip() for c in df_range.columns]
-            beklenen = [
-                "Uçuş Tarihi 2", "Çağrı", "Off Bl.", "On Bl.",
-                "Block Time", "Flight Time", "Öğretmen Pilot",
-                "Öğrenci Pilot", "Kalkış", "İniş", "Görev",
-                "Engine", "IFR Süresi"
-            ]
-            eksik = [s for s in beklenen if s not in df_range.columns]
-            if eksik:
-                st.error(f"❌ Eksik sütun(lar): {', '.join(eksik)}")
+            try:
+                df_range = naeron_excel_oku(
+                    uploaded_file_range,
+                    filtre=lambda p: (
+                        (p["Uçuş Tarihi 2"] >= tarih_baslangic) &
+                        (p["Uçuş Tarihi 2"] <= tarih_bitis)
+                    ),
+                    ilerleme=ilerleme_cubugu(st, "📥 Excel okunuyor"),
+                )
+            except EksikSutunHatasi as e:
+                st.error(f"❌ {e}")
                 return
 
-            df_range["Uçuş Tarihi 2"] = pd.to_datetime(
-                df_range["Uçuş Tarihi 2"], errors="coerce"
-            ).dt.date
-            df_range = df_range[
-                (df_range["Uçuş Tarihi 2"] >= tarih_baslangic) &
-                (df_range["Uçuş Tarihi 2"] <= tarih_bitis)
-            ]
-
             if df_range.empty:
                 st.warning(f"⚠️ {tarih_baslangic} – {tarih_bitis} aralığında veri yok.")
                 return
@@ -187,55 +125,20 @@ def tab_naeron_yukle(st, secilen_tarih, conn_main):
 
             # 3) Uçuş no üretimi ve yeni kayıtları oluşturma
             conn = sqlite3.connect("naeron_kayitlari.db")
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS naeron_ucuslar (
-                    ucus_no TEXT PRIMARY KEY,
-                    "Uçuş Tarihi 2" TEXT, "Çağrı" TEXT, "Off Bl." TEXT,
-                    "On Bl." TEXT, "Block Time" TEXT, "Flight Time" TEXT,
-                    "Öğretmen Pilot" TEXT, "Öğrenci Pilot" TEXT,
-                    "Kalkış" TEXT, "İniş" TEXT, "Görev" TEXT,
-                    "Engine" TEXT, "IFR Süresi" TEXT
-                )
-            """)
-            existing = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn)
-            existing_keys = {
-                (r["Uçuş Tarihi 2"], r["Öğrenci Pilot"], r["Görev"])
-                for _, r in existing.iterrows()
-            }
-
-            yeni_kayitlar = []
-            last_index_by_date = {}
-            for _, row in df_range.iterrows():
-                d = row["Uçuş Tarihi 2"]
-                key = (str(d), row["Öğrenci Pilot"], row["Görev"])
-                if key in existing_keys:
-                    continue
-                # tarih için bir kez index al
-                if d not in last_index_by_date:
-                    last_index_by_date[d] = get_last_index_for_date(conn, d) + 1
-                idx = last_index_by_date[d]
-                ucus_no = generate_ucus_no(d, idx)
-                last_index_by_date[d] += 1
-
-                yeni_kayitlar.append({
-                    "ucus_no": ucus_no,
-                    **row.to_dict()
-                })
-
+            df_yeni = yeni_kayitlari_hazirla(conn, df_range)
             conn.close()
 
-            if not yeni_kayitlar:
+            if df_yeni.empty:
                 st.info("⚠️ Yeni kayıt bulunamadı. Hepsi zaten mevcut.")
                 return
 
-            df_yeni = pd.DataFrame(yeni_kayitlar)
             st.markdown("### ✈️ Oluşturulacak Kayıtlar")
             st.dataframe(df_yeni, use_container_width=True)
 
             # 4) Aktarma butonu
             if st.button("💾 Tarih Aralığı Verilerini Aktar"):
                 conn = sqlite3.connect("naeron_kayitlari.db")
-                df_yeni.to_sql("naeron_ucuslar", conn, if_exists="append", index=False)
+                kayitlari_aktar(conn, df_yeni)
 
                 # Log'u da kaydet (isteğe bağlı: başlangıç tarihiyle)
                 cursor_main = conn_main.cursor()
@@ -245,6 +148,8 @@ def tab_naeron_yukle(st, secilen_tarih, conn_main):
                 )
                 conn_main.commit()
                 conn.close()
+                # Sadece yeni uçuşları olan öğrencilerin durum tablosunu yenile
+                durum_yenile(conn_main)
 
                 st.success(f"🧾 {len(df_yeni)} kayıt başarıyla aktarıldı ve log güncellendi.")
 
@@ -278,7 +183,7 @@ def tab_naeron_yukle(st, secilen_tarih, conn_main):
 
             conn = sqlite3.connect("naeron_kayitlari.db")
             if selected_row:
-                detay_df = pd.read_sql_query("SELECT * FROM naeron_ucuslar WHERE `Uçuş Tarihi 2` = ?", conn, params=[selected_row])
+                detay_df = pd.read_sql_query(f"SELECT {golgesiz_secim(conn, 'naeron_ucuslar')} FROM naeron_ucuslar WHERE `Uçuş Tarihi 2` = ?", conn, params=[selected_row])
                 if not detay_df.empty:
                     st.markdown(f"### 📄 {selected_row} tarihli uçuş detayları")
                     st.dataframe(detay_df, use_container_width=True)
@@ -289,22 +194,16 @@ def tab_naeron_yukle(st, secilen_tarih, conn_main):
 
         if uploaded_file:
             try:
-                df = pd.read_excel(uploaded_file)
-                df.columns = [c.strip() for c in df.columns]
-
-                beklenen = [
-                    "Uçuş Tarihi 2", "Çağrı", "Off Bl.", "On Bl.", "Block Time", "Flight Time",
-                    "Öğretmen Pilot", "Öğrenci Pilot", "Kalkış", "İniş", "Görev", "Engine", "IFR Süresi"
-                ]
-                eksik = [s for s in beklenen if s not in df.columns]
-                if eksik:
-                    st.error(f"❌ Eksik sütun(lar): {', '.join(eksik)}")
+                try:
+                    df = naeron_excel_oku(
+                        uploaded_file,
+                        filtre=lambda p: p["Uçuş Tarihi 2"] == secilen_tarih,
+                        ilerleme=ilerleme_cubugu(st, "📥 Excel okunuyor"),
+                    )
+                except EksikSutunHatasi as e:
+                    st.error(f"❌ {e}")
                     return
 
-                df = df[beklenen]
-                df["Uçuş Tarihi 2"] = pd.to_datetime(df["Uçuş Tarihi 2"], errors="coerce").dt.date
-
-                df = df[df["Uçuş Tarihi 2"] == secilen_tarih]
                 if df.empty:
                     st.warning(f"⚠️ Seçilen tarih ({secilen_tarih}) için veri bulunamadı.")
                     return
@@ -313,44 +212,24 @@ def tab_naeron_yukle(st, secilen_tarih, conn_main):
                     df[col] = df[col].apply(format_time_cell)
 
                 conn = sqlite3.connect("naeron_kayitlari.db")
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS naeron_ucuslar (
-                        ucus_no TEXT PRIMARY KEY,
-                        "Uçuş Tarihi 2" TEXT, "Çağrı" TEXT, "Off Bl." TEXT, "On Bl." TEXT,
-                        "Block Time" TEXT, "Flight Time" TEXT, "Öğretmen Pilot" TEXT, "Öğrenci Pilot" TEXT,
-                        "Kalkış" TEXT, "İniş" TEXT, "Görev" TEXT, "Engine" TEXT, "IFR Süresi" TEXT
-                    )
-                """)
-
-                existing = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn)
-                existing_keys = set((row["Uçuş Tarihi 2"], row["Öğrenci Pilot"], row["Görev"]) for _, row in existing.iterrows())
-
-                yeni_kayitlar = []
-                last_index = get_last_index_for_date(conn, secilen_tarih)
-                index = last_index + 1
-
-                for _, row in df.iterrows():
-                    key = (str(row["Uçuş Tarihi 2"]), row["Öğrenci Pilot"], row["Görev"])
-                    if key not in existing_keys:
-                        ucus_no = generate_ucus_no(pd.to_datetime(row["Uçuş Tarihi 2"]), index)
-                        index += 1
-                        yeni_kayitlar.append({"ucus_no": ucus_no, **row.to_dict()})
+                df_yeni = yeni_kayitlari_hazirla(conn, df)
 
-                if not yeni_kayitlar:
+                if df_yeni.empty:
                     st.info("⚠️ Yeni kayıt bulunamadı. Hepsi zaten mevcut.")
                     return
 
-                df_yeni = pd.DataFrame(yeni_kayitlar)
                 st.success(f"✅ {len(df_yeni)} yeni kayıt aktarılacak.")
                 st.dataframe(df_yeni, use_container_width=True)
 
                 if st.button("💾 Veritabanına Aktar"):
-                    df_yeni.to_sql("naeron_ucuslar", conn, if_exists="append", index=False)
+                    kayitlari_aktar(conn, df_yeni)
                     cursor_main = conn_main.cursor()
                     cursor_main.execute("REPLACE INTO naeron_log (tarih, kayit_sayisi) VALUES (?, ?)",
                                         (str(secilen_tarih), len(df_yeni)))
                     conn_main.commit()
                     conn.close()
+                    # Sadece yeni uçuşları olan öğrencilerin durum tablosunu yenile
+                    durum_yenile(conn_main)
                     st.success("🧾 Kayıtlar aktarıldı ve log güncellendi.")
 
             except Exception as e:
@@ -3,11 +3,12 @@ import pandas as pd
 import streamlit as st
 from tabs.utils.ozet_utils import ozet_panel_verisi_hazirla  # ⬅️ Fonksiyon burada olmalı
 import plotly.graph_objects as go
+from db.migrations import golgesiz_secim
 
 def tab_ogrenci_gelisim(st, conn):
     st.subheader("🧑‍✈️ Öğrenci Gelişim Takibi (Plan vs Gerçekleşen)")
 
-    df = pd.read_sql_query("SELECT * FROM ucus_planlari", conn)
+    df = pd.read_sql_query(f"SELECT {golgesiz_secim(conn, 'ucus_planlari')} FROM ucus_planlari", conn)
     if df.empty:
         st.warning("Veri bulunamadı.")
         return
@@ -99,7 +100,7 @@ from tabs.utils.ozet_utils import ozet_panel_verisi_hazirla
 import matplotlib.pyplot as plt
 
 def donem_ogrenci_dashboard_raporu(st, conn, secilen_donem):
-    df = pd.read_sql_query("SELECT * FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
+    df = pd.read_sql_query(f"SELECT {golgesiz_secim(conn, 'ucus_planlari')} FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
     df = df[df["donem"] == secilen_donem].copy()
     df["ogrenci_kodu"] = df["ogrenci"].str.split("-").str[0].str.strip()
     df["ogrenci"] = df["ogrenci"].astype(str)
@@ -5,6 +5,8 @@ from datetime import datetime, timedelta
 import io
 import sqlite3
 
+from tabs.utils.excel_akis import excel_oku
+
 def sureyi_stringe_cevir(sure_cell):
     if pd.isnull(sure_cell):
         return ""
@@ -60,8 +62,7 @@ def tab_plan_olustur(st, conn, cursor):
     uploaded_file = st.file_uploader("Plan şablon dosyasını yükleyin (Excel)", type=["xlsx"])
 
     if uploaded_file and donem and ogrenci_sayisi:
-        df = pd.read_excel(uploaded_file, sheet_name=0)
-        df.columns = [c.strip().upper() for c in df.columns]  # normalize başlıklar
+        df = excel_oku(uploaded_file, baslik_duzelt=lambda c: c.strip().upper())  # normalize başlıklar
         required_cols = ["GÖREV TİPİ", "TARİH", "GÖREV İSMİ", "SÜRE"]
 
         if not all(col in df.columns for col in required_cols):
@@ -135,8 +136,7 @@ def tab_plan_olustur(st, conn, cursor):
 
     if uploaded_file and donem and ogrenci_excel_file:
         try:
-            ogrenci_df = pd.read_excel(ogrenci_excel_file)
-            ogrenci_df.columns = [c.strip().upper() for c in ogrenci_df.columns]
+            ogrenci_df = excel_oku(ogrenci_excel_file, baslik_duzelt=lambda c: c.strip().upper())
 
             if not all(col in ogrenci_df.columns for col in ["STUDENT_NAME", "START_DATE"]):
                 st.error("Excel dosyasında 'Student_name' ve 'Start_date' sütunları olmalıdır.")
@@ -147,8 +147,7 @@ def tab_plan_olustur(st, conn, cursor):
                 pd.to_datetime(ogrenci_df["START_DATE"]).dt.date
             ))
 
-            df = pd.read_excel(uploaded_file, sheet_name=0)
-            df.columns = [c.strip().upper() for c in df.columns]
+            df = excel_oku(uploaded_file, baslik_duzelt=lambda c: c.strip().upper())
 
             required_cols = ["GÖREV TİPİ", "TARİH", "GÖREV İSMİ", "SÜRE"]
             if not all(col in df.columns for col in required_cols):
@@ -164,46 +164,57 @@ def _schedule_exact_reload(st, now: datetime, target: datetime, debug: bool = Fa
         pass
 
 
-def _run_general_scan_and_render(st) -> int | None:
-    """Run 'Tüm dönemleri arama' and render results on settings.
+def _run_general_scan_and_render(st, *, request: bool = True) -> int | None:
+    """Run 'Tüm dönemleri arama' in the background worker and render its latest result.
 
-    Returns number of rows if any (0 if empty), or None on error.
+    Tarama sayfa içinde çalışmaz: istek arka plan worker'ına bırakılır (revize_worker), sayfa
+    worker'ın yazdığı son sonucu gösterir; sonuç hazır olunca bir sonraki yenilemede görünür.
+    Returns number of rows of the last finished scan (0 if empty / still running), or None on error.
     """
     try:
-        from tabs.revize_panel_genel import hazirla_tum_donemler_df
+        from tabs.scripts import revize_worker
     except Exception as exc:
         st.error(f"Genel tarama modulu yuklenemedi: {exc}")
         return None
 
     try:
-        conn = sqlite3.connect("ucus_egitim.db", check_same_thread=False)
+        durum_conn = revize_worker.durum_baglan()
     except Exception as exc:
-        st.error(f"Veritabani baglantisi kurulamadi: {exc}")
+        st.error(f"Worker durum veritabani acilamadi: {exc}")
         return None
 
     try:
-        df = hazirla_tum_donemler_df(conn, bugun=_now_istanbul().date())
+        if request:
+            revize_worker.is_iste(durum_conn, "tarama")
+            revize_worker.worker_baslat(durum_conn)
+        son = revize_worker.son_isler(durum_conn, limit=1, tur="tarama")
+        df = revize_worker.son_tarama_sonucu(durum_conn)
     except Exception as exc:
         st.error(f"Genel tarama calistirilamadi: {exc}")
+        return None
+    finally:
         try:
-            conn.close()
+            durum_conn.close()
         except Exception:
             pass
-        return None
-
-    try:
-        conn.close()
-    except Exception:
-        pass
 
-    if df is None:
+    if not son:
+        return 0
+    is_ = son[0]
+    if is_["durum"] in ("bekliyor", "calisiyor"):
+        st.info(f"Genel tarama arka planda calisiyor (is #{is_['id']}, {is_['durum']}).")
+        return 0
+    if is_["durum"] == "error":
+        st.error(f"Genel tarama calistirilamadi: {is_['ozet'].get('hata', '')}")
+        return None
+    if is_["durum"] == "no_period":
         st.warning("Veritabaninda donem bulunamadi.")
         return 0
-    if getattr(df, "empty", False):
+    if is_["durum"] == "no_missing" or df is None or df.empty:
         st.success("Eksik gorevi olan ogrenci bulunmadi.")
         return 0
 
-    st.markdown("### Genel Tarama Sonucu (Tüm Dönemler)")
+    st.markdown(f"### Genel Tarama Sonucu (Tüm Dönemler) — {is_['bitti']}")
     try:
         st.dataframe(df, use_container_width=True, hide_index=True)
     except Exception:
@@ -459,6 +470,9 @@ def tab_settings(st) -> None:
             + next_display.strftime("%d %B %Y %H:%M")
             + " tarihinde gosterilecek."
         )
+        # Arka planda süren / biten son genel tarama
+        with st.expander("Genel Tarama (Son Sonuc)", expanded=False):
+            _run_general_scan_and_render(st, request=False)
 
     # Varsayılanlara dön
     if st.button("Varsayilan zamana don"):
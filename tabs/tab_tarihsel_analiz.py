@@ -8,6 +8,8 @@ from openpyxl.drawing.image import Image as XLImage
 import tempfile
 import os
 
+from tabs.utils.sure_utils import timedelta_saat
+
 def tab_tarihsel_analiz(st, conn):
     st.subheader("📈 Tarihsel Uçuş Süre Analizi")
 
@@ -196,17 +198,9 @@ def tarihsel_akilli_ozet_panel(st, conn, tarih1, tarih2, df_aralik):
     from datetime import date
     import io
 
-    def _to_hours(s):
-        try:
-            if pd.isna(s) or str(s).strip() == "" or str(s).strip().lower() == "nan":
-                return 0.0
-            td = pd.to_timedelta(str(s))
-            return td.total_seconds() / 3600.0
-        except Exception:
-            try:
-                return float(s)
-            except Exception:
-                return 0.0
+    def _to_hours(seri):
+        # pd.to_timedelta, olmazsa "H:M[:S]" / ondalık saat; boş/geçersiz → 0
+        return timedelta_saat(seri, ondalik=True)
 
     def _fmt_hhmm(hours_float: float) -> str:
         minutes = int(round(float(hours_float) * 60))
@@ -225,7 +219,7 @@ def tarihsel_akilli_ozet_panel(st, conn, tarih1, tarih2, df_aralik):
     df_range = df_aralik.copy()
     df_range["plan_tarihi"] = pd.to_datetime(df_range["plan_tarihi"]).dt.normalize()
     if "sure_saat" not in df_range.columns and "sure" in df_range.columns:
-        df_range["sure_saat"] = df_range["sure"].apply(_to_hours)
+        df_range["sure_saat"] = _to_hours(df_range["sure"])
 
     # --- Günlük toplamlar (SEÇİLEN ARALIK) ---
     gunluk = (
@@ -4,6 +4,7 @@ import streamlit as st
 import sqlite3
 import plotly.express as px
 import io
+from db.migrations import golgesiz_secim
 from tabs.utils.ozet_utils import ozet_panel_verisi_hazirla
 import zipfile
 import tempfile
@@ -12,7 +13,7 @@ def tab_geride_olanlar(st, conn):
     st.subheader("🟥 Geride Olan Öğrenciler Analizi")
 
     # --- 1) Dönem Bazında Geride Kalanlar ---
-    df = pd.read_sql_query("SELECT * FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
+    df = pd.read_sql_query(f"SELECT {golgesiz_secim(conn, 'ucus_planlari')} FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
     if df.empty or "donem" not in df.columns:
         st.warning("Veri bulunamadı.")
         return
@@ -0,0 +1,156 @@
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from tabs.utils.ozet_utils import ozet_panel_verisi_hazirla_toplu
+from tabs.utils.veri_deposu import NAERON_DB_PATH, naeron_ogrenci_oku, plan_oku, veri_surumu
+
+# Farklı dönemlerin öğrencileri birbirinden bağımsızdır: tarama dönem bazında parçalara (shard)
+# bölünür, parçalar ProcessPoolExecutor'da salt okunur bağlantılarla hesaplanır ve sonuçlar
+# dönem sırasıyla birleştirilir. Yazmalar her zaman çağıran süreçte, tek transaction'da yapılır.
+
+UCUS_YAPILMIS_DURUMLAR = ["🟢 Uçuş Yapıldı", "🟣 Eksik Uçuş Saati"]
+ILERI_GOSTERILECEKLER = ["donem", "ogrenci", "plan_tarihi", "gorev_ismi", "sure", "gerceklesen_sure", "durum"]
+
+
+# --- Parçalama / havuz ---
+def salt_okunur_baglan(db_path: str) -> sqlite3.Connection:
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+
+def _db_yolu(conn: sqlite3.Connection) -> str:
+    for _, ad, dosya in conn.execute("PRAGMA database_list"):
+        if ad == "main":
+            return dosya or ""
+    return ""
+
+
+def donem_parcalari(conn: sqlite3.Connection, donemler=None, ogrenci_kodlari=None) -> list[tuple]:
+    """
+    [(donem, [ogrenci_kodu, ...]), ...] — dönemler plan tablosundaki ilk görülme sırasıyla.
+    `donemler` (str karşılaştırılır) ve `ogrenci_kodlari` verilirse sadece onlar.
+    """
+    df = plan_oku(conn)[["donem", "ogrenci_kodu"]]
+    df = df[df["donem"].notna() & (df["ogrenci_kodu"] != "")]
+    if donemler is not None:
+        df = df[df["donem"].astype(str).isin({str(d) for d in donemler})]
+    if ogrenci_kodlari is not None:
+        df = df[df["ogrenci_kodu"].isin(set(ogrenci_kodlari))]
+    df = df.drop_duplicates()
+    return [(d, grup["ogrenci_kodu"].tolist()) for d, grup in df.groupby("donem", sort=False)]
+
+
+def _parca_calistir(is_tanimi):
+    db_path, fn, donem, kodlar, args = is_tanimi
+    conn = salt_okunur_baglan(db_path)
+    try:
+        return fn(conn, donem, kodlar, *args)
+    finally:
+        conn.close()
+
+
+def donem_bazinda(conn: sqlite3.Connection, fn, *args, donemler=None, ogrenci_kodlari=None,
+                  paralel: bool = False, max_workers=None, naeron_db_path: str = NAERON_DB_PATH) -> list:
+    """
+    `fn(conn, donem, ogrenci_kodlari, *args)`'ı her dönem parçası için çalıştırır; sonuçlar dönem
+    sırasıyla (tamamlanma sırasından bağımsız) liste olarak döner. paralel=True iken parçalar
+    süreç havuzunda salt okunur bağlantılarla hesaplanır (`fn` modül düzeyinde tanımlı olmalı);
+    tek parça varsa ya da DB dosyası yoksa (:memory:) sırayla çalışılır.
+    """
+    parcalar = donem_parcalari(conn, donemler, ogrenci_kodlari)
+    db_path = _db_yolu(conn)
+    if not paralel or len(parcalar) <= 1 or not db_path:
+        return [fn(conn, d, kodlar, *args) for d, kodlar in parcalar]
+
+    # Salt okunur worker'lar yazamaz: sürüm trigger'ları ve Naeron snapshot'ı burada hazırlanır
+    veri_surumu(conn, "ucus_planlari")
+    naeron_ogrenci_oku(naeron_db_path)
+    isler = [(db_path, fn, d, kodlar, args) for d, kodlar in parcalar]
+    with ProcessPoolExecutor(max_workers=min(max_workers or os.cpu_count() or 1, len(isler))) as havuz:
+        return list(havuz.map(_parca_calistir, isler))
+
+
+def parcalari_birlestir(parcalar: list) -> pd.DataFrame:
+    parcalar = [p for p in parcalar if p is not None and not p.empty]
+    return pd.concat(parcalar, ignore_index=True) if parcalar else pd.DataFrame()
+
+
+def _donem_satirlari(conn: sqlite3.Connection, donem, kodlar) -> pd.DataFrame:
+    # Öğrenci özeti tüm dönemlerinin satırlarıyla hesaplanır; parça sadece kendi dönemini döndürür
+    df = ozet_panel_verisi_hazirla_toplu(conn, ogrenci_kodlari=kodlar)
+    if df.empty:
+        return df
+    return df[df["donem"] == donem]
+
+
+# --- Parça çekirdekleri ---
+def gecikmis_eksikler(conn: sqlite3.Connection, donem, kodlar, bugun_ts) -> pd.DataFrame:
+    """
+    Dönemin (donem, ogrenci) çiftlerinde tarihi geçmiş eksik görevler; `sira` kolonu çiftin plan
+    tablosundaki DISTINCT sırasıdır (birleştirmeden sonra sıralama bununla yapılır).
+    """
+    df = _donem_satirlari(conn, donem, kodlar)
+    if df.empty:
+        return df
+    # Taranan (donem, ogrenci) çiftleri: ogrenci değeri kendi öğrenci koduyla aynı olanlar
+    ciftler = pd.read_sql_query(
+        "SELECT DISTINCT donem, ogrenci FROM ucus_planlari WHERE donem IS NOT NULL",
+        conn
+    )
+    ciftler["sira"] = range(len(ciftler))
+    df = df.merge(
+        ciftler.rename(columns={"ogrenci": "ogrenci_kodu"}),
+        on=["donem", "ogrenci_kodu"],
+        how="inner",
+        sort=False
+    )
+    durum_mask = df["durum"].fillna("").astype(str).str.contains("eksik", case=False)
+    return df[durum_mask & (df["plan_tarihi"] < bugun_ts)]
+
+
+def ileri_uculmus(conn: sqlite3.Connection, donem, kodlar, bugun_ts) -> pd.DataFrame:
+    """Dönemde uçulmuş (🟢 / 🟣) ama plan tarihi bugünden ileride olan görevler."""
+    df = _donem_satirlari(conn, donem, kodlar)
+    if df.empty:
+        return df
+    return df[df["durum"].isin(UCUS_YAPILMIS_DURUMLAR) & (df["plan_tarihi"] > bugun_ts)]
+
+
+def ileri_kaydirma_plani(conn: sqlite3.Connection, donem, kodlar, bugun_ts) -> pd.DataFrame:
+    """
+    İleri tarihte uçulmuş görevi olan öğrencilerin dönem planını, en ileri uçulmuş görev bugüne
+    gelecek kadar geri alan güncellemeler: [ogrenci, gorev_ismi, plan_tarihi, yeni_plan_tarihi].
+    """
+    df = _donem_satirlari(conn, donem, kodlar)
+    if df.empty:
+        return df
+    ileri = df[df["durum"].isin(UCUS_YAPILMIS_DURUMLAR) & (df["plan_tarihi"] > bugun_ts)]
+    fark = (ileri.groupby("ogrenci_kodu", sort=False)["plan_tarihi"].max() - bugun_ts).dt.days
+    fark = fark[fark > 0]
+    df = df[df["ogrenci_kodu"].isin(fark.index) & df["plan_tarihi"].notna()].copy()
+    df["yeni_plan_tarihi"] = df["plan_tarihi"] - pd.to_timedelta(df["ogrenci_kodu"].map(fark), unit="D")
+    return df[["ogrenci", "gorev_ismi", "plan_tarihi", "yeni_plan_tarihi"]]
+
+
+# --- Taramalar ---
+def ileri_uculmus_tara(conn: sqlite3.Connection, donemler=None, bugun=None, *,
+                       paralel: bool = False, max_workers=None) -> pd.DataFrame:
+    """
+    İleride-giden (ileri tarihe planlanıp uçulmuş) görev taraması; `donemler` None ise tüm dönemler.
+    Dönüş: ILERI_GOSTERILECEKLER kolonları, (donem, ogrenci, plan_tarihi, gorev_ismi) sıralı.
+    """
+    bugun_ts = pd.to_datetime(bugun or datetime.today().date())
+    df = parcalari_birlestir(donem_bazinda(
+        conn, ileri_uculmus, bugun_ts, donemler=donemler, paralel=paralel, max_workers=max_workers
+    ))
+    if df.empty:
+        return df
+    for kol in ILERI_GOSTERILECEKLER:
+        if kol not in df.columns:
+            df[kol] = None
+    return df[ILERI_GOSTERILECEKLER].sort_values(
+        ["donem", "ogrenci", "plan_tarihi", "gorev_ismi"], na_position="last"
+    ).reset_index(drop=True)
@@ -0,0 +1,127 @@
+import time
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+PARCA_BOYU = 5000
+
+
+class EksikSutunHatasi(ValueError):
+    """Excel başlığında beklenen sütunlar yok; `eksik` listesi hata mesajında da gösterilir."""
+
+    def __init__(self, eksik):
+        self.eksik = list(eksik)
+        super().__init__(f"Eksik sütun(lar): {', '.join(self.eksik)}")
+
+
+def _basa_sar(kaynak):
+    if hasattr(kaynak, "seek"):
+        kaynak.seek(0)
+
+
+def _hucre(deger):
+    # pd.read_excel (openpyxl) ile aynı: boş hücre → NaN, tam sayı değerli float → int
+    if deger is None:
+        return np.nan
+    if isinstance(deger, float) and deger.is_integer():
+        return int(deger)
+    return deger
+
+
+def _basliklar(ham, baslik_duzelt):
+    # Boş başlık → "Unnamed: i", tekrar eden başlık → "X.1", "X.2" (pandas ile aynı)
+    sonuc, sayac = [], {}
+    for i, b in enumerate(ham):
+        ad = f"Unnamed: {i}" if b is None else baslik_duzelt(str(b))
+        if ad in sayac:
+            sayac[ad] += 1
+            ad = f"{ad}.{sayac[ad]}"
+        else:
+            sayac[ad] = 0
+        sonuc.append(ad)
+    return sonuc
+
+
+def excel_parcalari(kaynak, kolonlar=None, parca_boyu: int = PARCA_BOYU,
+                    baslik_duzelt=str.strip, ilerleme=None):
+    """
+    xlsx dosyasının ilk sayfasını openpyxl read-only modunda satır satır okur ve
+    `parca_boyu` satırlık DataFrame parçaları üretir; dosyanın tamamı belleğe alınmaz.
+    İlk dolu satır başlıktır. `kolonlar` verilirse başlık okunur okunmaz kontrol edilir
+    (eksikse EksikSutunHatasi) ve parçalar sadece bu kolonları (bu sırayla) içerir.
+    `ilerleme(okunan, toplam)` her parçadan sonra çağrılır (toplam bilinmiyorsa None).
+    """
+    _basa_sar(kaynak)
+    wb = load_workbook(kaynak, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        toplam = ws.max_row - 1 if ws.max_row else None
+        satirlar = ws.iter_rows(values_only=True)
+
+        baslik = None
+        for satir in satirlar:
+            if any(v is not None for v in satir):
+                baslik = list(satir)
+                break
+        if baslik is None:
+            if kolonlar:
+                raise EksikSutunHatasi(kolonlar)
+            return
+        while baslik and baslik[-1] is None:
+            baslik.pop()
+        adlar = _basliklar(baslik, baslik_duzelt)
+        genislik = len(adlar)
+
+        if kolonlar is not None:
+            eksik = [k for k in kolonlar if k not in adlar]
+            if eksik:
+                raise EksikSutunHatasi(eksik)
+            secim = [adlar.index(k) for k in kolonlar]
+            adlar = list(kolonlar)
+        else:
+            secim = list(range(genislik))
+
+        parca, okunan = [], 0
+        for satir in satirlar:
+            if not any(v is not None for v in satir):
+                continue
+            satir = tuple(satir[:genislik]) + (None,) * (genislik - len(satir))
+            parca.append([_hucre(satir[i]) for i in secim])
+            if len(parca) >= parca_boyu:
+                okunan += len(parca)
+                yield pd.DataFrame(parca, columns=adlar)
+                parca = []
+                if ilerleme:
+                    ilerleme(okunan, toplam)
+        if parca:
+            okunan += len(parca)
+            yield pd.DataFrame(parca, columns=adlar)
+        if ilerleme:
+            ilerleme(okunan, okunan)
+    finally:
+        wb.close()
+
+
+def excel_oku(kaynak, kolonlar=None, parca_boyu: int = PARCA_BOYU,
+              baslik_duzelt=str.strip, ilerleme=None) -> pd.DataFrame:
+    """excel_parcalari'nın tüm parçalarını birleştirir (küçük dosyalar / şablonlar için)."""
+    parcalar = list(excel_parcalari(kaynak, kolonlar, parca_boyu, baslik_duzelt, ilerleme))
+    if not parcalar:
+        return pd.DataFrame(columns=kolonlar or [])
+    return pd.concat(parcalar, ignore_index=True)
+
+
+def ilerleme_cubugu(st, etiket: str = "Excel okunuyor"):
+    """excel_parcalari için st.progress tabanlı ilerleme geri çağrısı (satır/sn ile)."""
+    cubuk = st.progress(0.0, text=etiket)
+    baslangic = time.perf_counter()
+
+    def guncelle(okunan, toplam):
+        gecen = max(time.perf_counter() - baslangic, 1e-6)
+        hiz = okunan / gecen
+        oran = min(okunan / toplam, 1.0) if toplam else 0.0
+        metin = f"{etiket}: {okunan:,} satır" + (f" / {toplam:,}" if toplam else "") + f" · {hiz:,.0f} satır/sn"
+        cubuk.progress(oran, text=metin)
+
+    return guncelle
@@ -0,0 +1,303 @@
+import re
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from db.migrations import plan_kolonlari
+from tabs.utils.ozet_utils2 import (
+    naeron_ogrenci_kodu_ayikla,
+    ogrenci_kodu_ayikla,
+    ozet_panel_verisi_hazirla_batch,
+)
+from tabs.utils.ogrenci_kodu import plan_ogrenci_kodu
+
+NAERON_DB_PATH = "naeron_kayitlari.db"
+
+# ogrenci_gorev_durum: ucus_planlari satırı başına hesaplanmış eşleşme sonuçları (materialized).
+# Plan kolonları burada tutulmaz; okuma sırasında ucus_planlari ile join edilir.
+DURUM_KOLONLARI = [
+    "planlanan_saat_ondalik",
+    "gerceklesen_saat_ondalik",
+    "fark_saat_ondalik",
+    "Planlanan",
+    "Gerçekleşen",
+    "Fark",
+    "durum",
+]
+
+
+# --- Şema Kurulumu ---
+def ensure_durum_tablolari(conn: sqlite3.Connection, naeron_db_path: str = NAERON_DB_PATH) -> bool:
+    """
+    Materialized tabloyu ve değişiklik kuyruklarını (trigger'lar) kurar.
+    Trigger'lardan biri yeni oluşturulduysa (daha önce kaçırılmış değişiklik olabilir) True döner;
+    bu durumda çağıran taraf tam yenileme yapmalıdır.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS ogrenci_gorev_durum (
+            plan_id INTEGER PRIMARY KEY,
+            ogrenci_kodu TEXT NOT NULL,
+            sira INTEGER NOT NULL,
+            planlanan_saat_ondalik REAL,
+            gerceklesen_saat_ondalik REAL,
+            fark_saat_ondalik REAL,
+            "Planlanan" TEXT,
+            "Gerçekleşen" TEXT,
+            "Fark" TEXT,
+            durum TEXT,
+            guncelleme TEXT
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_ogrenci_gorev_durum_kod ON ogrenci_gorev_durum (ogrenci_kodu, sira)")
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS ogrenci_gorev_durum_kirli (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ogrenci TEXT
+        )
+    """)
+
+    yeni_trigger = False
+    plan_var = cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='ucus_planlari'"
+    ).fetchone()
+    if plan_var:
+        mevcut = {r[0] for r in cur.execute("SELECT name FROM sqlite_master WHERE type='trigger'")}
+        if "trg_ucus_planlari_durum_ins" not in mevcut:
+            yeni_trigger = True
+        cur.executescript("""
+            CREATE TRIGGER IF NOT EXISTS trg_ucus_planlari_durum_ins AFTER INSERT ON ucus_planlari
+            BEGIN
+                INSERT INTO ogrenci_gorev_durum_kirli (ogrenci) VALUES (NEW.ogrenci);
+            END;
+            CREATE TRIGGER IF NOT EXISTS trg_ucus_planlari_durum_upd AFTER UPDATE ON ucus_planlari
+            BEGIN
+                INSERT INTO ogrenci_gorev_durum_kirli (ogrenci) VALUES (OLD.ogrenci);
+                INSERT INTO ogrenci_gorev_durum_kirli (ogrenci) VALUES (NEW.ogrenci);
+            END;
+            CREATE TRIGGER IF NOT EXISTS trg_ucus_planlari_durum_del AFTER DELETE ON ucus_planlari
+            BEGIN
+                INSERT INTO ogrenci_gorev_durum_kirli (ogrenci) VALUES (OLD.ogrenci);
+            END;
+        """)
+    conn.commit()
+
+    # Naeron ayrı bir dosyada: kuyruk tablosu ve trigger'lar orada tutulur
+    try:
+        conn_n = sqlite3.connect(naeron_db_path)
+        cur_n = conn_n.cursor()
+        cur_n.execute("""
+            CREATE TABLE IF NOT EXISTS naeron_kirli_pilotlar (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                pilot TEXT
+            )
+        """)
+        naeron_var = cur_n.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='naeron_ucuslar'"
+        ).fetchone()
+        if naeron_var:
+            mevcut = {r[0] for r in cur_n.execute("SELECT name FROM sqlite_master WHERE type='trigger'")}
+            if "trg_naeron_ucuslar_durum_ins" not in mevcut:
+                yeni_trigger = True
+            cur_n.executescript("""
+                CREATE TRIGGER IF NOT EXISTS trg_naeron_ucuslar_durum_ins AFTER INSERT ON naeron_ucuslar
+                BEGIN
+                    INSERT INTO naeron_kirli_pilotlar (pilot) VALUES (NEW."Öğrenci Pilot");
+                END;
+                CREATE TRIGGER IF NOT EXISTS trg_naeron_ucuslar_durum_upd AFTER UPDATE ON naeron_ucuslar
+                BEGIN
+                    INSERT INTO naeron_kirli_pilotlar (pilot) VALUES (OLD."Öğrenci Pilot");
+                    INSERT INTO naeron_kirli_pilotlar (pilot) VALUES (NEW."Öğrenci Pilot");
+                END;
+                CREATE TRIGGER IF NOT EXISTS trg_naeron_ucuslar_durum_del AFTER DELETE ON naeron_ucuslar
+                BEGIN
+                    INSERT INTO naeron_kirli_pilotlar (pilot) VALUES (OLD."Öğrenci Pilot");
+                END;
+            """)
+        conn_n.commit()
+        conn_n.close()
+    except sqlite3.Error:
+        yeni_trigger = True
+
+    return yeni_trigger
+
+
+def _pilot_kodlari(pilot) -> set:
+    """Naeron pilot alanından etkilenen öğrenci kodları (MCC'de birden fazla öğrenci olabilir)."""
+    if pilot is None:
+        return set()
+    kodlar = set(re.findall(r"\d{3}[A-Z]{2}", str(pilot).upper()))
+    kod = naeron_ogrenci_kodu_ayikla(pilot)
+    if kod:
+        kodlar.add(kod)
+    return kodlar
+
+
+def _kirli_kodlar(conn: sqlite3.Connection, naeron_db_path: str):
+    """Kuyruklardaki öğrenci kodları ve temizlenecek son id'ler: (kodlar, plan_max_id, naeron_max_id)."""
+    kodlar = set()
+    rows = conn.execute("SELECT id, ogrenci FROM ogrenci_gorev_durum_kirli").fetchall()
+    plan_max = max((r[0] for r in rows), default=0)
+    for _, ogrenci in rows:
+        kod = ogrenci_kodu_ayikla(ogrenci) if ogrenci is not None else ""
+        if kod:
+            kodlar.add(kod)
+
+    naeron_max = 0
+    try:
+        conn_n = sqlite3.connect(naeron_db_path)
+        rows_n = conn_n.execute("SELECT id, pilot FROM naeron_kirli_pilotlar").fetchall()
+        conn_n.close()
+        naeron_max = max((r[0] for r in rows_n), default=0)
+        for _, pilot in rows_n:
+            kodlar |= _pilot_kodlari(pilot)
+    except sqlite3.Error:
+        pass
+    return kodlar, plan_max, naeron_max
+
+
+def _tum_plan_kodlari(conn: sqlite3.Connection) -> set:
+    # ogrenci_kodu gölge kolonu (migrasyon, indeksli) varsa kodlar doğrudan ondan okunur
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT ogrenci_kodu FROM ucus_planlari WHERE ogrenci IS NOT NULL"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        rows = conn.execute("SELECT DISTINCT ogrenci FROM ucus_planlari WHERE ogrenci IS NOT NULL").fetchall()
+    return {k for k in plan_ogrenci_kodu(pd.Series([r[0] for r in rows], dtype=object)) if k}
+
+
+def durum_kirlet(conn: sqlite3.Connection, ogrenciler) -> None:
+    """Dışarıdan bilinen değişiklikler için (ör. dönem tipi güncellemesi) öğrencileri yenilemeye işaretler."""
+    if isinstance(ogrenciler, str):
+        ogrenciler = [ogrenciler]
+    ensure_durum_tablolari(conn)
+    conn.executemany(
+        "INSERT INTO ogrenci_gorev_durum_kirli (ogrenci) VALUES (?)",
+        [(str(o),) for o in ogrenciler if str(o).strip()],
+    )
+    conn.commit()
+
+
+def donemleri_kirlet(conn: sqlite3.Connection, donemler) -> int:
+    """
+    Dönemlerin tüm öğrencilerini kuyruğa ekler (dönem tipi PIF/SIF durum kurallarını değiştirir).
+    return: işaretlenen öğrenci sayısı
+    """
+    donemler = [str(d) for d in donemler if d is not None and str(d).strip()]
+    if not donemler:
+        return 0
+    ogrenciler = [r[0] for r in conn.execute(
+        f"SELECT DISTINCT ogrenci FROM ucus_planlari WHERE donem IN ({','.join('?' * len(donemler))})",
+        donemler,
+    ) if r[0] is not None]
+    durum_kirlet(conn, ogrenciler)
+    return len(ogrenciler)
+
+
+def durum_yenile(conn: sqlite3.Connection, naeron_db_path: str = NAERON_DB_PATH, tam: bool = False) -> int:
+    """
+    Sadece değişen (kuyruktaki) öğrencilerin satırlarını yeniden hesaplar ve tek transaction'da yazar.
+    tam=True ya da tablo ilk kez kuruluyorsa tüm öğrenciler hesaplanır.
+    return: yenilenen öğrenci sayısı
+    """
+    if ensure_durum_tablolari(conn, naeron_db_path):
+        tam = True
+    if not tam and conn.execute("SELECT 1 FROM ogrenci_gorev_durum LIMIT 1").fetchone() is None:
+        tam = True
+
+    kodlar, plan_max, naeron_max = _kirli_kodlar(conn, naeron_db_path)
+    if tam:
+        kodlar |= _tum_plan_kodlari(conn)
+        kodlar |= {r[0] for r in conn.execute("SELECT DISTINCT ogrenci_kodu FROM ogrenci_gorev_durum")}
+    if not kodlar:
+        return 0
+
+    sonuclar = ozet_panel_verisi_hazirla_batch(sorted(kodlar), conn, naeron_db_path)
+
+    simdi = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    kayitlar = []
+    for kod, tup in sonuclar.items():
+        dfp = tup[0] if tup else None
+        if dfp is None or dfp.empty or "id" not in dfp.columns:
+            continue
+        df_yaz = dfp[["id"] + DURUM_KOLONLARI].copy()
+        df_yaz.insert(1, "ogrenci_kodu", kod)
+        df_yaz.insert(2, "sira", range(len(df_yaz)))
+        df_yaz["guncelleme"] = simdi
+        kayitlar.extend(df_yaz.itertuples(index=False, name=None))
+
+    cur = conn.cursor()
+    try:
+        cur.executemany(
+            "DELETE FROM ogrenci_gorev_durum WHERE ogrenci_kodu = ?",
+            [(k,) for k in kodlar],
+        )
+        cur.executemany(
+            """
+            INSERT OR REPLACE INTO ogrenci_gorev_durum (
+                plan_id, ogrenci_kodu, sira, planlanan_saat_ondalik, gerceklesen_saat_ondalik,
+                fark_saat_ondalik, "Planlanan", "Gerçekleşen", "Fark", durum, guncelleme
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            kayitlar,
+        )
+        cur.execute("DELETE FROM ogrenci_gorev_durum_kirli WHERE id <= ?", (plan_max,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    # Naeron kuyruğu ayrı dosyada; plan tarafı yazıldıktan sonra temizlenir
+    if naeron_max:
+        try:
+            conn_n = sqlite3.connect(naeron_db_path)
+            conn_n.execute("DELETE FROM naeron_kirli_pilotlar WHERE id <= ?", (naeron_max,))
+            conn_n.commit()
+            conn_n.close()
+        except sqlite3.Error:
+            pass
+    return len(kodlar)
+
+
+# --- Okuma API'si ---
+def gorev_durum_oku(
+    conn: sqlite3.Connection,
+    ogrenci_kodlari=None,
+    donem=None,
+    naeron_db_path: str = NAERON_DB_PATH,
+    yenile: bool = True,
+) -> pd.DataFrame:
+    """
+    ozet_panel_verisi_hazirla_batch'in döndürdüğü plan çerçevelerinin (res[0]) birleşik hali.
+    Okumadan önce sadece kuyruktaki öğrenciler yenilenir; değişiklik yoksa tek bir SELECT'tir.
+    """
+    if yenile:
+        durum_yenile(conn, naeron_db_path)
+
+    where, params = [], []
+    if ogrenci_kodlari is not None:
+        if isinstance(ogrenci_kodlari, str):
+            ogrenci_kodlari = [ogrenci_kodlari]
+        ogrenci_kodlari = [str(k).strip() for k in ogrenci_kodlari if str(k).strip()]
+        if not ogrenci_kodlari:
+            return pd.DataFrame()
+        where.append(f"d.ogrenci_kodu IN ({','.join('?' * len(ogrenci_kodlari))})")
+        params.extend(ogrenci_kodlari)
+    if donem is not None:
+        where.append("p.donem = ?")
+        params.append(str(donem))
+
+    # Gölge kolonlar (ogrenci_kodu, gorev_ust, plan_tarihi_iso) alınmaz; ogrenci_kodu join tablosundan gelir
+    plan_sec = ", ".join(f'p."{kol}"' for kol in plan_kolonlari(conn))
+    sql = f"""
+        SELECT {plan_sec}, d.ogrenci_kodu,
+               d.planlanan_saat_ondalik, d.gerceklesen_saat_ondalik, d.fark_saat_ondalik,
+               d."Planlanan", d."Gerçekleşen", d."Fark", d.durum
+        FROM ucus_planlari p
+        JOIN ogrenci_gorev_durum d ON d.plan_id = p.id
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY d.ogrenci_kodu, d.sira
+    """
+    return pd.read_sql_query(sql, conn, params=params, parse_dates=["plan_tarihi"])
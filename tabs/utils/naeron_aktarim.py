@@ -0,0 +1,149 @@
+import sqlite3
+
+import pandas as pd
+
+from db.migrations import naeron_migrasyonlari
+from tabs.utils.excel_akis import excel_parcalari
+from tabs.utils.tarih_utils import tarih_normalize
+
+NAERON_KOLONLARI = [
+    "Uçuş Tarihi 2", "Çağrı", "Off Bl.", "On Bl.",
+    "Block Time", "Flight Time", "Öğretmen Pilot",
+    "Öğrenci Pilot", "Kalkış", "İniş", "Görev",
+    "Engine", "IFR Süresi"
+]
+
+
+def naeron_excel_oku(kaynak, filtre=None, ilerleme=None) -> pd.DataFrame:
+    """
+    Naeron formatlı Excel'i parça parça okur (başlıkta NAERON_KOLONLARI yoksa EksikSutunHatasi).
+    "Uçuş Tarihi 2" date'e çevrilir; `filtre(parca)` verilirse sadece maskeye uyan satırlar biriktirilir,
+    böylece yıllık dosyadan bir ay/gün seçerken dosyanın tamamı bellekte tutulmaz.
+    """
+    secilenler = []
+    for parca in excel_parcalari(kaynak, NAERON_KOLONLARI, ilerleme=ilerleme):
+        parca["Uçuş Tarihi 2"] = tarih_normalize(parca["Uçuş Tarihi 2"]).dt.date
+        if filtre is not None:
+            parca = parca[filtre(parca)]
+        if not parca.empty:
+            secilenler.append(parca)
+    if not secilenler:
+        return pd.DataFrame(columns=NAERON_KOLONLARI)
+    return pd.concat(secilenler, ignore_index=True)
+
+
+def ensure_naeron_tablosu(conn: sqlite3.Connection) -> bool:
+    """
+    naeron_ucuslar tablosunu ve (tarih, öğrenci, görev) indeksini kurar.
+    Eski tekrarlı kayıtlar yüzünden UNIQUE indeks kurulamazsa aynı kolonlara normal indeks
+    açılır (anti-join yine indeksten yapılır). UNIQUE indeks varsa True döner.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS naeron_ucuslar (
+            ucus_no TEXT PRIMARY KEY,
+            "Uçuş Tarihi 2" TEXT, "Çağrı" TEXT, "Off Bl." TEXT, "On Bl." TEXT,
+            "Block Time" TEXT, "Flight Time" TEXT, "Öğretmen Pilot" TEXT, "Öğrenci Pilot" TEXT,
+            "Kalkış" TEXT, "İniş" TEXT, "Görev" TEXT, "Engine" TEXT, "IFR Süresi" TEXT
+        )
+    """)
+    try:
+        conn.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_naeron_tarih_ogrenci_gorev
+            ON naeron_ucuslar ("Uçuş Tarihi 2", "Öğrenci Pilot", "Görev")
+        """)
+        benzersiz = True
+    except sqlite3.IntegrityError:
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS ix_naeron_tarih_ogrenci_gorev
+            ON naeron_ucuslar ("Uçuş Tarihi 2", "Öğrenci Pilot", "Görev")
+        """)
+        benzersiz = False
+    conn.commit()
+    naeron_migrasyonlari(conn)
+    return benzersiz
+
+
+def _tarih_str(seri: pd.Series) -> pd.Series:
+    # date / Timestamp → 'YYYY-MM-DD' (DB'de saklanan biçim)
+    return tarih_normalize(seri).dt.strftime("%Y-%m-%d")
+
+
+def yeni_kayitlari_hazirla(conn: sqlite3.Connection, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Excel'den gelen uçuşlardan DB'de olmayanları seçer ve gün bazında
+    NRS-YYYYMMDD-NNN numaralarını (o günün mevcut en büyük numarasından devam ederek) atar.
+    Tekrar kontrolü SQLite içinde, (tarih, öğrenci, görev) indeksi üzerinden yapılır.
+    Dosya içindeki tekrarlardan ilki alınır. Dönen tablo başa `ucus_no` eklenmiş `df`'tir.
+    """
+    ensure_naeron_tablosu(conn)
+    df = df[df["Uçuş Tarihi 2"].notna()].reset_index(drop=True)
+    if df.empty:
+        return pd.DataFrame(columns=["ucus_no", *df.columns])
+
+    tarih = _tarih_str(df["Uçuş Tarihi 2"])
+    anahtar = pd.DataFrame({
+        "tarih": tarih,
+        "ogrenci": df["Öğrenci Pilot"].astype(object).where(df["Öğrenci Pilot"].notna(), None),
+        "gorev": df["Görev"].astype(object).where(df["Görev"].notna(), None),
+    })
+    # Öğrenci/görev DB'de TEXT; karşılaştırma da metin üzerinden yapılır
+    for kol in ("ogrenci", "gorev"):
+        anahtar[kol] = anahtar[kol].map(lambda v: v if v is None else str(v))
+    tekrar = anahtar.duplicated(keep="first")
+
+    cur = conn.cursor()
+    cur.execute("DROP TABLE IF EXISTS temp.naeron_aday")
+    cur.execute("CREATE TEMP TABLE naeron_aday (sira INTEGER PRIMARY KEY, tarih TEXT, ogrenci TEXT, gorev TEXT)")
+    cur.executemany(
+        "INSERT INTO temp.naeron_aday VALUES (?, ?, ?, ?)",
+        zip(anahtar.index.tolist(), anahtar["tarih"], anahtar["ogrenci"], anahtar["gorev"]),
+    )
+    mevcut = {
+        r[0] for r in cur.execute("""
+            SELECT a.sira FROM temp.naeron_aday a
+            WHERE EXISTS (
+                SELECT 1 FROM naeron_ucuslar n
+                WHERE n."Uçuş Tarihi 2" = a.tarih
+                  AND n."Öğrenci Pilot" IS a.ogrenci
+                  AND n."Görev" IS a.gorev
+            )
+        """)
+    }
+    # Günlerin son numarası tek sorguda (NRS-YYYYMMDD-NNN)
+    son_no = dict(cur.execute("""
+        SELECT substr(ucus_no, 5, 8) AS gun, MAX(CAST(substr(ucus_no, 14) AS INTEGER))
+        FROM naeron_ucuslar
+        WHERE ucus_no LIKE 'NRS-%'
+          AND substr(ucus_no, 5, 8) IN (SELECT DISTINCT replace(tarih, '-', '') FROM temp.naeron_aday)
+        GROUP BY gun
+    """).fetchall())
+    cur.execute("DROP TABLE temp.naeron_aday")
+
+    secili = ~tekrar & ~anahtar.index.isin(list(mevcut))
+    yeni = df[secili.to_numpy()].copy()
+    if yeni.empty:
+        return pd.DataFrame(columns=["ucus_no", *df.columns])
+
+    gun = tarih[secili].str.replace("-", "", regex=False)
+    sira = gun.groupby(gun, sort=False).cumcount() + 1 + gun.map(son_no).fillna(0).astype(int)
+    yeni.insert(0, "ucus_no", "NRS-" + gun + "-" + sira.astype(str).str.zfill(3))
+    return yeni.reset_index(drop=True)
+
+
+def kayitlari_aktar(conn: sqlite3.Connection, df_yeni: pd.DataFrame) -> int:
+    """
+    Hazırlanan kayıtları tek transaction içinde tek executemany ile yazar.
+    Değer dönüşümleri (tarih/saat → metin, NaN → NULL) pandas to_sql ile aynıdır.
+    """
+    if df_yeni.empty:
+        return 0
+    ensure_naeron_tablosu(conn)
+
+    def _toplu_ekle(tablo, baglanti, kolonlar, satirlar):
+        kolon_sql = ", ".join(f'"{k}"' for k in kolonlar)
+        yer = ", ".join("?" * len(kolonlar))
+        baglanti.executemany(f"INSERT INTO {tablo.name} ({kolon_sql}) VALUES ({yer})", list(satirlar))
+
+    # to_sql, sqlite3 bağlantısında yazmayı tek transaction içinde yapar
+    df_yeni.to_sql("naeron_ucuslar", conn, if_exists="append", index=False, method=_toplu_ekle)
+    return len(df_yeni)
@@ -0,0 +1,109 @@
+import sqlite3
+
+import pandas as pd
+
+from db.migrations import NAERON_KUP_BOYUTLARI, naeron_migrasyonlari
+from tabs.utils.veri_deposu import NAERON_DB_PATH
+
+# naeron_gunluk küpü: (gün, çağrı, görev, öğretmen, kalkış, iniş) başına sorti ve Block / Flight
+# saniyesi. Küp naeron_ucuslar trigger'larıyla (db/migrations.py, Naeron migrasyonu 3) her
+# yazmada güncel tutulur; panolar tarih aralığı sorularını ham satırları yüklemeden buradan alır.
+
+KUP_BOYUTLARI = list(NAERON_KUP_BOYUTLARI)
+KUP_OLCULERI = ["sorti", "block_sn", "ucus_sn"]
+# Boyut → Naeron kolon adı (ekranlarda gösterilen başlıklar)
+KUP_ETIKETLERI = {boyut: kaynak for boyut, (kaynak, _) in NAERON_KUP_BOYUTLARI.items()}
+
+
+def _kup_hazir(conn: sqlite3.Connection) -> bool:
+    # Migrasyonlar naeron_ucuslar yoksa hiçbir şey yapmaz; küp sadece tablo varken kurulur
+    naeron_migrasyonlari(conn)
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='naeron_gunluk'"
+    ).fetchone() is not None
+
+
+def _gun(tarih) -> str:
+    return pd.to_datetime(tarih).strftime("%Y-%m-%d")
+
+
+def kup_oku(bas=None, bit=None, boyutlar=("gun",), filtreler=None, dolu=(),
+            naeron_db_path: str = NAERON_DB_PATH) -> pd.DataFrame:
+    """
+    Küpü `boyutlar` üzerinde toplar: boyut kolonları + sorti, block_sn, ucus_sn (boyut sırasıyla).
+    bas / bit (dahil) gün aralığını, `filtreler` {boyut: değerler} IN koşullarını, `dolu` boş
+    olmaması gereken boyutları verir. Tarihi okunamayan uçuşlar dahil edilmez; "gun" boyutu datetime döner.
+    """
+    boyutlar = list(boyutlar)
+    bilinmeyen = set(boyutlar) | set(filtreler or {}) | set(dolu)
+    bilinmeyen -= set(KUP_BOYUTLARI)
+    if bilinmeyen:
+        raise ValueError(f"Bilinmeyen küp boyutu: {sorted(bilinmeyen)}")
+
+    kosullar, params = ["gun != ''"], []
+    if bas is not None:
+        kosullar.append("gun >= ?")
+        params.append(_gun(bas))
+    if bit is not None:
+        kosullar.append("gun <= ?")
+        params.append(_gun(bit))
+    for boyut, degerler in (filtreler or {}).items():
+        degerler = [str(d).strip() for d in degerler]
+        if degerler:
+            kosullar.append(f"{boyut} IN ({', '.join('?' * len(degerler))})")
+            params += degerler
+    kosullar += [f"{boyut} != ''" for boyut in dolu]
+
+    bos = pd.DataFrame(columns=boyutlar + KUP_OLCULERI)
+    conn = sqlite3.connect(naeron_db_path)
+    try:
+        if not _kup_hazir(conn):
+            return bos
+        grup = ", ".join(boyutlar)
+        secim = f"{grup}, " if grup else ""
+        sql = (
+            f"SELECT {secim}SUM(sorti) AS sorti, SUM(block_sn) AS block_sn, SUM(ucus_sn) AS ucus_sn "
+            f"FROM naeron_gunluk WHERE {' AND '.join(kosullar)}"
+        )
+        if grup:
+            sql += f" GROUP BY {grup} ORDER BY {grup}"
+        df = pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+    df = df[df["sorti"].notna()]
+    if df.empty:
+        return bos
+    df[KUP_OLCULERI] = df[KUP_OLCULERI].astype("int64")
+    if "gun" in df.columns:
+        df["gun"] = pd.to_datetime(df["gun"])
+    return df.reset_index(drop=True)
+
+
+def kup_tarih_araligi(naeron_db_path: str = NAERON_DB_PATH) -> tuple:
+    """Küpteki ilk ve son uçuş günü (date); kayıt yoksa (None, None)."""
+    conn = sqlite3.connect(naeron_db_path)
+    try:
+        if not _kup_hazir(conn):
+            return None, None
+        ilk, son = conn.execute("SELECT MIN(gun), MAX(gun) FROM naeron_gunluk WHERE gun != ''").fetchone()
+    finally:
+        conn.close()
+    if ilk is None:
+        return None, None
+    return pd.to_datetime(ilk).date(), pd.to_datetime(son).date()
+
+
+def kup_degerleri(boyut: str, naeron_db_path: str = NAERON_DB_PATH) -> list:
+    """Boyutun boş olmayan farklı değerleri (sıralı)."""
+    if boyut not in KUP_BOYUTLARI:
+        raise ValueError(f"Bilinmeyen küp boyutu: {boyut}")
+    conn = sqlite3.connect(naeron_db_path)
+    try:
+        if not _kup_hazir(conn):
+            return []
+        return [r[0] for r in conn.execute(
+            f"SELECT DISTINCT {boyut} FROM naeron_gunluk WHERE {boyut} != '' ORDER BY {boyut}"
+        )]
+    finally:
+        conn.close()
@@ -0,0 +1,83 @@
+import pandas as pd
+
+# MCC görevlerinde "Öğrenci Pilot" alanı birden çok öğrenci içerir (ör. "131AB / 131AC")
+MCC_KOD_RE = r"\d{3}[A-Z]{2}"
+
+
+def _benzersizlerde(seri, fn, bos=""):
+    """`fn`'i (vektörel) sadece benzersiz değerlere uygular, sonucu satırlara dağıtır; boş değerler → `bos`."""
+    seri = pd.Series(seri) if not isinstance(seri, pd.Series) else seri
+    kodlar, benzersiz = pd.factorize(seri)
+    sonuc = fn(pd.Series(benzersiz, dtype=object)).to_numpy(dtype=object)
+    dizi = pd.Series(sonuc).reindex(range(len(sonuc) + 1), fill_value=bos).to_numpy(dtype=object)
+    # -1 (boş değer) → sondaki `bos`
+    return pd.Series(dizi[kodlar], index=seri.index, name=seri.name, dtype=object)
+
+
+def _plan_kodlari(metin: pd.Series) -> pd.Series:
+    s = metin.str.strip()
+    diger = s.str.split("-", n=1).str[0].str.strip()
+    return s.where(s.str.startswith("OZ"), diger).fillna("")
+
+
+def _naeron_kodlari(metin: pd.Series) -> pd.Series:
+    s = metin.str.strip()
+    # OZ…: en az iki '-' varsa ikinci '-' öncesi (sağdan boşluk kırpılır), yoksa olduğu gibi
+    oz = s.str.extract(r"^([^-]*-[^-]*)-", expand=False).str.rstrip().fillna(s)
+    diger = s.str.split("-", n=1).str[0].str.strip()
+    return oz.where(s.str.startswith("OZ"), diger).fillna("")
+
+
+def plan_ogrenci_kodu(seri) -> pd.Series:
+    """ozet_utils2.ogrenci_kodu_ayikla'nın vektörel hali: OZ… olduğu gibi, diğerleri ilk '-' öncesi."""
+    return _benzersizlerde(seri, _plan_kodlari)
+
+
+def naeron_ogrenci_kodu(seri) -> pd.Series:
+    """ozet_utils2.naeron_ogrenci_kodu_ayikla'nın vektörel hali: OZ… ikinci '-' öncesi, diğerleri ilk '-' öncesi."""
+    return _benzersizlerde(seri, _naeron_kodlari)
+
+
+def oncelikli_ogrenci_kodu(seri) -> pd.Series:
+    """Metinde 3 rakam + 2 harf (ör. 131AB) kelimesi varsa o (büyük harfe çevrilmiş metinde), yoksa ilk '-' öncesi."""
+    def _kodlar(metin):
+        s = metin.astype(str).str.strip()
+        kod = s.str.upper().str.extract(r"\b(" + MCC_KOD_RE + r")\b", expand=False)
+        return kod.fillna(s.str.split("-", n=1).str[0].str.strip())
+
+    return _benzersizlerde(seri, _kodlar)
+
+
+def mcc_maskesi(gorev) -> pd.Series:
+    """Görev adı MCC ile başlayan (çoklu öğrenci) satırlar."""
+    return pd.Series(gorev).astype(str).str.upper().str.startswith("MCC")
+
+
+def mcc_ogrenci_kodlari(pilot) -> pd.Series:
+    """Her "Öğrenci Pilot" değerindeki tüm öğrenci kodları (bulunma sırasıyla liste)."""
+    return _benzersizlerde(
+        pd.Series(pilot).astype(str),
+        lambda m: m.str.upper().str.findall(MCC_KOD_RE),
+    )
+
+
+def ogrenci_patlat(df: pd.DataFrame, pilot_kolonu: str = "Öğrenci Pilot", gorev_kolonu: str = "Görev",
+                   kod_kolonu: str = "ogrenci_kodu", kod_ayikla=None) -> pd.DataFrame:
+    """
+    Naeron satırlarını öğrenci bazına açar (long format): MCC satırları içlerindeki her öğrenci
+    koduna çoğaltılır (kod bulunamayan MCC satırı düşer), diğer satırlar tek kod alır.
+    MCC dışı satırlarda `kod_ayikla(pilot serisi)` verilirse o, verilmezse varsa mevcut `kod_kolonu`,
+    yoksa naeron_ogrenci_kodu kullanılır. Sıra: önce MCC satırları
+    (eski iterrows ile aynı), sonra diğerleri; index sıfırlanır.
+    """
+    mcc = mcc_maskesi(df[gorev_kolonu]).to_numpy()
+    df_mcc = df[mcc].copy()
+    df_mcc[kod_kolonu] = mcc_ogrenci_kodlari(df_mcc[pilot_kolonu])
+    df_mcc = df_mcc.explode(kod_kolonu).dropna(subset=[kod_kolonu])
+
+    df_diger = df[~mcc].copy()
+    if kod_ayikla is not None:
+        df_diger[kod_kolonu] = kod_ayikla(df_diger[pilot_kolonu])
+    elif kod_kolonu not in df_diger.columns:
+        df_diger[kod_kolonu] = naeron_ogrenci_kodu(df_diger[pilot_kolonu])
+    return pd.concat([df_mcc, df_diger], ignore_index=True)
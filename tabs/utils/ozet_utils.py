@@ -1,87 +1,24 @@
 import re
+import numpy as np
 import pandas as pd
 import sqlite3
 from datetime import datetime
 from collections import deque
 
+from tabs.utils.sure_utils import saat_formatla, saat_tek, sure_saat
 
-def eslesen_pic_sure_sirali(df_plan, df_naeron):
-    # 1) Plan’daki PIC görevlerinin indekslerini al
-    plan_pic_idx = df_plan[df_plan["gorev_ismi"]
-                            .str.upper()
-                            .str.contains("PIC")].index
+# Plan ↔ Naeron eşleştirmesi ozet_utils2'deki vektörel motoru kullanır (tek kaynak)
+from tabs.utils.ozet_utils2 import eslesen_pic_sure_sirali, eslesen_normal_sure
+from tabs.utils.ozet_utils2 import (
+    _beklemede_maskesi,
+    _donem_tipleri,
+    _norm,
+    _norm_series,
+    _sirali_toplam,
+    eslesen_sureleri_hesapla,
+)
+from tabs.utils.veri_deposu import naeron_ogrenci_oku, plan_oku
 
-    # 2) Naeron’daki PIC uçuş kayıtlarını, Uçuş Tarihi 2 sütununa göre kronolojik sırala
-    naeron_pic = (
-        df_naeron[df_naeron["Görev"]
-                .str.upper()
-                .str.contains("PIC")]
-        .sort_values("Uçuş Tarihi 2")
-        .reset_index(drop=True)
-    )
-
-    # 3) Sırasıyla eşleştir
-    for i, plan_i in enumerate(plan_pic_idx):
-        if i < len(naeron_pic):
-            # i’inci uçuşun Block Time’ını ata
-            df_plan.at[plan_i, "gerceklesen_saat_ondalik"] = to_saat(
-                naeron_pic.at[i, "Block Time"]
-            )
-        else:
-            # Fazladan PIC planı kalırsa, 0 bırak
-            df_plan.at[plan_i, "gerceklesen_saat_ondalik"] = 0
-
-    return df_plan
-
-def eslesen_normal_sure(df_plan, df_naeron):
-    def _normalize_fam(name):
-        return re.sub(r"\s+", "", str(name or "")).upper()
-
-    fam_variants_norm = {_normalize_fam(v) for v in ["FAM.(SIM)", "FAMILIARIZATION(SIM)"]}
-    mask_non_pic = ~df_plan["gorev_ismi"].str.upper().str.contains("PIC", na=False)
-    fam_plan_mask = mask_non_pic & df_plan["gorev_ismi"].apply(lambda x: _normalize_fam(x) in fam_variants_norm)
-
-    fam_segments = deque()
-    if fam_plan_mask.any():
-        df_naeron_fam = df_naeron[df_naeron["Görev"].apply(lambda x: _normalize_fam(x) in fam_variants_norm)].copy()
-        if not df_naeron_fam.empty:
-            if "Uçuş Tarihi 2" in df_naeron_fam.columns:
-                df_naeron_fam = df_naeron_fam.sort_values("Uçuş Tarihi 2")
-            fam_segments = deque(
-                h for h in (to_saat(bt) for bt in df_naeron_fam["Block Time"].fillna("00:00"))
-                if h > 0
-            )
-
-        def allocate_hours(requested):
-            allocated = 0.0
-            epsilon = 1e-6
-            requested = float(requested)
-            while requested > epsilon and fam_segments:
-                current = fam_segments.popleft()
-                take = min(requested, current)
-                allocated += take
-                requested -= take
-                remainder = current - take
-                if remainder > epsilon:
-                    fam_segments.appendleft(remainder)
-            return allocated
-
-        for idx in df_plan.loc[fam_plan_mask].index:
-            plan_hours = df_plan.at[idx, "planlanan_saat_ondalik"]
-            if pd.isna(plan_hours) or plan_hours <= 0:
-                plan_hours = 1.0
-            df_plan.at[idx, "gerceklesen_saat_ondalik"] = allocate_hours(plan_hours)
-
-    regular_mask = mask_non_pic & ~fam_plan_mask
-
-    def match(gorev):
-        eslesme = df_naeron[df_naeron["Görev"] == gorev]
-        return eslesme["Block Time"].apply(to_saat).sum() if not eslesme.empty else 0
-
-    df_plan.loc[regular_mask, "gerceklesen_saat_ondalik"] = (
-        df_plan.loc[regular_mask, "gorev_ismi"].apply(match)
-    )
-    return df_plan
 
 def durum_pic_renk(row):
     # Eğer görev adı içinde "PIC" geçiyorsa
@@ -127,13 +64,7 @@ def ogrenci_kodu_ayikla(ogrenci):
         return ogrenci.split("-")[0].strip()
 # --- Yardımcı fonksiyonlar ---
 def to_saat(sure_str):
-    try:
-        if pd.isna(sure_str) or sure_str == "":
-            return 0
-        parts = [int(p) for p in sure_str.split(":")]
-        return parts[0] + parts[1]/60 + (parts[2] if len(parts)>2 else 0)/3600
-    except:
-        return 0
+    return saat_tek(sure_str)
 
 def format_sure(hours_float):
     neg = hours_float < 0
@@ -149,46 +80,18 @@ def normalize_task(name):
 
 def ozet_panel_verisi_hazirla(secilen_kod, conn, naeron_db_path="naeron_kayitlari.db",st=None):
     # --- 1) Plan verisi ---
-    df = pd.read_sql_query("SELECT * FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
-
-    df["ogrenci_kodu"] = df["ogrenci"].apply(ogrenci_kodu_ayikla)
-    #df["ogrenci_kodu"] = df["ogrenci"].str.split("-").str[0].str.strip()
+    df = plan_oku(conn).drop(columns=["gorev_norm", "sure_saat"])
     df_ogrenci = df[df["ogrenci_kodu"] == secilen_kod].sort_values("plan_tarihi").copy()
     if df_ogrenci.empty:
         return pd.DataFrame(), pd.DataFrame(), 0, 0, 0, pd.DataFrame()
 
     # --- 2) Naeron verisini OKU ve birleştir ---
-    conn_naeron = sqlite3.connect(naeron_db_path)
-    df_naeron_raw = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn_naeron)
-    conn_naeron.close()
-
-    # 2.a) MCC çoklu öğrenci ayrıştırma
-    def mcc_coklu_ogrenci(df_naeron):
-        mask = df_naeron["Görev"].astype(str).str.upper().str.startswith("MCC")
-        df_mcc = df_naeron[mask].copy()
-        def extract_ogrenciler(pilot_str):
-            return re.findall(r"\d{3}[A-Z]{2}", str(pilot_str).upper())
-        rows = []
-        for _, row in df_mcc.iterrows():
-            for kod in extract_ogrenciler(row["Öğrenci Pilot"]):
-                new_row = row.copy()
-                new_row["ogrenci_kodu"] = kod
-                rows.append(new_row)
-        return pd.DataFrame(rows)
-
-    df_naeron_mcc = mcc_coklu_ogrenci(df_naeron_raw)
-
-    # 2.b) MCC dışı öğrenci atama
-    mask_mcc = df_naeron_raw["Görev"].astype(str).str.upper().str.startswith("MCC")
-    df_naeron_other = df_naeron_raw[~mask_mcc].copy()
-    df_naeron_other["ogrenci_kodu"] = df_naeron_other["Öğrenci Pilot"].apply(naeron_ogrenci_kodu_ayikla)
-
-    # 2.c) Birleştir ve normalize et
-    df_naeron_all = pd.concat([df_naeron_mcc, df_naeron_other], ignore_index=True)
-    df_naeron_all["gorev_norm"] = df_naeron_all["Görev"].apply(normalize_task)
-
-    # 2.d) Sadece seçilen öğrenci
+    # MCC satırları öğrenci bazında açılmış halde gelir (her kod için bir satır)
+    df_naeron_all = naeron_ogrenci_oku(naeron_db_path).drop(columns=["ucus_tarihi", "sure_dec", "flight_dec"], errors="ignore")
+
+    # Sadece seçilen öğrenci; görev adı normalize
     df_naeron = df_naeron_all[df_naeron_all["ogrenci_kodu"] == secilen_kod].copy()
+    df_naeron["gorev_norm"] = df_naeron["Görev"].apply(normalize_task)
     # Eğer PIC ayrımı gerekiyorsa, mesela:
     # df_naeron = df_naeron[df_naeron["Role"] == "PIC"]
 
@@ -196,11 +99,11 @@ def ozet_panel_verisi_hazirla(secilen_kod, conn, naeron_db_path="naeron_kayitlar
     def eslesen_block_sure(gorev_ismi):
         norm = normalize_task(gorev_ismi)
         eş = df_naeron[df_naeron["gorev_norm"] == norm]
-        return eş["Block Time"].apply(to_saat).sum() if not eş.empty else 0
+        return sure_saat(eş["Block Time"]).sum() if not eş.empty else 0
 
     # --- 4) Planlanan, gerçekleşen, fark ---
     # Planlanan süre
-    df_ogrenci["planlanan_saat_ondalik"] = df_ogrenci["sure"].apply(to_saat)
+    df_ogrenci["planlanan_saat_ondalik"] = sure_saat(df_ogrenci["sure"])
     # Gerçekleşen süre (önce PIC, sonra normal)
     df_ogrenci["gerceklesen_saat_ondalik"] = 0
     df_ogrenci = eslesen_pic_sure_sirali(df_ogrenci, df_naeron)
@@ -209,9 +112,9 @@ def ozet_panel_verisi_hazirla(secilen_kod, conn, naeron_db_path="naeron_kayitlar
     df_ogrenci["fark_saat_ondalik"] = df_ogrenci["gerceklesen_saat_ondalik"] - df_ogrenci["planlanan_saat_ondalik"]
 
 
-    df_ogrenci["Planlanan"]   = df_ogrenci["planlanan_saat_ondalik"].apply(format_sure)
-    df_ogrenci["Gerçekleşen"] = df_ogrenci["gerceklesen_saat_ondalik"].apply(format_sure)
-    df_ogrenci["Fark"]        = df_ogrenci["fark_saat_ondalik"].apply(format_sure)
+    df_ogrenci["Planlanan"]   = saat_formatla(df_ogrenci["planlanan_saat_ondalik"])
+    df_ogrenci["Gerçekleşen"] = saat_formatla(df_ogrenci["gerceklesen_saat_ondalik"])
+    df_ogrenci["Fark"]        = saat_formatla(df_ogrenci["fark_saat_ondalik"])
 
     # --- 5) Durum ataması ---
     def ilk_durum(row):
@@ -292,7 +195,7 @@ def ozet_panel_verisi_hazirla(secilen_kod, conn, naeron_db_path="naeron_kayitlar
         # df_naeron zaten sadece bu öğrenciye indirgenmiş durumda
         def _toplam_saat(naeron_df, gorev_list):
             mask = naeron_df["Görev"].apply(lambda x: _norm(x) in {_norm(g) for g in gorev_list})
-            return naeron_df.loc[mask, "Block Time"].apply(to_saat).sum()
+            return sure_saat(naeron_df.loc[mask, "Block Time"]).sum()
 
         # Görünümde ilgili satırları seçmeye yarayan yardımcı
         def _view_mask(df_view, gorev_list):
@@ -343,9 +246,9 @@ def ozet_panel_verisi_hazirla(secilen_kod, conn, naeron_db_path="naeron_kayitlar
         df_ogrenci["durum"] = df_ogrenci.apply(guncel_durum, axis=1)
 
         # Phase özet tablo biçimleme
-        phase_toplamlar["Planlanan"]   = phase_toplamlar["planlanan_saat_ondalik"].apply(format_sure)
-        phase_toplamlar["Gerçekleşen"] = phase_toplamlar["gerceklesen_saat_ondalik"].apply(format_sure)
-        phase_toplamlar["Fark"]        = phase_toplamlar["fark"].apply(format_sure)
+        phase_toplamlar["Planlanan"]   = saat_formatla(phase_toplamlar["planlanan_saat_ondalik"])
+        phase_toplamlar["Gerçekleşen"] = saat_formatla(phase_toplamlar["gerceklesen_saat_ondalik"])
+        phase_toplamlar["Fark"]        = saat_formatla(phase_toplamlar["fark"])
         phase_toplamlar["durum"]       = phase_toplamlar["fark"].apply(lambda x: "✅ Tamamlandı" if x >= 0 else "❌ Tamamlanmadı")
 
     else:
@@ -364,6 +267,98 @@ def ozet_panel_verisi_hazirla(secilen_kod, conn, naeron_db_path="naeron_kayitlar
 
     plan_gorevler = set(df_ogrenci["gorev_ismi"].dropna().str.strip())
     df_naeron_eksik = df_naeron[df_naeron["Görev"].isin(plan_gorevler)==False].copy()
-    df_naeron_eksik["sure_str"] = df_naeron_eksik["Block Time"].apply(lambda x: format_sure(to_saat(x)))
+    df_naeron_eksik["sure_str"] = saat_formatla(sure_saat(df_naeron_eksik["Block Time"]))
 
     return df_ogrenci, phase_toplamlar, toplam_plan, toplam_gercek, toplam_fark, df_naeron_eksik
+
+
+def _ilk_durum_toplu(df):
+    """ozet_panel_verisi_hazirla içindeki `ilk_durum`'un vektörel karşılığı."""
+    return pd.Series(
+        np.select(
+            [df["Planlanan"] == "00:00", df["fark_saat_ondalik"] >= 0, df["Gerçekleşen"] != "00:00"],
+            ["🟡 Teorik Ders", "🟢 Uçuş Yapıldı", "🟣 Eksik Uçuş Saati"],
+            default="🔴 Eksik",
+        ),
+        index=df.index,
+    )
+
+
+# ozet_panel_verisi_hazirla'daki sırayla: (dönem tipi / None = hepsi, görevler, eşik, hedef durumlar, yeni durum)
+_PIF_SIF_KURALLARI = [
+    ("MPL", [f"PIF-{i}" for i in range(20, 29)], 14.5, ["🔴 Eksik", "🟤 Eksik - Beklemede"], "✨ PIF 20-28 BİTTİ"),
+    ("ENTEGRE", [f"PIF-{i}" for i in range(1, 16)], 30.0, ["🔴 Eksik", "🟤 Eksik - Beklemede"], "✨ PIF-SIM TAMAMLANDI"),
+    ("ENTEGRE", [f"PIF-{i}" for i in range(16, 36)], 33.5, ["🔴 Eksik", "🟤 Eksik - Beklemede"], "✨ PIF-AC TAMAMLANDI"),
+    (None, [f"SIF-{i}" for i in range(1, 15)], 20.0,
+     ["🔴 Eksik", "🟤 Eksik - Beklemede", "🟣 Eksik Uçuş Saati"], "✨ SIF TAMAMLANDI"),
+]
+
+
+def ozet_panel_verisi_hazirla_toplu(conn, naeron_db_path="naeron_kayitlari.db", ogrenci_kodlari=None):
+    """
+    ozet_panel_verisi_hazirla'nın tüm öğrenciler için tek geçişlik hali.
+    Plan ve Naeron bir kez okunur; durum kuralları (beklemede, PIF/SIF, phase) öğrenci
+    döngüsü yerine groupby ile uygulanır. Öğrenci bazında plan_tarihi sıralı df_ogrenci'lerin
+    birleşimini döndürür. `ogrenci_kodlari` verilirse sadece bu öğrenciler hesaplanır
+    (kurallar öğrenci bazında olduğu için sonuçları tam hesaplamadakiyle aynıdır).
+    """
+    df = plan_oku(conn).drop(columns=["gorev_norm"])
+    if ogrenci_kodlari is not None:
+        df = df[df["ogrenci_kodu"].isin(set(ogrenci_kodlari))]
+    df = df[df["ogrenci_kodu"] != ""].sort_values(["ogrenci_kodu", "plan_tarihi"], kind="mergesort").copy()
+    if df.empty:
+        return df
+
+    # MCC satırları içindeki her öğrenci koduna çoğaltılmış (long) hali
+    df_naeron = naeron_ogrenci_oku(naeron_db_path).drop(columns=["ucus_tarihi", "flight_dec"], errors="ignore")
+    df_naeron = df_naeron[df_naeron["ogrenci_kodu"].isin(set(df["ogrenci_kodu"]))]
+
+    # Planlanan / gerçekleşen / fark
+    df["planlanan_saat_ondalik"] = df.pop("sure_saat")
+    df["gerceklesen_saat_ondalik"] = eslesen_sureleri_hesapla(df, df_naeron, "ogrenci_kodu")
+    df["fark_saat_ondalik"] = df["gerceklesen_saat_ondalik"] - df["planlanan_saat_ondalik"]
+    df["Planlanan"]   = saat_formatla(df["planlanan_saat_ondalik"])
+    df["Gerçekleşen"] = saat_formatla(df["gerceklesen_saat_ondalik"])
+    df["Fark"]        = saat_formatla(df["fark_saat_ondalik"])
+
+    # Durum + Eksik - Beklemede
+    df["durum"] = _ilk_durum_toplu(df)
+    df.loc[_beklemede_maskesi(df), "durum"] = "🟤 Eksik - Beklemede"
+
+    if "phase" not in df.columns:
+        return df
+
+    # PIF/SIF: dönem tipi öğrencinin ilk (en erken) plan satırındaki dönemden okunur
+    donem_tipleri = _donem_tipleri()
+    ilk_donem = df.drop_duplicates("ogrenci_kodu").set_index("ogrenci_kodu")["donem"]
+    tip = df["ogrenci_kodu"].map(ilk_donem.astype(str).map(donem_tipleri))
+    gorev_view = _norm_series(df["gorev_ismi"])
+    gorev_naeron = _norm_series(df_naeron["Görev"])
+    for donem_tipi, liste, esik, hedef_durumlar, etiket in _PIF_SIF_KURALLARI:
+        hedef = {_norm(g) for g in liste}
+        secili = df_naeron[gorev_naeron.isin(hedef)]
+        if secili.empty:
+            continue
+        gruplar = secili.groupby("ogrenci_kodu", sort=False)
+        toplam = pd.Series(_sirali_toplam(gruplar, secili["sure_dec"]), index=gruplar.size().index)
+        m = (
+            df["ogrenci_kodu"].isin(toplam[toplam >= esik].index)
+            & gorev_view.isin(hedef)
+            & df["durum"].isin(hedef_durumlar)
+        )
+        if donem_tipi is not None:
+            m &= tip == donem_tipi
+        df.loc[m, "durum"] = etiket
+
+    # Phase: fark >= 0 olan (öğrenci, phase) gruplarında eksikler tamamlandı sayılır
+    df["phase"] = df["phase"].astype(str).str.strip()
+    ph = df.groupby(["ogrenci_kodu", "phase"])[["planlanan_saat_ondalik", "gerceklesen_saat_ondalik"]].sum()
+    tamamlanan = ph.index[(ph["gerceklesen_saat_ondalik"] - ph["planlanan_saat_ondalik"]) >= 0]
+    m = (
+        pd.MultiIndex.from_arrays([df["ogrenci_kodu"], df["phase"]]).isin(tamamlanan)
+        & df["durum"].isin(["🟣 Eksik Uçuş Saati", "🔴 Eksik", "🟤 Eksik - Beklemede"])
+    )
+    ucus_yok = df["Gerçekleşen"] == "00:00"
+    df.loc[m & ucus_yok, "durum"] = "⚪ Phase Tamamlandı - Uçuş Yapılmadı"
+    df.loc[m & ~ucus_yok, "durum"] = "🔷 Phase Tamamlandı - 🟣 Eksik Uçuş Saati"
+    return df
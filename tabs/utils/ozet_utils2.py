@@ -1,9 +1,13 @@
 import re
+import numpy as np
 import pandas as pd
 import sqlite3
 from datetime import datetime
 from collections import deque
 
+from tabs.utils.sure_utils import saat_formatla, saat_tek, sure_saat
+from tabs.utils.veri_deposu import naeron_ogrenci_oku, plan_oku
+
 
 def _norm(name: str) -> str:
     return str(name).replace(" ", "").replace("(C)", "").replace("-", "").upper()
@@ -22,21 +26,12 @@ def apply_pif_sif_rules_on_view(
     def _norm(name: str) -> str:
         return str(name).replace(" ", "").replace("(C)", "").replace("-", "").upper()
 
-    def to_saat_local(s):
-        try:
-            if pd.isna(s) or s == "":
-                return 0.0
-            parts = [int(p) for p in str(s).split(":")]
-            return parts[0] + parts[1] / 60 + (parts[2] if len(parts) > 2 else 0) / 3600
-        except:
-            return 0.0
-
     def total_from_list(naeron_df, gorev_list):
         if naeron_df.empty:
             return 0.0
         s = {_norm(g) for g in gorev_list}
         m = naeron_df["Görev"].apply(lambda x: _norm(x) in s)
-        return naeron_df.loc[m, "Block Time"].apply(to_saat_local).sum()
+        return sure_saat(naeron_df.loc[m, "Block Time"], metne_cevir=True).sum()
 
     def view_mask(dfv, gorev_list):
         s = {_norm(g) for g in gorev_list}
@@ -91,82 +86,186 @@ def apply_pif_sif_rules_on_view(
 
     return df_view
 
-def eslesen_pic_sure_sirali(df_plan, df_naeron):
-    # 1) Plan’daki PIC görevlerinin indekslerini al
-    plan_pic_idx = df_plan[df_plan["gorev_ismi"]
-                            .str.upper()
-                            .str.contains("PIC")].index
-
-    # 2) Naeron’daki PIC uçuş kayıtlarını, Uçuş Tarihi 2 sütununa göre kronolojik sırala
-    naeron_pic = (
-        df_naeron[df_naeron["Görev"]
-                .str.upper()
-                .str.contains("PIC")]
-        .sort_values("Uçuş Tarihi 2")
-        .reset_index(drop=True)
-    )
+PIC_ANAHTARI = "PIC"
+FAM_VARYANTLARI = {"FAM.(SIM)", "FAMILIARIZATION(SIM)"}
 
-    # 3) Sırasıyla eşleştir
-    for i, plan_i in enumerate(plan_pic_idx):
-        if i < len(naeron_pic):
-            # i’inci uçuşun Block Time’ını ata
-            df_plan.at[plan_i, "gerceklesen_saat_ondalik"] = to_saat(
-                naeron_pic.at[i, "Block Time"]
-            )
-        else:
-            # Fazladan PIC planı kalırsa, 0 bırak
-            df_plan.at[plan_i, "gerceklesen_saat_ondalik"] = 0
 
-    return df_plan
+def _pic_maskesi(seri):
+    return seri.astype(str).str.upper().str.contains(PIC_ANAHTARI, regex=False, na=False)
 
-def eslesen_normal_sure(df_plan, df_naeron):
-    def _normalize_fam(name):
-        return re.sub(r"\s+", "", str(name or "")).upper()
 
-    fam_variants_norm = {_normalize_fam(v) for v in ["FAM.(SIM)", "FAMILIARIZATION(SIM)"]}
-    mask_non_pic = ~df_plan["gorev_ismi"].str.upper().str.contains("PIC", na=False)
-    fam_plan_mask = mask_non_pic & df_plan["gorev_ismi"].apply(lambda x: _normalize_fam(x) in fam_variants_norm)
+def _fam_maskesi(seri):
+    norm = seri.astype(str).str.replace(r"\s+", "", regex=True).str.upper()
+    return norm.isin(FAM_VARYANTLARI)
 
-    fam_segments = deque()
-    if fam_plan_mask.any():
-        df_naeron_fam = df_naeron[df_naeron["Görev"].apply(lambda x: _normalize_fam(x) in fam_variants_norm)].copy()
-        if not df_naeron_fam.empty:
-            if "Uçuş Tarihi 2" in df_naeron_fam.columns:
-                df_naeron_fam = df_naeron_fam.sort_values("Uçuş Tarihi 2")
-            fam_segments = deque(
-                h for h in (to_saat(bt) for bt in df_naeron_fam["Block Time"].fillna("00:00"))
-                if h > 0
-            )
 
-        def allocate_hours(requested):
-            allocated = 0.0
-            epsilon = 1e-6
-            requested = float(requested)
-            while requested > epsilon and fam_segments:
-                current = fam_segments.popleft()
-                take = min(requested, current)
-                allocated += take
-                requested -= take
-                remainder = current - take
-                if remainder > epsilon:
-                    fam_segments.appendleft(remainder)
-            return allocated
-
-        for idx in df_plan.loc[fam_plan_mask].index:
-            plan_hours = df_plan.at[idx, "planlanan_saat_ondalik"]
-            if pd.isna(plan_hours) or plan_hours <= 0:
-                plan_hours = 1.0
-            df_plan.at[idx, "gerceklesen_saat_ondalik"] = allocate_hours(plan_hours)
-
-    regular_mask = mask_non_pic & ~fam_plan_mask
-
-    def match(gorev):
-        eslesme = df_naeron[df_naeron["Görev"] == gorev]
-        return eslesme["Block Time"].apply(to_saat).sum() if not eslesme.empty else 0
-
-    df_plan.loc[regular_mask, "gerceklesen_saat_ondalik"] = (
-        df_plan.loc[regular_mask, "gorev_ismi"].apply(match)
+def _sirali_toplam(gruplar, degerler):
+    """
+    Grup toplamlarını, eski `eslesme["Block Time"].apply(to_saat).sum()` ile bit düzeyinde
+    aynı olacak şekilde hesaplar. Numpy 8 elemandan kısa dizileri soldan sağa toplar
+    (groupby.sum ise Kahan kullanır ve son basamakta farklılaşır); kısa gruplar sütun sütun
+    biriktirilir, nadir görülen uzun gruplar doğrudan numpy ile toplanır.
+    """
+    gid = np.asarray(gruplar.ngroup())
+    sira = np.asarray(gruplar.cumcount())
+    boy = np.bincount(gid, minlength=gruplar.ngroups) if len(gid) else np.zeros(0, dtype=int)
+    toplam = np.zeros(gruplar.ngroups)
+    degerler = np.asarray(degerler, dtype=float)
+    for j in range(min(int(boy.max(initial=0)), 7)):
+        m = (sira == j) & (boy[gid] < 8)
+        toplam[gid[m]] += degerler[m]
+    buyukler = np.flatnonzero(boy >= 8)
+    if len(buyukler):
+        sirali = degerler[np.argsort(gid, kind="stable")]
+        baslangic = np.concatenate(([0], np.cumsum(boy)[:-1]))
+        for g in buyukler:
+            toplam[g] = sirali[baslangic[g]:baslangic[g] + boy[g]].sum()
+    return toplam
+
+
+def _eslesme_naeron_cercevesi(df_naeron, kod_kolonu):
+    """Eşleştirme motorunun kullandığı Naeron kolonlarını tek seferde hazırlar."""
+    n = pd.DataFrame(index=df_naeron.index)
+    n["kod"] = df_naeron[kod_kolonu] if kod_kolonu else ""
+    n["gorev"] = df_naeron["Görev"] if "Görev" in df_naeron.columns else None
+    if "sure_dec" in df_naeron.columns:
+        n["saat"] = pd.to_numeric(df_naeron["sure_dec"], errors="coerce").fillna(0.0).astype(float)
+    else:
+        n["saat"] = sure_saat(df_naeron.get("Block Time", pd.Series(index=df_naeron.index, dtype=object)))
+    if "Uçuş Tarihi 2" in df_naeron.columns:
+        n["tarih"] = df_naeron["Uçuş Tarihi 2"]
+    n = n[n["kod"].notna()].copy()
+    n["pic"] = _pic_maskesi(n["gorev"])
+    n["fam"] = _fam_maskesi(n["gorev"])
+    return n
+
+
+def _tarih_sirali(n):
+    # Öğrenci içinde kronolojik sıra; aynı gün uçuşlarda kayıt sırası korunur (stabil sıralama)
+    if "tarih" in n.columns:
+        return n.sort_values(["kod", "tarih"], kind="mergesort", na_position="last")
+    return n.sort_values("kod", kind="mergesort")
+
+
+def _plan_kodlari(df_plan, kod_kolonu):
+    if kod_kolonu:
+        return df_plan[kod_kolonu]
+    return pd.Series("", index=df_plan.index)
+
+
+def _pic_sureleri(df_plan, n, kod_kolonu):
+    """Plan PIC satırlarına, öğrencinin PIC uçuşlarını tarih sırasıyla (i. plan ↔ i. uçuş) atar."""
+    plan_pic = _pic_maskesi(df_plan["gorev_ismi"])
+    plan_kod = _plan_kodlari(df_plan, kod_kolonu)[plan_pic]
+    if plan_kod.empty:
+        return pd.Series(dtype=float)
+    plan_sira = plan_kod.groupby(plan_kod, sort=False).cumcount()
+
+    naeron_pic = _tarih_sirali(n[n["pic"]])
+    naeron_sira = naeron_pic.groupby("kod", sort=False).cumcount()
+    saat_map = pd.Series(
+        naeron_pic["saat"].to_numpy(),
+        index=pd.MultiIndex.from_arrays([naeron_pic["kod"], naeron_sira]),
     )
+    anahtar = pd.MultiIndex.from_arrays([plan_kod, plan_sira])
+    return pd.Series(saat_map.reindex(anahtar).fillna(0.0).to_numpy(), index=plan_kod.index)
+
+
+def _fam_sureleri(df_plan, n, fam_plan_mask, kod_kolonu):
+    """FAM.(SIM) bloklarını plan sırasıyla, talep edilen saat kadar sırayla paylaştırır."""
+    sonuc = pd.Series(0.0, index=df_plan.index[fam_plan_mask])
+    plan_kod = _plan_kodlari(df_plan, kod_kolonu)[fam_plan_mask]
+    naeron_fam = _tarih_sirali(n[n["fam"] & (n["saat"] > 0)])
+    segmentler_map = {k: deque(g) for k, g in naeron_fam.groupby("kod", sort=False)["saat"]}
+    epsilon = 1e-6
+
+    # FAM plan satırları öğrenci başına birkaç adettir; deque paylaştırması burada yeterince ucuz
+    for idx, kod in plan_kod.items():
+        fam_segments = segmentler_map.setdefault(kod, deque())
+        requested = df_plan.at[idx, "planlanan_saat_ondalik"]
+        if pd.isna(requested) or requested <= 0:
+            requested = 1.0
+        requested = float(requested)
+        allocated = 0.0
+        while requested > epsilon and fam_segments:
+            current = fam_segments.popleft()
+            take = min(requested, current)
+            allocated += take
+            requested -= take
+            remainder = current - take
+            if remainder > epsilon:
+                fam_segments.appendleft(remainder)
+        sonuc.at[idx] = allocated
+    return sonuc
+
+
+def _normal_sureleri(df_plan, n, regular_mask, kod_kolonu):
+    """(öğrenci, görev) eşleşmesi: aynı isimli tüm Naeron uçuşlarının Block Time toplamı."""
+    plan_kod = _plan_kodlari(df_plan, kod_kolonu)[regular_mask]
+    if plan_kod.empty:
+        return pd.Series(dtype=float)
+    n = n[n["gorev"].notna()]
+    gruplar = n.groupby(["kod", "gorev"], sort=False)
+    toplam = pd.Series(_sirali_toplam(gruplar, n["saat"]), index=gruplar.size().index)
+    anahtar = pd.MultiIndex.from_arrays([plan_kod, df_plan.loc[regular_mask, "gorev_ismi"]])
+    return pd.Series(toplam.reindex(anahtar).fillna(0.0).to_numpy(), index=plan_kod.index)
+
+
+def eslesen_sureleri_hesapla(df_plan, df_naeron, kod_kolonu="ogrenci_kodu"):
+    """
+    Plan ↔ Naeron eşleştirme motoru (çok öğrencili, tek geçiş).
+    Satır bazlı `match()` yerine öğrenci/görev anahtarlarıyla join ve groupby kullanır;
+    sonuç eski eslesen_pic_sure_sirali + eslesen_normal_sure zinciriyle aynıdır.
+    kod_kolonu=None verilirse tüm satırlar tek öğrenciye aitmiş gibi işlenir.
+    df_plan index'ine hizalı `gerceklesen_saat_ondalik` Series'i döndürür.
+    """
+    sonuc = pd.Series(0.0, index=df_plan.index)
+    if df_plan.empty:
+        return sonuc
+    if df_naeron is None or df_naeron.empty:
+        return sonuc
+
+    n = _eslesme_naeron_cercevesi(df_naeron, kod_kolonu)
+
+    plan_pic = _pic_maskesi(df_plan["gorev_ismi"])
+    fam_plan_mask = ~plan_pic & _fam_maskesi(df_plan["gorev_ismi"])
+    regular_mask = ~plan_pic & ~fam_plan_mask
+
+    if plan_pic.any():
+        sonuc.loc[plan_pic] = _pic_sureleri(df_plan, n, kod_kolonu).to_numpy()
+    if fam_plan_mask.any():
+        sonuc.loc[fam_plan_mask] = _fam_sureleri(df_plan, n, fam_plan_mask, kod_kolonu).to_numpy()
+    if regular_mask.any():
+        sonuc.loc[regular_mask] = _normal_sureleri(df_plan, n, regular_mask, kod_kolonu).to_numpy()
+    return sonuc
+
+
+def _gerceklesen_float(df_plan):
+    # Eski kod kolonu 0 (int) ile başlatıyordu; ondalık atamalar için float'a yükselt
+    if "gerceklesen_saat_ondalik" in df_plan.columns:
+        df_plan["gerceklesen_saat_ondalik"] = df_plan["gerceklesen_saat_ondalik"].astype(float)
+
+
+def eslesen_pic_sure_sirali(df_plan, df_naeron):
+    # Tek öğrenci için geriye dönük API: PIC planları ↔ PIC uçuşları (kronolojik sıra)
+    _gerceklesen_float(df_plan)
+    plan_pic = _pic_maskesi(df_plan["gorev_ismi"])
+    if plan_pic.any():
+        n = _eslesme_naeron_cercevesi(df_naeron, None)
+        df_plan.loc[plan_pic, "gerceklesen_saat_ondalik"] = _pic_sureleri(df_plan, n, None).to_numpy()
+    return df_plan
+
+def eslesen_normal_sure(df_plan, df_naeron):
+    # Tek öğrenci için geriye dönük API: FAM paylaştırma + isim eşleşmeli toplamlar
+    _gerceklesen_float(df_plan)
+    plan_pic = _pic_maskesi(df_plan["gorev_ismi"])
+    fam_plan_mask = ~plan_pic & _fam_maskesi(df_plan["gorev_ismi"])
+    regular_mask = ~plan_pic & ~fam_plan_mask
+    n = _eslesme_naeron_cercevesi(df_naeron, None)
+    if fam_plan_mask.any():
+        df_plan.loc[fam_plan_mask, "gerceklesen_saat_ondalik"] = _fam_sureleri(df_plan, n, fam_plan_mask, None).to_numpy()
+    if regular_mask.any():
+        df_plan.loc[regular_mask, "gerceklesen_saat_ondalik"] = _normal_sureleri(df_plan, n, regular_mask, None).to_numpy()
     return df_plan
 
 def durum_pic_renk(row):
@@ -214,13 +313,7 @@ def ogrenci_kodu_ayikla(ogrenci):
         return ogrenci.split("-")[0].strip()
 # --- Yardımcı fonksiyonlar ---
 def to_saat(sure_str):
-    try:
-        if pd.isna(sure_str) or sure_str == "":
-            return 0
-        parts = [int(p) for p in sure_str.split(":")]
-        return parts[0] + parts[1]/60 + (parts[2] if len(parts)>2 else 0)/3600
-    except:
-        return 0
+    return saat_tek(sure_str)
 
 def format_sure(hours_float):
     neg = hours_float < 0
@@ -247,165 +340,227 @@ def get_donem_tipi(donem: str) -> str | None:
         return row[0] if row else None
     except Exception:
         return None
+def _donem_tipleri() -> dict:
+    """donem_bilgileri.db'deki tüm dönem tiplerini tek sorguda okur (get_donem_tipi'nin toplu hali)."""
+    try:
+        conn_d = sqlite3.connect("donem_bilgileri.db")
+        rows = conn_d.execute("SELECT donem, donem_tipi FROM donem_bilgileri ORDER BY rowid").fetchall()
+        conn_d.close()
+    except Exception:
+        return {}
+    tipler = {}
+    for donem, tip in rows:
+        tipler.setdefault(str(donem), tip)
+    return tipler
+
+
+def durum_hesapla_toplu(df):
+    """`durum_pic_renk`'in vektörel karşılığı (tüm satırlar için tek seferde)."""
+    pic = df["gorev_ismi"].astype(str).str.upper().str.contains("PIC", regex=False, na=False)
+    gercek_var = df["gerceklesen_saat_ondalik"] > 0
+    teorik = df["Planlanan"] == "00:00"
+    yapildi = df["fark_saat_ondalik"] >= 0
+    eksik_saat = (df["Planlanan"] != "00:00") & (df["Gerçekleşen"] != "00:00")
+    return pd.Series(
+        np.select(
+            [pic & gercek_var, pic, teorik, yapildi, eksik_saat],
+            ["🟦 PIC Görevi", "🔴 Eksik", "🟡 Teorik Ders", "🟢 Uçuş Yapıldı", "🟣 Eksik Uçuş Saati"],
+            default="🔴 Eksik",
+        ),
+        index=df.index,
+    )
+
+
+def _beklemede_maskesi(df, kod_kolonu="ogrenci_kodu"):
+    """
+    Uçulmamış 🔴 satırından sonraki 9 satırda (aynı öğrenci) en az 3 🟢 varsa 🟤 Beklemede.
+    df öğrenci bazında bitişik ve plan_tarihi sıralı olmalıdır.
+    """
+    yesil = (df["durum"] == "🟢 Uçuş Yapıldı").to_numpy().astype(int)
+    kum = np.concatenate(([0], np.cumsum(yesil)))
+    konum = np.arange(len(df))
+    grup_sonu = df.groupby(kod_kolonu, sort=False)[kod_kolonu].transform("size").to_numpy() \
+        - df.groupby(kod_kolonu, sort=False).cumcount().to_numpy() + konum
+    pencere_sonu = np.minimum(konum + 10, grup_sonu)
+    sonraki_yesil = kum[pencere_sonu] - kum[konum + 1]
+    aday = (df["durum"] == "🔴 Eksik") & (df["Gerçekleşen"] == "00:00")
+    return aday & (sonraki_yesil >= 3)
+
+
+_PIF_SIF_KURALLARI = [
+    # (dönem tipi / None = hepsi, görev listesi, eşik saat, yeni durum) — apply_pif_sif_rules_on_view sırası
+    (None, [f"SIF-{i}" for i in range(1, 15)], 20.0, "✨ SIF TAMAMLANDI"),
+    ("MPL", [f"PIF-{i}" for i in range(20, 29)], 14.5, "✨ PIF 20-28 BİTTİ"),
+    ("ENTEGRE", [f"PIF-{i}" for i in range(1, 16)], 30.0, "✨ PIF-SIM TAMAMLANDI"),
+    ("ENTEGRE", [f"PIF-{i}" for i in range(16, 36)], 33.5, "✨ PIF-AC TAMAMLANDI"),
+]
+
+
+def _norm_series(seri):
+    return (
+        seri.astype(str)
+        .str.replace(" ", "", regex=False)
+        .str.replace("(C)", "", regex=False)
+        .str.replace("-", "", regex=False)
+        .str.upper()
+    )
+
+
+def _pif_sif_kurallari_toplu(dfp, dfn, donem_tipi_map):
+    """apply_pif_sif_rules_on_view'in tüm öğrenciler için tek geçişlik hali."""
+    tip = dfp["ogrenci_kodu"].map(donem_tipi_map).fillna("").astype(str).str.upper()
+    gorev_view = _norm_series(dfp["gorev_ismi"])
+    gorev_naeron = _norm_series(dfn["Görev"])
+    for donem_tipi, liste, esik, etiket in _PIF_SIF_KURALLARI:
+        hedef = {_norm(g) for g in liste}
+        m_n = gorev_naeron.isin(hedef)
+        if not m_n.any():
+            continue
+        secili = dfn.loc[m_n]
+        gruplar = secili.groupby("ogrenci_kodu", sort=False)
+        toplam = pd.Series(_sirali_toplam(gruplar, secili["sure_dec"]), index=gruplar.size().index)
+        tamam = toplam[toplam >= esik].index
+        m = (
+            dfp["ogrenci_kodu"].isin(tamam)
+            & gorev_view.isin(hedef)
+            & dfp["durum"].isin(["🔴 Eksik", "🟤 Eksik - Beklemede"])
+        )
+        if donem_tipi is not None:
+            m &= tip == donem_tipi
+        dfp.loc[m, "durum"] = etiket
+    return dfp
+
+
+def _phase_guncelle(dfp):
+    """Phase toplamlarını öğrenci+phase bazında tek groupby ile hesaplar ve durumu günceller."""
+    df_phase = dfp.loc[dfp["phase"].notna(), ["ogrenci_kodu", "phase", "planlanan_saat_ondalik", "gerceklesen_saat_ondalik"]].copy()
+    df_phase["phase"] = df_phase["phase"].astype(str).str.strip()
+    ph = (
+        df_phase.groupby(["ogrenci_kodu", "phase"])[["planlanan_saat_ondalik", "gerceklesen_saat_ondalik"]]
+        .sum()
+        .reset_index()
+    )
+    ph["fark"] = ph["gerceklesen_saat_ondalik"] - ph["planlanan_saat_ondalik"]
+
+    tamamlanan = pd.MultiIndex.from_frame(ph.loc[ph["fark"] >= 0, ["ogrenci_kodu", "phase"]])
+    m_phase = pd.MultiIndex.from_arrays([dfp["ogrenci_kodu"], dfp["phase"]]).isin(tamamlanan)
+    m = m_phase & dfp["durum"].isin(["🟣 Eksik Uçuş Saati", "🔴 Eksik", "🟤 Eksik - Beklemede"])
+    ucus_yok = dfp["Gerçekleşen"] == "00:00"
+    dfp.loc[m & ucus_yok, "durum"] = "⚪ Phase Tamamlandı - Uçuş Yapılmadı"
+    dfp.loc[m & ~ucus_yok, "durum"] = "🔷 Phase Tamamlandı - 🟣 Eksik Uçuş Saati"
+
+    # PPL (A) SKILL TEST: Uçuş yapılmadıysa asla ⚪ olarak işaretlenmez; her zaman 🔴 Eksik kalır.
+    skill_norm = dfp["gorev_ismi"].astype(str).str.upper().str.replace(r"[^A-Z0-9]+", "", regex=True)
+    _skill_mask = skill_norm.str.startswith("PPLASKILLTEST") | skill_norm.isin({"PPLST", "PPLAST"})
+    _no_flight_mask = dfp.get("gerceklesen_saat_ondalik", 0) == 0
+    dfp.loc[_skill_mask & _no_flight_mask, "durum"] = "🔴 Eksik"
+
+    # Phase özeti döndürmek için hazırla (string alanlar dahil)
+    ph["Planlanan"] = saat_formatla(ph["planlanan_saat_ondalik"])
+    ph["Gerçekleşen"] = saat_formatla(ph["gerceklesen_saat_ondalik"])
+    ph["Fark"] = saat_formatla(ph["fark"])
+    ph["durum"] = np.where(ph["fark"] >= 0, "✅ Tamamlandı", "❌ Tamamlanmadı")
+    return dfp, ph
+
+
 # === Batch hazirlayici: tek seferde Naeron & Plan okuyup ogrenci bazinda ozet dondurur ===
 def ozet_panel_verisi_hazirla_batch(ogrenci_kodlari, conn, naeron_db_path="naeron_kayitlari.db"):
+    """
+    Tüm öğrenciler için özet: plan ve Naeron bir kez okunur, eşleştirme/durum/phase
+    hesapları öğrenci filtresi yerine groupby ile tek geçişte yapılır.
+    {kod: (df_plan, phase_toplamlar, toplam_plan, toplam_gercek, toplam_fark, df_naeron_eksik, son_ucus)}
+    """
     if isinstance(ogrenci_kodlari, (str,)):
         ogrenci_kodlari = [ogrenci_kodlari]
     ogrenci_kodlari = [str(k).strip() for k in ogrenci_kodlari if str(k).strip()]
     if not ogrenci_kodlari:
         return {}
 
-    # PLAN
-    df_plan = pd.read_sql_query("SELECT * FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
-    if "ogrenci_kodu" not in df_plan.columns:
-        df_plan["ogrenci_kodu"] = df_plan["ogrenci"].apply(ogrenci_kodu_ayikla)
+    # PLAN / NAERON: veri deposundan (sürüm sayacına bağlı önbellek), ogrenci_kodu/gorev_norm/sure hazır gelir
+    df_plan = plan_oku(conn).drop(columns=["gorev_norm"])
+    # MCC satırları öğrenci bazında açılmış halde (naeron_ogrenci_oku da aynı önbellekte)
+    df_naeron_all = naeron_ogrenci_oku(naeron_db_path).drop(columns=["flight_dec"], errors="ignore")
+    df_naeron_all["Uçuş Tarihi 2"] = df_naeron_all.pop("ucus_tarihi")
+
+    # Sadece istenen öğrenciler; öğrenci bazında bitişik ve tarih sıralı (stabil) bloklar
+    istenen = set(ogrenci_kodlari)
+    dfp_all = df_plan[df_plan["ogrenci_kodu"].isin(istenen)]
+    dfp_all = dfp_all.sort_values(["ogrenci_kodu", "plan_tarihi"], kind="mergesort").copy()
+    dfn_all = df_naeron_all[df_naeron_all["ogrenci_kodu"].isin(istenen)]
+    dfn_all = dfn_all.sort_values(["ogrenci_kodu", "Uçuş Tarihi 2"], kind="mergesort")
+
+    # planlanan
+    dfp_all["planlanan_saat_ondalik"] = dfp_all.pop("sure_saat")
+
+    # eşleştirme (tüm öğrenciler birlikte)
+    dfp_all["gerceklesen_saat_ondalik"] = eslesen_sureleri_hesapla(dfp_all, dfn_all, "ogrenci_kodu")
+    dfp_all["fark_saat_ondalik"] = dfp_all["gerceklesen_saat_ondalik"] - dfp_all["planlanan_saat_ondalik"]
+
+    # stringler
+    dfp_all["Planlanan"]   = saat_formatla(dfp_all["planlanan_saat_ondalik"])
+    dfp_all["Gerçekleşen"] = saat_formatla(dfp_all["gerceklesen_saat_ondalik"])
+    dfp_all["Fark"]        = saat_formatla(dfp_all["fark_saat_ondalik"])
+
+    # durum (PIC özel mantığı dahil) + beklemede
+    dfp_all["durum"] = durum_hesapla_toplu(dfp_all)
+    dfp_all.loc[_beklemede_maskesi(dfp_all), "durum"] = "🟤 Eksik - Beklemede"
+
+    # Phase tamamlandı güncellemesi ve özet (varsa)
+    if "phase" in dfp_all.columns:
+        dfp_all, ph_all = _phase_guncelle(dfp_all)
+        phase_map = {k: g.drop(columns="ogrenci_kodu").reset_index(drop=True) for k, g in ph_all.groupby("ogrenci_kodu", sort=False)}
     else:
-        df_plan["ogrenci_kodu"] = df_plan["ogrenci_kodu"].apply(ogrenci_kodu_ayikla)
-
-    # NAERON
-    conn_naeron = sqlite3.connect(naeron_db_path)
-    df_naeron_raw = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn_naeron, parse_dates=["Uçuş Tarihi 2"])
-    conn_naeron.close()
-
+        phase_map = None
 
-     # MCC ayrıştırma
-    def extract_ogrenciler(pilot_str):
-        return re.findall(r"\d{3}[A-Z]{2}", str(pilot_str).upper())
+    # --- döneme göre PIF/SIF kuralları (phase sonrası uygulanır) ---
+    if "donem" in dfp_all.columns and not dfp_all.empty:
+        ilk_donem = dfp_all.groupby("ogrenci_kodu", sort=False)["donem"].first()
+        tipler = _donem_tipleri()
+        donem_tipi_map = {k: tipler.get(str(d)) if d else None for k, d in ilk_donem.items()}
+    else:
+        donem_tipi_map = {}
+    dfp_all = _pif_sif_kurallari_toplu(dfp_all, dfn_all, donem_tipi_map)
 
-    mask_mcc = df_naeron_raw["Görev"].astype(str).str.upper().str.startswith("MCC")
-    df_mcc = df_naeron_raw[mask_mcc].copy()
-    rows = []
-    for _, row in df_mcc.iterrows():
-        for kod in extract_ogrenciler(row["Öğrenci Pilot"]):
-            nr = row.copy(); nr["ogrenci_kodu"] = kod; rows.append(nr)
-    df_naeron_mcc = pd.DataFrame(rows)
+    # son uçuş tarihi
+    if "Uçuş Tarihi 2" in dfn_all.columns and pd.api.types.is_datetime64_any_dtype(dfn_all["Uçuş Tarihi 2"]):
+        son_tarih = dfn_all.groupby("ogrenci_kodu", sort=False)["Uçuş Tarihi 2"].max()
+        son_tarih = son_tarih.dt.strftime("%Y-%m-%d").fillna("-")
+    else:
+        son_tarih = pd.Series(dtype=object)
 
-    df_naeron_other = df_naeron_raw[~mask_mcc].copy()
-    df_naeron_other["ogrenci_kodu"] = df_naeron_other["Öğrenci Pilot"].apply(naeron_ogrenci_kodu_ayikla)
+    # planda olmayan Naeron
+    plan_gorevler = pd.MultiIndex.from_frame(
+        pd.DataFrame({"kod": dfp_all["ogrenci_kodu"], "gorev": dfp_all["gorev_ismi"].str.strip()}).dropna()
+    )
+    eksik_mask = ~pd.MultiIndex.from_arrays([dfn_all["ogrenci_kodu"], dfn_all["Görev"]]).isin(plan_gorevler)
+    dfn_eksik_all = dfn_all[eksik_mask].copy()
+    dfn_eksik_all["sure_dec"] = sure_saat(dfn_eksik_all["Block Time"])
+    dfn_eksik_all["sure_str"] = saat_formatla(dfn_eksik_all["sure_dec"])
 
-    df_naeron_all = pd.concat([df_naeron_mcc, df_naeron_other], ignore_index=True)
-    df_naeron_all["gorev_norm"] = df_naeron_all["Görev"].apply(normalize_task)
-    df_naeron_all["sure_dec"] = df_naeron_all.get("Block Time", pd.Series([0]*len(df_naeron_all))).apply(to_saat)
+    plan_gruplari = dict(list(dfp_all.groupby("ogrenci_kodu", sort=False)))
+    naeron_gruplari = dict(list(dfn_all.groupby("ogrenci_kodu", sort=False)))
+    eksik_gruplari = dict(list(dfn_eksik_all.groupby("ogrenci_kodu", sort=False)))
+    bos_naeron = dfn_all.iloc[0:0]
 
     out = {}
-    #PIF_LIST = ["PIF-20","PIF-21","PIF-22","PIF-23","PIF-24","PIF-25","PIF-26","PIF-27","PIF-28"]
-
     for kod in ogrenci_kodlari:
-        dfp = df_plan[df_plan["ogrenci_kodu"] == kod].sort_values("plan_tarihi").copy()
-        if dfp.empty:
+        dfp = plan_gruplari.get(kod)
+        if dfp is None:
             out[kod] = (pd.DataFrame(), pd.DataFrame(), 0, 0, 0, pd.DataFrame(), "-")
             continue
-
-        # planlanan
-        dfp["planlanan_saat_ondalik"] = dfp.get("sure", 0).apply(to_saat) if "sure" in dfp.columns else 0.0
-
-        # öğrencinin tüm Naeron kayıtları
-        dfn = df_naeron_all[df_naeron_all["ogrenci_kodu"] == kod].copy().sort_values("Uçuş Tarihi 2")
-
-        # son uçuş tarihi
-        if not dfn.empty and "Uçuş Tarihi 2" in dfn.columns and pd.api.types.is_datetime64_any_dtype(dfn["Uçuş Tarihi 2"]):
-            last_naeron_date = dfn["Uçuş Tarihi 2"].max()
-            try:
-                last_naeron_date = last_naeron_date.strftime("%Y-%m-%d")
-            except Exception:
-                last_naeron_date = "-"
-        else:
-            last_naeron_date = "-"
-
-        # eşleştirme
-        dfp["gerceklesen_saat_ondalik"] = 0.0
-        dfp = eslesen_pic_sure_sirali(dfp, dfn)
-        dfp = eslesen_normal_sure(dfp, dfn)
-        dfp["fark_saat_ondalik"] = dfp["gerceklesen_saat_ondalik"] - dfp["planlanan_saat_ondalik"]
-
-        # stringler
-        dfp["Planlanan"]   = dfp["planlanan_saat_ondalik"].apply(format_sure)
-        dfp["Gerçekleşen"] = dfp["gerceklesen_saat_ondalik"].apply(format_sure)
-        dfp["Fark"]        = dfp["fark_saat_ondalik"].apply(format_sure)
-
-        # durum (PIC özel mantığı dahil)
-        dfp["durum"] = dfp.apply(durum_pic_renk, axis=1)
-
-        # beklemede
-        for i in range(len(dfp)):
-            if dfp.iloc[i]["durum"] == "🔴 Eksik" and dfp.iloc[i]["Gerçekleşen"] == "00:00":
-                sonraki = dfp.iloc[i+1:i+10]
-                if (sonraki["durum"].str.contains("🟢 Uçuş Yapıldı")).sum() >= 3:
-                    dfp.iat[i, dfp.columns.get_loc("durum")] = "🟤 Eksik - Beklemede"
-
-        # Phase tamamlandı güncellemesi ve özet (varsa)
-        if "phase" in dfp.columns:
-            df_phase = dfp[dfp["phase"].notna()].copy()
-            df_phase["phase"] = df_phase["phase"].astype(str).str.strip()
-
-            ph = (
-                df_phase.groupby("phase")[
-                    ["planlanan_saat_ondalik", "gerceklesen_saat_ondalik"]
-                ]
-                .sum()
-                .reset_index()
-            )
-            ph["fark"] = ph["gerceklesen_saat_ondalik"] - ph["planlanan_saat_ondalik"]
-
-            tamamlanan_phaseler = ph[ph["fark"] >= 0]["phase"].tolist()
-
-            def guncel_durum(row):
-                if row.get("phase") in tamamlanan_phaseler and row["durum"] in [
-                    "🟣 Eksik Uçuş Saati",
-                    "🔴 Eksik",
-                    "🟤 Eksik - Beklemede",
-                ]:
-                    return (
-                        "⚪ Phase Tamamlandı - Uçuş Yapılmadı"
-                        if row["Gerçekleşen"] == "00:00"
-                        else "🔷 Phase Tamamlandı - 🟣 Eksik Uçuş Saati"
-                    )
-                return row["durum"]
-
-            dfp["durum"] = dfp.apply(guncel_durum, axis=1)
-            # PPL (A) SKILL TEST: Uçuş yapılmadıysa asla ⚪ olarak işaretlenmez; her zaman 🔴 Eksik kalır.
-            def _norm_task_for_skill(name):
-                try:
-                    return re.sub(r"[^A-Z0-9]+", "", str(name).upper())
-                except Exception:
-                    return ""
-            _skill_mask = dfp["gorev_ismi"].apply(lambda x: _norm_task_for_skill(x).startswith("PPLASKILLTEST") or _norm_task_for_skill(x) in {"PPLST", "PPLAST"})
-            _no_flight_mask = dfp.get("gerceklesen_saat_ondalik", 0) == 0
-            dfp.loc[_skill_mask & _no_flight_mask, "durum"] = "🔴 Eksik"
-
-            # Phase özeti döndürmek için hazırla (string alanlar dahil)
-            ph["Planlanan"] = ph["planlanan_saat_ondalik"].apply(format_sure)
-            ph["Gerçekleşen"] = ph["gerceklesen_saat_ondalik"].apply(format_sure)
-            ph["Fark"] = ph["fark"].apply(format_sure)
-            ph["durum"] = ph["fark"].apply(lambda x: "✅ Tamamlandı" if x >= 0 else "❌ Tamamlanmadı")
-            phase_toplamlar = ph
-        else:
+        dfn = naeron_gruplari.get(kod, bos_naeron)
+        dfn_eksik = eksik_gruplari.get(kod, dfn.iloc[0:0])
+        if phase_map is None:
             phase_toplamlar = pd.DataFrame()
+        else:
+            phase_toplamlar = phase_map.get(kod, ph_all.iloc[0:0].drop(columns="ogrenci_kodu"))
 
-        # --- döneme göre PIF/SIF kuralları (phase sonrası uygulanır) ---
-        secilen_donem = dfp["donem"].iloc[0] if "donem" in dfp.columns and not dfp.empty else None
-        donem_tipi = get_donem_tipi(secilen_donem)
-        dfp = apply_pif_sif_rules_on_view(
-            df_view=dfp,
-            df_naeron_student=dfn,
-            st=None,
-            donem_tipi=donem_tipi,
-        )
-        #print(f"Öğrenci {kod} için PIF/SIF kuralları uygulandı: {donem_tipi}")
-
-        # genel toplamlar
+        # genel toplamlar (öğrenci dilimi üzerinde: Series.sum ile birebir aynı sonuç)
         toplam_plan   = float(dfp["planlanan_saat_ondalik"].sum())
         toplam_gercek = float(dfp["gerceklesen_saat_ondalik"].sum())
         toplam_fark   = float(toplam_gercek - toplam_plan)
 
-        # planda olmayan Naeron
-        plan_gorevler = set(dfp["gorev_ismi"].dropna().str.strip())
-        dfn_eksik = dfn[~dfn["Görev"].isin(plan_gorevler)].copy()
-        if not dfn_eksik.empty:
-            dfn_eksik["sure_dec"] = dfn_eksik["Block Time"].apply(to_saat)
-            dfn_eksik["sure_str"] = dfn_eksik["sure_dec"].apply(format_sure)
-
-        out[kod] = (dfp, phase_toplamlar, toplam_plan, toplam_gercek, toplam_fark, dfn_eksik, last_naeron_date)
+        out[kod] = (dfp, phase_toplamlar, toplam_plan, toplam_gercek, toplam_fark, dfn_eksik, son_tarih.get(kod, "-"))
 
     return out
 
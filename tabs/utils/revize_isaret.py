@@ -0,0 +1,185 @@
+import sqlite3
+from datetime import date, datetime
+
+import pandas as pd
+
+from db.migrations import plan_migrasyonlari
+from tabs.utils.ogrenci_kodu import ogrenci_patlat
+
+NAERON_DB_PATH = "naeron_kayitlari.db"
+
+
+# --- Şema ---
+def ensure_revize_isaret(conn: sqlite3.Connection) -> None:
+    """
+    auto_revize_isaret: öğrenci başına son işlenen Naeron kaydı (rowid + ucus_no),
+    plan_degisiklik günlüğü id'si, işlendiği gün ve o gün tarihi geçmiş eksik görevi olup
+    olmadığı (eksik_var). Günlük migrasyonla kurulur.
+    """
+    plan_migrasyonlari(conn)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS auto_revize_isaret (
+            ogrenci_kodu TEXT PRIMARY KEY,
+            son_naeron_rowid INTEGER NOT NULL DEFAULT 0,
+            son_ucus_no TEXT,
+            son_plan_degisiklik INTEGER NOT NULL DEFAULT 0,
+            son_tarih TEXT,
+            eksik_var INTEGER NOT NULL DEFAULT 0,
+            guncelleme TEXT
+        )
+    """)
+    conn.commit()
+
+
+def _plan_degisiklik_son_id(conn: sqlite3.Connection) -> int:
+    # AUTOINCREMENT sayacı: günlük budansa da verilmiş en büyük id'yi korur
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'plan_degisiklik'").fetchone()
+    return row[0] if row else 0
+
+
+def _naeron_yeni_kayitlar(naeron_db_path: str, alt_sinir: int):
+    """
+    (en büyük rowid, onun ucus_no'su, rowid > alt_sinir olan uçuşların [ogrenci_kodu, rowid] hali).
+    Yeni satırlar rowid aralığından okunur; MCC satırları öğrenci bazında açılır.
+    """
+    bos = pd.DataFrame(columns=["ogrenci_kodu", "rowid"])
+    try:
+        conn_n = sqlite3.connect(naeron_db_path)
+    except sqlite3.Error:
+        return 0, None, bos
+    try:
+        son = conn_n.execute(
+            "SELECT rowid, ucus_no FROM naeron_ucuslar ORDER BY rowid DESC LIMIT 1"
+        ).fetchone()
+        if son is None:
+            return 0, None, bos
+        df = pd.read_sql_query(
+            'SELECT rowid AS rowid, "Öğrenci Pilot", "Görev" FROM naeron_ucuslar WHERE rowid > ?',
+            conn_n, params=(alt_sinir,),
+        )
+    except sqlite3.Error:
+        return 0, None, bos
+    finally:
+        conn_n.close()
+    if df.empty:
+        return son[0], son[1], bos
+    df = ogrenci_patlat(df)
+    return son[0], son[1], df.loc[df["ogrenci_kodu"] != "", ["ogrenci_kodu", "rowid"]]
+
+
+# --- Değişen öğrenciler ---
+def degisen_ogrenciler(conn: sqlite3.Connection, bugun: date, naeron_db_path: str = NAERON_DB_PATH,
+                       tam: bool = False) -> dict:
+    """
+    İşaretlere göre yeniden işlenmesi gereken öğrencileri bulur:
+      - işareti olmayan (yeni) öğrenciler,
+      - işaretinden sonra yeni Naeron uçuşu gelenler (rowid),
+      - işaretinden sonra plan satırı eklenen/değişen/silinenler (plan_degisiklik),
+      - son işlendiği günden bugüne kadar tarihi geçmiş plan görevi olanlar (eksik durumu güne bağlı),
+      - son çalışmada tarihi geçmiş eksik görevi olanlar (revize her gün yarından başlattığı için
+        veri değişmese de sonuçları gün ilerledikçe değişir).
+    Naeron tablosu yeniden kurulduysa (rowid işaretin gerisinde) ya da tam=True ise herkes işlenir.
+    Dönen sözlük: kodlar, tum_kodlar, tam ve işaretlerin ilerletileceği imleç değerleri.
+    """
+    ensure_revize_isaret(conn)
+    tum_kodlar = {
+        r[0] for r in conn.execute(
+            "SELECT DISTINCT ogrenci_kodu FROM ucus_planlari WHERE ogrenci_kodu IS NOT NULL AND ogrenci_kodu != ''"
+        )
+    }
+    isaret = pd.read_sql_query("SELECT * FROM auto_revize_isaret", conn).set_index("ogrenci_kodu")
+    plan_son = _plan_degisiklik_son_id(conn)
+
+    alt_naeron = int(isaret["son_naeron_rowid"].min()) if not isaret.empty else 0
+    naeron_son, ucus_no, yeni_ucuslar = _naeron_yeni_kayitlar(naeron_db_path, 0 if tam else alt_naeron)
+    # Tablo yeniden kurulduysa (imleçler işaretlerin gerisinde) işaretler geçersizdir
+    if not isaret.empty and (
+        naeron_son < isaret["son_naeron_rowid"].max() or plan_son < isaret["son_plan_degisiklik"].max()
+    ):
+        tam = True
+
+    imlec = {"naeron_rowid": naeron_son, "ucus_no": ucus_no, "plan_degisiklik": plan_son}
+    if tam or isaret.empty:
+        return {"kodlar": set(tum_kodlar), "tum_kodlar": tum_kodlar, "tam": True, "imlec": imlec}
+
+    kodlar = tum_kodlar - set(isaret.index)
+
+    # Yeni uçuşlar: öğrencinin kendi işaretinden sonraki rowid'ler
+    if not yeni_ucuslar.empty:
+        esik = yeni_ucuslar["ogrenci_kodu"].map(isaret["son_naeron_rowid"]).fillna(0)
+        kodlar |= set(yeni_ucuslar.loc[yeni_ucuslar["rowid"] > esik, "ogrenci_kodu"])
+
+    # Plan değişiklikleri: günlükte öğrencinin işaretinden büyük id
+    alt_plan = int(isaret["son_plan_degisiklik"].min())
+    kodlar |= {
+        r[0] for r in conn.execute("""
+            SELECT g.ogrenci_kodu
+            FROM plan_degisiklik g
+            LEFT JOIN auto_revize_isaret i ON i.ogrenci_kodu = g.ogrenci_kodu
+            WHERE g.id > ? AND g.id > COALESCE(i.son_plan_degisiklik, 0)
+            GROUP BY g.ogrenci_kodu
+        """, (alt_plan,))
+    }
+
+    # Son çalışmada tarihi geçmiş eksik görevi olanlar
+    kodlar |= {r[0] for r in conn.execute("SELECT ogrenci_kodu FROM auto_revize_isaret WHERE eksik_var = 1")}
+
+    # Tarihi son işlemden bu yana geçen görevler (plan_tarihi indeksinden aralık taraması)
+    bugun_str = bugun.isoformat()
+    alt_tarih = isaret["son_tarih"].dropna().min()
+    if isinstance(alt_tarih, str) and alt_tarih < bugun_str:
+        kodlar |= {
+            r[0] for r in conn.execute("""
+                SELECT DISTINCT p.ogrenci_kodu
+                FROM ucus_planlari p
+                JOIN auto_revize_isaret i ON i.ogrenci_kodu = p.ogrenci_kodu
+                WHERE p.plan_tarihi >= ? AND p.plan_tarihi < ?
+                  AND p.plan_tarihi >= i.son_tarih
+            """, (alt_tarih, bugun_str))
+        }
+
+    return {"kodlar": kodlar & tum_kodlar, "tum_kodlar": tum_kodlar, "tam": False, "imlec": imlec}
+
+
+# --- İşaretleri ilerlet ---
+def isaretleri_ilerlet(conn: sqlite3.Connection, tarama: dict, bugun: date, eksikler=(), hatali=()) -> None:
+    """
+    Tarama başarıyla bittikten sonra çağrılır. İşlenen öğrencilerin plan işareti revize yazımları
+    dahil güncel günlük id'sine, atlananlarınki tarama anındaki imlece çekilir; `hatali` öğrencilerin
+    işareti değişmez (bir sonraki çalışmada yeniden denenir). `eksikler`: bu taramada tarihi geçmiş
+    eksik görevi bulunan öğrenciler (bir sonraki çalışmada yeniden işlenir). Plandan çıkan
+    öğrencilerin işareti silinir ve tüm işaretlerin gerisinde kalan günlük satırları budanır.
+    """
+    imlec = tarama["imlec"]
+    hatali, eksikler = set(hatali), set(eksikler)
+    simdi = datetime.now().isoformat(timespec="seconds")
+    bugun_str = bugun.isoformat()
+    plan_sonra = _plan_degisiklik_son_id(conn)
+
+    satirlar = []
+    for kod in tarama["tum_kodlar"] - hatali:
+        plan_id = plan_sonra if kod in tarama["kodlar"] else imlec["plan_degisiklik"]
+        satirlar.append((
+            kod, imlec["naeron_rowid"], imlec["ucus_no"], plan_id, bugun_str, int(kod in eksikler), simdi
+        ))
+
+    cur = conn.cursor()
+    try:
+        cur.executemany("""
+            INSERT OR REPLACE INTO auto_revize_isaret (
+                ogrenci_kodu, son_naeron_rowid, son_ucus_no, son_plan_degisiklik, son_tarih, eksik_var, guncelleme
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, satirlar)
+        cur.execute("DROP TABLE IF EXISTS temp.revize_kodlar")
+        cur.execute("CREATE TEMP TABLE revize_kodlar (ogrenci_kodu TEXT PRIMARY KEY)")
+        cur.executemany("INSERT INTO temp.revize_kodlar VALUES (?)", [(k,) for k in tarama["tum_kodlar"]])
+        cur.execute("DELETE FROM auto_revize_isaret WHERE ogrenci_kodu NOT IN (SELECT ogrenci_kodu FROM temp.revize_kodlar)")
+        cur.execute("DROP TABLE temp.revize_kodlar")
+        cur.execute("""
+            DELETE FROM plan_degisiklik
+            WHERE id <= (SELECT COALESCE(MIN(son_plan_degisiklik), 0) FROM auto_revize_isaret)
+        """)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
@@ -0,0 +1,133 @@
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from tabs.DonemOgrenci.plan_revize import toplu_revize_uygula
+from tabs.utils.donem_tarama import UCUS_YAPILMIS_DURUMLAR, donem_parcalari
+from tabs.utils.ozet_utils import ozet_panel_verisi_hazirla_toplu
+from tabs.utils.veri_deposu import NAERON_DB_PATH, veri_surumleri
+
+# Kuru çalıştırma (dry-run) revizesi: plan snapshot'ı üzerinde kaydırma kuralı bellekte uygulanır,
+# önerilen yeni plan ve kompakt fark (id → yeni plan_tarihi) döner. Veritabanına sadece
+# simulasyonu_uygula yazar; o da farkı yeniden hesaplamaz, simülasyondakini kullanır.
+
+KAYDIRMA_MODLARI = ["Bugüne çek", "Hedef tarihe çek", "Sabit miktar kadar geri al"]
+ONIZLEME_KOLONLARI = ["id", "donem", "ogrenci", "gorev_ismi", "plan_tarihi", "yeni_plan_tarihi", "durum"]
+
+
+class EskiSimulasyonHatasi(ValueError):
+    """Simülasyondan sonra plan / Naeron verisi değişti; önizleme yenilenmeli."""
+
+
+def referans_tarihleri(df: pd.DataFrame, bugun_ts: pd.Timestamp) -> pd.DataFrame:
+    """
+    Öğrenci başına bugünden ileri tarihli en ileri 🟢 / 🟣 görev (eşit tarihte 🟢 öncelikli):
+    index ogrenci_kodu, kolonlar ref_tarih (gün başı), ref_durum.
+    """
+    ileri = df[df["durum"].isin(UCUS_YAPILMIS_DURUMLAR) & (df["plan_tarihi"] > bugun_ts)]
+    if ileri.empty:
+        return pd.DataFrame(columns=["ref_tarih", "ref_durum"], index=pd.Index([], name="ogrenci_kodu"))
+    ileri = ileri.assign(_yesil=ileri["durum"] == UCUS_YAPILMIS_DURUMLAR[0])
+    son = ileri.sort_values(["plan_tarihi", "_yesil"], kind="mergesort").groupby("ogrenci_kodu").tail(1)
+    return pd.DataFrame({
+        "ref_tarih": son["plan_tarihi"].dt.normalize().to_numpy(),
+        "ref_durum": son["durum"].to_numpy(),
+    }, index=pd.Index(son["ogrenci_kodu"], name="ogrenci_kodu"))
+
+
+def kaydirma_gunleri(ref: pd.DataFrame, mod: str, bugun_ts: pd.Timestamp, hedef_tarih=None,
+                     birim: str = "Gün", miktar: int = 30) -> pd.DataFrame:
+    """
+    Referanslara kaydırma kuralını uygular: ref'e hedef ve fark_gun (geri alınacak gün) ekler,
+    uygulanamayanlara `sebep` yazar (fark_gun NaN). Ay birimi takvim ayıdır (DateOffset).
+    """
+    ref = ref.copy()
+    ref["sebep"] = None
+    if mod == "Bugüne çek":
+        ref["hedef"] = bugun_ts
+    elif mod == "Hedef tarihe çek":
+        ref["hedef"] = pd.to_datetime(hedef_tarih)
+        ref.loc[ref["hedef"] >= ref["ref_tarih"], "sebep"] = "Hedef tarih referans tarihten önce olmalı"
+    elif mod == "Sabit miktar kadar geri al":
+        if birim == "Ay":
+            ref["hedef"] = ref["ref_tarih"] - pd.DateOffset(months=int(miktar))
+        else:
+            ref["hedef"] = ref["ref_tarih"] - pd.Timedelta(days=int(miktar))
+    else:
+        raise ValueError(f"Geçersiz kaydırma modu: {mod}")
+
+    ref["fark_gun"] = (ref["ref_tarih"] - ref["hedef"]).dt.days.astype(float)
+    ref.loc[ref["sebep"].isna() & (ref["fark_gun"] <= 0), "sebep"] = "Kaydırma gerekmiyor"
+    ref.loc[ref["sebep"].notna(), "fark_gun"] = float("nan")
+    return ref
+
+
+def revize_simule_et(conn: sqlite3.Connection, mod: str = "Bugüne çek", *, ogrenci_kodlari=None,
+                     donemler=None, hedef_tarih=None, birim: str = "Gün", miktar: int = 30, bugun=None,
+                     naeron_db_path: str = NAERON_DB_PATH) -> dict:
+    """
+    Verilen öğrencilerin (ya da `donemler`deki tüm öğrencilerin) planına kaydırma kuralını
+    veritabanına dokunmadan uygular. Her öğrencinin referansı ileri tarihli en ileri 🟢 / 🟣
+    görevidir; kural uygulanabilen öğrencilerin tüm planı fark_gun kadar geri alınır.
+    Dönüş sözlüğü:
+      plan    : etkilenen öğrencilerin önerilen planı (ONIZLEME_KOLONLARI),
+      fark    : değişen satırlar [id, plan_tarihi] — simulasyonu_uygula bunu yazar,
+      ozet    : öğrenci başına ref_tarih, ref_durum, hedef, fark_gun, satir,
+      atlanan : ileri görevi olup kuralı uygulanamayan öğrenciler ve sebebi,
+      surum   : simülasyon anındaki (plan, naeron) veri sürümü, kural, bugun.
+    """
+    bugun_ts = pd.to_datetime(bugun or datetime.today().date())
+    if ogrenci_kodlari is None and donemler is not None:
+        ogrenci_kodlari = [k for _, kodlar in donem_parcalari(conn, donemler) for k in kodlar]
+    surum = veri_surumleri(conn, naeron_db_path)
+    df = ozet_panel_verisi_hazirla_toplu(conn, naeron_db_path, ogrenci_kodlari=ogrenci_kodlari)
+
+    kural = {"mod": mod, "hedef_tarih": hedef_tarih, "birim": birim, "miktar": miktar}
+    sonuc = {
+        "plan": pd.DataFrame(columns=ONIZLEME_KOLONLARI),
+        "fark": pd.DataFrame(columns=["id", "plan_tarihi"]),
+        "ozet": pd.DataFrame(columns=["ogrenci", "ref_tarih", "ref_durum", "hedef", "fark_gun", "satir"]),
+        "atlanan": pd.DataFrame(columns=["ogrenci", "ref_tarih", "sebep"]),
+        "surum": surum, "kural": kural, "bugun": bugun_ts,
+    }
+    if df.empty:
+        return sonuc
+
+    ref = kaydirma_gunleri(referans_tarihleri(df, bugun_ts), mod, bugun_ts, hedef_tarih, birim, miktar)
+    ogrenciler = df.drop_duplicates("ogrenci_kodu").set_index("ogrenci_kodu")["ogrenci"]
+    ref.insert(0, "ogrenci", ogrenciler.reindex(ref.index))
+    sonuc["atlanan"] = ref.loc[ref["sebep"].notna(), ["ogrenci", "ref_tarih", "sebep"]]
+    ref = ref[ref["sebep"].isna()].drop(columns="sebep")
+    if ref.empty:
+        return sonuc
+
+    plan = df[df["ogrenci_kodu"].isin(ref.index) & df["plan_tarihi"].notna()].copy()
+    plan["yeni_plan_tarihi"] = plan["plan_tarihi"] - pd.to_timedelta(
+        plan["ogrenci_kodu"].map(ref["fark_gun"]), unit="D"
+    )
+    ref["satir"] = plan.groupby("ogrenci_kodu").size().reindex(ref.index, fill_value=0)
+    ref["fark_gun"] = ref["fark_gun"].astype(int)
+
+    sonuc["plan"] = plan[ONIZLEME_KOLONLARI].reset_index(drop=True)
+    sonuc["fark"] = (
+        plan.loc[plan["yeni_plan_tarihi"] != plan["plan_tarihi"], ["id", "yeni_plan_tarihi"]]
+        .rename(columns={"yeni_plan_tarihi": "plan_tarihi"})
+        .reset_index(drop=True)
+    )
+    sonuc["ozet"] = ref
+    return sonuc
+
+
+def simulasyonu_uygula(conn: sqlite3.Connection, simulasyon: dict, reason: str = "",
+                       naeron_db_path: str = NAERON_DB_PATH) -> dict:
+    """
+    Simülasyonun farkını tek transaction'da yazar (plan_revize.toplu_revize_uygula, loglu).
+    Simülasyondan sonra plan veya Naeron verisi değiştiyse EskiSimulasyonHatasi fırlatır.
+    """
+    if veri_surumleri(conn, naeron_db_path) != simulasyon["surum"]:
+        raise EskiSimulasyonHatasi("Veriler önizlemeden sonra değişti; önizlemeyi yenileyin.")
+    kural = simulasyon["kural"]
+    if not reason:
+        reason = f"Kaydırma simülasyonu: {kural['mod']}"
+    return toplu_revize_uygula(conn, simulasyon["fark"], key_col="id", reason=reason)
@@ -0,0 +1,203 @@
+import math
+import re
+from datetime import time as dtime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# "H:M[:S[:...]]" — parçalar int() gibi okunur (işaret ve parça çevresindeki boşluklar serbest),
+# dördüncü ve sonraki parçalar yok sayılır. tek_parca=True iken tek başına "H" de kabul edilir.
+_P = r"\s*([+-]?[0-9]+)\s*"
+_SURE_RE = re.compile(_P + ":" + _P + "(?::" + _P + r")?(?::\s*[+-]?[0-9]+\s*)*")
+_SURE_TEK_RE = re.compile(_P + "(?::" + _P + ")?(?::" + _P + r")?(?::\s*[+-]?[0-9]+\s*)*")
+
+KOLONLAR = ["saat", "dakika", "saniye"]
+
+
+def _desen(tek_parca: bool):
+    return _SURE_TEK_RE if tek_parca else _SURE_RE
+
+
+# --- Tek değer ---
+def sure_parcala_tek(deger, tek_parca: bool = False, ondalik: bool = False, metne_cevir: bool = False):
+    """
+    sure_parcala'nın tek değerlik hali: (saat, dakika, saniye) ya da ayrıştırılamazsa None.
+    Döngü içinde tek tek çağrılan eski yardımcılar bunu kullanır.
+    """
+    if deger is None or (not isinstance(deger, str) and pd.isna(deger)):
+        return None
+    if metne_cevir:
+        if isinstance(deger, (timedelta, np.timedelta64)):
+            saat, kalan = divmod(pd.Timedelta(deger).total_seconds(), 3600)
+            return (saat, *divmod(kalan, 60))
+        if isinstance(deger, dtime):
+            return deger.hour, deger.minute, deger.second
+        deger = str(deger)
+    elif not isinstance(deger, str):
+        return None
+    m = _desen(tek_parca).fullmatch(deger)
+    if m:
+        s, d, sn = (int(g) if g is not None else 0 for g in m.groups())
+        return s, d, sn
+    if ondalik:
+        try:
+            v = float(deger)
+        except ValueError:
+            return None
+        return (v, 0, 0) if math.isfinite(v) else None
+    return None
+
+
+def saat_tek(deger, **kurallar) -> float:
+    """Tek değer → ondalık saat (ayrıştırılamazsa 0)."""
+    p = sure_parcala_tek(deger, **kurallar)
+    return p[0] + p[1] / 60 + p[2] / 3600 if p else 0
+
+
+def saniye_tek(deger, **kurallar) -> int:
+    """Tek değer → tam sayı saniye (ayrıştırılamazsa 0)."""
+    p = sure_parcala_tek(deger, **kurallar)
+    return int(round(p[0] * 3600 + p[1] * 60 + p[2])) if p else 0
+
+
+# --- Seri ---
+def _saniyeden_parcalar(sn) -> np.ndarray:
+    saat, kalan = np.divmod(np.asarray(sn, dtype=float), 3600)
+    dakika, saniye = np.divmod(kalan, 60)
+    return np.column_stack([saat, dakika, saniye])
+
+
+def _metinleri_parcala(metin: pd.Series, tek_parca: bool, ondalik: bool) -> np.ndarray:
+    """Benzersiz metinler → (n, 3) [saat, dakika, saniye] dizisi; uymayanlar NaN."""
+    sonuc = np.full((len(metin), 3), np.nan)
+    # str olmayan (object) değerler .str erişiminde NaN döner → geçersiz
+    parcalar = metin.str.extract("^" + _desen(tek_parca).pattern + r"\Z")
+    gecerli = parcalar[0].notna().to_numpy()
+    if gecerli.any():
+        sonuc[gecerli] = parcalar[gecerli].astype(float).fillna(0.0).to_numpy()
+    if ondalik and not gecerli.all():
+        sayi = pd.to_numeric(metin[~gecerli].str.strip(), errors="coerce").to_numpy(dtype=float)
+        sonlu = np.isfinite(sayi)
+        satir = np.flatnonzero(~gecerli)[sonlu]
+        sonuc[satir] = 0.0
+        sonuc[satir, 0] = sayi[sonlu]
+    return sonuc
+
+
+def sure_parcala(seri, tek_parca: bool = False, ondalik: bool = False, metne_cevir: bool = False) -> pd.DataFrame:
+    """
+    Süre kolonunu tek geçişte [saat, dakika, saniye] (float) kolonlarına ayırır; ayrıştırılamayan
+    satırlar NaN olur. Kurallar:
+      - metne_cevir=False: sadece str değerler okunur (time / sayı vb. geçersiz sayılır);
+        True: değerler str() ile metne çevrilir, timedelta / time nesneleri doğrudan saniyeye alınır.
+      - tek_parca: "H" (iki nokta yok) saat olarak kabul edilir.
+      - ondalik: "H:M" biçimine uymayan sayısal metinler ondalık saat kabul edilir.
+    """
+    seri = pd.Series(seri) if not isinstance(seri, pd.Series) else seri
+    dizi = np.full((len(seri), 3), np.nan)
+    dolu = seri.notna().to_numpy()
+
+    if pd.api.types.is_timedelta64_dtype(seri.dtype):
+        dizi[dolu] = _saniyeden_parcalar(seri[dolu].dt.total_seconds())
+        return pd.DataFrame(dizi, index=seri.index, columns=KOLONLAR)
+
+    if metne_cevir:
+        if seri.dtype == object:
+            tipler = seri.map(type).to_numpy()
+            td = np.isin(tipler, [timedelta, pd.Timedelta]) & dolu
+            if td.any():
+                dizi[td] = _saniyeden_parcalar(pd.to_timedelta(seri[td]).dt.total_seconds())
+                dolu &= ~td
+            # datetime.time: saat/dakika/saniye alanları (mikrosaniye atılır)
+            zaman = (tipler == dtime) & dolu
+            if zaman.any():
+                dizi[zaman] = _saniyeden_parcalar(np.floor(pd.to_timedelta(seri[zaman].astype(str)).dt.total_seconds()))
+                dolu &= ~zaman
+        metin = seri[dolu].astype(str)
+    elif pd.api.types.is_object_dtype(seri.dtype) or pd.api.types.is_string_dtype(seri.dtype):
+        metin = seri[dolu]
+    else:
+        metin = seri.iloc[:0]
+
+    if not metin.empty:
+        # Tekrar eden değerler (ör. "01:00:00") bir kez ayrıştırılır
+        kodlar, benzersiz = pd.factorize(metin)
+        dizi[dolu] = _metinleri_parcala(pd.Series(benzersiz, dtype=object), tek_parca, ondalik)[kodlar]
+    return pd.DataFrame(dizi, index=seri.index, columns=KOLONLAR)
+
+
+def sure_saat(seri, **kurallar) -> pd.Series:
+    """Süre kolonu → ondalık saat (float); ayrıştırılamayan/boş değerler 0.0."""
+    p = sure_parcala(seri, **kurallar)
+    return (p["saat"] + p["dakika"] / 60 + p["saniye"] / 3600).fillna(0.0)
+
+
+def sure_saniye(seri, **kurallar) -> pd.Series:
+    """Süre kolonu → tam sayı saniye (int64); ondalık saatler en yakın saniyeye yuvarlanır, geçersizler 0."""
+    p = sure_parcala(seri, **kurallar)
+    return np.round(p["saat"] * 3600 + p["dakika"] * 60 + p["saniye"]).fillna(0).astype("int64")
+
+
+def sure_dakika(seri, **kurallar) -> pd.Series:
+    """Süre kolonu → tam sayı dakika (Int64); ayrıştırılamayan/boş değerler <NA>."""
+    p = sure_parcala(seri, **kurallar)
+    return np.round(p["saat"] * 60 + p["dakika"] + p["saniye"] / 60).astype("Int64")
+
+
+def sure_timedelta(seri, **kurallar) -> pd.Series:
+    """Süre kolonu → timedelta64; ayrıştırılamayan/boş değerler 0."""
+    p = sure_parcala(seri, **kurallar)
+    saniye = (p["saat"] * 3600 + p["dakika"] * 60 + p["saniye"]).fillna(0.0)
+    return pd.to_timedelta(saniye, unit="s")
+
+
+def timedelta_saat(seri, **kurallar) -> pd.Series:
+    """
+    Önce pd.to_timedelta ile ("1 days 02:00:00", "-01:30:00" gibi), okunamayanlar sure_parcala
+    kurallarıyla ondalık saate çevrilir; boş/geçersiz değerler 0.0.
+    """
+    seri = pd.Series(seri) if not isinstance(seri, pd.Series) else seri
+    metin = seri[seri.notna()].astype(str).str.strip()
+    metin = metin[metin != ""]
+    td = pd.to_timedelta(metin, errors="coerce")
+    saat = (td.dt.total_seconds() / 3600.0).fillna(sure_saat(metin[td.isna()], **kurallar))
+    return saat.reindex(seri.index, fill_value=0.0)
+
+
+# --- Biçimlendirme ---
+def saat_formatla(seri, tasi: bool = False) -> pd.Series:
+    """
+    Ondalık saat kolonu → "HH:MM" (format_sure'nin vektörel hali: saat kesilir, dakika yuvarlanır,
+    negatifler "-" ile). tasi=True iken 60'a yuvarlanan dakika saate eklenir. Boş değerler "00:00".
+    """
+    x = pd.to_numeric(pd.Series(seri), errors="coerce").fillna(0.0).astype(float)
+    mutlak = x.abs()
+    saat = np.trunc(mutlak)
+    dakika = np.round((mutlak - saat) * 60)
+    if tasi:
+        tam = dakika == 60
+        saat = saat + tam
+        dakika = dakika.mask(tam, 0.0)
+    # Aynı (işaret, saat, dakika) üçlüsü bir kez biçimlenir (dakika 60 olabildiği için 61 taban)
+    kodlar, benzersiz = pd.factorize(
+        (saat.astype("int64") * 61 + dakika.astype("int64")) * 2 + (x < 0).astype("int64")
+    )
+    negatif, toplam = benzersiz % 2, benzersiz // 2
+    metin = (
+        pd.Series(np.where(negatif == 1, "-", ""))
+        + pd.Series(toplam // 61).astype(str).str.zfill(2)
+        + ":"
+        + pd.Series(toplam % 61).astype(str).str.zfill(2)
+    )
+    return pd.Series(metin.to_numpy()[kodlar], index=x.index)
+
+
+def saniye_formatla(seri) -> pd.Series:
+    """Saniye kolonu → "HH:MM:SS" (negatif / boş değerler 0 sayılır)."""
+    sn = pd.to_numeric(pd.Series(seri), errors="coerce").fillna(0).clip(lower=0).astype("int64")
+    saat, kalan = sn // 3600, sn % 3600
+    return (
+        saat.astype(str).str.zfill(2)
+        + ":" + (kalan // 60).astype(str).str.zfill(2)
+        + ":" + (kalan % 60).astype(str).str.zfill(2)
+    )
@@ -0,0 +1,243 @@
+import hashlib
+import threading
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Günlük uçuş saati serisi tahmini. Uydurulmuş modeller (seri özeti, yöntem, parametreler)
+# anahtarıyla süreç içinde önbelleklenir: ufku değiştirmek ya da güven aralığını açıp kapamak
+# yeniden fit etmez. statsmodels opsiyoneldir; yoksa ARIMA / Holt-Winters TahminHatasi verir.
+
+YONTEMLER = ["Haftalık Ortalama", "ARIMA", "Holt-Winters"]
+ARIMA_SIRASI = (2, 1, 2)
+PROFIL_HAFTA = 8         # haftalık profil: her gün için son 8 haftanın aynı gün ortalaması
+GUVEN_ALFA = 0.32        # ~±1σ bandı
+MODEL_ONBELLEK_BOYUTU = 64
+
+_modeller: OrderedDict = OrderedDict()
+_kilit = threading.Lock()
+
+
+class TahminHatasi(ValueError):
+    """Yöntem bu ortamda ya da bu seride kullanılamıyor (statsmodels yok, fit başarısız...)."""
+
+
+# --- Seri ---
+def gunluk_seri(s: pd.Series) -> pd.Series:
+    """Tarih indeksli saat serisi → eksiksiz günlük eksen (freq='D', eksik gün = 0.0)."""
+    s = pd.Series(s, dtype=float)
+    s.index = pd.to_datetime(s.index).normalize()
+    s = s.groupby(level=0).sum()
+    if s.empty:
+        return s
+    eksen = pd.date_range(s.index.min(), s.index.max(), freq="D")
+    return s.reindex(eksen, fill_value=0.0)
+
+
+def seri_ozeti(y: pd.Series) -> str:
+    return hashlib.sha1(pd.util.hash_pandas_object(y, index=True).to_numpy().tobytes()).hexdigest()
+
+
+def _gelecek_tarihler(y: pd.Series, ufuk: int) -> pd.Index:
+    tarihler = pd.date_range(y.index[-1] + pd.Timedelta(days=1), periods=ufuk, freq="D")
+    return pd.Index(tarihler.date, name="Tarih")
+
+
+# --- Haftalık profil ---
+def ayni_gun_ortalamasi(y: pd.Series) -> np.ndarray:
+    """Her gün için, o güne kadarki son PROFIL_HAFTA aynı haftagünü değerinin ortalaması."""
+    return (
+        y.groupby(y.index.weekday)
+        .transform(lambda g: g.rolling(PROFIL_HAFTA, min_periods=1).mean())
+        .to_numpy()
+    )
+
+
+def _profil_indeksleri(son: np.ndarray, ufuk: int) -> np.ndarray:
+    # son gün t'den h gün sonrası için profil, t'ye kadarki aynı haftagününden okunur: t + h - 7·⌈h/7⌉
+    h = np.arange(1, ufuk + 1)
+    return np.asarray(son)[:, None] + h[None, :] - 7 * ((h + 6) // 7)[None, :]
+
+
+# --- Model önbelleği ---
+def _fit(y: pd.Series, yontem: str, parametreler: dict):
+    if yontem == "Haftalık Ortalama":
+        return ayni_gun_ortalamasi(y)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            if yontem == "ARIMA":
+                import statsmodels.api as sm
+                return sm.tsa.ARIMA(y, order=parametreler.get("order", ARIMA_SIRASI)).fit()
+            if yontem == "Holt-Winters":
+                from statsmodels.tsa.holtwinters import ExponentialSmoothing
+                return ExponentialSmoothing(y, trend="add", seasonal="add", seasonal_periods=7).fit(optimized=True)
+    except Exception as e:
+        raise TahminHatasi(str(e)) from e
+    raise ValueError(f"Geçersiz tahmin yöntemi: {yontem}")
+
+
+def model_getir(y: pd.Series, yontem: str, **parametreler):
+    """
+    `y` (gunluk_seri çıktısı) için uydurulmuş modeli önbellekten döndürür, yoksa fit eder.
+    Başarısız fit'ler de önbelleklenir (her çağrıda yeniden denenmez, TahminHatasi tekrar atılır).
+    """
+    anahtar = (seri_ozeti(y), yontem, tuple(sorted(parametreler.items())))
+    with _kilit:
+        if anahtar in _modeller:
+            _modeller.move_to_end(anahtar)
+            model = _modeller[anahtar]
+            if isinstance(model, TahminHatasi):
+                raise model
+            return model
+    try:
+        model = _fit(y, yontem, parametreler)
+    except TahminHatasi as e:
+        model = e
+    with _kilit:
+        _modeller[anahtar] = model
+        while len(_modeller) > MODEL_ONBELLEK_BOYUTU:
+            _modeller.popitem(last=False)
+    if isinstance(model, TahminHatasi):
+        raise model
+    return model
+
+
+def onbellegi_temizle() -> None:
+    with _kilit:
+        _modeller.clear()
+
+
+# --- Tahmin ---
+def tahmin_et(s: pd.Series, yontem: str, ufuk: int, guven_araligi: bool = True, **parametreler):
+    """
+    (tahmin, alt, ust): tahmin 'Tahmin' kolonlu, Tarih (date) indeksli DataFrame; alt / ust
+    güven bandı Serileri ya da None. Haftalık Ortalama bant üretmez; ARIMA bandı modelden
+    (~%68), Holt-Winters bandı ±1σ yaklaşıktır. Model yalnızca seri değişince yeniden fit edilir.
+    """
+    y = gunluk_seri(s)
+    if y.empty:
+        raise TahminHatasi("Tahmin için veri yok.")
+    tarihler = _gelecek_tarihler(y, ufuk)
+    model = model_getir(y, yontem, **parametreler)
+    alt = ust = None
+
+    if yontem == "Haftalık Ortalama":
+        idx = _profil_indeksleri([len(y) - 1], ufuk)[0]
+        # Bir haftadan kısa seride olmayan haftagünleri pencerenin genel ortalamasıyla doldurulur
+        tahmin = np.where(idx >= 0, model[np.clip(idx, 0, None)], y.iloc[-7 * PROFIL_HAFTA:].mean())
+    elif yontem == "ARIMA":
+        fc = model.get_forecast(steps=ufuk)
+        tahmin = fc.predicted_mean.to_numpy()
+        if guven_araligi:
+            conf = fc.conf_int(alpha=GUVEN_ALFA).to_numpy()
+            alt, ust = conf[:, 0], conf[:, 1]
+    else:
+        tahmin = model.forecast(ufuk).to_numpy()
+        if guven_araligi:
+            sigma = float(y.std()) if y.std() > 0 else 0.0
+            alt, ust = tahmin - sigma, tahmin + sigma
+
+    out = pd.DataFrame({"Tahmin": np.asarray(tahmin, dtype=float)}, index=tarihler)
+    if alt is not None:
+        alt = pd.Series(alt, index=tarihler, name="Alt")
+        ust = pd.Series(ust, index=tarihler, name="Üst")
+    return out, alt, ust
+
+
+# --- Geriye dönük test ---
+def _orijinler(n: int, ufuk: int, orijin_sayisi: int, adim: int, min_egitim: int) -> np.ndarray:
+    """Eğitim uzunlukları (artan): son orijin serinin sonundan `ufuk` gün önce, aralarında `adim` gün."""
+    o = n - ufuk - adim * np.arange(orijin_sayisi)
+    return np.sort(o[o >= max(min_egitim, 7)])
+
+
+def _toplu_tahmin(y: pd.Series, yontem: str, orijinler: np.ndarray, ufuk: int, parametreler: dict) -> np.ndarray:
+    """(orijin × ufuk) tahmin matrisi. Parametreler en kısa eğitim penceresinde bir kez fit edilir."""
+    if yontem == "Haftalık Ortalama":
+        return ayni_gun_ortalamasi(y)[_profil_indeksleri(orijinler - 1, ufuk)]
+
+    model = model_getir(y.iloc[:orijinler[0]], yontem, **parametreler)
+    if yontem == "ARIMA":
+        # Aynı parametrelerle tüm seri tek kez filtrelenir (refit yok); t anındaki filtrelenmiş
+        # durumdan h adım tahmin Z·Tʰ·a_t'dir (ARIMA'da sabit terim yok, matrisler zamanla değişmez)
+        fr = model.apply(y).filter_results
+        if (fr.transition.shape[-1] == 1 and fr.design.shape[-1] == 1
+                and not fr.state_intercept.any() and not fr.obs_intercept.any()):
+            gecis, tasarim = fr.transition[:, :, 0], fr.design[0, :, 0]
+            durum = fr.filtered_state[:, orijinler - 1]
+            sonuc = np.empty((len(orijinler), ufuk))
+            for h in range(ufuk):
+                durum = gecis @ durum
+                sonuc[:, h] = tasarim @ durum
+            return sonuc
+        return np.vstack([model.apply(y.iloc[:o]).forecast(ufuk).to_numpy() for o in orijinler])
+
+    # Holt-Winters: genişleyen pencereler aynı başlangıcı paylaşır; sabit parametrelerle tüm seri
+    # tek geçişte filtrelenir ve her orijinin tahmini kapalı formdan okunur: l_t + h·b_t + s_(t+h-7⌈h/7⌉)
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing
+    p = model.params
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        tam = ExponentialSmoothing(
+            y, trend="add", seasonal="add", seasonal_periods=7, initialization_method="known",
+            initial_level=p["initial_level"], initial_trend=p["initial_trend"],
+            initial_seasonal=p["initial_seasons"],
+        ).fit(
+            smoothing_level=p["smoothing_level"], smoothing_trend=p["smoothing_trend"],
+            smoothing_seasonal=p["smoothing_seasonal"], optimized=False,
+        )
+    t = orijinler - 1
+    h = np.arange(1, ufuk + 1)
+    return (
+        np.asarray(tam.level)[t][:, None] + h[None, :] * np.asarray(tam.trend)[t][:, None]
+        + np.asarray(tam.season)[_profil_indeksleri(t, ufuk)]
+    )
+
+
+def geriye_donuk_test(s: pd.Series, yontemler=None, ufuk: int = 7, orijin_sayisi: int = 8,
+                      adim: int = 7, min_egitim: int = 28, **parametreler) -> pd.DataFrame:
+    """
+    Kayan orijinli geriye dönük test: her yöntem için tüm orijinlerin `ufuk` günlük tahmini tek
+    matriste üretilir ve MAE (saat) / MAPE (%, gerçekleşenin 0 olduğu günler hariç) hesaplanır.
+    Dönüş: Yöntem, MAE, MAPE, Orijin (kullanılan orijin sayısı), Hata (kullanılamayan yöntemler).
+    """
+    y = gunluk_seri(s)
+    yontemler = yontemler or YONTEMLER
+    orijinler = _orijinler(len(y), ufuk, orijin_sayisi, adim, min_egitim)
+    satirlar = []
+    if len(orijinler) == 0:
+        return pd.DataFrame(
+            [{"Yöntem": yontem, "MAE": np.nan, "MAPE": np.nan, "Orijin": 0, "Hata": "Seri çok kısa"}
+             for yontem in yontemler]
+        )
+
+    gercek = y.to_numpy()[orijinler[:, None] + np.arange(ufuk)[None, :]]
+    pozitif = gercek > 0
+    for yontem in yontemler:
+        try:
+            tahmin = _toplu_tahmin(y, yontem, orijinler, ufuk, parametreler)
+        except TahminHatasi as e:
+            satirlar.append({"Yöntem": yontem, "MAE": np.nan, "MAPE": np.nan, "Orijin": 0, "Hata": str(e)})
+            continue
+        hata = np.abs(tahmin - gercek)
+        mape = (hata[pozitif] / gercek[pozitif]).mean() * 100 if pozitif.any() else np.nan
+        satirlar.append({
+            "Yöntem": yontem, "MAE": float(hata.mean()), "MAPE": float(mape),
+            "Orijin": len(orijinler), "Hata": None,
+        })
+    return pd.DataFrame(satirlar)
+
+
+def yontem_karsilastir(df: pd.DataFrame, grup_kolonu: str, tarih_kolonu: str, saat_kolonu: str,
+                       yontemler=None, **kwargs) -> pd.DataFrame:
+    """Gruplar (ör. çağrı kodu) için geriye_donuk_test sonuçları alt alta; ilk kolon grup değeri."""
+    gunluk = df.groupby([grup_kolonu, df[tarih_kolonu].dt.normalize()])[saat_kolonu].sum()
+    parcalar = []
+    for grup, s in gunluk.groupby(level=0, sort=True):
+        sonuc = geriye_donuk_test(s.droplevel(0), yontemler, **kwargs)
+        sonuc.insert(0, grup_kolonu, grup)
+        parcalar.append(sonuc)
+    return pd.concat(parcalar, ignore_index=True) if parcalar else pd.DataFrame()
@@ -0,0 +1,105 @@
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# Biçim sınıfları (metin hali üzerinden, tam eşleşme)
+_SERI_RE = r"\d+(?:\.\d+)?"
+_SAAT_RE = r"(?: \d{2}:\d{2}(?::\d{2})?)?"
+_ISO_RE = r"\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?"
+_NOKTALI_RE = r"\d{2}\.\d{2}\.\d{4}" + _SAAT_RE
+_EGIK_RE = r"(\d{1,2})/(\d{1,2})/\d{4}" + _SAAT_RE
+
+_EXCEL_TABAN = pd.Timestamp("1899-12-30")
+# Timedelta aralığını aşan seri sayılar (ör. 20250301) son çareye bırakılır
+_SERI_UST_SINIR = pd.Timedelta.max.days
+
+
+def _son_care(s: str):
+    # Yıl başta (YYYY/AA/GG, YYYY-A-G ...) ise dayfirst gün ile ayı takas eder
+    yil_basta = s[:4].isdigit()
+    try:
+        ts = pd.to_datetime(s, errors="raise", dayfirst=not yil_basta, yearfirst=True)
+    except Exception:
+        return pd.NaT
+    return ts.tz_localize(None) if ts.tzinfo is not None else ts
+
+
+def _nesne_tarih(x) -> np.datetime64:
+    # datetime64[ns] aralığı dışındaki değerler (ör. date(1, 1, 1)) NaT olur
+    try:
+        ts = pd.Timestamp(x).as_unit("ns")
+    except (ValueError, OverflowError):
+        return np.datetime64("NaT")
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    return ts.to_datetime64()
+
+
+def _benzersizleri_ayristir(metin: pd.Series) -> np.ndarray:
+    """Benzersiz (strip'lenmiş) metinleri sınıflarına göre toplu ayrıştırır → datetime64[ns] dizisi."""
+    sonuc = pd.Series(pd.NaT, index=metin.index, dtype="datetime64[ns]")
+
+    # 1) Excel seri sayısı (1899-12-30 bazlı, kesirli gün = saat)
+    seri = metin.str.fullmatch(_SERI_RE)
+    if seri.any():
+        gun = pd.to_numeric(metin[seri], errors="coerce")
+        gun = gun[gun.abs() <= _SERI_UST_SINIR]
+        sonuc[gun.index] = _EXCEL_TABAN + pd.to_timedelta(gun, unit="D")
+
+    # 2) ISO (YYYY-MM-DD[ hh:mm[:ss]]) → sadece gün
+    iso = metin.str.fullmatch(_ISO_RE) & sonuc.isna()
+    if iso.any():
+        sonuc[iso] = pd.to_datetime(metin[iso].str[:10], format="%Y-%m-%d", errors="coerce")
+
+    # 3) TR noktalı (GG.AA.YYYY[ ...]) → sadece gün
+    nokta = metin.str.fullmatch(_NOKTALI_RE) & sonuc.isna()
+    if nokta.any():
+        sonuc[nokta] = pd.to_datetime(metin[nokta].str[:10], format="%d.%m.%Y", errors="coerce")
+
+    # 4) Eğik çizgi: 1. parça > 12 → GG/AA, 2. parça > 12 → AA/GG, ikisi de ≤ 12 → TR (GG/AA)
+    parcalar = metin.str.extract(r"^" + _EGIK_RE + r"$")
+    egik = parcalar[0].notna() & sonuc.isna()
+    if egik.any():
+        p1 = parcalar.loc[egik, 0].astype(int)
+        p2 = parcalar.loc[egik, 1].astype(int)
+        gun_kismi = metin[egik].str.split(" ").str[0]
+        ay_gun = (p1 <= 12) & (p2 > 12)
+        sonuc[ay_gun[ay_gun].index] = pd.to_datetime(gun_kismi[ay_gun], format="%m/%d/%Y", errors="coerce")
+        gun_ay = ~ay_gun
+        sonuc[gun_ay[gun_ay].index] = pd.to_datetime(gun_kismi[gun_ay], format="%d/%m/%Y", errors="coerce")
+
+    # 5) Son çare: tek tek dayfirst (yıl başta değilse) + yearfirst (yalnız hiçbir sınıfa uymayan / ayrıştırılamayan benzersizler)
+    kalan = sonuc.isna()
+    if kalan.any():
+        sonuc[kalan] = pd.to_datetime(metin[kalan].map(_son_care), errors="coerce")
+    return sonuc.to_numpy(dtype="datetime64[ns]")
+
+
+def tarih_normalize(seri) -> pd.Series:
+    """
+    Karışık biçimli tarih kolonunu datetime64'e çevirir (OZU'daki biçim-duyarlı kurallar):
+    Excel seri → ISO (YYYY-MM-DD) → TR noktalı (GG.AA.YYYY) → eğik çizgi (GG/AA ya da AA/GG sezgisel)
+    → son çare (yıl başta değilse dayfirst). ISO / noktalı / eğik biçimlerde saat kısmı atılır.
+    Her değer metin halinde bir kez ayrıştırılır: tekrar eden değerler factorize ile tek sefer işlenir.
+    Zaten datetime64 olan kolonlar olduğu gibi döner; kolon içindeki date / datetime nesneleri
+    metne çevrilmeden (saatiyle) alınır.
+    """
+    seri = pd.Series(seri) if not isinstance(seri, pd.Series) else seri
+    if pd.api.types.is_datetime64_any_dtype(seri.dtype):
+        return seri
+    if seri.empty:
+        return pd.Series(pd.NaT, index=seri.index, dtype="datetime64[ns]")
+
+    kodlar, benzersiz = pd.factorize(seri)
+    benzersiz = pd.Series(benzersiz, dtype=object)
+    nesne = benzersiz.map(lambda x: isinstance(x, (date, datetime, np.datetime64)))
+    ayrik = np.full(len(benzersiz), np.datetime64("NaT"), dtype="datetime64[ns]")
+    if nesne.any():
+        ayrik[nesne.to_numpy()] = [_nesne_tarih(x) for x in benzersiz[nesne]]
+    if not nesne.all():
+        metin = benzersiz[~nesne].map(lambda x: str(x).strip())
+        ayrik[~nesne.to_numpy()] = _benzersizleri_ayristir(metin)
+    # -1 (boş değer) → sondaki NaT
+    dizi = np.append(ayrik, np.datetime64("NaT"))
+    return pd.Series(dizi[kodlar], index=seri.index, name=seri.name)
@@ -0,0 +1,276 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+
+import pandas as pd
+
+try:  # Naeron snapshot'ı için opsiyonel; yoksa doğrudan SQLite'tan okunur
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+from db.migrations import golgesiz_secim
+from tabs.utils.ogrenci_kodu import naeron_ogrenci_kodu, ogrenci_patlat, plan_ogrenci_kodu
+from tabs.utils.sure_utils import sure_saat
+from tabs.utils.tarih_utils import tarih_normalize
+
+PLAN_DB_PATH = "ucus_egitim.db"
+NAERON_DB_PATH = "naeron_kayitlari.db"
+
+# veri_surumu: tablo başına yazma sayacı. ucus_planlari / naeron_ucuslar üzerindeki trigger'lar
+# her INSERT/UPDATE/DELETE'te sayacı artırır; önbellek bu sayaca göre geçersiz olur.
+IZLENEN_TABLOLAR = ("ucus_planlari", "naeron_ucuslar")
+
+# Snapshot dosyasında kategorik saklanan (tekrarlı) metin kolonları
+SNAPSHOT_KATEGORIK = ["Öğrenci Pilot", "Öğretmen Pilot", "Görev", "Çağrı", "ogrenci_kodu"]
+SNAPSHOT_IMZA_ANAHTARI = b"naeron_imza"
+
+_onbellek: dict = {}
+_kilit = threading.Lock()
+
+
+# --- Sürüm sayacı ---
+def ensure_veri_surumu(conn: sqlite3.Connection, tablo: str) -> bool:
+    """
+    veri_surumu tablosunu ve `tablo` için sayaç trigger'larını kurar.
+    Tablo yoksa False döner. Trigger'lar yeni kurulduysa (ör. tablo to_sql ile yeniden
+    oluşturulduysa ya da DB dosyası değiştiyse) arada kaçan yazmalar olabileceği için
+    sayaca yeni bir kimlik atanır; eski önbellek kayıtları böylece eşleşmez.
+    """
+    if tablo not in IZLENEN_TABLOLAR:
+        raise ValueError(f"İzlenmeyen tablo: {tablo}")
+    cur = conn.cursor()
+    if not cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (tablo,)
+    ).fetchone():
+        return False
+    if cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='trigger' AND name=?", (f"trg_{tablo}_surum_ins",)
+    ).fetchone():
+        return True
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS veri_surumu (
+            tablo TEXT PRIMARY KEY,
+            surum INTEGER NOT NULL DEFAULT 0,
+            kimlik TEXT
+        )
+    """)
+    cur.execute("INSERT OR IGNORE INTO veri_surumu (tablo, surum) VALUES (?, 0)", (tablo,))
+    for olay in ("INSERT", "UPDATE", "DELETE"):
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{tablo}_surum_{olay[:3].lower()} AFTER {olay} ON {tablo}
+            BEGIN
+                UPDATE veri_surumu SET surum = surum + 1 WHERE tablo = '{tablo}';
+            END
+        """)
+    cur.execute("UPDATE veri_surumu SET kimlik = ? WHERE tablo = ?", (uuid.uuid4().hex, tablo))
+    conn.commit()
+    return True
+
+
+def veri_surumu(conn: sqlite3.Connection, tablo: str):
+    """Tablonun (kimlik, yazma sayacı) çiftini döndürür; tablo yoksa None."""
+    if not ensure_veri_surumu(conn, tablo):
+        return None
+    row = conn.execute("SELECT kimlik, surum FROM veri_surumu WHERE tablo = ?", (tablo,)).fetchone()
+    return tuple(row) if row else None
+
+
+def veri_surumleri(conn: sqlite3.Connection, naeron_db_path: str = NAERON_DB_PATH) -> tuple:
+    """(plan sürümü, naeron sürümü) — st.cache_data anahtarı olarak kullanılabilir."""
+    conn_n = sqlite3.connect(naeron_db_path)
+    try:
+        return veri_surumu(conn, "ucus_planlari"), veri_surumu(conn_n, "naeron_ucuslar")
+    finally:
+        conn_n.close()
+
+
+def _db_dosyasi(conn: sqlite3.Connection) -> str:
+    for _, ad, dosya in conn.execute("PRAGMA database_list"):
+        if ad == "main":
+            return os.path.abspath(dosya) if dosya else ""
+    return ""
+
+
+# --- Tiplendirme ---
+def _gorev_norm(seri: pd.Series) -> pd.Series:
+    # ozet_utils2.normalize_task'in vektörel hali (boşluk/tire kaldır, uppercase)
+    return seri.astype(str).str.replace(r"[\s\-]+", "", regex=True).str.upper()
+
+
+def _kod_kaynagi(df: pd.DataFrame, ham_kolon: str) -> pd.Series:
+    # Migrasyonla gelen (trigger'la güncel tutulan, indeksli) ogrenci_kodu gölge kolonu varsa o
+    # kullanılır; ayıklama idempotent olduğu için benzersiz gölge değerlerinden geçirmek sadece
+    # Python strip() kurallarına hizalar. Gölgesi boş satırlar ham kolondan hesaplanır.
+    if "ogrenci_kodu" in df.columns:
+        return df["ogrenci_kodu"].where(df["ogrenci_kodu"].notna(), df[ham_kolon])
+    return df[ham_kolon]
+
+
+def _plan_tiplendir(df: pd.DataFrame) -> pd.DataFrame:
+    if "ogrenci" in df.columns:
+        df["ogrenci_kodu"] = plan_ogrenci_kodu(_kod_kaynagi(df, "ogrenci"))
+    if "gorev_ismi" in df.columns:
+        df["gorev_norm"] = _gorev_norm(df["gorev_ismi"])
+    df["sure_saat"] = sure_saat(df["sure"]) if "sure" in df.columns else 0.0
+    return df
+
+
+def _naeron_tiplendir(df: pd.DataFrame) -> pd.DataFrame:
+    if "Uçuş Tarihi 2" in df.columns:
+        df["ucus_tarihi"] = tarih_normalize(df["Uçuş Tarihi 2"])
+    if "Öğrenci Pilot" in df.columns:
+        df["ogrenci_kodu"] = naeron_ogrenci_kodu(_kod_kaynagi(df, "Öğrenci Pilot"))
+    if "Görev" in df.columns:
+        df["gorev_norm"] = _gorev_norm(df["Görev"])
+    df["sure_dec"] = sure_saat(df["Block Time"]) if "Block Time" in df.columns else 0.0
+    if "Flight Time" in df.columns:
+        df["flight_dec"] = sure_saat(df["Flight Time"])
+    return df
+
+
+# --- Naeron snapshot (Parquet) ---
+def naeron_snapshot_yolu(naeron_db_path: str = NAERON_DB_PATH) -> str:
+    """naeron_kayitlari.db → naeron_kayitlari.parquet (aynı klasörde)."""
+    return os.path.splitext(naeron_db_path)[0] + ".parquet"
+
+
+def _naeron_imzasi(conn_n: sqlite3.Connection, surum) -> str:
+    # İçerik imzası: trigger sayacı (her yazmada değişir) + satır sayısı + snapshot biçimi
+    # (biçim 2: gölge kolonlar hariç; gölgeli eski snapshot'lar böylece yeniden yazılır)
+    satir = conn_n.execute("SELECT COUNT(*) FROM naeron_ucuslar").fetchone()[0]
+    return json.dumps({"kimlik": surum[0], "surum": surum[1], "satir": satir, "bicim": 2})
+
+
+def _snapshot_oku(yol: str, imza: str):
+    """İmza eşleşirse snapshot'ı memory-map ile yükler; eşleşmezse/okunamazsa None."""
+    try:
+        meta = pq.read_schema(yol).metadata or {}
+        if meta.get(SNAPSHOT_IMZA_ANAHTARI, b"").decode("utf-8") != imza:
+            return None
+        df = pq.read_table(yol, memory_map=True).to_pandas()
+    except Exception:
+        return None
+    # Kategorikler tüketicilere SQLite yolundaki gibi object (None'lu) döner
+    for kol in SNAPSHOT_KATEGORIK:
+        if kol in df.columns and isinstance(df[kol].dtype, pd.CategoricalDtype):
+            df[kol] = df[kol].astype(object).where(df[kol].notna(), None)
+    return df
+
+
+def _snapshot_yaz(df: pd.DataFrame, yol: str, imza: str) -> None:
+    gecici = f"{yol}.{os.getpid()}.tmp"
+    try:
+        yazilacak = df.copy()
+        for kol in SNAPSHOT_KATEGORIK:
+            if kol in yazilacak.columns:
+                yazilacak[kol] = yazilacak[kol].astype("category")
+        tablo = pa.Table.from_pandas(yazilacak, preserve_index=False)
+        tablo = tablo.replace_schema_metadata(
+            {**(tablo.schema.metadata or {}), SNAPSHOT_IMZA_ANAHTARI: imza.encode("utf-8")}
+        )
+        pq.write_table(tablo, gecici)
+        os.replace(gecici, yol)
+    except Exception:
+        # Snapshot sadece hızlandırma; karışık tipli kolon vb. durumlarda SQLite yolu kullanılır
+        try:
+            os.remove(gecici)
+        except Exception:
+            pass
+
+
+def _naeron_sqliteden(conn_n: sqlite3.Connection) -> pd.DataFrame:
+    sorgu = f"SELECT {golgesiz_secim(conn_n, 'naeron_ucuslar')} FROM naeron_ucuslar"
+    return _naeron_tiplendir(pd.read_sql_query(sorgu, conn_n))
+
+
+def _naeron_yukle(conn_n: sqlite3.Connection, naeron_db_path: str, surum) -> pd.DataFrame:
+    if pq is None or surum is None:
+        return _naeron_sqliteden(conn_n)
+    yol = naeron_snapshot_yolu(naeron_db_path)
+    imza = _naeron_imzasi(conn_n, surum)
+    df = _snapshot_oku(yol, imza) if os.path.exists(yol) else None
+    if df is None:
+        df = _naeron_sqliteden(conn_n)
+        _snapshot_yaz(df, yol, imza)
+    return df
+
+
+def _oku(conn: sqlite3.Connection, tablo: str, yukle, gorunum: str = "") -> pd.DataFrame:
+    # `gorunum`: aynı tablodan türetilen farklı çerçeveler (ör. öğrenci bazında açılmış hali)
+    # aynı sürüm sayacına bağlı ayrı önbellek kayıtlarında tutulur
+    surum = veri_surumu(conn, tablo)
+    anahtar = (_db_dosyasi(conn), tablo, gorunum)
+    if surum is not None and anahtar[0]:
+        with _kilit:
+            kayit = _onbellek.get(anahtar)
+        if kayit is not None and kayit[0] == surum:
+            return kayit[1].copy()
+
+    df = yukle(surum)
+    if surum is not None and anahtar[0]:
+        with _kilit:
+            _onbellek[anahtar] = (surum, df)
+        return df.copy()
+    return df
+
+
+# --- Okuma API'si ---
+def plan_oku(conn: sqlite3.Connection) -> pd.DataFrame:
+    """
+    `ucus_planlari` (trigger'lı gölge kolonlar hariç) + tipli yardımcı kolonlar:
+    plan_tarihi (datetime), ogrenci_kodu, gorev_norm, sure_saat (ondalık saat).
+    Sonuç veri sürümü değişene kadar süreç içinde önbellekte tutulur; her çağrı kopya döndürür.
+    """
+    return _oku(
+        conn,
+        "ucus_planlari",
+        lambda _surum: _plan_tiplendir(
+            pd.read_sql_query(
+                f"SELECT {golgesiz_secim(conn, 'ucus_planlari')} FROM ucus_planlari",
+                conn,
+                parse_dates=["plan_tarihi"],
+            )
+        ),
+    )
+
+
+def naeron_oku(naeron_db_path: str = NAERON_DB_PATH) -> pd.DataFrame:
+    """
+    `naeron_ucuslar` (trigger'lı gölge kolonlar hariç) + tipli yardımcı kolonlar:
+    ucus_tarihi (datetime), ogrenci_kodu, gorev_norm, sure_dec / flight_dec (Block / Flight Time,
+    ondalık saat). Ham kolonlar (ör. "Uçuş Tarihi 2") olduğu gibi korunur.
+    pyarrow kuruluysa süreç önbelleği boşken DB yanındaki Parquet snapshot'ı kullanılır;
+    snapshot tablo içeriği (sürüm sayacı + satır sayısı) değişince yeniden yazılır.
+    """
+    conn_n = sqlite3.connect(naeron_db_path)
+    try:
+        return _oku(conn_n, "naeron_ucuslar", lambda surum: _naeron_yukle(conn_n, naeron_db_path, surum))
+    finally:
+        conn_n.close()
+
+
+def naeron_ogrenci_oku(naeron_db_path: str = NAERON_DB_PATH) -> pd.DataFrame:
+    """
+    naeron_oku'nun öğrenci bazında açılmış (long) hali: MCC satırları içlerindeki her öğrenci
+    koduna çoğaltılır, diğer satırlar kendi ogrenci_kodu'nu taşır (bkz. ogrenci_patlat).
+    naeron_oku ile aynı sürüm sayacına bağlı önbellekte tutulur.
+    """
+    conn_n = sqlite3.connect(naeron_db_path)
+    try:
+        return _oku(
+            conn_n, "naeron_ucuslar",
+            lambda _surum: ogrenci_patlat(naeron_oku(naeron_db_path)),
+            gorunum="ogrenci",
+        )
+    finally:
+        conn_n.close()
+
+
+def onbellegi_temizle() -> None:
+    with _kilit:
+        _onbellek.clear()
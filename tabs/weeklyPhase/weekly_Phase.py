@@ -7,10 +7,9 @@ import numpy as np
 import pandas as pd
 import streamlit as st
 
-from tabs.utils.ozet_utils2 import (
-    ozet_panel_verisi_hazirla_batch,
-    ogrenci_kodu_ayikla,
-)
+from db.migrations import golgesiz_secim
+from tabs.utils.ogrenci_kodu import plan_ogrenci_kodu
+from tabs.utils.ozet_utils2 import ozet_panel_verisi_hazirla_batch
 
 
 def _ensure_kume_table(conn: sqlite3.Connection) -> None:
@@ -339,7 +338,7 @@ def tab_ogrenci_ozet_sadece_eksik(
     bitis = baslangic + timedelta(days=gun_dict[periyot])
     st.caption(f"Bitis: {bitis}")
 
-    df_plan = pd.read_sql_query("SELECT * FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
+    df_plan = pd.read_sql_query(f"SELECT {golgesiz_secim(conn, 'ucus_planlari')} FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
     df_plan.columns = [_normalize_text(col) for col in df_plan.columns]
     if 'ogrenci' not in df_plan.columns or 'plan_tarihi' not in df_plan.columns:
         st.error('Plan tablosunda gerekli kolonlar (ogrenci, plan_tarihi) bulunamadi.')
@@ -358,7 +357,7 @@ def tab_ogrenci_ozet_sadece_eksik(
             df_plan = df_plan.rename(columns={"gorev": "gorev_ismi"})
         else:
             df_plan["gorev_ismi"] = df_plan.get("gorev_kodu", "GOREV-NA")
-    df_plan["ogrenci_kodu"] = df_plan["ogrenci"].apply(ogrenci_kodu_ayikla)
+    df_plan["ogrenci_kodu"] = plan_ogrenci_kodu(df_plan["ogrenci"])
 
     st.markdown("## Filtreler ve Kumeler")
     tab_filtre, tab_kume = st.tabs(["Filtrele", "Kume Yonetimi"])
@@ -700,7 +699,7 @@ def tab_ogrenci_ozet_sadece_eksik(
         )
         try:
             with sqlite3.connect(naeron_db_path, check_same_thread=False) as conn_naeron:
-                df_naeron_raw = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn_naeron)
+                df_naeron_raw = pd.read_sql_query(f"SELECT {golgesiz_secim(conn_naeron, 'naeron_ucuslar')} FROM naeron_ucuslar", conn_naeron)
             df_naeron_raw.columns = [_normalize_text(col) for col in df_naeron_raw.columns]
         except Exception as err:
             st.error(f"Naeron verisi okunamadi: {err}")
@@ -708,7 +707,7 @@ def tab_ogrenci_ozet_sadece_eksik(
 
         required_cols = {"ogrenci_pilot", "ucus_tarihi_2", "gorev"}
         if not df_naeron_raw.empty and required_cols.issubset(df_naeron_raw.columns):
-            df_naeron_raw["ogrenci_kodu"] = df_naeron_raw["ogrenci_pilot"].apply(ogrenci_kodu_ayikla)
+            df_naeron_raw["ogrenci_kodu"] = plan_ogrenci_kodu(df_naeron_raw["ogrenci_pilot"])
             df_naeron_raw["tarih"] = pd.to_datetime(df_naeron_raw["ucus_tarihi_2"], errors="coerce")
             df_naeron_raw = df_naeron_raw.dropna(subset=["tarih"])
         else:
@@ -8,10 +8,9 @@ from io import BytesIO
 import re
 import numpy as np
 
-from tabs.utils.ozet_utils2 import (
-    ozet_panel_verisi_hazirla_batch,
-    ogrenci_kodu_ayikla,
-)
+from tabs.utils.ogrenci_kodu import plan_ogrenci_kodu
+from tabs.utils.ozet_utils2 import ozet_panel_verisi_hazirla_batch
+from tabs.utils.veri_deposu import naeron_oku, onbellegi_temizle, plan_oku, veri_surumleri
 today = pd.to_datetime(pd.Timestamp.today().date())
 def _last_flight_style(val):
     t = pd.to_datetime(val, errors="coerce")
@@ -34,6 +33,7 @@ def _hard_refresh():
     # Tüm data ve resource cache'lerini temizle
     st.cache_data.clear()
     st.cache_resource.clear()
+    onbellegi_temizle()
     # Bu sayfada kullandığın buster'ı artır
     st.session_state.weekly_cache_buster = st.session_state.get("weekly_cache_buster", 0) + 1
     # Tam bir yeniden çalıştırma
@@ -45,10 +45,12 @@ def _gorev_durum_string(row) -> str:
     return f"{row['gorev_ismi']} - {row['durum']}" + (f" ({sure})" if sure and sure != "00:00" else "") + f" [{tip}]"
 
 def _cached_batch_fetcher(conn, kodlar, cache_buster:int=0):
-    @st.cache_data(show_spinner=False, ttl=5)  # <-- EKLE: ttl
-    def _run(_kodlar, _buster):
+    # Anahtar: plan/naeron veri sürümleri — import veya revize yazdığında cache anında geçersiz olur.
+    # Eski sürümlerin girdileri bir daha okunmaz; max_entries bellekte birikmelerini önler.
+    @st.cache_data(show_spinner=False, max_entries=8)
+    def _run(_kodlar, _buster, _surumler):
         return ozet_panel_verisi_hazirla_batch(_kodlar, conn)
-    return _run(kodlar, cache_buster)
+    return _run(kodlar, cache_buster, veri_surumleri(conn))
 
 
 def _fmt_hhmm(val):
@@ -208,11 +210,10 @@ def tab_ogrenci_ozet_sadece_eksik(st, conn):
     st.caption(f"Bitiş: {bitis}")
 
     # Plan tablosu
-    df_plan = pd.read_sql_query("SELECT * FROM ucus_planlari", conn, parse_dates=["plan_tarihi"])
+    df_plan = plan_oku(conn)
     if df_plan.empty:
         st.warning("Planlama tablosunda veri bulunamadı.")
         return
-    df_plan["ogrenci_kodu"] = df_plan["ogrenci"].apply(ogrenci_kodu_ayikla)
 
 
 
@@ -300,24 +301,9 @@ def tab_ogrenci_ozet_sadece_eksik(st, conn):
     # BATCH: tek seferde hepsini hazırla (cache'li)
     sonuc = _cached_batch_fetcher(conn, tuple(sorted(ogrenciler_aralik)), st.session_state.weekly_cache_buster)
 
-    import sqlite3
-    # --- Naeron verisini oku ve kodları ayıkla ---
-    conn_naeron = sqlite3.connect("naeron_kayitlari.db")
-    df_naeron_raw = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn_naeron)
-    conn_naeron.close()
-
-    # Kodları senin fonksiyonla ayıkla
-    df_naeron_raw["ogrenci_kodu"] = df_naeron_raw["Öğrenci Pilot"].apply(ogrenci_kodu_ayikla)
-
-    # Tarih formatı
-    df_naeron_raw["Tarih"] = pd.to_datetime(df_naeron_raw["Uçuş Tarihi 2"], errors="coerce")
-
-
     # --- (DÖNGÜDEN ÖNCE) NAERON VERİSİNİ HAZIRLA ---
     try:
-        conn_naeron = sqlite3.connect("naeron_kayitlari.db", check_same_thread=False)
-        df_naeron_raw = pd.read_sql_query("SELECT * FROM naeron_ucuslar", conn_naeron)
-        conn_naeron.close()
+        df_naeron_raw = naeron_oku("naeron_kayitlari.db")
     except Exception as e:
         st.error(f"Naeron verisi okunamadı: {e}")
         df_naeron_raw = pd.DataFrame()
@@ -375,9 +361,9 @@ def tab_ogrenci_ozet_sadece_eksik(st, conn):
     gerekli_kolonlar = {"Öğrenci Pilot", "Uçuş Tarihi 2", "Görev"}
     if not df_naeron_raw.empty and gerekli_kolonlar.issubset(df_naeron_raw.columns):
         # Öğrenci kodunu SENİN fonksiyonla ayıkla
-        df_naeron_raw["ogrenci_kodu"] = df_naeron_raw["Öğrenci Pilot"].apply(ogrenci_kodu_ayikla)
-        # Tarihi parse et
-        df_naeron_raw["Tarih"] = pd.to_datetime(df_naeron_raw["Uçuş Tarihi 2"], errors="coerce")
+        df_naeron_raw["ogrenci_kodu"] = plan_ogrenci_kodu(df_naeron_raw["Öğrenci Pilot"])
+        # Tarih (veri deposunda parse edilmiş halde gelir)
+        df_naeron_raw["Tarih"] = df_naeron_raw["ucus_tarihi"]
         df_naeron_raw = df_naeron_raw.dropna(subset=["Tarih"])
     else:
         # Boş güvenliği (kolonlar yoksa da buraya düşsün)